@@ -36,6 +36,15 @@ def build_binary():
         print(f"Error: Main script not found: {main_script}")
         sys.exit(1)
     
+    # Bundle the preview's JavaScript libraries (see fetch_preview_assets.py)
+    sys.path.insert(0, str(Path(__file__).parent))
+    from fetch_preview_assets import fetch_assets
+    if not fetch_assets():
+        # A binary without them would need the network for its preview
+        print("Error: preview assets are missing or unverified.")
+        print("Pin their digests with: python scripts/fetch_preview_assets.py --pin")
+        sys.exit(1)
+    
     # PyInstaller arguments
     # Using --onedir (folder method) instead of --onefile for faster startup
     system = platform.system()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Download the JavaScript libraries bundled with the GUI preview.
+
+The preview shell page (src/md2office/gui/resources/preview/shell.html)
+loads Mermaid.js and highlight.js from its vendor/ directory so that it
+works offline. Run this before building or packaging; files that are
+already present are kept if they match their pinned digest.
+
+Every file is checked against the SHA-256 recorded in
+scripts/preview_assets.sha256 (sha256sum format) before it is written;
+a file without a recorded digest, or with a different one, is not
+bundled. To record the digests after changing a version, run with
+--pin: each file is then downloaded from two independent CDNs, and its
+digest is recorded only if both copies are identical.
+
+Usage:
+    python scripts/fetch_preview_assets.py [--force] [--pin]
+"""
+
+import hashlib
+import sys
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+VENDOR_DIR = PROJECT_ROOT / "src" / "md2office" / "gui" / "resources" / "preview" / "vendor"
+DIGEST_FILE = Path(__file__).parent / "preview_assets.sha256"
+
+# Pinned library versions: the URL the shell page falls back to (keep in
+# sync with shell.html) and an independent mirror used by --pin
+ASSETS = {
+    "mermaid.min.js": (
+        "https://cdn.jsdelivr.net/npm/mermaid@10.9.1/dist/mermaid.min.js",
+        "https://unpkg.com/mermaid@10.9.1/dist/mermaid.min.js",
+    ),
+    "highlight.min.js": (
+        "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js",
+        "https://cdn.jsdelivr.net/npm/@highlightjs/cdn-assets@11.9.0/highlight.min.js",
+    ),
+    "highlight.min.css": (
+        "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/default.min.css",
+        "https://cdn.jsdelivr.net/npm/@highlightjs/cdn-assets@11.9.0/styles/default.min.css",
+    ),
+}
+
+
+def read_digests() -> Dict[str, str]:
+    """Read the pinned digests (name -> SHA-256 hex digest)."""
+    digests = {}
+    if DIGEST_FILE.exists():
+        for line in DIGEST_FILE.read_text(encoding='utf-8').splitlines():
+            if line.strip() and not line.startswith('#'):
+                digest, name = line.split(None, 1)
+                digests[name.lstrip('*')] = digest.lower()
+    return digests
+
+
+def write_digests(digests: Dict[str, str]):
+    """Record pinned digests in sha256sum format."""
+    lines = [f"{digests[name]}  {name}\n" for name in ASSETS]
+    DIGEST_FILE.write_text(''.join(lines), encoding='utf-8')
+
+
+def verify_asset(name: str, data: bytes, digests: Dict[str, str]) -> bool:
+    """Check downloaded bytes against the digest pinned for an asset."""
+    expected = digests.get(name)
+    actual = hashlib.sha256(data).hexdigest()
+    if expected is None:
+        print(f"  {name}: no SHA-256 pinned in {DIGEST_FILE.name}; run with --pin")
+        return False
+    if actual != expected:
+        print(f"  {name}: SHA-256 mismatch (expected {expected}, got {actual})")
+        return False
+    return True
+
+
+def download(url: str) -> Optional[bytes]:
+    """Download a URL, or print the error and return None."""
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            return response.read()
+    except OSError as e:
+        print(f"  {url}: failed ({e})")
+        return None
+
+
+def pin_assets() -> bool:
+    """Download every asset from both sources and record digests if they agree."""
+    digests = {}
+    for name, urls in ASSETS.items():
+        copies = [download(url) for url in urls]
+        if None in copies:
+            return False
+        if copies[0] != copies[1]:
+            print(f"  {name}: sources differ; not pinned")
+            return False
+        digests[name] = hashlib.sha256(copies[0]).hexdigest()
+        print(f"  {name}: {digests[name]}")
+    write_digests(digests)
+    return True
+
+
+def fetch_assets(force: bool = False) -> bool:
+    """Download missing preview assets; return True if all are present and verified."""
+    VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+    digests = read_digests()
+    ok = True
+    for name, (url, _) in ASSETS.items():
+        target = VENDOR_DIR / name
+        if target.exists() and not force:
+            if verify_asset(name, target.read_bytes(), digests):
+                print(f"  {name}: present")
+                continue
+            target.unlink()
+        data = download(url)
+        if data is None or not verify_asset(name, data, digests):
+            ok = False
+            continue
+        target.write_bytes(data)
+        print(f"  {name}: downloaded")
+    return ok
+
+
+if __name__ == '__main__':
+    if '--pin' in sys.argv:
+        print(f"Pinning preview asset digests in {DIGEST_FILE}")
+        if not pin_assets():
+            sys.exit(1)
+    print(f"Fetching preview assets into {VENDOR_DIR}")
+    sys.exit(0 if fetch_assets(force='--force' in sys.argv) else 1)
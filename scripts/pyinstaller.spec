@@ -26,6 +26,15 @@ a = Analysis(
         'md2office',
         'md2office.cli',
         'md2office.cli.main',
+        'md2office.cli.serve',
+        'md2office.cli.watch',
+        'md2office.watch',
+        'md2office.watch.file_watcher',
+        'md2office.watch.incremental_builder',
+        'md2office.watch.watch_session',
+        'md2office.server',
+        'md2office.server.conversion_server',
+        'md2office.server.client',
         'md2office.gui',
         'md2office.gui.main_window',
         'md2office.gui.gui_main',
@@ -34,6 +43,11 @@ a = Analysis(
         'md2office.gui.workers.conversion_worker',
         'md2office.router',
         'md2office.generators',
+        # Generators are imported lazily by the registry, so list them explicitly
+        'md2office.generators.registry',
+        'md2office.generators.word_generator',
+        'md2office.generators.powerpoint_generator',
+        'md2office.generators.pdf_generator',
         'md2office.parser',
         'md2office.config',
         'md2office.errors',
@@ -0,0 +1,16 @@
+"""
+Cancellation module.
+
+Cooperative cancellation of conversions and all-or-nothing writing of
+their output files.
+"""
+
+from .cancel_token import (
+    CancellationToken, CANCEL_OPTION, get_cancel_token, check_cancelled, run_process
+)
+from .outputs import OutputTransaction
+
+__all__ = [
+    'CancellationToken', 'CANCEL_OPTION', 'get_cancel_token', 'check_cancelled',
+    'run_process', 'OutputTransaction'
+]
@@ -0,0 +1,177 @@
+"""
+Cancellation Tokens
+
+Cooperative cancellation for conversions. A CancellationToken is passed
+to the pipeline in the conversion options; the pipeline and generators
+check it between stages, sections, slides and flowables, and child
+processes (Mermaid renderers, PDF partition workers) are killed as soon
+as it is cancelled.
+"""
+
+import subprocess
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from ..errors import CancellationError, get_logger
+
+# Key under which the cancellation token is passed to generators in options
+CANCEL_OPTION = 'cancel_token'
+
+
+class CancellationToken:
+    """
+    Flag shared between a conversion and whoever may stop it.
+
+    Safe to cancel from any thread. Callbacks registered while work that
+    cannot poll the token is running (child processes) are called once,
+    on the cancelling thread.
+    """
+
+    def __init__(self):
+        """Initialize an uncancelled token."""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: Dict[int, Callable[[], None]] = {}
+        self._next_handle = 0
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Request cancellation and run the registered callbacks."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                get_logger().debug(f"Cancellation callback failed: {e}")
+
+    def raise_if_cancelled(self, stage: Optional[str] = None):
+        """
+        Stop the current conversion if cancellation was requested.
+
+        Args:
+            stage: Stage checking the token (reported in the error)
+
+        Raises:
+            CancellationError: If the token was cancelled
+        """
+        if self._event.is_set():
+            raise CancellationError(stage=stage)
+
+    def register(self, callback: Callable[[], None]) -> Optional[int]:
+        """
+        Call a function when the token is cancelled.
+
+        Args:
+            callback: Function to call (at once if already cancelled)
+
+        Returns:
+            Handle for unregister(), or None if the callback already ran
+        """
+        with self._lock:
+            if not self._event.is_set():
+                handle = self._next_handle
+                self._next_handle += 1
+                self._callbacks[handle] = callback
+                return handle
+        callback()
+        return None
+
+    def unregister(self, handle: Optional[int]):
+        """
+        Remove a registered callback.
+
+        Args:
+            handle: Handle returned by register()
+        """
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the token is cancelled.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the token was cancelled
+        """
+        return self._event.wait(timeout)
+
+
+def get_cancel_token(options: Optional[Dict[str, Any]]) -> Optional[CancellationToken]:
+    """Get the cancellation token passed in the conversion options, if any."""
+    return options.get(CANCEL_OPTION) if options else None
+
+
+def check_cancelled(options: Optional[Dict[str, Any]], stage: Optional[str] = None):
+    """
+    Stop the conversion if the token in the options was cancelled.
+
+    Args:
+        options: Conversion options (may contain a cancellation token)
+        stage: Stage checking the token
+
+    Raises:
+        CancellationError: If the conversion was cancelled
+    """
+    token = get_cancel_token(options)
+    if token is not None:
+        token.raise_if_cancelled(stage)
+
+
+def run_process(args: List[str], options: Optional[Dict[str, Any]] = None,
+                timeout: Optional[float] = None,
+                check: bool = False) -> subprocess.CompletedProcess:
+    """
+    Run a child process that is killed if the conversion is cancelled.
+
+    Behaves like ``subprocess.run(args, capture_output=True, ...)``.
+
+    Args:
+        args: Command line
+        options: Conversion options (may contain a cancellation token)
+        timeout: Maximum run time in seconds
+        check: Raise CalledProcessError on a non-zero exit status
+
+    Returns:
+        Completed process with captured output
+
+    Raises:
+        CancellationError: If the conversion was cancelled
+        FileNotFoundError: If the program does not exist
+        subprocess.TimeoutExpired: If the process timed out
+        subprocess.CalledProcessError: If check is set and the process failed
+    """
+    token = get_cancel_token(options)
+    if token is not None:
+        token.raise_if_cancelled("render")
+
+    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+        handle = token.register(process.kill) if token is not None else None
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            # Includes timeouts and KeyboardInterrupt: never leave the child running
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            if token is not None:
+                token.unregister(handle)
+
+    if token is not None:
+        token.raise_if_cancelled("render")
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
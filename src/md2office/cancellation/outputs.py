@@ -0,0 +1,116 @@
+"""
+Output Transactions
+
+Writes the output files of one document so an interrupted or cancelled
+conversion never leaves partial files behind: each file is staged as a
+temporary file next to its target, and the staged files are renamed
+into place only once the whole document has been written. Until then
+(and if the renames fail part way) the previous outputs are untouched.
+"""
+
+import os
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+# Flags for creating staged files; the mode passed with them is reduced
+# by the process umask, so outputs get the usual permissions
+_CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+
+def _create_temp_file(path: Path, suffix: str) -> Tuple[int, Path]:
+    """Create a new hidden file next to ``path``; return its descriptor and path."""
+    while True:
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}{suffix}")
+        try:
+            return os.open(temp_path, _CREATE_FLAGS, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+class OutputTransaction:
+    """
+    Output files written for one document.
+
+    Use as a context manager: files are put in place when the block
+    completes and discarded if it raises (including KeyboardInterrupt),
+    leaving any previous outputs as they were.
+    """
+
+    def __init__(self):
+        """Initialize an empty transaction."""
+        self.staged: List[Tuple[Path, Path]] = []
+        self.written: List[Path] = []
+
+    def write(self, path: Union[str, Path], data: bytes):
+        """
+        Stage a file, to be put in place by ``commit()``.
+
+        Args:
+            path: Output file
+            data: File contents
+        """
+        path = Path(path)
+        descriptor, temp_path = _create_temp_file(path, '.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as temp_file:
+                temp_file.write(data)
+        except BaseException:
+            _unlink(temp_path)
+            raise
+        self.staged.append((temp_path, path))
+
+    def commit(self):
+        """
+        Rename the staged files into place.
+
+        Existing outputs are moved aside first and restored if any rename
+        fails, so either all files are replaced or none.
+        """
+        replaced: List[Tuple[Path, Optional[Path]]] = []
+        try:
+            for temp_path, path in self.staged:
+                backup = None
+                if os.path.lexists(path):
+                    descriptor, backup = _create_temp_file(path, '.bak')
+                    os.close(descriptor)
+                    os.replace(path, backup)
+                replaced.append((path, backup))
+                os.replace(temp_path, path)
+        except BaseException:
+            for path, backup in reversed(replaced):
+                _unlink(path)
+                if backup is not None:
+                    os.replace(backup, path)
+            self.rollback()
+            raise
+
+        for _, backup in replaced:
+            if backup is not None:
+                _unlink(backup)
+        self.written.extend(path for _, path in self.staged)
+        self.staged = []
+
+    def rollback(self):
+        """Discard the staged files."""
+        for temp_path, _ in self.staged:
+            _unlink(temp_path)
+        self.staged = []
+
+    def __enter__(self) -> 'OutputTransaction':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+def _unlink(path: Path):
+    """Remove a file, ignoring errors."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -7,6 +7,7 @@ Command-line interface for md2office converter.
 
 import sys
 import os
+import time
 from pathlib import Path
 from typing import List, Optional
 
@@ -44,44 +45,74 @@ except ImportError:
     })()
 
 from ..router import ConversionPipeline
-# Import generators (may be None if dependencies not installed)
-try:
-    from ..generators import WordGenerator, PowerPointGenerator, PDFGenerator
-except ImportError:
-    WordGenerator = None
-    PowerPointGenerator = None
-    PDFGenerator = None
-from ..config import Config, load_config, find_config_file, merge_configs
+from ..parser.ast_cache import ASTCache, default_cache_dir
+from ..profiling import ConversionProfiler, PROFILER_OPTION, cprofile_to, profile_stage
+from ..cancellation import CancellationToken, OutputTransaction
+from ..progress import ProgressEvent, ProgressReporter, format_duration
+from ..config import Config, ConfigResolver, merge_configs
 from ..errors import (
     MD2OfficeError, ParseError, ConversionError, FileError,
-    ConfigurationError, setup_logger, get_logger
+    ConfigurationError, ServerError, setup_logger, get_logger
 )
 
 __version__ = "0.1.0"
 
 
-def ensure_generators_registered(pipeline: ConversionPipeline):
-    """Ensure format generators are registered."""
-    if WordGenerator is not None:
-        try:
-            word_gen = WordGenerator()
-            pipeline.register_generator('word', word_gen)
-        except Exception:
-            pass  # Generator initialization failed
+class _ProgressLine:
+    """
+    Live status line on stderr for a batch of conversions.
     
-    if PowerPointGenerator is not None:
-        try:
-            pptx_gen = PowerPointGenerator()
-            pipeline.register_generator('powerpoint', pptx_gen)
-        except Exception:
-            pass  # Generator initialization failed
+    Shows the file being converted, its progress and, for batches, the
+    share of the batch done and the estimated time left.
+    """
     
-    if PDFGenerator is not None:
-        try:
-            pdf_gen = PDFGenerator()
-            pipeline.register_generator('pdf', pdf_gen)
-        except Exception:
-            pass  # Generator initialization failed
+    def __init__(self, total_files: int):
+        """
+        Initialize progress line.
+        
+        Args:
+            total_files: Number of files in the batch
+        """
+        self.total_files = total_files
+        self.file_index = 0
+        self.file_name = ''
+        self.start = time.monotonic()
+        self._width = 0
+    
+    def reporter(self, file_index: int, file_name: str) -> ProgressReporter:
+        """
+        Create the progress reporter for one file of the batch.
+        
+        Args:
+            file_index: Position of the file in the batch
+            file_name: Name shown for the file
+            
+        Returns:
+            Reporter that updates the line
+        """
+        self.file_index = file_index
+        self.file_name = file_name
+        return ProgressReporter(self._show)
+    
+    def clear(self):
+        """Remove the line so other output starts at the line start."""
+        if self._width:
+            click.echo('\r' + ' ' * self._width + '\r', nl=False, err=True)
+            self._width = 0
+    
+    def _show(self, event: ProgressEvent):
+        """Redraw the line for a progress event."""
+        batch = self.total_files > 1
+        line = (f"[{self.file_index + 1}/{self.total_files}] {self.file_name}: "
+                f"{event.describe(with_eta=not batch)}")
+        if batch:
+            done = (self.file_index + event.fraction) / self.total_files
+            line += f" | batch {int(done * 100)}%"
+            if 0 < done < 1:
+                elapsed = time.monotonic() - self.start
+                line += f", about {format_duration(elapsed * (1 - done) / done)} left"
+        click.echo('\r' + line.ljust(self._width), nl=False, err=True)
+        self._width = len(line)
 
 
 @click.command()
@@ -90,7 +121,8 @@ def ensure_generators_registered(pipeline: ConversionPipeline):
 @click.option('--word', '-w', is_flag=True, help='Convert to Word (.docx) format')
 @click.option('--powerpoint', '-p', is_flag=True, help='Convert to PowerPoint (.pptx) format')
 @click.option('--pdf', is_flag=True, help='Convert to PDF format')
-@click.option('--all', '-a', is_flag=True, help='Convert to all formats')
+@click.option('--html', is_flag=True, help='Convert to HTML format')
+@click.option('--all', '-a', is_flag=True, help='Convert to Word, PowerPoint and PDF formats')
 @click.option('--output', '-o', type=click.Path(), default='.', help='Output directory')
 @click.option('--name', '-n', type=str, help='Output filename (without extension)')
 @click.option('--suffix', type=str, help='Add suffix to output filename')
@@ -104,18 +136,42 @@ def ensure_generators_registered(pipeline: ConversionPipeline):
 @click.option('--toc', is_flag=True, help='Generate table of contents (Word/PDF)')
 @click.option('--bookmarks/--no-bookmarks', default=True, help='Generate bookmarks (PDF)')
 @click.option('--skip-missing-images', is_flag=True, help='Skip missing image files')
+@click.option('--word-backend', type=click.Choice(['docx', 'streaming']), default='docx',
+              help='Word writer: "streaming" keeps memory bounded for very large documents')
+@click.option('--powerpoint-backend', type=click.Choice(['pptx', 'streaming']), default='pptx',
+              help='PowerPoint writer: "streaming" keeps memory bounded for very large decks')
+@click.option('--pdf-workers', type=click.IntRange(min=0), default=1,
+              help='Render large PDFs in this many processes, split at H1 sections (0: one per CPU)')
+@click.option('--pdf-partition-level', type=click.IntRange(1, 6), default=1,
+              help='Heading level at which --pdf-workers splits the document')
+@click.option('--emit-ast', is_flag=True,
+              help='Also write the parsed document as a binary AST (.mdast) for external tools')
+@click.option('--ast-cache/--no-ast-cache', default=True,
+              help='Reuse parsed documents from the on-disk cache when only options change')
+@click.option('--server', is_flag=True,
+              help='Convert using a running "md2office serve" process (falls back to local)')
+@click.option('--server-address', type=str, default=None,
+              help='Conversion server address (default: $MD2OFFICE_SERVER or per-user socket)')
+@click.option('--profile', is_flag=True,
+              help='Print time and peak memory per conversion stage after the batch')
+@click.option('--profile-dump', type=click.Path(file_okay=False), default=None,
+              help='Write a cProfile (pstats) file per document to this directory')
+@click.option('--progress', 'show_progress', is_flag=True,
+              help='Show a live progress line with the time left for the batch')
 @click.version_option(version=__version__, prog_name='md2office')
-def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite,
-        config, style, verbose, quiet, page_breaks, toc, bookmarks, skip_missing_images):
+def cli(inputs, gui, word, powerpoint, pdf, html, all, output, name, suffix, overwrite,
+        config, style, verbose, quiet, page_breaks, toc, bookmarks, skip_missing_images,
+        word_backend, powerpoint_backend, pdf_workers, pdf_partition_level, emit_ast, ast_cache, server, server_address, profile, profile_dump,
+        show_progress):
     """
-    Convert markdown files to Word, PowerPoint, and PDF formats.
+    Convert markdown files to Word, PowerPoint, PDF and HTML formats.
     
     INPUTS: Markdown file(s) or directory to convert
     
     If no inputs are provided and --gui is not specified, GUI will be launched automatically.
     """
     # Check for GUI mode
-    if gui or (not inputs and not any([word, powerpoint, pdf, all])):
+    if gui or (not inputs and not any([word, powerpoint, pdf, html, all])):
         try:
             from ..gui.gui_main import main as gui_main
             gui_main()
@@ -133,6 +189,9 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
     # Set up logging
     logger = setup_logger(verbose=verbose, quiet=quiet)
     
+    # Cancelled on Ctrl-C, so renderer and worker processes are stopped too
+    cancel_token = CancellationToken()
+    
     try:
         # Validate inputs
         if not inputs:
@@ -155,23 +214,28 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
                 formats.append('powerpoint')
             if pdf:
                 formats.append('pdf')
+        if html:
+            formats.append('html')
         
-        if not formats:
+        if not formats and not emit_ast:
             click.echo("Error: No output format specified", err=True)
             click.echo("\nPlease specify at least one output format:", err=True)
             click.echo("  --word, -w       Convert to Word (.docx) format", err=True)
             click.echo("  --powerpoint, -p Convert to PowerPoint (.pptx) format", err=True)
             click.echo("  --pdf            Convert to PDF format", err=True)
-            click.echo("  --all, -a        Convert to all formats", err=True)
+            click.echo("  --html           Convert to HTML format", err=True)
+            click.echo("  --all, -a        Convert to Word, PowerPoint and PDF formats", err=True)
+            click.echo("  --emit-ast       Write the parsed document as a binary AST (.mdast)", err=True)
             click.echo("\nExample:", err=True)
             click.echo("  md2office --word document.md", err=True)
             sys.exit(1)
         
         # Load configuration file if specified
+        config_resolver = ConfigResolver()
         base_config = Config()
         if config:
             try:
-                base_config = load_config(config)
+                base_config = config_resolver.load(config)
             except ConfigurationError as e:
                 click.echo(f"Error loading configuration file '{config}': {e}", err=True)
                 if hasattr(e, 'suggestion') and e.suggestion:
@@ -182,13 +246,8 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
                 click.echo("  - Configuration keys are correct", err=True)
                 sys.exit(1)
         else:
-            # Try to find config file automatically
-            config_path = find_config_file()
-            if config_path:
-                try:
-                    base_config = load_config(config_path)
-                except ConfigurationError:
-                    pass  # Ignore errors in auto-found config
+            # Try to find config file automatically (errors are ignored)
+            _, base_config = config_resolver.resolve()
         
         # Merge CLI options with config
         cli_options = {
@@ -197,6 +256,10 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
             'tableOfContents': toc,
             'bookmarks': bookmarks,
             'skipMissingImages': skip_missing_images,
+            'word_backend': word_backend,
+            'powerpoint_backend': powerpoint_backend,
+            'pdf_workers': pdf_workers,
+            'pdf_partition_level': pdf_partition_level,
             'overwrite': overwrite,
             'verbose': verbose,
             'quiet': quiet
@@ -204,9 +267,26 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
         
         config_obj = merge_configs(base_config, cli_options)
         
-        # Initialize pipeline
-        pipeline = ConversionPipeline()
-        ensure_generators_registered(pipeline)
+        # Use a warm conversion server if requested and reachable
+        server_client = None
+        if (server or server_address) and (profile or profile_dump):
+            if not quiet:
+                click.echo("Warning: profiling runs locally; ignoring --server", err=True)
+        elif server or server_address:
+            from ..server import ServerClient
+            try:
+                server_client = ServerClient(server_address)
+                if not server_client.is_available():
+                    raise ServerError("Conversion server is not running",
+                                      address=server_client.address)
+            except ServerError as e:
+                server_client = None
+                if not quiet:
+                    click.echo(f"Warning: {e.message}; converting locally", err=True)
+        
+        # Initialize pipeline (generators are loaded on first use)
+        parsed_cache = ASTCache(cache_dir=default_cache_dir()) if ast_cache else None
+        pipeline = None if server_client else ConversionPipeline(ast_cache=parsed_cache)
         
         # Collect input files
         input_files = []
@@ -241,7 +321,12 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
         success_count = 0
         error_count = 0
         
-        for input_file in input_files:
+        # Stage timings accumulated over the batch
+        batch_profile = ConversionProfiler() if profile else None
+        
+        progress_line = _ProgressLine(len(input_files)) if show_progress and not quiet else None
+        
+        for file_index, input_file in enumerate(input_files):
             try:
                 input_path = Path(input_file)
                 
@@ -257,46 +342,92 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
                 if not quiet:
                     click.echo(f"Converting {input_path.name}...", err=True)
                 
-                results = pipeline.convert_file(
-                    str(input_path),
-                    formats,
-                    config_obj.to_dict()
-                )
+                results = None if formats else {}
+                if results is None and server_client is not None:
+                    server_options = config_obj.to_dict()
+                    # Relative image paths resolve against our working directory
+                    server_options.setdefault('base_path', os.getcwd())
+                    try:
+                        results = server_client.convert(
+                            formats,
+                            input_path=str(input_path.resolve()),
+                            options=server_options
+                        )
+                    except ServerError as e:
+                        server_client = None
+                        if not quiet:
+                            click.echo(f"Warning: {e.message}; converting locally", err=True)
+                
+                if results is None:
+                    if pipeline is None:
+                        pipeline = ConversionPipeline(ast_cache=parsed_cache)
+                    dump_path = str(Path(profile_dump) / f"{input_path.stem}.prof") if profile_dump else None
+                    progress = (progress_line.reporter(file_index, input_path.name)
+                                if progress_line is not None else None)
+                    with cprofile_to(dump_path):
+                        results = pipeline.convert_file(
+                            str(input_path),
+                            formats,
+                            config_obj.to_dict(),
+                            profile=profile,
+                            cancel_token=cancel_token,
+                            progress=progress
+                        )
+                    if progress_line is not None:
+                        progress_line.clear()
+                    if batch_profile is not None:
+                        batch_profile.merge(results.profile)
+                    if dump_path and verbose:
+                        click.echo(f"  Profile: {dump_path}", err=True)
+                
+                if emit_ast:
+                    if pipeline is None:
+                        pipeline = ConversionPipeline(ast_cache=parsed_cache)
+                    results = dict(results)
+                    results['ast'] = pipeline.parse_file(str(input_path), config_obj.to_dict()).to_bytes()
                 
-                # Write output files
-                for format_name, doc_bytes in results.items():
-                    if format_name == 'error':
-                        continue
+                # Write output files (a document's files are put in place
+                # together once all are written; if interrupted, previous
+                # outputs are left as they were)
+                with OutputTransaction() as transaction:
+                    for format_name, doc_bytes in results.items():
+                        if format_name == 'error':
+                            continue
                     
-                    ext_map = {
-                        'word': '.docx',
-                        'powerpoint': '.pptx',
-                        'pdf': '.pdf'
-                    }
-                    ext = ext_map.get(format_name, f'.{format_name}')
-                    output_file = output_dir / f"{base_name}{ext}"
+                        ext_map = {
+                            'word': '.docx',
+                            'powerpoint': '.pptx',
+                            'pdf': '.pdf',
+                            'html': '.html',
+                            'ast': '.mdast'
+                        }
+                        ext = ext_map.get(format_name, f'.{format_name}')
+                        output_file = output_dir / f"{base_name}{ext}"
                     
-                    # Check if file exists
-                    if output_file.exists() and not overwrite:
-                        if not quiet:
-                            response = click.prompt(
-                                f"{output_file.name} already exists. Overwrite? [y/N]",
-                                default='n'
-                            )
-                            if response.lower() != 'y':
-                                continue
+                        # Check if file exists
+                        if output_file.exists() and not overwrite:
+                            if not quiet:
+                                response = click.prompt(
+                                    f"{output_file.name} already exists. Overwrite? [y/N]",
+                                    default='n'
+                                )
+                                if response.lower() != 'y':
+                                    continue
                     
-                    # Write file
-                    output_file.write_bytes(doc_bytes)
+                        # Write file
+                        with profile_stage({PROFILER_OPTION: batch_profile}, "write"):
+                            transaction.write(output_file, doc_bytes)
                     
-                    if not quiet:
-                        click.echo(f"  Created: {output_file}", err=True)
+                        if not quiet:
+                            click.echo(f"  Created: {output_file}", err=True)
                 
                 success_count += 1
                 
             except Exception as e:
                 error_count += 1
                 input_path = Path(input_file)
+                if progress_line is not None:
+                    progress_line.clear()
                 
                 if isinstance(e, ParseError):
                     click.echo(f"\nError: Failed to parse '{input_path.name}'", err=True)
@@ -364,6 +495,10 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
                         click.echo("\n  Run with --verbose for more details", err=True)
         
         # Summary
+        if batch_profile is not None and batch_profile.stages:
+            click.echo(f"\nProfile ({success_count} document(s)):", err=True)
+            click.echo(batch_profile.format_table(), err=True)
+        
         if not quiet:
             click.echo(f"\nConversion complete: {success_count} succeeded, {error_count} failed", err=True)
         
@@ -371,8 +506,9 @@ def cli(inputs, gui, word, powerpoint, pdf, all, output, name, suffix, overwrite
             sys.exit(1)
     
     except KeyboardInterrupt:
+        cancel_token.cancel()
         click.echo("\n\nInterrupted by user", err=True)
-        click.echo("Conversion cancelled. Partial files may have been created.", err=True)
+        click.echo("Conversion cancelled. Files of the interrupted document were not written.", err=True)
         sys.exit(130)
     except Exception as e:
         click.echo(f"\nUnexpected error: {type(e).__name__}: {str(e)}", err=True)
@@ -415,6 +551,16 @@ def main():
         click.echo("  pip install -r requirements.txt", err=True)
         sys.exit(1)
     
+    # Subcommands (kept out of the main command so INPUTS stays positional)
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from .serve import serve_cli
+        serve_cli(args=sys.argv[2:], prog_name='md2office serve')
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'watch':
+        from .watch import watch_cli
+        watch_cli(args=sys.argv[2:], prog_name='md2office watch')
+        return
+    
     cli()
 
 
@@ -0,0 +1,63 @@
+"""
+CLI Serve Command
+
+Implements ``md2office serve``: run a persistent conversion server with
+warm worker processes.
+"""
+
+import signal
+import sys
+import threading
+
+from .main import click
+from ..errors import ServerError, setup_logger
+
+
+@click.command(name='serve')
+@click.option('--address', type=str, default=None,
+              help='Listen address: unix:/path/to.sock or host:port '
+                   '(default: $MD2OFFICE_SERVER or a per-user Unix socket)')
+@click.option('--workers', '-j', type=int, default=None,
+              help='Number of warm worker processes (default: CPU count)')
+@click.option('--formats', type=str, default=None,
+              help='Comma-separated formats to preload (default: all)')
+@click.option('--verbose', is_flag=True, help='Log every request')
+@click.option('--stop', is_flag=True, help='Stop the server running at the address')
+def serve_cli(address, workers, formats, verbose, stop):
+    """
+    Run a persistent conversion server.
+
+    Clients submit jobs with 'md2office --server ...'.
+    """
+    setup_logger(verbose=verbose)
+
+    if stop:
+        from ..server import ServerClient
+        try:
+            ServerClient(address).shutdown()
+        except ServerError as e:
+            click.echo(f"Error: {e.message}", err=True)
+            sys.exit(1)
+        return
+
+    from ..server import ConversionServer
+
+    format_list = [f.strip() for f in formats.split(',') if f.strip()] if formats else None
+    try:
+        server = ConversionServer(address=address, workers=workers, formats=format_list)
+        server.start()
+    except ServerError as e:
+        click.echo(f"Error: {e.message}", err=True)
+        sys.exit(1)
+
+    # Let SIGTERM shut the server down cleanly (removing the socket)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(
+        target=server.stop, daemon=True).start())
+
+    click.echo(f"md2office server listening on {server.address} "
+               f"({server.workers} worker(s))", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    click.echo("md2office server stopped", err=True)
@@ -0,0 +1,105 @@
+"""
+CLI Watch Command
+
+Implements ``md2office watch``: keep Office outputs of a documentation
+tree up to date while markdown, images or configuration change.
+"""
+
+import sys
+from pathlib import Path
+
+from .main import click
+from ..errors import setup_logger
+
+
+def _echo_report(report, quiet: bool, root: Path, label: str = 'Rebuilt'):
+    """Print a rebuild report."""
+    for document, message in report.errors.items():
+        click.echo(f"  Error: {Path(document).relative_to(root)}: {message}", err=True)
+    if quiet:
+        return
+
+    count = len(report.documents) - len(report.errors)
+    timing = f"{report.build_time * 1000:.0f} ms"
+    if report.latency is not None:
+        timing += f", {report.latency * 1000:.0f} ms after change"
+    click.echo(f"{label} {count} document(s) in {timing}", err=True)
+    for document in report.documents:
+        if document not in report.errors:
+            click.echo(f"  {Path(document).relative_to(root)}", err=True)
+
+
+@click.command(name='watch')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False), default='.')
+@click.option('--word', '-w', is_flag=True, help='Convert to Word (.docx) format')
+@click.option('--powerpoint', '-p', is_flag=True, help='Convert to PowerPoint (.pptx) format')
+@click.option('--pdf', is_flag=True, help='Convert to PDF format')
+@click.option('--html', is_flag=True, help='Convert to HTML format')
+@click.option('--all', '-a', is_flag=True, help='Convert to Word, PowerPoint and PDF formats')
+@click.option('--output', '-o', type=click.Path(), default=None,
+              help='Output directory (default: next to each markdown file)')
+@click.option('--config', '-c', type=click.Path(exists=True), help='Configuration file path')
+@click.option('--style', '-s', type=click.Choice(['default', 'minimal', 'professional']),
+              default=None, help='Style preset (overrides configuration files)')
+@click.option('--page-breaks', is_flag=True, help='Insert page breaks at major sections')
+@click.option('--toc', is_flag=True, help='Generate table of contents (Word/PDF)')
+@click.option('--skip-missing-images', is_flag=True, help='Skip missing image files')
+@click.option('--debounce', type=float, default=0.2, show_default=True,
+              help='Seconds of quiet that end a burst of changes')
+@click.option('--poll', is_flag=True, help='Use stat polling instead of inotify')
+@click.option('--interval', type=float, default=0.5, show_default=True,
+              help='Polling interval in seconds (with --poll or without inotify)')
+@click.option('--verbose', is_flag=True, help='Show detailed progress information')
+@click.option('--quiet', '-q', is_flag=True, help='Suppress non-error output')
+def watch_cli(directory, word, powerpoint, pdf, html, all, output, config, style, page_breaks,
+              toc, skip_missing_images, debounce, poll, interval, verbose, quiet):
+    """
+    Watch DIRECTORY and reconvert documents as they change.
+
+    Only documents whose markdown, referenced images, configuration file
+    or style preset changed are rebuilt.
+    """
+    from ..watch import IncrementalBuilder, WatchSession, create_watcher
+
+    setup_logger(verbose=verbose, quiet=quiet)
+
+    formats = ['word', 'powerpoint', 'pdf'] if all else [
+        name for name, enabled in (('word', word), ('powerpoint', powerpoint), ('pdf', pdf))
+        if enabled
+    ]
+    if html:
+        formats.append('html')
+    if not formats:
+        click.echo("Error: No output format specified", err=True)
+        click.echo("\nExample:", err=True)
+        click.echo("  md2office watch --word ./docs/", err=True)
+        sys.exit(1)
+
+    # Only explicit flags override configuration files
+    cli_options = {'overwrite': True}
+    if style:
+        cli_options['style'] = style
+    if page_breaks:
+        cli_options['pageBreaks'] = True
+    if toc:
+        cli_options['tableOfContents'] = True
+    if skip_missing_images:
+        cli_options['skipMissingImages'] = True
+
+    root = Path(directory).resolve()
+    builder = IncrementalBuilder(str(root), formats, output_dir=output,
+                                 cli_options=cli_options, config_file=config)
+    watcher = create_watcher(str(root), polling=poll, interval=interval)
+    session = WatchSession(builder, watcher, debounce=debounce,
+                           on_rebuild=lambda report: _echo_report(report, quiet, root))
+
+    try:
+        _echo_report(session.start(), quiet, root, label='Built')
+        if not quiet:
+            click.echo(f"Watching {root} ({type(watcher).__name__}); press Ctrl+C to stop",
+                       err=True)
+        session.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session.close()
@@ -3,6 +3,7 @@ Configuration system module.
 """
 
 from .config import Config, load_config, merge_configs, get_default_config, find_config_file
+from .resolver import ConfigResolver
 
-__all__ = ['Config', 'load_config', 'merge_configs', 'get_default_config', 'find_config_file']
+__all__ = ['Config', 'load_config', 'merge_configs', 'get_default_config', 'find_config_file', 'ConfigResolver']
 
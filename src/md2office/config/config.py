@@ -11,6 +11,12 @@ from typing import Dict, Any, Optional, List
 from pathlib import Path
 from ..errors import ConfigurationError
 
+# Configuration file names, in lookup order
+CONFIG_FILE_NAMES = ['.md2office.json', '.md2office.yaml', '.md2office.yml']
+
+# Number of directories searched for a configuration file
+MAX_SEARCH_DEPTH = 10
+
 
 class Config:
     """
@@ -270,11 +276,10 @@ def find_config_file(start_path: Optional[str] = None) -> Optional[str]:
         start_path = os.getcwd()
     
     path = Path(start_path).resolve()
-    config_names = ['.md2office.json', '.md2office.yaml', '.md2office.yml']
     
     # Check current directory and parent directories
-    for _ in range(10):  # Limit search depth
-        for config_name in config_names:
+    for _ in range(MAX_SEARCH_DEPTH):  # Limit search depth
+        for config_name in CONFIG_FILE_NAMES:
             config_path = path / config_name
             if config_path.exists() and config_path.is_file():
                 return str(config_path)
@@ -0,0 +1,171 @@
+"""
+Configuration Resolver
+
+Caches configuration file discovery and parsing so a batch of documents
+only looks up and parses each directory's configuration once.
+"""
+
+import copy
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .config import Config, load_config, merge_configs, CONFIG_FILE_NAMES, MAX_SEARCH_DEPTH
+from ..errors import ConfigurationError
+
+
+class ConfigResolver:
+    """
+    Cached configuration lookup and loading.
+
+    Two caches are kept:
+
+    - a lookup cache mapping each directory to the configuration file that
+      applies to it (or None), so the parent-directory walk and its
+      ``is_file()`` checks happen once per directory;
+    - a parse cache mapping configuration files to their parsed contents,
+      validated against the file's modification time and size, so a
+      configuration is re-read only when it changes.
+
+    Lookups are not revalidated; call ``clear_lookups()`` at the start of
+    a new run (e.g. before each GUI conversion or watch rebuild) to pick
+    up configuration files created or removed since. Instances are safe
+    to share between threads.
+    """
+
+    def __init__(self, max_depth: int = MAX_SEARCH_DEPTH):
+        """
+        Initialize configuration resolver.
+
+        Args:
+            max_depth: Number of directories searched, starting with the
+                document's own directory
+        """
+        self.max_depth = max_depth
+        self._present: Dict[Path, Optional[str]] = {}
+        self._lookups: Dict[Path, Optional[str]] = {}
+        self._parsed: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.RLock()
+
+    def find(self, start_path: Optional[str] = None) -> Optional[str]:
+        """
+        Find the configuration file for a directory.
+
+        Behaves like ``find_config_file`` but caches results per directory.
+
+        Args:
+            start_path: Starting directory path (defaults to current directory)
+
+        Returns:
+            Path to configuration file, or None if not found
+        """
+        path = Path(start_path if start_path is not None else os.getcwd()).resolve()
+        with self._lock:
+            if path in self._lookups:
+                return self._lookups[path]
+
+            result = None
+            directory = path
+            for _ in range(self.max_depth):
+                result = self._config_in(directory)
+                if result:
+                    break
+                parent = directory.parent
+                if parent == directory:  # Reached filesystem root
+                    break
+                directory = parent
+
+            self._lookups[path] = result
+            return result
+
+    def load(self, config_path: str) -> Config:
+        """
+        Load a configuration file, reusing the parsed result if unchanged.
+
+        Args:
+            config_path: Path to configuration file
+
+        Returns:
+            New Config instance (callers may modify it)
+
+        Raises:
+            ConfigurationError: If file cannot be loaded or parsed
+        """
+        key = os.path.abspath(config_path)
+        try:
+            stat = os.stat(key)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+
+        with self._lock:
+            cached = self._parsed.get(key)
+            if signature is None or cached is None or cached[0] != signature:
+                try:
+                    value: Any = load_config(config_path).to_dict()
+                except ConfigurationError as e:
+                    value = e
+                if signature is not None:
+                    self._parsed[key] = (signature, value)
+            else:
+                value = cached[1]
+
+        if isinstance(value, ConfigurationError):
+            raise value
+        return Config(copy.deepcopy(value))
+
+    def resolve(self, directory: Optional[str] = None,
+                overrides: Optional[Dict[str, Any]] = None,
+                config_file: Optional[str] = None) -> Tuple[Optional[str], Config]:
+        """
+        Resolve the configuration for documents in a directory.
+
+        Args:
+            directory: Document directory (defaults to current directory)
+            overrides: Values overriding the configuration file (CLI options)
+            config_file: Explicit configuration file; skips the lookup and
+                raises on errors instead of ignoring them
+
+        Returns:
+            Tuple of (configuration file path or None, merged Config)
+
+        Raises:
+            ConfigurationError: If an explicit configuration file cannot be loaded
+        """
+        config_path = config_file or self.find(directory)
+        base_config = Config()
+        if config_path:
+            try:
+                base_config = self.load(config_path)
+            except ConfigurationError:
+                if config_file:
+                    raise
+                # Ignore errors in auto-found config
+        if overrides:
+            return config_path, merge_configs(base_config, overrides)
+        return config_path, base_config
+
+    def clear_lookups(self):
+        """Forget cached lookups so new or removed config files are found."""
+        with self._lock:
+            self._present.clear()
+            self._lookups.clear()
+
+    def clear(self):
+        """Forget all cached lookups and parsed configurations."""
+        with self._lock:
+            self.clear_lookups()
+            self._parsed.clear()
+
+    def _config_in(self, directory: Path) -> Optional[str]:
+        """Get the configuration file directly inside a directory."""
+        if directory not in self._present:
+            found = None
+            for config_name in CONFIG_FILE_NAMES:
+                config_path = directory / config_name
+                if config_path.is_file():
+                    found = str(config_path)
+                    break
+            self._present[directory] = found
+        return self._present[directory]
@@ -8,7 +8,10 @@ from .exceptions import (
     ConversionError,
     FileError,
     ConfigurationError,
-    ValidationError
+    ValidationError,
+    ServerError,
+    SerializationError,
+    CancellationError
 )
 from .logger import setup_logger, get_logger
 
@@ -19,6 +22,9 @@ __all__ = [
     'FileError',
     'ConfigurationError',
     'ValidationError',
+    'ServerError',
+    'SerializationError',
+    'CancellationError',
     'setup_logger',
     'get_logger'
 ]
@@ -188,3 +188,58 @@ class ValidationError(MD2OfficeError):
         self.field = field
         self.value = value
 
+
+
+class ServerError(MD2OfficeError):
+    """Error communicating with a conversion server."""
+    
+    def __init__(self, message: str, address: Optional[str] = None):
+        """
+        Initialize server error.
+        
+        Args:
+            message: Error message
+            address: Server address
+        """
+        context = {}
+        if address:
+            context['address'] = address
+        
+        suggestion = "Start a server with 'md2office serve' or run without --server."
+        
+        super().__init__(message, context, suggestion)
+        self.address = address
+
+
+class SerializationError(MD2OfficeError):
+    """Error serializing or deserializing a document AST."""
+    
+    def __init__(self, message: str):
+        """
+        Initialize serialization error.
+        
+        Args:
+            message: Error message
+        """
+        suggestion = "Re-parse the markdown source; cached or emitted ASTs may be stale."
+        
+        super().__init__(message, {}, suggestion)
+
+
+class CancellationError(MD2OfficeError):
+    """Conversion stopped because it was cancelled."""
+    
+    def __init__(self, message: str = "Conversion cancelled", stage: Optional[str] = None):
+        """
+        Initialize cancellation error.
+        
+        Args:
+            message: Error message
+            stage: Conversion stage that noticed the cancellation
+        """
+        context = {}
+        if stage:
+            context['stage'] = stage
+        
+        super().__init__(message, context)
+        self.stage = stage
@@ -1,44 +1,42 @@
 """
 Document format generators module.
+
+Generator classes are imported lazily on first attribute access so that
+importing this package does not pull in python-docx, python-pptx or
+ReportLab. Each name resolves to None if its dependencies are missing.
 """
 
-# Lazy imports to handle missing dependencies gracefully
-def _import_word_generator():
-    try:
-        from .word_generator import WordGenerator
-        return WordGenerator
-    except ImportError:
-        return None
+from .registry import (
+    GeneratorRegistry, get_default_registry, get_output_extension,
+    BUILTIN_GENERATORS, OUTPUT_EXTENSIONS
+)
 
-def _import_powerpoint_generator():
-    try:
-        from .powerpoint_generator import PowerPointGenerator
-        return PowerPointGenerator
-    except ImportError:
-        return None
+_LAZY_GENERATORS = {
+    'WordGenerator': 'word',
+    'PowerPointGenerator': 'powerpoint',
+    'PDFGenerator': 'pdf',
+    'HTMLGenerator': 'html',
+}
 
-def _import_pdf_generator():
-    try:
-        from .pdf_generator import PDFGenerator
-        return PDFGenerator
-    except ImportError:
-        return None
 
-# Try to import generators, but don't fail if dependencies are missing
-try:
-    from .word_generator import WordGenerator
-except (ImportError, ModuleNotFoundError):
-    WordGenerator = None
+def __getattr__(name):
+    """Resolve generator classes on first access (PEP 562)."""
+    if name not in _LAZY_GENERATORS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    from .powerpoint_generator import PowerPointGenerator
-except (ImportError, ModuleNotFoundError):
-    PowerPointGenerator = None
+    try:
+        generator_class = GeneratorRegistry(use_entry_points=False).load_class(
+            _LAZY_GENERATORS[name]
+        )
+    except (ImportError, ModuleNotFoundError):
+        generator_class = None
 
-try:
-    from .pdf_generator import PDFGenerator
-except (ImportError, ModuleNotFoundError):
-    PDFGenerator = None
+    globals()[name] = generator_class
+    return generator_class
 
-__all__ = ['WordGenerator', 'PowerPointGenerator', 'PDFGenerator']
 
+__all__ = [
+    'WordGenerator', 'PowerPointGenerator', 'PDFGenerator', 'HTMLGenerator',
+    'GeneratorRegistry', 'get_default_registry', 'get_output_extension',
+    'BUILTIN_GENERATORS', 'OUTPUT_EXTENSIONS'
+]
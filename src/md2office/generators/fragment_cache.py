@@ -0,0 +1,96 @@
+"""
+Rendered Fragment Cache
+
+Size-bounded LRU shared by the generators that reuse rendered output
+between regenerations (Word sections, PowerPoint slides). Fragments
+record the signatures of the image files they were rendered from and
+are dropped once any of those files changes.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Rendered output kept in memory by default
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# File signature: (mtime_ns, size), or None if the file is missing
+Signature = Optional[Tuple[int, int]]
+
+
+def file_signature(path: str) -> Signature:
+    """Get (mtime_ns, size) for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FragmentCache:
+    """
+    LRU cache of rendered fragments, bounded by size.
+
+    Fragments must provide a ``size`` attribute and an ``is_current()``
+    method. Safe to share between threads.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize fragment cache.
+
+        Args:
+            max_bytes: Total fragment size kept
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._fragments: 'OrderedDict[Tuple, object]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple):
+        """
+        Get a cached fragment whose images are unchanged.
+
+        Args:
+            key: Fragment key (content hash, preset and options)
+
+        Returns:
+            Fragment, or None on a miss
+        """
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None and fragment.is_current():
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, fragment):
+        """
+        Cache a fragment, evicting the least recently used over the size limit.
+
+        Args:
+            key: Fragment key
+            fragment: Rendered fragment
+        """
+        if fragment.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._fragments.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._fragments[key] = fragment
+            self._size += fragment.size
+            while self._size > self.max_bytes:
+                _, evicted = self._fragments.popitem(last=False)
+                self._size -= evicted.size
+
+    def clear(self):
+        """Drop every fragment."""
+        with self._lock:
+            self._fragments.clear()
+            self._size = 0
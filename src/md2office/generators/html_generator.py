@@ -0,0 +1,500 @@
+"""
+HTML Document Generator
+
+Generates HTML documents from the AST the Office generators use, so an
+exported HTML file (and the GUI preview, which renders the same body)
+shows exactly the tree that is converted. Output is produced one block
+at a time and can be written straight to a stream, so large documents
+are never held in memory as a single string.
+"""
+
+import hashlib
+import html
+import re
+from io import BytesIO
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from ..parser.ast_builder import ASTNode, NodeType
+from ..router.content_router import FormatGenerator
+from ..errors import ConversionError, CancellationError
+from ..styling.style import StylePreset, get_style_preset
+from ..cancellation import check_cancelled
+from ..progress import get_progress
+
+# Encoded output collected before each write to the stream
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# First words of code blocks treated as Mermaid diagrams without a language
+MERMAID_KEYWORDS = (
+    'graph', 'flowchart', 'sequenceDiagram', 'classDiagram',
+    'stateDiagram', 'stateDiagram-v2', 'erDiagram', 'gantt',
+    'pie', 'gitgraph', 'journey', 'mindmap', 'C4Context',
+    'quadrantChart', 'requirement', 'timeline'
+)
+
+# Inline markdown, matched in a single pass (code spans first, so their
+# content is not formatted)
+_INLINE = re.compile(
+    r'(?P<code>`(?P<code_text>[^`]+)`)'
+    r'|(?P<image>!\[(?P<image_alt>[^\]]*)\]\((?P<image_src>[^)\s]+)(?:\s+"[^"]*")?\))'
+    r'|(?P<link>\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)(?:\s+"[^"]*")?\))'
+    r'|(?P<bold>\*\*(?P<bold_text>.+?)\*\*|__(?P<bold_under>.+?)__)'
+    r'|(?P<italic>\*(?P<italic_text>[^*\s][^*]*?)\*|(?<!\w)_(?P<italic_under>[^_]+)_(?!\w))'
+)
+
+_SLUG_SEPARATORS = re.compile(r'[^\w]+')
+
+# URL schemes emitted as links and image sources; anything else (e.g.
+# javascript:) is rendered as text. URLs without a scheme are relative.
+SAFE_URL_SCHEMES = {'http', 'https', 'mailto'}
+_URL_SCHEME = re.compile(r'([a-zA-Z][a-zA-Z0-9+.-]*):')
+# Browsers ignore these characters inside a URL scheme
+_URL_IGNORED = re.compile(r'[\x00-\x20\x7f]')
+
+
+def is_safe_url(url: str) -> bool:
+    """
+    Check whether a URL may be emitted as a link or image source.
+
+    Args:
+        url: URL from the markdown source
+
+    Returns:
+        True for http, https and mailto URLs, relative URLs and anchors
+    """
+    match = _URL_SCHEME.match(_URL_IGNORED.sub('', url))
+    if match is None:
+        return True
+    scheme = match.group(1)
+    # A single letter is a Windows drive (C:/images/...), not a scheme
+    return len(scheme) == 1 or scheme.lower() in SAFE_URL_SCHEMES
+
+
+def render_inline(text: str) -> str:
+    """
+    Render inline markdown (bold, italic, code, links, images) as HTML.
+
+    Args:
+        text: Text with inline markdown
+
+    Returns:
+        HTML with all other text escaped
+    """
+    parts = []
+    pos = 0
+    for match in _INLINE.finditer(text):
+        parts.append(html.escape(text[pos:match.start()], quote=False))
+        kind = match.lastgroup
+        if kind == 'code':
+            parts.append(f"<code>{html.escape(match.group('code_text'), quote=False)}</code>")
+        elif kind == 'image':
+            if is_safe_url(match.group('image_src')):
+                parts.append(f'<img src="{html.escape(match.group("image_src"))}" '
+                             f'alt="{html.escape(match.group("image_alt"))}">')
+            else:
+                parts.append(html.escape(match.group('image_alt'), quote=False))
+        elif kind == 'link':
+            if is_safe_url(match.group('link_url')):
+                parts.append(f'<a href="{html.escape(match.group("link_url"))}">'
+                             f"{render_inline(match.group('link_text'))}</a>")
+            else:
+                parts.append(render_inline(match.group('link_text')))
+        elif kind == 'bold':
+            inner = match.group('bold_text') or match.group('bold_under')
+            parts.append(f"<strong>{render_inline(inner)}</strong>")
+        else:
+            inner = match.group('italic_text') or match.group('italic_under')
+            parts.append(f"<em>{render_inline(inner)}</em>")
+        pos = match.end()
+    parts.append(html.escape(text[pos:], quote=False))
+    return ''.join(parts)
+
+
+def diagram_hash(source: str) -> str:
+    """
+    Get the hash identifying a Mermaid diagram by its source.
+
+    Args:
+        source: Diagram source
+
+    Returns:
+        Short hex digest
+    """
+    return hashlib.md5(source.encode()).hexdigest()[:12]
+
+
+def is_mermaid_diagram(language: Optional[str], content: str) -> bool:
+    """Check whether a code block is a Mermaid diagram."""
+    if language == 'mermaid':
+        return True
+    first_line = content.strip().split('\n')[0].strip() if content else ''
+    return bool(first_line) and first_line.startswith(MERMAID_KEYWORDS)
+
+
+class HTMLGenerator(FormatGenerator):
+    """
+    Generates HTML documents from AST.
+
+    Each top-level block becomes one top-level element of the body, so
+    the preview can replace changed blocks only. Mermaid code blocks
+    become ``<div class="mermaid">`` elements carrying the hash of their
+    source, for pages that include Mermaid.js.
+    """
+
+    def __init__(self):
+        """Initialize HTML generator."""
+        self.current_style_preset: Optional[StylePreset] = None
+        # Heading ids used so far in the document being generated
+        self._heading_ids: Dict[str, int] = {}
+
+    def generate(self, ast: ASTNode, options: Dict[str, Any]) -> bytes:
+        """
+        Generate HTML document from AST.
+
+        Args:
+            ast: Root AST node
+            options: Generation options
+
+        Returns:
+            Generated HTML document as UTF-8 bytes
+
+        Raises:
+            ConversionError: If generation fails
+            CancellationError: If the conversion was cancelled
+        """
+        output = BytesIO()
+        self.write(ast, output, options)
+        return output.getvalue()
+
+    def write(self, ast: ASTNode, stream: BinaryIO, options: Dict[str, Any]):
+        """
+        Write an HTML document to a binary stream as it is generated.
+
+        Args:
+            ast: Root AST node
+            stream: Binary stream to write UTF-8 encoded HTML to
+            options: Generation options
+
+        Raises:
+            ConversionError: If generation fails
+            CancellationError: If the conversion was cancelled
+        """
+        try:
+            buffer = []
+            size = 0
+            for chunk in self.iter_document(ast, options):
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= WRITE_BUFFER_SIZE:
+                    stream.write(''.join(buffer).encode('utf-8'))
+                    buffer = []
+                    size = 0
+            stream.write(''.join(buffer).encode('utf-8'))
+
+        except CancellationError:
+            raise
+
+        except Exception as e:
+            raise ConversionError(
+                f"Failed to generate HTML document: {str(e)}",
+                format="html",
+                stage="generation"
+            ) from e
+
+    def iter_document(self, ast: ASTNode, options: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate a complete HTML document in chunks.
+
+        Args:
+            ast: Root AST node
+            options: Generation options
+
+        Yields:
+            HTML chunks (the head, then one per block, then the end)
+        """
+        self.current_style_preset = get_style_preset(options.get('style', 'default'))
+        title = ast.metadata.get('title') or self._first_heading(ast) or 'Document'
+
+        head = [
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n',
+            '<meta charset="UTF-8">\n',
+            '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n',
+            f'<title>{html.escape(str(title))}</title>\n'
+        ]
+        for name in ('author', 'subject', 'keywords'):
+            value = ast.metadata.get(name) or (options.get(name) if name == 'author' else None)
+            if value:
+                head.append(f'<meta name="{name}" content="{html.escape(str(value))}">\n')
+        head.append(f'<style>\n{self.stylesheet(self.current_style_preset)}</style>\n')
+        head.append('</head>\n<body>\n')
+        yield ''.join(head)
+
+        yield from self.iter_body(ast, options)
+        yield '</body>\n</html>\n'
+
+    def iter_body(self, ast: ASTNode, options: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate the body content in chunks, one per top-level block.
+
+        Args:
+            ast: Root AST node
+            options: Generation options
+
+        Yields:
+            HTML of each block, newline-terminated
+        """
+        self._heading_ids = {}
+        if options.get('table_of_contents', False):
+            yield self._render_table_of_contents(ast)
+            # Headings get the same ids again below
+            self._heading_ids = {}
+        yield from self._iter_blocks(ast, options)
+
+    def render_body(self, ast: ASTNode, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render the body content of a document.
+
+        Args:
+            ast: Root AST node
+            options: Generation options
+
+        Returns:
+            Body HTML
+        """
+        return ''.join(self.iter_body(ast, options or {}))
+
+    def get_file_extension(self) -> str:
+        """Get file extension for HTML format."""
+        return ".html"
+
+    def iter_parts(self, ast: ASTNode) -> Iterator[List[ASTNode]]:
+        """
+        Split a document into parts at section boundaries.
+
+        Each part is a heading with the blocks up to the next heading (the
+        first part may have no heading), in document order. Rendering the
+        parts one after another gives the document body.
+
+        Args:
+            ast: Root AST node
+
+        Yields:
+            Lists of block nodes
+        """
+        blocks: List[ASTNode] = []
+        subsections = []
+        for child in ast.children:
+            if child.node_type == NodeType.SECTION:
+                if blocks:
+                    yield blocks
+                    blocks = []
+                yield from self.iter_parts(child)
+                continue
+            blocks.append(child)
+            # The AST builder attaches subsections to their parent
+            # section's heading; they follow the section's own blocks
+            if child.node_type == NodeType.HEADING:
+                subsections.extend(section for section in child.children
+                                   if section.node_type == NodeType.SECTION)
+        if blocks:
+            yield blocks
+        for section in subsections:
+            yield from self.iter_parts(section)
+
+    def render_blocks(self, blocks: List[ASTNode],
+                      options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render block nodes (e.g. one part of a document) as HTML.
+
+        Args:
+            blocks: Block nodes
+            options: Generation options
+
+        Returns:
+            HTML of the blocks, one per line
+        """
+        options = options or {}
+        return ''.join(self._iter_part(blocks, options))
+
+    def _iter_blocks(self, node: ASTNode, options: Dict[str, Any]) -> Iterator[str]:
+        """Generate the blocks of a document in document order."""
+        for blocks in self.iter_parts(node):
+            check_cancelled(options, "html")
+            yield from self._iter_part(blocks, options)
+            progress = get_progress(options)
+            if progress is not None:
+                progress.advance()
+
+    def _iter_part(self, blocks: List[ASTNode], options: Dict[str, Any]) -> Iterator[str]:
+        """Generate the HTML of each block of a part."""
+        for node in blocks:
+            block = self._render_block(node, options)
+            if block:
+                yield block + '\n'
+
+    def _render_block(self, node: ASTNode, options: Dict[str, Any]) -> str:
+        """Render a block node as HTML."""
+        node_type = node.node_type
+        if node_type == NodeType.HEADING:
+            return self._render_heading(node, options)
+        if node_type == NodeType.PARAGRAPH:
+            return f"<p>{render_inline(node.content)}</p>"
+        if node_type == NodeType.LIST:
+            return self._render_list(node)
+        if node_type == NodeType.TABLE:
+            return self._render_table(node)
+        if node_type == NodeType.CODE_BLOCK:
+            return self._render_code_block(node)
+        if node_type == NodeType.BLOCKQUOTE:
+            paragraphs = [line.strip() for line in node.content.split('\n\n') if line.strip()]
+            inner = ''.join(f"<p>{render_inline(text)}</p>" for text in paragraphs)
+            return f"<blockquote>{inner}</blockquote>"
+        if node_type == NodeType.HORIZONTAL_RULE:
+            return "<hr>"
+        if node_type == NodeType.IMAGE:
+            src = node.attributes.get("src", "")
+            if not is_safe_url(src):
+                return f"<p>{html.escape(node.content, quote=False)}</p>"
+            return (f'<p><img src="{html.escape(src)}" '
+                    f'alt="{html.escape(node.content)}"></p>')
+        return ''
+
+    def _render_heading(self, node: ASTNode, options: Dict[str, Any]) -> str:
+        """Render a heading with an id for links to it."""
+        level = min(max(node.level or 1, 1), 6)
+        attributes = f' id="{self._heading_id(node.content)}"'
+        if options.get('page_breaks', False) and level == 1:
+            attributes += ' class="page-break"'
+        return f"<h{level}{attributes}>{render_inline(node.content)}</h{level}>"
+
+    def _heading_id(self, text: str) -> str:
+        """Get a unique id for a heading."""
+        slug = _SLUG_SEPARATORS.sub('-', text.lower()).strip('-') or 'section'
+        count = self._heading_ids.get(slug, 0)
+        self._heading_ids[slug] = count + 1
+        return slug if count == 0 else f"{slug}-{count}"
+
+    def _render_list(self, node: ASTNode) -> str:
+        """Render a list, nesting items by their level."""
+        parts: List[str] = []
+        # Tags of the open lists, innermost last
+        open_lists: List[str] = []
+        for item in node.children:
+            if item.node_type != NodeType.LIST_ITEM:
+                continue
+            depth = (item.level or 0) + 1
+            # The builder flags a whole run of items as ordered or not, so
+            # adjacent bullet and numbered lists are told apart by marker
+            marker = item.metadata.get('marker', '-')
+            tag = 'ol' if marker.rstrip('.)').isdigit() else 'ul'
+            while len(open_lists) > depth:
+                parts.append(f"</li></{open_lists.pop()}>")
+            if len(open_lists) == depth and open_lists[-1] != tag:
+                parts.append(f"</li></{open_lists.pop()}>")
+            if len(open_lists) == depth:
+                parts.append("</li>")
+            while len(open_lists) < depth:
+                parts.append(f"<{tag}>")
+                open_lists.append(tag)
+            parts.append(f"<li>{render_inline(item.content)}")
+        while open_lists:
+            parts.append(f"</li></{open_lists.pop()}>")
+        return ''.join(parts)
+
+    def _render_table(self, node: ASTNode) -> str:
+        """Render a table with its header row."""
+        parts = ["<table>"]
+        for row in node.children:
+            if row.node_type != NodeType.TABLE_ROW:
+                continue
+            cell_tag = 'th' if row.metadata.get('is_header', False) else 'td'
+            cells = ''.join(f"<{cell_tag}>{render_inline(cell.content)}</{cell_tag}>"
+                            for cell in row.children)
+            parts.append(f"<tr>{cells}</tr>")
+        parts.append("</table>")
+        return ''.join(parts)
+
+    def _render_code_block(self, node: ASTNode) -> str:
+        """Render a code block, or a Mermaid diagram element."""
+        language = node.metadata.get('language')
+        content = node.content
+        if is_mermaid_diagram(language, content):
+            source = content.strip()
+            return (f'<div class="mermaid" data-hash="{diagram_hash(source)}">'
+                    f'{html.escape(source, quote=False)}</div>')
+        language_class = f' class="language-{html.escape(language)}"' if language else ''
+        return f"<pre><code{language_class}>{html.escape(content, quote=False)}</code></pre>"
+
+    def _render_table_of_contents(self, ast: ASTNode) -> str:
+        """Render links to the document's headings."""
+        items = []
+        stack = list(reversed(ast.children))
+        while stack:
+            node = stack.pop()
+            if node.node_type == NodeType.HEADING:
+                items.append(f'<li class="toc-level-{node.level or 1}">'
+                             f'<a href="#{self._heading_id(node.content)}">'
+                             f'{html.escape(node.content, quote=False)}</a></li>')
+            if node.node_type in (NodeType.HEADING, NodeType.SECTION):
+                stack.extend(reversed(node.children))
+        return f'<nav class="toc"><h2>Table of Contents</h2><ul>{"".join(items)}</ul></nav>\n'
+
+    @staticmethod
+    def _first_heading(ast: ASTNode) -> Optional[str]:
+        """Get the text of the document's first heading."""
+        stack = list(reversed(ast.children))
+        while stack:
+            node = stack.pop()
+            if node.node_type == NodeType.HEADING:
+                return node.content
+            stack.extend(reversed(node.children))
+        return None
+
+    @staticmethod
+    def stylesheet(preset: StylePreset) -> str:
+        """
+        Build the CSS for a style preset.
+
+        Args:
+            preset: Style preset
+
+        Returns:
+            CSS rules
+        """
+        paragraph = preset.paragraph_style
+        code = preset.code_block_style
+        table = preset.table_style
+        rules = [
+            f"body {{ font-family: {paragraph.font.family}; font-size: {paragraph.font.size}pt; "
+            f"line-height: {paragraph.line_height}; color: {paragraph.font.color}; "
+            f"max-width: 900px; margin: 0 auto; padding: 20px; }}",
+            f"p {{ margin: {paragraph.spacing_before}pt 0 {paragraph.spacing_after}pt; "
+            f"text-align: {paragraph.alignment}; }}",
+        ]
+        for level in range(1, 7):
+            heading = preset.get_heading_style(level)
+            rules.append(
+                f"h{level} {{ font-size: {heading.font.size}pt; font-weight: {heading.font.weight}; "
+                f"color: {heading.font.color}; "
+                f"margin: {heading.spacing_before}pt 0 {heading.spacing_after}pt; }}"
+            )
+        rules += [
+            f"pre, .mermaid {{ font-family: {code.font.family}; font-size: {code.font.size}pt; "
+            f"background-color: {code.background_color}; "
+            f"border: {code.border_width}px solid {code.border_color}; "
+            f"padding: {code.padding}px; overflow-x: auto; }}",
+            f"code {{ font-family: {code.font.family}; }}",
+            ".mermaid { white-space: pre; text-align: center; }",
+            ".mermaid svg { white-space: normal; }",
+            "table { border-collapse: collapse; margin: 1em 0; }",
+            f"th, td {{ border: {table.border_width}px solid {table.border_color}; "
+            f"padding: {table.cell_padding}px; text-align: left; }}",
+            f"th {{ background-color: {table.header_background}; "
+            f"font-weight: {table.header_font.weight}; }}",
+            f"blockquote {{ border-left: 4px solid {preset.blockquote_border_color}; "
+            f"background-color: {preset.blockquote_background}; margin: 1em 0; padding: 0 1em; }}",
+            f"a {{ color: {preset.link_color}; }}",
+            "img { max-width: 100%; height: auto; }",
+            ".page-break { page-break-before: always; }",
+        ]
+        return '\n'.join(rules) + '\n'
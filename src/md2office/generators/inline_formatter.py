@@ -9,6 +9,7 @@ import re
 from typing import List, Tuple, Optional, Dict
 
 try:
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
     from docx.shared import RGBColor
     from docx.oxml import OxmlElement
     from docx.oxml.ns import qn
@@ -50,7 +51,8 @@ class InlineFormatter:
         self.link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
         self.image_pattern = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
     
-    def format_text(self, paragraph, text: str, base_font_size=None, base_font_name=None):
+    def format_text(self, paragraph, text: str, base_font_size=None, base_font_name=None,
+                    character_styles: Optional[Dict[str, str]] = None):
         """
         Format text with inline markdown elements.
         
@@ -59,6 +61,9 @@ class InlineFormatter:
             text: Text with inline markdown
             base_font_size: Base font size in points
             base_font_name: Base font name
+            character_styles: Character style IDs for 'bold', 'italic',
+                'code' and 'link' segments; when given, runs reference
+                these styles instead of carrying direct formatting
         """
         # Parse text into segments with formatting
         segments = self._parse_inline_markdown(text)
@@ -66,26 +71,49 @@ class InlineFormatter:
         for segment in segments:
             run = paragraph.add_run(segment['text'])
             
-            # Apply base font
-            if base_font_size:
-                run.font.size = base_font_size
-            if base_font_name:
-                run.font.name = base_font_name
-            
-            # Apply formatting
-            if segment.get('bold'):
-                run.font.bold = True
-            if segment.get('italic'):
-                run.font.italic = True
-            if segment.get('code'):
-                run.font.name = 'Courier New'
-                if base_font_size:
-                    run.font.size = base_font_size * 0.9  # Slightly smaller for code
-                run.font.color.rgb = RGBColor(0xCC, 0x00, 0x00)  # Red for code
+            if character_styles is not None:
+                kind = self._segment_kind(segment)
+                if kind:
+                    run._r.style = character_styles[kind]
+            else:
+                self._apply_direct_formatting(run, segment, base_font_size, base_font_name)
             
             # Handle links
             if segment.get('link_url'):
-                self._add_hyperlink(paragraph, run, segment['link_url'], segment['text'])
+                self._add_hyperlink(paragraph, run, segment['link_url'])
+    
+    @staticmethod
+    def _apply_direct_formatting(run, segment: Dict, base_font_size, base_font_name):
+        """Format a run directly when no character styles are used."""
+        # Apply base font
+        if base_font_size:
+            run.font.size = base_font_size
+        if base_font_name:
+            run.font.name = base_font_name
+        
+        # Apply formatting
+        if segment.get('bold'):
+            run.font.bold = True
+        if segment.get('italic'):
+            run.font.italic = True
+        if segment.get('code'):
+            run.font.name = 'Courier New'
+            if base_font_size:
+                run.font.size = base_font_size * 0.9  # Slightly smaller for code
+            run.font.color.rgb = RGBColor(0xCC, 0x00, 0x00)  # Red for code
+        if segment.get('link_url'):
+            run.font.color.rgb = RGBColor(0x00, 0x66, 0xCC)
+            run.font.underline = True
+    
+    @staticmethod
+    def _segment_kind(segment: Dict) -> Optional[str]:
+        """Get the formatting kind of a segment, or None for plain text."""
+        if segment.get('link_url'):
+            return 'link'
+        for kind in ('code', 'bold', 'italic'):
+            if segment.get(kind):
+                return kind
+        return None
     
     def _parse_inline_markdown(self, text: str) -> List[Dict]:
         """
@@ -193,44 +221,21 @@ class InlineFormatter:
         
         return segments
     
-    def _add_hyperlink(self, paragraph, run, url: str, text: str):
+    def _add_hyperlink(self, paragraph, run, url: str):
         """
-        Add hyperlink to paragraph.
+        Turn a run into a hyperlink.
         
         Args:
-            paragraph: Word paragraph
-            run: Text run
-            url: Hyperlink URL
-            text: Link text
+            paragraph: Word paragraph containing the run
+            run: Text run (already formatted or styled as a link)
+            url: Hyperlink URL; '#name' links to a bookmark in the document
         """
-        # Create hyperlink element
         hyperlink = OxmlElement('w:hyperlink')
-        hyperlink.set(qn('r:id'), 'rId1')  # Relationship ID (simplified)
-        
-        # Create run for hyperlink
-        run_element = OxmlElement('w:r')
-        run_properties = OxmlElement('w:rPr')
-        
-        # Set hyperlink formatting (blue, underlined)
-        color = OxmlElement('w:color')
-        color.set(qn('w:val'), '0000FF')
-        run_properties.append(color)
-        
-        underline = OxmlElement('w:u')
-        underline.set(qn('w:val'), 'single')
-        run_properties.append(underline)
-        
-        run_element.append(run_properties)
-        
-        # Add text
-        text_element = OxmlElement('w:t')
-        text_element.text = text
-        run_element.append(text_element)
-        
-        hyperlink.append(run_element)
-        
-        # Insert hyperlink (simplified - full implementation needs relationship management)
-        # For now, just format the run as a link
-        run.font.color.rgb = RGBColor(0x00, 0x66, 0xCC)
-        run.font.underline = True
+        if url.startswith('#'):
+            hyperlink.set(qn('w:anchor'), url[1:])
+        else:
+            rel_id = paragraph.part.relate_to(url, RT.HYPERLINK, is_external=True)
+            hyperlink.set(qn('r:id'), rel_id)
+        run._r.addprevious(hyperlink)
+        hyperlink.append(run._r)
 
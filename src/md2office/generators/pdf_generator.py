@@ -5,9 +5,12 @@ Implements Epic 4: PDF Conversion
 Generates PDF documents from AST using ReportLab.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 from pathlib import Path
+import os
 
 try:
     from reportlab.lib.pagesizes import letter, A4
@@ -20,14 +23,95 @@ try:
     )
     from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
     from reportlab.pdfgen import canvas
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.lib.rl_accel import fp_str
     REPORTLAB_AVAILABLE = True
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
 from ..parser.ast_builder import ASTNode, NodeType
 from ..router.content_router import FormatGenerator, OutputFormat
-from ..errors import ConversionError, FileError
+from ..errors import ConversionError, FileError, SerializationError, CancellationError, get_logger
 from ..styling.style import StylePreset, get_style_preset
+from ..profiling import PROFILER_OPTION, profile_stage
+from ..cancellation import CANCEL_OPTION, check_cancelled, get_cancel_token
+from ..progress import PROGRESS_OPTION, get_progress
+from .pdf_merge import PDFMerger, STAMP_FONT
+
+# Options that cannot be sent to partition worker processes (cancelling
+# kills the workers instead; progress is reported per partition)
+_LOCAL_OPTIONS = (PROFILER_OPTION, CANCEL_OPTION, PROGRESS_OPTION, 'structure_analysis')
+
+
+# Per-process state for partition workers: (AST, options)
+_partition_document = None
+
+
+def _init_partition_worker(ast_data: bytes, options: Dict[str, Any]):
+    """Initialize a partition worker with the document to render."""
+    global _partition_document
+    _partition_document = (ASTNode.from_bytes(ast_data), options)
+
+
+def _render_partition(segments: range) -> Tuple[bytes, List[Dict[str, Any]]]:
+    """Render a range of segments of the worker's document."""
+    ast, options = _partition_document
+    generator = PDFGenerator()
+    data = generator._build(ast, options, segments)
+    return data, generator.bookmarks
+
+
+def outline_level(heading_level: int, previous: int) -> int:
+    """
+    Get the outline level of a heading.
+    
+    Args:
+        heading_level: Heading level (1-6)
+        previous: Outline level of the previous entry (-1 for the first)
+        
+    Returns:
+        0-based outline level; skipped heading levels are closed up, since
+        an outline entry can only be one level below the previous one
+    """
+    return max(0, min(heading_level - 1, previous + 1))
+
+
+def partition_segments(sizes: List[int], count: int) -> List[range]:
+    """
+    Group consecutive segments into partitions of similar size.
+    
+    Args:
+        sizes: Size of each segment, in document order
+        count: Number of partitions wanted
+        
+    Returns:
+        Contiguous segment ranges covering every segment (at most ``count``)
+    """
+    count = max(1, min(count, len(sizes)))
+    target = sum(sizes) / count
+    partitions = []
+    start, total = 0, 0
+    for index, size in enumerate(sizes):
+        total += size
+        # Close the partition at its share of the total, or when only one
+        # segment is left for each partition still to come
+        needed = count - 1 - len(partitions)
+        remaining = len(sizes) - index - 1
+        if needed and (remaining <= needed or total >= target * (len(partitions) + 1)):
+            partitions.append(range(start, index + 1))
+            start = index + 1
+    partitions.append(range(start, len(sizes)))
+    return [partition for partition in partitions if partition]
+
+
+def _kill_workers(executor: ProcessPoolExecutor):
+    """Kill the worker processes of a pool whose conversion was cancelled."""
+    kill_workers = getattr(executor, 'kill_workers', None)  # Python 3.14+
+    if kill_workers is not None:
+        kill_workers()
+        return
+    for process in list((executor._processes or {}).values()):
+        process.kill()
 
 
 class PDFGenerator(FormatGenerator):
@@ -51,6 +135,15 @@ class PDFGenerator(FormatGenerator):
         self.bookmarks: List[Dict[str, Any]] = []
         self.page_width = letter[0]
         self.page_height = letter[1]
+        # Partitioning state (see pdf_workers option): sections at the
+        # partition level start a new segment; only the segments in
+        # self._segments are rendered (all if None)
+        self._partition_level = 1
+        self._segments: Optional[range] = None
+        self._segment_sizes: List[int] = [0]
+        self._outline_level = -1
+        self._cancel_token = None
+        self._progress = None
     
     def generate(self, ast: ASTNode, options: Dict[str, Any]) -> bytes:
         """
@@ -58,64 +151,33 @@ class PDFGenerator(FormatGenerator):
         
         Args:
             ast: Root AST node
-            options: Generation options
+            options: Generation options. ``pdf_workers`` (default 1) renders
+                the document in that many worker processes (0: one per
+                CPU): it is split into partitions at sections of level
+                ``pdf_partition_level`` (default 1) or above, each partition
+                starts on a new page, and the parts are merged with page
+                numbers and the outline fixed up
             
         Returns:
             Generated PDF document as bytes
             
         Raises:
             ConversionError: If generation fails
+            CancellationError: If the conversion was cancelled (partition
+                workers are killed)
         """
         try:
-            # Initialize buffer and document
-            self.buffer = BytesIO()
-            
-            # Get page size
-            page_size = options.get('page_size', 'letter')
-            if page_size == 'A4':
-                self.page_width, self.page_height = A4
-            else:
-                self.page_width, self.page_height = letter
-            
-            # Create document
-            self.doc = SimpleDocTemplate(
-                self.buffer,
-                pagesize=(self.page_width, self.page_height),
-                rightMargin=inch,
-                leftMargin=inch,
-                topMargin=inch,
-                bottomMargin=inch
-            )
-            
-            self.story = []
-            self.bookmarks = []
-            
-            # Get style preset
-            style_name = options.get('style', 'default')
-            self.current_style_preset = get_style_preset(style_name)
-            
-            # Set document metadata
-            self._set_document_metadata(ast, options)
-            
-            # Add table of contents if requested
-            if options.get('table_of_contents', False):
-                self._add_table_of_contents(ast)
-            
-            # Process AST nodes
-            self._process_node(ast, options)
-            
-            # Build PDF
-            self.doc.build(
-                self.story,
-                onFirstPage=self._on_first_page,
-                onLaterPages=self._on_later_pages
-            )
-            
-            # Add bookmarks if requested
-            if options.get('bookmarks', True) and self.bookmarks:
-                self._add_bookmarks()
-            
-            return self.buffer.getvalue()
+            workers = options.get('pdf_workers', 1)
+            if workers == 0:
+                workers = os.cpu_count() or 1
+            if workers > 1:
+                data = self._generate_partitioned(ast, options, workers)
+                if data is not None:
+                    return data
+            return self._build(ast, options)
+        
+        except CancellationError:
+            raise
         
         except Exception as e:
             raise ConversionError(
@@ -128,6 +190,162 @@ class PDFGenerator(FormatGenerator):
         """Get file extension for PDF format."""
         return ".pdf"
     
+    def _build(self, ast: ASTNode, options: Dict[str, Any],
+               segments: Optional[range] = None) -> bytes:
+        """
+        Render the document, or only some of its segments.
+        
+        Args:
+            ast: Root AST node
+            options: Generation options
+            segments: Segments to render (all if omitted); partial renders
+                have no page numbers or outline, which are added on merge
+                
+        Returns:
+            PDF bytes
+        """
+        # Initialize buffer and document
+        self.buffer = BytesIO()
+        self._set_page_size(options)
+        
+        # Create document
+        self.doc = SimpleDocTemplate(
+            self.buffer,
+            pagesize=(self.page_width, self.page_height),
+            rightMargin=inch,
+            leftMargin=inch,
+            topMargin=inch,
+            bottomMargin=inch
+        )
+        self.doc.afterFlowable = self._after_flowable
+        
+        self.story = []
+        self.bookmarks = []
+        self._partition_level = options.get('pdf_partition_level', 1)
+        self._segments = segments
+        self._segment_sizes = [0]
+        self._outline_level = -1
+        self._cancel_token = get_cancel_token(options)
+        self._progress = get_progress(options) if segments is None else None
+        
+        # Get style preset
+        style_name = options.get('style', 'default')
+        self.current_style_preset = get_style_preset(style_name)
+        
+        # Set document metadata
+        self._set_document_metadata(ast, options)
+        
+        # Add table of contents if requested
+        if options.get('table_of_contents', False) and self._in_partition():
+            self._add_table_of_contents(ast)
+        
+        # Process AST nodes
+        self._process_node(ast, options)
+        
+        # Build PDF (progress counts laid out flowables)
+        if self._progress is not None:
+            self._progress.set_total(len(self.story), 'flowables')
+        if segments is None:
+            self.doc.build(
+                self.story,
+                onFirstPage=self._on_first_page,
+                onLaterPages=self._on_later_pages
+            )
+        else:
+            self.doc.build(self.story)
+        
+        return self.buffer.getvalue()
+    
+    def _generate_partitioned(self, ast: ASTNode, options: Dict[str, Any],
+                              workers: int) -> Optional[bytes]:
+        """
+        Render partitions of the document in worker processes and merge them.
+        
+        Returns:
+            PDF bytes, or None if the document should be rendered in one
+            process (too few sections, or it cannot be sent to workers)
+        """
+        partitions = partition_segments(self._plan_segments(ast, options), workers)
+        if len(partitions) < 2:
+            return None
+        try:
+            ast_data = ast.to_bytes()
+        except SerializationError as e:
+            get_logger().debug(f"Rendering PDF in one process: {e.message}")
+            return None
+        
+        worker_options = {name: value for name, value in options.items()
+                          if name not in _LOCAL_OPTIONS}
+        self._set_page_size(options)
+        merger = PDFMerger(page_stamp=self._page_footer)
+        bookmarks = []
+        token = get_cancel_token(options)
+        progress = get_progress(options)
+        if progress is not None:
+            progress.set_total(len(partitions), 'partitions')
+        try:
+            with ProcessPoolExecutor(max_workers=len(partitions),
+                                     initializer=_init_partition_worker,
+                                     initargs=(ast_data, worker_options)) as executor:
+                futures = [executor.submit(_render_partition, partition)
+                           for partition in partitions]
+                # Workers are started by submit(); cancelling kills them
+                handle = token.register(lambda: _kill_workers(executor)) if token else None
+                try:
+                    for future in futures:
+                        data, part_bookmarks = future.result()
+                        offset = merger.page_count
+                        merger.add_part(data)
+                        for bookmark in part_bookmarks:
+                            bookmark['page'] += offset
+                            bookmarks.append(bookmark)
+                        if progress is not None:
+                            progress.advance(produced=merger.page_count)
+                    check_cancelled(options, "pdf")
+                except KeyboardInterrupt:
+                    _kill_workers(executor)
+                    raise
+                finally:
+                    if token is not None:
+                        token.unregister(handle)
+        except (BrokenProcessPool, OSError) as e:
+            # Killed workers break the pool: only fall back if not cancelled
+            check_cancelled(options, "pdf")
+            get_logger().debug(f"Rendering PDF in one process: {e}")
+            return None
+        
+        self.bookmarks = bookmarks
+        outline = []
+        level = -1
+        for bookmark in bookmarks:
+            level = outline_level(bookmark['level'], level)
+            outline.append((level, bookmark['title'], bookmark['page']))
+        return merger.finish(outline)
+    
+    def _plan_segments(self, ast: ASTNode, options: Dict[str, Any]) -> List[int]:
+        """Walk the document without rendering it; returns the size of each segment."""
+        self._partition_level = options.get('pdf_partition_level', 1)
+        self._segments = range(0)
+        self._segment_sizes = [0]
+        self.story = []
+        try:
+            self._process_node(ast, options)
+            return self._segment_sizes
+        finally:
+            self._segments = None
+    
+    def _in_partition(self) -> bool:
+        """Check whether the current segment is being rendered."""
+        return self._segments is None or len(self._segment_sizes) - 1 in self._segments
+    
+    def _set_page_size(self, options: Dict[str, Any]):
+        """Set the page size from the options."""
+        page_size = options.get('page_size', 'letter')
+        if page_size == 'A4':
+            self.page_width, self.page_height = A4
+        else:
+            self.page_width, self.page_height = letter
+    
     def _set_document_metadata(self, ast: ASTNode, options: Dict[str, Any]):
         """Set PDF document metadata."""
         title = ast.metadata.get('title')
@@ -149,17 +367,29 @@ class PDFGenerator(FormatGenerator):
     
     def _process_node(self, node: ASTNode, options: Dict[str, Any]):
         """Process AST node and add to PDF story."""
-        if node.node_type == NodeType.DOCUMENT:
-            for child in node.children:
-                self._process_node(child, options)
-        
-        elif node.node_type == NodeType.SECTION:
+        if node.node_type == NodeType.SECTION:
+            check_cancelled(options, "pdf")
+        if (node.node_type == NodeType.SECTION and node.level is not None
+                and node.level <= self._partition_level):
+            self._segment_sizes.append(0)
+        self._segment_sizes[-1] += len(node.content) + 1
+        
+        if node.node_type in (NodeType.DOCUMENT, NodeType.SECTION):
             # Process section (may add page break)
-            if options.get('page_breaks', False) and node.level == 1:
-                self.story.append(PageBreak())
+            if (node.node_type == NodeType.SECTION and options.get('page_breaks', False)
+                    and node.level == 1 and self._in_partition()):
+                # Partitions after the first already start on a new page
+                if self.story or self._segments is None or self._segments.start == 0:
+                    self.story.append(PageBreak())
             
+            # Children are all processed here, not by the loop below
             for child in node.children:
                 self._process_node(child, options)
+            return
+        
+        elif not self._in_partition():
+            # Outside the partition being rendered; walked only to count segments
+            pass
         
         elif node.node_type == NodeType.HEADING:
             self._add_heading(node, options)
@@ -183,7 +413,8 @@ class PDFGenerator(FormatGenerator):
             self._add_horizontal_rule()
         
         elif node.node_type == NodeType.IMAGE:
-            self._add_image(node, options)
+            with profile_stage(options, "image"):
+                self._add_image(node, options)
         
         # Process children recursively
         for child in node.children:
@@ -227,16 +458,19 @@ class PDFGenerator(FormatGenerator):
         else:
             heading_style = styles[style_name]
         
-        # Add bookmark
+        # Add paragraph
+        para = Paragraph(content, heading_style)
+        
+        # Add bookmark (its page is set once the heading is laid out)
         if options.get('bookmarks', True):
-            self.bookmarks.append({
+            para._bookmark = {
                 'level': level,
                 'title': content,
-                'page': len(self.story)  # Approximate page number
-            })
+                'page': None,
+                'key': f"heading{len(self.bookmarks)}"
+            }
+            self.bookmarks.append(para._bookmark)
         
-        # Add paragraph
-        para = Paragraph(content, heading_style)
         self.story.append(para)
         self.story.append(Spacer(1, 0.2 * inch))
     
@@ -460,11 +694,24 @@ class PDFGenerator(FormatGenerator):
         for child in node.children:
             self._extract_headings_for_toc(child, headings)
     
-    def _add_bookmarks(self):
-        """Add bookmarks to PDF."""
-        # Bookmarks are added during heading processing
-        # ReportLab handles bookmarks through outline
-        pass
+    def _after_flowable(self, flowable):
+        """
+        Check for cancellation and report progress; record the page of a
+        laid out heading and add its outline entry.
+        """
+        if self._cancel_token is not None:
+            self._cancel_token.raise_if_cancelled("pdf")
+        if self._progress is not None:
+            self._progress.advance(produced=self.doc.page)
+        bookmark = getattr(flowable, '_bookmark', None)
+        if bookmark is None:
+            return
+        bookmark['page'] = self.doc.page
+        if self._segments is None:
+            # Partial renders get their outline when merged
+            self._outline_level = outline_level(bookmark['level'], self._outline_level)
+            self.doc.canv.bookmarkPage(bookmark['key'])
+            self.doc.canv.addOutlineEntry(bookmark['title'], bookmark['key'], self._outline_level)
     
     def _on_first_page(self, canvas_obj, doc):
         """Callback for first page."""
@@ -487,6 +734,13 @@ class PDFGenerator(FormatGenerator):
         )
         canvas_obj.restoreState()
     
+    def _page_footer(self, page_number: int) -> bytes:
+        """Page number footer as content stream operators (for merged partitions)."""
+        text = f"Page {page_number}"
+        x = self.page_width / 2.0 - stringWidth(text, 'Helvetica', 9) / 2.0
+        return (f"0 0 0 rg BT /{STAMP_FONT} 9 Tf 1 0 0 1 {fp_str(x, 0.75 * inch)} Tm "
+                f"({text}) Tj ET").encode('ascii')
+    
     def _find_first_heading(self, node: ASTNode, level: int) -> Optional[ASTNode]:
         """Find first heading of specified level."""
         if node.node_type == NodeType.HEADING and node.level == level:
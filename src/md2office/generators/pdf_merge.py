@@ -0,0 +1,488 @@
+"""
+PDF Concatenation
+
+Lightweight merger for PDFs written by ReportLab, used to join the
+partitions of a document rendered in parallel. Pages are concatenated
+into a single page tree, each page can be stamped with extra content
+(the page number footer) and the document outline is built from
+headings given with their final page numbers.
+
+Only what ReportLab writes is supported: a classic cross-reference
+table, no object streams and no encryption.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..errors import ConversionError
+
+# Font resource name available to page stamps (Helvetica)
+STAMP_FONT = 'FMdStamp'
+
+_WHITESPACE = b'\x00\t\n\x0c\r '
+_DELIMITERS = b'()<>[]{}/%'
+_NUMBER = re.compile(rb'[+-]?(?:\d+\.?\d*|\.\d+)')
+_REFERENCE = re.compile(rb'(\d+)\s+(\d+)\s+R(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])')
+_XREF_SUBSECTION = re.compile(rb'(\d+)\s+(\d+)')
+_OBJECT_HEADER = re.compile(rb'\s*(\d+)\s+(\d+)\s+obj')
+_STREAM_START = re.compile(rb'\s*stream\r?\n')
+
+# Page attributes inherited from the page tree
+_INHERITED = ('Resources', 'MediaBox', 'CropBox', 'Rotate')
+
+
+class Name(str):
+    """PDF name (without the leading slash, escapes kept as written)."""
+
+
+class Ref:
+    """Indirect object reference."""
+
+    __slots__ = ('number',)
+
+    def __init__(self, number: int):
+        self.number = number
+
+    def __repr__(self):
+        return f"Ref({self.number})"
+
+
+class _Merged(Ref):
+    """Reference to an object of the merged document (never remapped)."""
+
+    __slots__ = ()
+
+
+class RawString(bytes):
+    """PDF string token, kept exactly as written (with delimiters)."""
+
+
+class Stream:
+    """Stream object: its dictionary and (still encoded) data."""
+
+    __slots__ = ('dictionary', 'data')
+
+    def __init__(self, dictionary: Dict[str, Any], data: bytes):
+        self.dictionary = dictionary
+        self.data = data
+
+
+def _error(message: str) -> ConversionError:
+    """Build a merge error."""
+    return ConversionError(f"Cannot merge PDF partitions: {message}", format="pdf", stage="merge")
+
+
+class _Reader:
+    """Parses the objects of one PDF file on demand."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offsets: Dict[int, int] = {}
+        self._objects: Dict[int, Any] = {}
+        self.trailer = self._read_xref()
+
+    def resolve(self, value: Any) -> Any:
+        """Follow a reference to its object (other values are returned as is)."""
+        while isinstance(value, Ref):
+            value = self.object(value.number)
+        return value
+
+    def object(self, number: int) -> Any:
+        """Get an object by number (None if it does not exist)."""
+        if number not in self._objects:
+            offset = self.offsets.get(number)
+            self._objects[number] = None if offset is None else self._read_object(offset)
+        return self._objects[number]
+
+    def _read_xref(self) -> Dict[str, Any]:
+        """Read the cross-reference table and trailer."""
+        data = self.data
+        position = data.rfind(b'startxref')
+        if position < 0:
+            raise _error("no cross-reference table")
+        _, position = self._skip(position + len(b'startxref'))
+        match = _NUMBER.match(data, position)
+        if not match:
+            raise _error("bad startxref")
+        position = int(match.group())
+        if not data.startswith(b'xref', position):
+            raise _error("cross-reference streams are not supported")
+        position += len(b'xref')
+        while True:
+            _, position = self._skip(position)
+            if data.startswith(b'trailer', position):
+                break
+            header = _XREF_SUBSECTION.match(data, position)
+            if not header:
+                raise _error("bad cross-reference table")
+            first, count = int(header.group(1)), int(header.group(2))
+            _, position = self._skip(header.end())
+            for index in range(count):
+                entry = data[position:position + 20]
+                if entry[17:18] == b'n':
+                    self.offsets[first + index] = int(entry[:10])
+                position += 20
+        trailer, _ = self._value(position + len(b'trailer'))
+        if not isinstance(trailer, dict) or 'Prev' in trailer:
+            raise _error("incremental updates are not supported")
+        return trailer
+
+    def _read_object(self, offset: int) -> Any:
+        """Read the object at a byte offset."""
+        header = _OBJECT_HEADER.match(self.data, offset)
+        if not header:
+            raise _error(f"no object at offset {offset}")
+        value, position = self._value(header.end())
+        stream = _STREAM_START.match(self.data, position)
+        if stream and isinstance(value, dict):
+            length = self.resolve(value.get('Length'))
+            if not isinstance(length, int):
+                raise _error("stream without a length")
+            start = stream.end()
+            value = Stream(value, self.data[start:start + length])
+        return value
+
+    def _skip(self, position: int) -> Tuple[None, int]:
+        """Skip whitespace and comments."""
+        data = self.data
+        while position < len(data):
+            byte = data[position]
+            if byte in _WHITESPACE:
+                position += 1
+            elif byte == 0x25:  # %
+                end = data.find(b'\n', position)
+                position = len(data) if end < 0 else end + 1
+            else:
+                break
+        return None, position
+
+    def _value(self, position: int) -> Tuple[Any, int]:
+        """Parse one value; returns (value, position after it)."""
+        data = self.data
+        _, position = self._skip(position)
+        if data.startswith(b'<<', position):
+            result = {}
+            position += 2
+            while True:
+                _, position = self._skip(position)
+                if data.startswith(b'>>', position):
+                    return result, position + 2
+                key, position = self._value(position)
+                if not isinstance(key, Name):
+                    raise _error(f"dictionary key is not a name at offset {position}")
+                result[str(key)], position = self._value(position)
+        byte = data[position:position + 1]
+        if byte == b'[':
+            result = []
+            position += 1
+            while True:
+                _, position = self._skip(position)
+                if data.startswith(b']', position):
+                    return result, position + 1
+                item, position = self._value(position)
+                result.append(item)
+        if byte == b'/':
+            end = position + 1
+            while end < len(data) and data[end] not in _WHITESPACE and data[end] not in _DELIMITERS:
+                end += 1
+            return Name(data[position + 1:end].decode('latin-1')), end
+        if byte == b'(':
+            depth, end = 0, position
+            while True:
+                char = data[end]
+                if char == 0x5C:  # backslash
+                    end += 2
+                    continue
+                if char == 0x28:
+                    depth += 1
+                elif char == 0x29:
+                    depth -= 1
+                    if not depth:
+                        return RawString(data[position:end + 1]), end + 1
+                end += 1
+        if byte == b'<':
+            end = data.index(b'>', position)
+            return RawString(data[position:end + 1]), end + 1
+        reference = _REFERENCE.match(data, position)
+        if reference:
+            return Ref(int(reference.group(1))), reference.end()
+        number = _NUMBER.match(data, position)
+        if number:
+            text = number.group()
+            return (float(text) if b'.' in text else int(text)), number.end()
+        for keyword, value in ((b'true', True), (b'false', False), (b'null', None)):
+            if data.startswith(keyword, position):
+                return value, position + len(keyword)
+        raise _error(f"unexpected token at offset {position}")
+
+
+def _format_number(value: float) -> bytes:
+    """Format a real number the way PDF writers do."""
+    text = ('%.6f' % value).rstrip('0').rstrip('.')
+    return (text if text not in ('', '-0') else '0').encode('ascii')
+
+
+def serialize(value: Any) -> bytes:
+    """Serialize a parsed value back to PDF syntax."""
+    if isinstance(value, Ref):
+        return b'%d 0 R' % value.number
+    if isinstance(value, Name):
+        return b'/' + value.encode('latin-1')
+    if isinstance(value, RawString):
+        return bytes(value)
+    if value is True:
+        return b'true'
+    if value is False:
+        return b'false'
+    if value is None:
+        return b'null'
+    if isinstance(value, int):
+        return b'%d' % value
+    if isinstance(value, float):
+        return _format_number(value)
+    if isinstance(value, dict):
+        return b'<< ' + b' '.join(b'/' + key.encode('latin-1') + b' ' + serialize(item)
+                                  for key, item in value.items()) + b' >>'
+    if isinstance(value, list):
+        return b'[ ' + b' '.join(serialize(item) for item in value) + b' ]'
+    if isinstance(value, Stream):
+        dictionary = dict(value.dictionary, Length=len(value.data))
+        return serialize(dictionary) + b'\nstream\n' + value.data + b'\nendstream'
+    raise TypeError(f"Cannot serialize {type(value).__name__} as PDF")
+
+
+def text_string(text: str) -> RawString:
+    """Encode text as a PDF text string."""
+    try:
+        encoded = text.encode('latin-1')
+    except UnicodeEncodeError:
+        return RawString(b'<FEFF' + text.encode('utf-16-be').hex().upper().encode('ascii') + b'>')
+    escaped = encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return RawString(b'(' + escaped.replace(b'\r', b'\\r').replace(b'\n', b'\\n') + b')')
+
+
+class PDFMerger:
+    """
+    Concatenates ReportLab PDFs into one document.
+
+    Usage::
+
+        merger = PDFMerger(page_stamp=footer)
+        for data in partitions:
+            merger.add_part(data)
+        pdf = merger.finish(outline)
+    """
+
+    # Object numbers reserved for the document structure
+    _CATALOG, _PAGES, _STAMP_FONT = 1, 2, 3
+
+    def __init__(self, page_stamp: Optional[Callable[[int], bytes]] = None):
+        """
+        Initialize merger.
+
+        Args:
+            page_stamp: Function returning content stream operators drawn
+                on top of each page, given its 1-based page number; it
+                may use the font resource named ``STAMP_FONT``
+        """
+        self.page_stamp = page_stamp
+        self.page_count = 0
+        self._objects: List[Optional[bytes]] = [None, None, None]
+        self._pages: List[Ref] = []
+        self._info: Optional[Ref] = None
+        self._dests: Dict[str, Any] = {}
+        self._save_state: Optional[int] = None
+
+    def add_part(self, data: bytes) -> int:
+        """
+        Append every page of a PDF.
+
+        Args:
+            data: PDF written by ReportLab
+
+        Returns:
+            Number of pages added
+        """
+        try:
+            return self._add_part(_Reader(data))
+        except (IndexError, ValueError) as e:
+            raise _error(f"malformed PDF ({e})") from e
+
+    def _add_part(self, reader: _Reader) -> int:
+        """Append the pages of a parsed PDF."""
+        catalog = reader.resolve(reader.trailer.get('Root'))
+        if not isinstance(catalog, dict):
+            raise _error("no document catalog")
+
+        # Old object number to new reference; page tree nodes map to the
+        # merged page tree and the catalog and outline are dropped
+        mapping: Dict[int, Any] = {}
+        pending: List[Tuple[int, int]] = []
+        for node in (reader.trailer.get('Root'), catalog.get('Outlines')):
+            if isinstance(node, Ref):
+                mapping[node.number] = None
+        pages = self._collect_pages(reader, catalog.get('Pages'), {}, mapping)
+
+        def remap(value):
+            if isinstance(value, _Merged):
+                return value
+            if isinstance(value, Ref):
+                if value.number not in mapping:
+                    mapping[value.number] = _Merged(self._allocate())
+                    pending.append((value.number, mapping[value.number].number))
+                return mapping[value.number]
+            if isinstance(value, dict):
+                return {key: remap(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [remap(item) for item in value]
+            if isinstance(value, Stream):
+                return Stream(remap(value.dictionary), value.data)
+            return value
+
+        for old_number, page, inherited in pages:
+            page = dict(page)
+            for key, value in inherited.items():
+                page.setdefault(key, value)
+            page['Parent'] = _Merged(self._PAGES)
+            self.page_count += 1
+            if self.page_stamp is not None:
+                self._stamp(reader, page)
+            self._set(mapping[old_number].number, remap(page))
+            self._pages.append(mapping[old_number])
+
+        if self._info is None and isinstance(reader.trailer.get('Info'), Ref):
+            self._info = remap(reader.trailer['Info'])
+        dests = reader.resolve(catalog.get('Dests'))
+        if isinstance(dests, dict):
+            self._dests.update(remap(dests))
+
+        while pending:
+            old_number, new_number = pending.pop()
+            self._set(new_number, remap(reader.object(old_number)))
+        return len(pages)
+
+    def finish(self, outline: Sequence[Tuple[int, str, int]] = ()) -> bytes:
+        """
+        Write the merged document.
+
+        Args:
+            outline: (outline level, title, 1-based page number) entries in
+                document order; levels start at 0 and increase by at most
+                one from an entry to the next
+
+        Returns:
+            PDF bytes
+        """
+        catalog = {'Type': Name('Catalog'), 'Pages': _Merged(self._PAGES)}
+        if outline:
+            catalog['Outlines'] = _Merged(self._add_outline(outline))
+        if self._dests:
+            catalog['Dests'] = self._dests
+        self._set(self._CATALOG, catalog)
+        self._set(self._PAGES, {'Type': Name('Pages'), 'Count': len(self._pages),
+                                'Kids': list(self._pages)})
+        self._set(self._STAMP_FONT, {'Type': Name('Font'), 'Subtype': Name('Type1'),
+                                     'BaseFont': Name('Helvetica'),
+                                     'Encoding': Name('WinAnsiEncoding')})
+
+        output = [b'%PDF-1.4\n%\x93\x8c\x8b\x9e md2office\n']
+        size = len(output[0])
+        offsets = []
+        for number, body in enumerate(self._objects, 1):
+            chunk = b'%d 0 obj\n' % number + (body or b'null') + b'\nendobj\n'
+            offsets.append(size)
+            output.append(chunk)
+            size += len(chunk)
+
+        trailer = {'Size': len(self._objects) + 1, 'Root': _Merged(self._CATALOG)}
+        if self._info is not None:
+            trailer['Info'] = self._info
+        output.append(b'xref\n0 %d\n0000000000 65535 f \n' % (len(self._objects) + 1))
+        output.extend(b'%010d 00000 n \n' % offset for offset in offsets)
+        output.append(b'trailer\n' + serialize(trailer) + b'\nstartxref\n%d\n%%%%EOF\n' % size)
+        return b''.join(output)
+
+    def _allocate(self) -> int:
+        """Reserve an object number."""
+        self._objects.append(None)
+        return len(self._objects)
+
+    def _set(self, number: int, value: Any):
+        """Store an object's serialized body."""
+        self._objects[number - 1] = serialize(value)
+
+    def _add(self, value: Any) -> int:
+        """Add a new object; returns its number."""
+        number = self._allocate()
+        self._set(number, value)
+        return number
+
+    def _collect_pages(self, reader: _Reader, node: Any, inherited: Dict[str, Any],
+                       mapping: Dict[int, Any]) -> List[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+        """Walk a page tree; returns (old number, page, inherited attributes) in order."""
+        pages = []
+        stack = [(node, inherited)]
+        while stack:
+            reference, inherited = stack.pop()
+            node = reader.resolve(reference)
+            if not isinstance(reference, Ref) or not isinstance(node, dict):
+                raise _error("malformed page tree")
+            if node.get('Type') == 'Pages':
+                mapping[reference.number] = _Merged(self._PAGES)
+                inherited = dict(inherited, **{key: node[key] for key in _INHERITED if key in node})
+                stack.extend((kid, inherited) for kid in reversed(node.get('Kids', [])))
+            else:
+                mapping[reference.number] = _Merged(self._allocate())
+                pages.append((reference.number, node, inherited))
+        return pages
+
+    def _stamp(self, reader: _Reader, page: Dict[str, Any]):
+        """Draw the page stamp over a page's content."""
+        contents = page.get('Contents')
+        contents = list(contents) if isinstance(contents, list) else [contents] if contents else []
+        if self._save_state is None:
+            self._save_state = self._add(Stream({}, b'q'))
+        after = self._add(Stream({}, b'Q q ' + self.page_stamp(self.page_count) + b' Q'))
+        page['Contents'] = [_Merged(self._save_state)] + contents + [_Merged(after)]
+
+        resources = dict(reader.resolve(page.get('Resources')) or {})
+        fonts = dict(reader.resolve(resources.get('Font')) or {})
+        fonts[STAMP_FONT] = _Merged(self._STAMP_FONT)
+        resources['Font'] = fonts
+        page['Resources'] = resources
+
+    def _add_outline(self, outline: Sequence[Tuple[int, str, int]]) -> int:
+        """Write outline items; returns the outline dictionary's object number."""
+        root_number = self._allocate()
+        # Each open item: [number, fields, children]
+        root = [root_number, {'Type': Name('Outlines')}, []]
+        path = [root]
+        for level, title, page in outline:
+            del path[level + 1:]
+            parent = path[-1]
+            item = [self._allocate(), {
+                'Title': text_string(title),
+                'Parent': Ref(parent[0]),
+                'Dest': [self._pages[min(max(page, 1), len(self._pages)) - 1], Name('Fit')],
+            }, []]
+            parent[2].append(item)
+            path.append(item)
+
+        def write(node) -> int:
+            number, fields, children = node
+            count = 0
+            for index, child in enumerate(children):
+                if index:
+                    child[1]['Prev'] = Ref(children[index - 1][0])
+                if index + 1 < len(children):
+                    child[1]['Next'] = Ref(children[index + 1][0])
+                count += 1 + write(child)
+            if children:
+                fields['First'] = Ref(children[0][0])
+                fields['Last'] = Ref(children[-1][0])
+                fields['Count'] = count
+            self._set(number, fields)
+            return count
+
+        write(root)
+        return root_number
@@ -31,8 +31,28 @@ except ImportError:
 
 from ..parser.ast_builder import ASTNode, NodeType
 from ..router.content_router import FormatGenerator, OutputFormat
-from ..errors import ConversionError, FileError
+from ..errors import ConversionError, FileError, CancellationError
 from ..styling.style import StylePreset, get_style_preset
+from ..profiling import profile_stage
+from ..cancellation import check_cancelled, run_process
+from ..progress import get_progress
+from .pptx_streaming import StreamingPptxWriter, check_streaming_support
+from .fragment_cache import FragmentCache, Signature, file_signature
+from .pptx_fragments import FRAGMENT_OPTIONS, capture_slide, splice_slide
+
+# Values of the powerpoint_backend option
+POWERPOINT_BACKENDS = ('pptx', 'streaming')
+
+
+class _SlidePlan:
+    """A slide to render: the method that creates it and the content added to it."""
+
+    __slots__ = ('create', 'heading', 'steps')
+
+    def __init__(self, create, heading: Optional[ASTNode]):
+        self.create = create
+        self.heading = heading
+        self.steps: List[Tuple[Any, ASTNode]] = []
 
 
 class PowerPointGenerator(FormatGenerator):
@@ -55,6 +75,13 @@ class PowerPointGenerator(FormatGenerator):
         self.slide_width = Inches(10)
         self.slide_height = Inches(7.5)
         self._temp_dir: Optional[tempfile.TemporaryDirectory] = None  # Keep temp dir alive during generation
+        self._slide_writer: Optional[StreamingPptxWriter] = None  # Streaming backend only
+        # Rendered slides, reused while their content is unchanged
+        self.fragment_cache = FragmentCache()
+        self._slide_plans: List[_SlidePlan] = []
+        # Images used by the slide being rendered, and whether it can be cached
+        self._slide_images: Dict[str, Signature] = {}
+        self._slide_cacheable = True
         
         # Patterns for inline markdown parsing
         self.bold_pattern = re.compile(r'\*\*([^*]+)\*\*|__([^_]+)__')
@@ -68,7 +95,10 @@ class PowerPointGenerator(FormatGenerator):
         
         Args:
             ast: Root AST node
-            options: Generation options
+            options: Generation options. ``powerpoint_backend`` selects how
+                the deck is written: 'pptx' (default) keeps every slide in
+                memory until saving; 'streaming' writes each slide out as
+                soon as it is complete, for very large decks
             
         Returns:
             Generated PowerPoint presentation as bytes
@@ -76,6 +106,16 @@ class PowerPointGenerator(FormatGenerator):
         Raises:
             ConversionError: If generation fails
         """
+        backend = options.get('powerpoint_backend', 'pptx')
+        if backend not in POWERPOINT_BACKENDS:
+            raise ConversionError(
+                f"Unknown PowerPoint backend '{backend}' (use one of: {', '.join(POWERPOINT_BACKENDS)})",
+                format="powerpoint",
+                stage="generation"
+            )
+        if backend == 'streaming' and PPTX_AVAILABLE:
+            check_streaming_support()
+        
         # Create temporary directory for Mermaid images (kept alive during generation)
         self._temp_dir = tempfile.TemporaryDirectory()
         
@@ -84,6 +124,9 @@ class PowerPointGenerator(FormatGenerator):
             self.presentation = Presentation()
             self.presentation.slide_width = self.slide_width
             self.presentation.slide_height = self.slide_height
+            self.current_slide = None
+            if backend == 'streaming':
+                self._slide_writer = StreamingPptxWriter(self.presentation)
             
             # Get style preset
             style_name = options.get('style', 'default')
@@ -92,14 +135,24 @@ class PowerPointGenerator(FormatGenerator):
             # Set presentation metadata
             self._set_presentation_metadata(ast, options)
             
-            # Process AST nodes
+            # Lay out the slides, then render (or reuse) each one
+            self._slide_plans = []
             self._process_node(ast, options)
+            self._render_slides(options)
+            
+            if self._slide_writer is not None:
+                if self.current_slide is not None:
+                    self._slide_writer.write_slide(self.current_slide)
+                return self._slide_writer.finish()
             
             # Save to bytes
             output = BytesIO()
             self.presentation.save(output)
             return output.getvalue()
         
+        except CancellationError:
+            raise
+        
         except Exception as e:
             raise ConversionError(
                 f"Failed to generate PowerPoint presentation: {str(e)}",
@@ -111,6 +164,10 @@ class PowerPointGenerator(FormatGenerator):
             if self._temp_dir:
                 self._temp_dir.cleanup()
                 self._temp_dir = None
+            if self._slide_writer is not None:
+                self._slide_writer.close()
+                self._slide_writer = None
+            self._slide_plans = []
     
     def get_file_extension(self) -> str:
         """Get file extension for PowerPoint format."""
@@ -135,7 +192,7 @@ class PowerPointGenerator(FormatGenerator):
     
     def _process_node(self, node: ASTNode, options: Dict[str, Any]):
         """
-        Process AST node and add to presentation.
+        Lay out an AST node on the presentation's slides.
         
         Args:
             node: AST node to process
@@ -155,22 +212,22 @@ class PowerPointGenerator(FormatGenerator):
             self._process_heading(node, options)
         
         elif node.node_type == NodeType.PARAGRAPH:
-            self._add_paragraph_to_slide(node, options)
+            self._plan_content(self._add_paragraph_to_slide, node)
         
         elif node.node_type == NodeType.LIST:
-            self._add_list_to_slide(node, options)
+            self._plan_content(self._add_list_to_slide, node)
         
         elif node.node_type == NodeType.TABLE:
-            self._add_table_to_slide(node, options)
+            self._plan_content(self._add_table_to_slide, node)
         
         elif node.node_type == NodeType.CODE_BLOCK:
-            self._add_code_block_to_slide(node, options)
+            self._plan_content(self._add_code_block_to_slide, node)
         
         elif node.node_type == NodeType.BLOCKQUOTE:
-            self._add_blockquote_to_slide(node, options)
+            self._plan_content(self._add_blockquote_to_slide, node)
         
         elif node.node_type == NodeType.IMAGE:
-            self._add_image_to_slide(node, options)
+            self._plan_content(self._add_image_to_slide, node)
         
         # Process children recursively (but not for SECTION nodes - they handle their own children)
         # Also skip already-processed content nodes
@@ -194,13 +251,13 @@ class PowerPointGenerator(FormatGenerator):
         
         if level == 1:
             # H1 section - create title slide
-            self._create_title_slide(heading, options)
+            self._plan_slide(self._create_title_slide, heading)
         elif level == 2:
             # H2 section - create section header slide
-            self._create_section_slide(heading, options)
+            self._plan_slide(self._create_section_slide, heading)
         else:
             # H3+ section - may create content slide or add to current slide
-            self._create_content_slide(heading, options)
+            self._plan_slide(self._create_content_slide, heading)
         
         # Process section content (excluding heading and nested sections)
         # Nested sections will be processed separately to create their own slides
@@ -227,22 +284,99 @@ class PowerPointGenerator(FormatGenerator):
         level = node.level or 1
         
         if level == 1:
-            self._create_title_slide(node, options)
+            self._plan_slide(self._create_title_slide, node)
         elif level == 2:
-            self._create_section_slide(node, options)
+            self._plan_slide(self._create_section_slide, node)
         else:
             # H3+ - add as slide title or content header
-            if not self.current_slide:
-                self._create_content_slide(node, options)
+            if not self._slide_plans:
+                self._plan_slide(self._create_content_slide, node)
             else:
                 # Add as subsection header in current slide
-                self._add_subsection_header(node, options)
+                self._slide_plans[-1].steps.append((self._add_subsection_header, node))
+    
+    def _plan_slide(self, create, heading: Optional[ASTNode]):
+        """Start laying out a new slide."""
+        self._slide_plans.append(_SlidePlan(create, heading))
+    
+    def _plan_content(self, add, node: ASTNode):
+        """Lay out a content node on the current slide, starting one if needed."""
+        if not self._slide_plans:
+            self._plan_slide(self._create_content_slide, None)
+        self._slide_plans[-1].steps.append((add, node))
+    
+    def _render_slides(self, options: Dict[str, Any]):
+        """
+        Render the laid out slides, reusing cached slides that are unchanged.
+        
+        Slides are cached by the content they are built from, the style
+        preset, the slide dimensions and the options that affect
+        rendering; see pptx_fragments.
+        """
+        preset_key = repr(self.current_style_preset)
+        option_key = repr([options.get(name) for name in FRAGMENT_OPTIONS])
+        progress = get_progress(options)
+        if progress is not None:
+            progress.set_total(len(self._slide_plans), 'slides')
+        for number, plan in enumerate(self._slide_plans, 1):
+            check_cancelled(options, "powerpoint")
+            key = (self._slide_content_hash(plan), preset_key,
+                   int(self.slide_width), int(self.slide_height), option_key)
+            self._render_slide(plan, key, options)
+            if progress is not None:
+                progress.advance(produced=number)
+    
+    def _render_slide(self, plan: _SlidePlan, key: Tuple, options: Dict[str, Any]):
+        """Render one laid out slide, or splice it from the cache."""
+        # The streaming backend keeps one slide in memory at a time, so
+        # its slides are not cached
+        use_cache = self._slide_writer is None
+        fragment = self.fragment_cache.get(key) if use_cache else None
+        if fragment is not None:
+            slide = self._add_slide(self.presentation.slide_layouts[fragment.layout])
+            self.current_slide = splice_slide(slide, fragment)
+            return
+        
+        self._slide_images = {}
+        self._slide_cacheable = True
+        plan.create(plan.heading, options)
+        for add, node in plan.steps:
+            if add == self._add_image_to_slide:
+                with profile_stage(options, "image"):
+                    add(node, options)
+            else:
+                add(node, options)
+        if use_cache and self._slide_cacheable:
+            layout = self.presentation.slide_layouts.index(self.current_slide.slide_layout)
+            fragment = capture_slide(self.current_slide, layout, self._slide_images)
+            if fragment is not None:
+                self.fragment_cache.put(key, fragment)
+    
+    @staticmethod
+    def _slide_content_hash(plan: _SlidePlan) -> str:
+        """Hash the AST content a slide is built from."""
+        parts = [plan.create.__name__, plan.heading and (plan.heading.content, plan.heading.level)]
+        for add, node in plan.steps:
+            # Headings only contribute their own text; nested content is laid out separately
+            if node.node_type == NodeType.HEADING:
+                parts.append((add.__name__, node.content, node.level))
+            else:
+                parts.append((add.__name__, node.structural_hash()))
+        return hashlib.blake2b(repr(parts).encode('utf-8', 'surrogatepass'),
+                               digest_size=16).hexdigest()
+    
+    def _add_slide(self, layout):
+        """Add a slide and make it current, writing out the finished one when streaming."""
+        if self._slide_writer is not None and self.current_slide is not None:
+            self._slide_writer.write_slide(self.current_slide)
+        slide = self.presentation.slides.add_slide(layout)
+        self.current_slide = slide
+        return slide
     
     def _create_title_slide(self, heading: Optional[ASTNode], options: Dict[str, Any]):
         """Create title slide from H1 heading."""
         layout = self.presentation.slide_layouts[0]  # Title slide layout
-        slide = self.presentation.slides.add_slide(layout)
-        self.current_slide = slide
+        slide = self._add_slide(layout)
         
         title = slide.shapes.title
         subtitle = slide.placeholders[1] if len(slide.placeholders) > 1 else None
@@ -262,8 +396,7 @@ class PowerPointGenerator(FormatGenerator):
     def _create_section_slide(self, heading: Optional[ASTNode], options: Dict[str, Any]):
         """Create section header slide from H2 heading."""
         layout = self.presentation.slide_layouts[1]  # Title and Content layout
-        slide = self.presentation.slides.add_slide(layout)
-        self.current_slide = slide
+        slide = self._add_slide(layout)
         
         title = slide.shapes.title
         if heading:
@@ -274,8 +407,7 @@ class PowerPointGenerator(FormatGenerator):
     def _create_content_slide(self, heading: Optional[ASTNode], options: Dict[str, Any]):
         """Create content slide."""
         layout = self.presentation.slide_layouts[1]  # Title and Content layout
-        slide = self.presentation.slides.add_slide(layout)
-        self.current_slide = slide
+        slide = self._add_slide(layout)
         
         title = slide.shapes.title
         if heading:
@@ -584,11 +716,14 @@ class PowerPointGenerator(FormatGenerator):
         
         if is_mermaid:
             # Try to render Mermaid diagram as image
-            image_path = self._render_mermaid_diagram(content, options)
+            with profile_stage(options, "mermaid"):
+                image_path = self._render_mermaid_diagram(content, options)
             if image_path and image_path.exists():
                 # Add as image
                 self._add_mermaid_image_to_slide(image_path, options)
                 return
+            # Rendered as code; a renderer may be available next time
+            self._slide_cacheable = False
         
         # Check if there's existing text content on the slide
         has_text_content = self._slide_has_text_content()
@@ -645,7 +780,13 @@ class PowerPointGenerator(FormatGenerator):
         
         Returns:
             Path to rendered image file, or None if rendering failed
+            
+        Raises:
+            CancellationError: If the conversion was cancelled (renderer
+                processes are killed)
         """
+        check_cancelled(options, "mermaid")
+        
         # Try multiple rendering methods
         # Method 1: Try mermaid-cli (mmdc) if available
         image_path = self._render_with_mermaid_cli(mermaid_code, options)
@@ -664,11 +805,7 @@ class PowerPointGenerator(FormatGenerator):
         """Render Mermaid diagram using mermaid-cli (mmdc)."""
         try:
             # Check if mmdc is available
-            result = subprocess.run(
-                ['mmdc', '--version'],
-                capture_output=True,
-                timeout=5
-            )
+            result = run_process(['mmdc', '--version'], options, timeout=5)
             if result.returncode != 0:
                 return None
         except (FileNotFoundError, subprocess.TimeoutExpired):
@@ -690,7 +827,7 @@ class PowerPointGenerator(FormatGenerator):
         
         # Render diagram
         try:
-            result = subprocess.run(
+            result = run_process(
                 [
                     'mmdc',
                     '-i', str(input_file),
@@ -699,7 +836,7 @@ class PowerPointGenerator(FormatGenerator):
                     '-H', '800',
                     '-b', 'transparent'
                 ],
-                capture_output=True,
+                options,
                 timeout=30,
                 check=True
             )
@@ -721,6 +858,9 @@ class PowerPointGenerator(FormatGenerator):
         if not self._temp_dir:
             return None
         
+        # The browser cannot be stopped from another thread; check before launching it
+        check_cancelled(options, "mermaid")
+        
         try:
             temp_dir_path = Path(self._temp_dir.name)
             
@@ -841,6 +981,7 @@ class PowerPointGenerator(FormatGenerator):
         if not image_path.is_absolute():
             base_path = options.get('base_path', '.')
             image_path = Path(base_path) / image_path
+        self._slide_images[str(image_path)] = file_signature(str(image_path))
         
         if not image_path.exists():
             if options.get('skip_missing_images', False):
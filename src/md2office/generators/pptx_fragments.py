@@ -0,0 +1,126 @@
+"""
+PowerPoint Slide Fragments
+
+Slide XML rendered for each slide of a deck, cached (see fragment_cache)
+by a hash of the AST content that produced the slide, the style preset,
+the slide dimensions and the options that affect rendering.
+Regenerating a deck after a small edit splices the cached XML of
+unchanged slides and renders only the changed ones, including slides
+with rendered Mermaid diagrams.
+
+Media referenced by a fragment are stored with it and re-added to the
+target deck on splice.
+"""
+
+import re
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+try:
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.opc.oxml import serialize_part_xml
+    from pptx.oxml import parse_xml
+    PPTX_AVAILABLE = True
+except ImportError:
+    PPTX_AVAILABLE = False
+
+from .fragment_cache import Signature, file_signature
+
+# Generation options that change the rendered XML of a slide
+FRAGMENT_OPTIONS = ('subtitle', 'skip_missing_images', 'base_path')
+
+# Relationship references in slide XML (python-pptx always uses the r prefix)
+_RELATIONSHIP_REFERENCE = re.compile(rb'( r:(?:embed|id|link)=")([^"]+)(")')
+
+
+@dataclass
+class SlideFragment:
+    """
+    Rendered XML of one slide.
+
+    Attributes:
+        xml: Serialized slide part
+        layout: Index of the slide's layout in the deck
+        relationships: Referenced relationship ID to (relationship type,
+            external target or None, image bytes or None)
+        images: Image path to the file signature seen when rendering
+    """
+    xml: bytes
+    layout: int
+    relationships: Dict[str, Tuple[str, Optional[str], Optional[bytes]]] = field(default_factory=dict)
+    images: Dict[str, Signature] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by the fragment."""
+        return len(self.xml) + sum(len(blob or b'') for _, _, blob in self.relationships.values())
+
+    def is_current(self) -> bool:
+        """Check that no image the slide uses changed since rendering."""
+        return all(file_signature(path) == signature for path, signature in self.images.items())
+
+
+def capture_slide(slide, layout: int, images: Dict[str, Signature]) -> Optional[SlideFragment]:
+    """
+    Capture a finished slide as a fragment.
+
+    Args:
+        slide: python-pptx Slide, before it is written out
+        layout: Index of the slide's layout in the deck
+        images: Image files the slide was rendered from
+
+    Returns:
+        Fragment, or None if the slide references a relationship that
+        cannot be re-created elsewhere
+    """
+    part = slide.part
+    xml = serialize_part_xml(part._element)
+    relationships = {}
+    for match in _RELATIONSHIP_REFERENCE.finditer(xml):
+        rel_id = match.group(2).decode()
+        if rel_id in relationships:
+            continue
+        rel = part.rels.get(rel_id)
+        if rel is None:
+            continue
+        if rel.is_external:
+            relationships[rel_id] = (rel.reltype, rel.target_ref, None)
+        elif rel.reltype == RT.IMAGE and rel.target_part.blob:
+            relationships[rel_id] = (rel.reltype, None, rel.target_part.blob)
+        else:
+            # Includes media already written out by the streaming backend
+            return None
+    return SlideFragment(xml, layout, relationships, dict(images))
+
+
+def splice_slide(slide, fragment: SlideFragment):
+    """
+    Replace the content of a new slide with a cached fragment.
+
+    Args:
+        slide: python-pptx Slide just added with the fragment's layout
+        fragment: Cached fragment
+
+    Returns:
+        Slide proxy for the spliced content
+    """
+    part = slide.part
+    rel_ids = {}
+    for old_id, (reltype, target, blob) in fragment.relationships.items():
+        if blob is None:
+            rel_ids[old_id] = part.relate_to(target, reltype, is_external=True)
+        else:
+            _, rel_ids[old_id] = part.get_or_add_image_part(BytesIO(blob))
+
+    xml = fragment.xml
+    if rel_ids:
+        xml = _RELATIONSHIP_REFERENCE.sub(
+            lambda match: match.group(1) + rel_ids.get(match.group(2).decode(),
+                                                      match.group(2).decode()).encode()
+            + match.group(3),
+            xml
+        )
+    part._element = parse_xml(xml)
+    part.__dict__.pop('slide', None)  # Cached Slide proxy of the old tree
+    return part.slide
@@ -0,0 +1,220 @@
+"""
+Streaming PowerPoint Writer
+
+Memory-bounded alternative to ``Presentation.save`` for very large
+decks. Each finished slide's XML part, its relationships and any new
+media are written to a staging archive as soon as the slide is
+complete, and the in-memory slide tree and image bytes are released.
+The presentation part, content types and remaining relationships are
+written when the deck is finished.
+
+The writer relies on python-pptx internals outside its public API, so it
+is only enabled for the release series it has been checked against (see
+``check_streaming_support``).
+"""
+
+import re
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+from typing import BinaryIO, Optional, Set
+
+try:
+    import pptx
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.opc.oxml import serialize_part_xml
+    from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+    from pptx.opc.package import XmlPart
+    from pptx.oxml import parse_xml
+    from pptx.parts.image import ImagePart
+    PPTX_AVAILABLE = True
+except ImportError:
+    PPTX_AVAILABLE = False
+
+try:
+    from pptx.opc.serialized import _ContentTypesItem
+except ImportError:
+    _ContentTypesItem = None
+
+from ..errors import ConversionError
+
+# Newest python-pptx release series (major, minor) the writer has been
+# checked against; newer releases may have changed the internals it uses
+MAX_PPTX_VERSION = (1, 0)
+
+# Slide XML left behind once a slide has been written out
+_EMPTY_SLIDE = (
+    b'<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    b'<p:cSld><p:spTree/></p:cSld></p:sld>'
+)
+
+
+if PPTX_AVAILABLE:
+    class _StreamedImagePart(ImagePart):
+        """Image part already written out; keeps its hash and size for reuse."""
+
+        @property
+        def _px_size(self):
+            return self._streamed_px_size
+
+        @property
+        def _dpi(self):
+            return self._streamed_dpi
+
+
+def check_streaming_support():
+    """
+    Check that the installed python-pptx can be used by the streaming writer.
+
+    Besides ``_ContentTypesItem``, the writer replaces ``XmlPart._element``,
+    reads ``_rels`` and swaps the class and ``_blob`` of written image
+    parts (whose ``_px_size`` and ``_dpi`` it keeps).
+
+    Raises:
+        ConversionError: If python-pptx is newer than MAX_PPTX_VERSION or
+            lacks one of those internals
+    """
+    version = pptx.__version__
+    release = tuple(int(number) for number in re.findall(r'\d+', version)[:2])
+    missing = [name for owner, name in (
+        (_ContentTypesItem, 'xml_for'), (XmlPart, '_rels'),
+        (ImagePart, '_px_size'), (ImagePart, '_dpi'),
+    ) if owner is None or not hasattr(owner, name)]
+    if release > MAX_PPTX_VERSION or missing:
+        supported = '.'.join(map(str, MAX_PPTX_VERSION))
+        raise ConversionError(
+            f"The streaming PowerPoint backend does not support python-pptx {version} "
+            f"(supported up to {supported}.x); use the 'pptx' backend instead",
+            format="powerpoint",
+            stage="generation"
+        )
+
+
+class StreamingPptxWriter:
+    """
+    Writes the slides of a python-pptx Presentation incrementally.
+
+    Usage::
+
+        writer = StreamingPptxWriter(presentation)
+        ...build a slide...
+        writer.write_slide(slide)   # once the slide is complete
+        data = writer.finish()      # complete .pptx bytes
+    """
+
+    def __init__(self, presentation):
+        """
+        Initialize streaming writer.
+
+        Args:
+            presentation: python-pptx Presentation whose slides are streamed
+
+        Raises:
+            ConversionError: If the installed python-pptx is not supported
+        """
+        if not PPTX_AVAILABLE:
+            raise ImportError(
+                "python-pptx is required for PowerPoint generation. "
+                "Install with: pip install python-pptx"
+            )
+        check_streaming_support()
+        self.presentation = presentation
+        self.package = presentation.part.package
+        self.slides_written = 0
+        self._written: Set[str] = set()
+        self._spool: Optional[BinaryIO] = tempfile.TemporaryFile()
+        # Staged parts are stored uncompressed; the final package compresses them
+        self._staging: Optional[zipfile.ZipFile] = zipfile.ZipFile(
+            self._spool, 'w', zipfile.ZIP_STORED
+        )
+
+    def write_slide(self, slide):
+        """
+        Write a finished slide and its new media, then release them.
+
+        Args:
+            slide: python-pptx Slide that will not be modified again
+        """
+        part = slide.part
+        if part.partname in self._written:
+            return
+
+        for rel in part.rels.values():
+            if rel.is_external or rel.reltype != RT.IMAGE:
+                continue
+            image_part = rel.target_part
+            if image_part.partname not in self._written:
+                self._stage(image_part.partname, image_part.blob)
+                self._release_image(image_part)
+
+        self._stage(part.partname, serialize_part_xml(part._element))
+        if part._rels:
+            self._stage(part.partname.rels_uri, part.rels.xml)
+
+        part._element = parse_xml(_EMPTY_SLIDE)
+        part.__dict__.pop('slide', None)  # Cached Slide proxy of the old tree
+        self.slides_written += 1
+
+    def finish(self, output: Optional[BinaryIO] = None) -> Optional[bytes]:
+        """
+        Write the complete package.
+
+        Args:
+            output: Binary file to write to (bytes are returned if omitted)
+
+        Returns:
+            Presentation bytes, or None if ``output`` was given
+        """
+        parts = list(self.package.iter_parts())
+        self._staging.close()
+        self._spool.seek(0)
+
+        target = output if output is not None else BytesIO()
+        with zipfile.ZipFile(self._spool) as staged, \
+                zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as destination:
+            destination.writestr(CONTENT_TYPES_URI.membername,
+                                 serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+            destination.writestr(PACKAGE_URI.rels_uri.membername, self.package._rels.xml)
+
+            for part in parts:
+                if part.partname not in self._written:
+                    destination.writestr(part.partname.membername, part.blob)
+                    if part._rels:
+                        destination.writestr(part.partname.rels_uri.membername, part.rels.xml)
+                    continue
+                names = [part.partname.membername]
+                if part.partname.rels_uri in self._written:
+                    names.append(part.partname.rels_uri.membername)
+                for name in names:
+                    with staged.open(name) as source, destination.open(name, 'w') as stream:
+                        shutil.copyfileobj(source, stream)
+
+        self.close()
+        if output is None:
+            return target.getvalue()
+        return None
+
+    def close(self):
+        """Discard staged parts."""
+        if self._staging is not None:
+            self._staging.close()
+            self._staging = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    def _stage(self, partname, blob: bytes):
+        """Write a part (or rels item) to the staging archive."""
+        self._staging.writestr(partname.membername, blob)
+        self._written.add(partname)
+
+    @staticmethod
+    def _release_image(image_part):
+        """Drop image bytes, keeping what python-pptx needs to reuse the part."""
+        image_part.sha1  # Cached on first access
+        px_size, dpi = image_part._px_size, image_part._dpi
+        image_part.__class__ = _StreamedImagePart
+        image_part._streamed_px_size = px_size
+        image_part._streamed_dpi = dpi
+        image_part._blob = b''
@@ -0,0 +1,210 @@
+"""
+Generator Registry
+
+Lazy registry mapping output format names to generator import paths.
+Generators (and their heavy dependencies such as python-docx, python-pptx
+and ReportLab) are only imported and constructed when a format is
+actually requested.
+"""
+
+import importlib
+import threading
+from typing import Dict, List, Optional
+
+# Entry point group third-party packages can use to provide generators
+ENTRY_POINT_GROUP = 'md2office.generators'
+
+# Built-in generators as "module:attribute" import paths
+BUILTIN_GENERATORS: Dict[str, str] = {
+    'word': 'md2office.generators.word_generator:WordGenerator',
+    'powerpoint': 'md2office.generators.powerpoint_generator:PowerPointGenerator',
+    'pdf': 'md2office.generators.pdf_generator:PDFGenerator',
+    'html': 'md2office.generators.html_generator:HTMLGenerator',
+}
+
+# Output file extensions of the built-in formats
+OUTPUT_EXTENSIONS: Dict[str, str] = {
+    'word': '.docx',
+    'powerpoint': '.pptx',
+    'pdf': '.pdf',
+    'html': '.html',
+}
+
+
+def get_output_extension(format_name: str) -> str:
+    """
+    Get the output file extension for a format.
+
+    Args:
+        format_name: Format name
+
+    Returns:
+        Extension including the dot (``.<format>`` for other formats)
+    """
+    format_name = format_name.lower()
+    return OUTPUT_EXTENSIONS.get(format_name, f'.{format_name}')
+
+
+class GeneratorRegistry:
+    """
+    Registry of format generators resolved on first use.
+
+    Maps format names to "module:attribute" import paths. The generator
+    class is imported and instantiated the first time its format is
+    requested; the instance is then cached and reused.
+    """
+
+    def __init__(self, import_paths: Optional[Dict[str, str]] = None,
+                 use_entry_points: bool = True):
+        """
+        Initialize generator registry.
+
+        Args:
+            import_paths: Format name to import path mapping
+                (defaults to the built-in generators)
+            use_entry_points: Discover additional generators from the
+                ``md2office.generators`` entry point group
+        """
+        if import_paths is None:
+            import_paths = BUILTIN_GENERATORS
+        self._import_paths: Dict[str, str] = dict(import_paths)
+        self._instances: Dict[str, object] = {}
+        self._use_entry_points = use_entry_points
+        self._entry_points_loaded = False
+        self._lock = threading.RLock()
+
+    def register(self, format_name: str, import_path: str):
+        """
+        Register (or override) the import path for a format.
+
+        Args:
+            format_name: Format name ('word', 'powerpoint', 'pdf', 'html')
+            import_path: Import path in "module:attribute" form
+        """
+        with self._lock:
+            self._import_paths[format_name.lower()] = import_path
+            self._instances.pop(format_name.lower(), None)
+
+    def get_import_path(self, format_name: str) -> Optional[str]:
+        """Get the import path registered for a format."""
+        format_name = format_name.lower()
+        if format_name not in self._import_paths:
+            self._load_entry_points()
+        return self._import_paths.get(format_name)
+
+    def get_formats(self) -> List[str]:
+        """Get list of format names known to the registry."""
+        self._load_entry_points()
+        return list(self._import_paths.keys())
+
+    def is_loaded(self, format_name: str) -> bool:
+        """Check whether a generator instance has already been created."""
+        return format_name.lower() in self._instances
+
+    def load_class(self, format_name: str):
+        """
+        Import and return the generator class for a format.
+
+        Args:
+            format_name: Format name
+
+        Returns:
+            Generator class
+
+        Raises:
+            KeyError: If no generator is registered for the format
+            ImportError: If the generator or its dependencies cannot be imported
+        """
+        import_path = self.get_import_path(format_name)
+        if import_path is None:
+            raise KeyError(f"No generator registered for format: {format_name}")
+
+        module_name, _, attribute = import_path.partition(':')
+        module = importlib.import_module(module_name)
+        generator_class = getattr(module, attribute, None) if attribute else module
+        if generator_class is None:
+            raise ImportError(f"Generator '{import_path}' could not be found")
+        return generator_class
+
+    def get(self, format_name: str):
+        """
+        Get generator instance for a format, creating it on first use.
+
+        Args:
+            format_name: Format name
+
+        Returns:
+            Generator instance
+
+        Raises:
+            KeyError: If no generator is registered for the format
+            ImportError: If the generator or its dependencies are not installed
+        """
+        format_name = format_name.lower()
+        with self._lock:
+            if format_name not in self._instances:
+                generator_class = self.load_class(format_name)
+                self._instances[format_name] = generator_class()
+            return self._instances[format_name]
+
+    def preload(self, formats: Optional[List[str]] = None) -> List[str]:
+        """
+        Eagerly create generators, e.g. for long-running processes.
+
+        Args:
+            formats: Formats to load (defaults to all registered formats)
+
+        Returns:
+            List of formats that were loaded successfully
+        """
+        loaded = []
+        for format_name in formats or self.get_formats():
+            try:
+                self.get(format_name)
+                loaded.append(format_name)
+            except (KeyError, ImportError):
+                pass  # Dependency not installed
+        return loaded
+
+    def _load_entry_points(self):
+        """Discover generators published through entry points (once)."""
+        if not self._use_entry_points or self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+
+        try:
+            all_entry_points = entry_points()
+            if hasattr(all_entry_points, 'select'):
+                group = all_entry_points.select(group=ENTRY_POINT_GROUP)
+            else:
+                # Python < 3.10 returns a dict of groups
+                group = all_entry_points.get(ENTRY_POINT_GROUP, [])
+        except Exception:
+            return
+
+        with self._lock:
+            for entry_point in group:
+                # Built-in and explicitly registered formats take precedence
+                self._import_paths.setdefault(entry_point.name.lower(), entry_point.value)
+
+
+# Global registry instance shared by CLI and GUI
+_default_registry: Optional[GeneratorRegistry] = None
+
+
+def get_default_registry() -> GeneratorRegistry:
+    """
+    Get the process-wide generator registry.
+
+    Returns:
+        Shared GeneratorRegistry instance
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = GeneratorRegistry()
+    return _default_registry
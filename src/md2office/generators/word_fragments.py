@@ -0,0 +1,167 @@
+"""
+Word Section Fragments
+
+Body XML rendered for each SECTION of a document, cached (see
+fragment_cache) by the section's structural hash, the style preset and
+the options that affect rendering. Regenerating a document after a small
+edit splices the cached XML of unchanged sections and renders only the
+changed ones.
+
+Fragments are stored in the same serialized form the streaming writer
+uses. Relationships referenced by a fragment (images, hyperlinks) are
+stored with it and re-created in the target document on splice.
+"""
+
+import re
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.oxml.parser import parse_xml
+    from docx.oxml.ns import qn
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+from .fragment_cache import Signature, file_signature
+
+# Generation options that change the rendered body XML of a section
+FRAGMENT_OPTIONS = ('bookmarks', 'page_breaks', 'skip_missing_images', 'base_path', 'image_width')
+
+# Relationship references in body XML (python-docx always uses the r prefix)
+_RELATIONSHIP_REFERENCE = re.compile(rb'( r:(?:embed|id|link)=")([^"]+)(")')
+_DRAWING_ID = re.compile(rb'(<wp:docPr id=")(\d+)(")')
+
+
+@dataclass
+class WordFragment:
+    """
+    Rendered body XML of one section.
+
+    Attributes:
+        xml: Serialized body elements
+        relationships: Referenced relationship ID to (relationship type,
+            external target or None, image bytes or None)
+        images: Image path to the file signature seen when rendering
+    """
+    xml: bytes
+    relationships: Dict[str, Tuple[str, Optional[str], Optional[bytes]]] = field(default_factory=dict)
+    images: Dict[str, Signature] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by the fragment."""
+        return len(self.xml) + sum(len(blob or b'') for _, _, blob in self.relationships.values())
+
+    def is_current(self) -> bool:
+        """Check that no image the section uses changed since rendering."""
+        return all(file_signature(path) == signature for path, signature in self.images.items())
+
+
+def collect_relationships(part, xml: bytes
+                          ) -> Optional[Dict[str, Tuple[str, Optional[str], Optional[bytes]]]]:
+    """
+    Record the relationships referenced by rendered XML.
+
+    Args:
+        part: python-docx document part the XML was rendered into
+        xml: Serialized body elements
+
+    Returns:
+        Relationships to store with the fragment, or None if the XML
+        references a relationship that cannot be re-created elsewhere
+    """
+    relationships = {}
+    for match in _RELATIONSHIP_REFERENCE.finditer(xml):
+        rel_id = match.group(2).decode()
+        if rel_id in relationships:
+            continue
+        rel = part.rels.get(rel_id)
+        if rel is None:
+            continue
+        if rel.is_external:
+            relationships[rel_id] = (rel.reltype, rel.target_ref, None)
+        elif rel.reltype == RT.IMAGE:
+            relationships[rel_id] = (rel.reltype, None, rel.target_part.blob)
+        else:
+            return None
+    return relationships
+
+
+def relocate(part, fragment: WordFragment) -> bytes:
+    """
+    Re-create a fragment's relationships in a document part.
+
+    Args:
+        part: python-docx document part the fragment is spliced into
+        fragment: Cached fragment
+
+    Returns:
+        Fragment XML referencing the part's relationship and drawing IDs
+    """
+    if not fragment.relationships:
+        return fragment.xml
+
+    rel_ids = {}
+    for old_id, (reltype, target, blob) in fragment.relationships.items():
+        if blob is None:
+            rel_ids[old_id] = part.relate_to(target, reltype, is_external=True)
+        else:
+            rel_ids[old_id], _ = part.get_or_add_image(BytesIO(blob))
+
+    xml = _RELATIONSHIP_REFERENCE.sub(
+        lambda match: match.group(1) + rel_ids.get(match.group(2).decode(),
+                                                  match.group(2).decode()).encode()
+        + match.group(3),
+        fragment.xml
+    )
+    # Drawing IDs must be unique within the document
+    next_id = [part.next_id]
+
+    def renumber(match):
+        drawing_id = next_id[0]
+        next_id[0] += 1
+        return match.group(1) + str(drawing_id).encode() + match.group(3)
+
+    return _DRAWING_ID.sub(renumber, xml)
+
+
+def parse_fragment(xml: bytes, namespaces: Dict[bytes, bytes]) -> List:
+    """
+    Parse fragment XML into body elements.
+
+    Args:
+        xml: Serialized body elements
+        namespaces: Root declarations the XML was serialized against
+
+    Returns:
+        Parsed elements, ready to be added to a document body
+    """
+    declarations = b' '.join(
+        b'xmlns:' + prefix + b'="' + uri + b'"' for prefix, uri in namespaces.items()
+    )
+    wrapper = parse_xml(b'<w:body ' + declarations + b'>' + xml + b'</w:body>')
+    # Rendered empty runs hold '' (written as <w:t></w:t>); parsing gives
+    # None, so restore it to keep spliced output identical
+    for text in wrapper.iter(qn('w:t')):
+        if text.text is None:
+            text.text = ''
+    return list(wrapper)
+
+
+def insert_body_elements(body, elements: Iterable):
+    """
+    Append elements to a document body, before its section properties.
+
+    Args:
+        body: python-docx body element
+        elements: Elements to add
+    """
+    section_properties = body.find(qn('w:sectPr'))
+    for element in elements:
+        if section_properties is not None:
+            section_properties.addprevious(element)
+        else:
+            body.append(element)
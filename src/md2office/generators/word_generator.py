@@ -5,7 +5,7 @@ Implements Epic 2: Word Document Conversion
 Generates Microsoft Word (.docx) documents from AST.
 """
 
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 from io import BytesIO
 from pathlib import Path
 
@@ -26,9 +26,32 @@ except ImportError:
 
 from ..parser.ast_builder import ASTNode, NodeType
 from ..router.content_router import FormatGenerator, OutputFormat
-from ..errors import ConversionError, FileError
+from ..errors import ConversionError, FileError, CancellationError
 from ..styling.style import StylePreset, get_style_preset
+from ..profiling import profile_stage
+from ..cancellation import check_cancelled
+from ..progress import get_progress
 from .inline_formatter import InlineFormatter
+from .word_streaming import StreamingDocxWriter, document_namespaces, serialize_body_element
+from .fragment_cache import FragmentCache, Signature, file_signature
+from .word_fragments import (
+    WordFragment, FRAGMENT_OPTIONS, collect_relationships, relocate, parse_fragment,
+    insert_body_elements
+)
+from .word_styles import (
+    WordStyleSheet, BODY_STYLE, CODE_STYLE, QUOTE_STYLE, STRONG_STYLE,
+    LIST_BULLET_STYLE, LIST_NUMBER_STYLE, CHARACTER_STYLES, heading_style_name
+)
+
+
+# Values of the word_backend option
+WORD_BACKENDS = ('docx', 'streaming')
+
+
+def _count_sections(node: ASTNode) -> int:
+    """Count a section and the sections nested in it."""
+    return 1 + sum(_count_sections(child) for child in node.children
+                   if child.node_type == NodeType.SECTION)
 
 
 class WordGenerator(FormatGenerator):
@@ -47,7 +70,17 @@ class WordGenerator(FormatGenerator):
             )
         self.document: Optional[Document] = None
         self.current_style_preset: Optional[StylePreset] = None
+        self.style_sheet: Optional[WordStyleSheet] = None
         self.inline_formatter = InlineFormatter()
+        # Compiled style sheets, keyed by preset contents
+        self._style_sheets: Dict[str, WordStyleSheet] = {}
+        # Streaming backend state (see word_backend option)
+        self._body_writer: Optional[StreamingDocxWriter] = None
+        # Rendered sections, reused while their content is unchanged
+        self.fragment_cache = FragmentCache()
+        self._preset_key: Optional[str] = None
+        # Images used by each section being rendered (innermost last)
+        self._section_images: List[Dict[str, Signature]] = []
     
     def generate(self, ast: ASTNode, options: Dict[str, Any]) -> bytes:
         """
@@ -55,14 +88,27 @@ class WordGenerator(FormatGenerator):
         
         Args:
             ast: Root AST node
-            options: Generation options
+            options: Generation options. ``word_backend`` selects how the
+                document is written: 'docx' (default) keeps the whole
+                document in memory until saving; 'streaming' writes each
+                top-level block out as soon as it is finished, for very
+                large documents
             
         Returns:
             Generated Word document as bytes
             
         Raises:
             ConversionError: If generation fails
+            CancellationError: If the conversion was cancelled
         """
+        backend = options.get('word_backend', 'docx')
+        if backend not in WORD_BACKENDS:
+            raise ConversionError(
+                f"Unknown Word backend '{backend}' (use one of: {', '.join(WORD_BACKENDS)})",
+                format="word",
+                stage="generation"
+            )
+        
         try:
             # Initialize document
             self.document = Document()
@@ -71,14 +117,22 @@ class WordGenerator(FormatGenerator):
             style_name = options.get('style', 'default')
             self.current_style_preset = get_style_preset(style_name)
             
+            # Install the preset as Word styles; content only references them
+            self._apply_style_sheet()
+            
             # Set document metadata
             self._set_document_metadata(ast, options)
             
+            if backend == 'streaming':
+                return self._generate_streaming(ast, options)
+            
             # Process AST nodes
             self._process_node(ast, options)
             
-            # Add table of contents if requested
+            # Add table of contents if requested (its heading goes first)
             if options.get('table_of_contents', False):
+                heading = self._add_table_of_contents_heading()
+                self.document.element.body.insert(0, heading._p)
                 self._add_table_of_contents()
             
             # Save to bytes
@@ -86,17 +140,60 @@ class WordGenerator(FormatGenerator):
             self.document.save(output)
             return output.getvalue()
         
+        except CancellationError:
+            raise
+        
         except Exception as e:
             raise ConversionError(
                 f"Failed to generate Word document: {str(e)}",
                 format="word",
                 stage="generation"
             ) from e
+        
+        finally:
+            if self._body_writer is not None:
+                self._body_writer.close()
+                self._body_writer = None
+    
+    def _generate_streaming(self, ast: ASTNode, options: Dict[str, Any]) -> bytes:
+        """Generate the document, writing blocks out as they finish."""
+        self._body_writer = StreamingDocxWriter(self.document)
+        
+        # Nothing can be inserted before written content, so the table of
+        # contents heading is written first; the rest follows as with 'docx'
+        table_of_contents = options.get('table_of_contents', False)
+        if table_of_contents:
+            self._add_table_of_contents_heading()
+        
+        self._process_node(ast, options)
+        
+        if table_of_contents:
+            self._add_table_of_contents()
+        return self._body_writer.finish()
     
     def get_file_extension(self) -> str:
         """Get file extension for Word format."""
         return ".docx"
     
+    def _apply_style_sheet(self):
+        """Compile the current style preset (once) and install it in the document."""
+        key = self._preset_key = repr(self.current_style_preset)
+        style_sheet = self._style_sheets.get(key)
+        if style_sheet is None:
+            style_sheet = WordStyleSheet(self.current_style_preset)
+            self._style_sheets[key] = style_sheet
+        style_sheet.apply(self.document)
+        self.style_sheet = style_sheet
+        self._character_styles = {
+            kind: style_sheet.style_id(name) for kind, name in CHARACTER_STYLES.items()
+        }
+    
+    def _add_styled_paragraph(self, style_name: str):
+        """Add an empty paragraph referencing a style from the style sheet."""
+        paragraph = self.document.add_paragraph()
+        paragraph._p.style = self.style_sheet.style_id(style_name)
+        return paragraph
+    
     def _set_document_metadata(self, ast: ASTNode, options: Dict[str, Any]):
         """Set document metadata (title, author, etc.)."""
         core_props = self.document.core_properties
@@ -130,23 +227,106 @@ class WordGenerator(FormatGenerator):
         """
         Process AST node and add to document.
         
+        With the streaming backend, finished blocks are written out after
+        each node, so only the block being built is held in memory.
+        
         Args:
             node: AST node to process
             options: Generation options
         """
+        if node.node_type == NodeType.SECTION:
+            check_cancelled(options, "word")
+            self._add_section(node, options)
+        else:
+            self._add_node(node, options)
+        if self._body_writer is not None:
+            self._body_writer.flush()
+    
+    def _add_section(self, node: ASTNode, options: Dict[str, Any]):
+        """
+        Add a section, reusing its rendered XML if it is unchanged.
+        
+        Sections are cached by structural hash, style preset and the
+        options that affect rendering; see word_fragments.
+        """
+        key = (node.structural_hash(), self._preset_key,
+               repr([options.get(name) for name in FRAGMENT_OPTIONS]))
+        fragment = self.fragment_cache.get(key)
+        if fragment is not None:
+            self._splice_fragment(fragment)
+            images = fragment.images
+            finished_sections = _count_sections(node)
+        else:
+            # Nested sections report their own progress while rendering
+            fragment, images = self._render_section(node, options)
+            if fragment is not None:
+                self.fragment_cache.put(key, fragment)
+            finished_sections = 1
+        
+        progress = get_progress(options)
+        if progress is not None:
+            progress.advance(finished_sections)
+        
+        # Enclosing sections depend on the same images
+        for enclosing in self._section_images:
+            enclosing.update(images)
+    
+    def _render_section(self, node: ASTNode, options: Dict[str, Any]
+                        ) -> Tuple[Optional[WordFragment], Dict[str, Signature]]:
+        """
+        Render a section and capture its XML.
+        
+        Returns:
+            Tuple of (fragment, or None if it cannot be reused; images used)
+        """
+        body = self.document.element.body
+        writer = self._body_writer
+        if writer is not None:
+            writer.flush()
+            start = writer.bytes_written
+        else:
+            start = len(body) - (body.sectPr is not None)
+        
+        images: Dict[str, Signature] = {}
+        self._section_images.append(images)
+        try:
+            self._add_node(node, options)
+        finally:
+            self._section_images.pop()
+        
+        if writer is not None:
+            writer.flush()
+            xml = writer.read_since(start)
+        else:
+            namespaces = document_namespaces(self.document)
+            xml = b''.join(serialize_body_element(element, namespaces)
+                           for element in body[start:] if element is not body.sectPr)
+        
+        relationships = collect_relationships(self.document.part, xml)
+        if relationships is None:
+            return None, images
+        return WordFragment(xml, relationships, images), images
+    
+    def _splice_fragment(self, fragment: WordFragment):
+        """Add a cached section's XML to the document."""
+        xml = relocate(self.document.part, fragment)
+        if self._body_writer is not None:
+            # Blocks added before the section must be written out first
+            self._body_writer.flush()
+            self._body_writer.write_raw(xml)
+        else:
+            insert_body_elements(self.document.element.body,
+                                 parse_fragment(xml, document_namespaces(self.document)))
+    
+    def _add_node(self, node: ASTNode, options: Dict[str, Any]):
+        """Add an AST node and its children to the document."""
         if node.node_type == NodeType.DOCUMENT:
             # Process all children of document
             for child in node.children:
                 self._process_node(child, options)
         
         elif node.node_type == NodeType.SECTION:
-            # Process section (may add page break)
-            if options.get('page_breaks', False) and node.level == 1:
-                # Add page break before H1 sections
-                if self.document.paragraphs:
-                    self.document.paragraphs[-1].runs[-1].add_break(6)  # Page break
-            
-            # Process section children
+            # Process section children (page breaks are set on H1 headings)
             for child in node.children:
                 self._process_node(child, options)
         
@@ -172,7 +352,8 @@ class WordGenerator(FormatGenerator):
             self._add_horizontal_rule()
         
         elif node.node_type == NodeType.IMAGE:
-            self._add_image(node, options)
+            with profile_stage(options, "image"):
+                self._add_image(node, options)
         
         # Process children recursively
         for child in node.children:
@@ -184,25 +365,16 @@ class WordGenerator(FormatGenerator):
     
     def _add_heading(self, node: ASTNode, options: Dict[str, Any]):
         """Add heading to document."""
-        level = node.level or 1
+        level = min(node.level or 1, 6)
         content = node.content
         
-        # Use Word's built-in heading styles
-        style_name = f'Heading {level}'
-        
-        # Create paragraph with heading style
-        paragraph = self.document.add_heading(content, level=level)
+        # Heading styles carry the preset's font size, weight and colour
+        paragraph = self._add_styled_paragraph(heading_style_name(level))
+        paragraph.add_run(content)
         
-        # Apply custom styling if preset is available
-        if self.current_style_preset:
-            heading_style = self.current_style_preset.get_heading_style(level)
-            
-            # Apply font size
-            for run in paragraph.runs:
-                run.font.size = Pt(heading_style.font.size)
-                run.font.bold = heading_style.font.weight == "bold"
-                if heading_style.font.color:
-                    run.font.color.rgb = self._parse_color(heading_style.font.color)
+        # Start each H1 section on a new page if requested
+        if options.get('page_breaks', False) and level == 1:
+            paragraph.paragraph_format.page_break_before = True
         
         # Add bookmark for navigation
         if options.get('bookmarks', True):
@@ -210,14 +382,7 @@ class WordGenerator(FormatGenerator):
     
     def _add_paragraph(self, node: ASTNode, options: Dict[str, Any]):
         """Add paragraph to document."""
-        paragraph = self.document.add_paragraph()
-        
-        # Apply paragraph style
-        if self.current_style_preset:
-            para_style = self.current_style_preset.paragraph_style
-            paragraph_format = paragraph.paragraph_format
-            paragraph_format.space_after = Pt(para_style.spacing_after)
-            paragraph_format.line_spacing = para_style.line_height
+        paragraph = self._add_styled_paragraph(BODY_STYLE)
         
         # Process paragraph content (handle inline elements)
         content = node.content
@@ -227,21 +392,11 @@ class WordGenerator(FormatGenerator):
     
     def _add_formatted_text(self, paragraph, content: str, metadata: Dict[str, Any]):
         """Add formatted text to paragraph, handling inline elements."""
-        # Get base font settings
-        base_font_size = None
-        base_font_name = None
-        
-        if self.current_style_preset:
-            para_style = self.current_style_preset.paragraph_style
-            base_font_size = Pt(para_style.font.size)
-            base_font_name = para_style.font.family
-        
-        # Use inline formatter to parse and apply formatting
+        # Fonts come from the paragraph style; inline elements use character styles
         self.inline_formatter.format_text(
-            paragraph, 
-            content, 
-            base_font_size=base_font_size,
-            base_font_name=base_font_name
+            paragraph,
+            content,
+            character_styles=self._character_styles
         )
     
     def _add_list(self, node: ASTNode, options: Dict[str, Any]):
@@ -255,10 +410,10 @@ class WordGenerator(FormatGenerator):
         is_ordered = node.metadata.get('ordered', False)
         content = node.content
         
-        if is_ordered:
-            paragraph = self.document.add_paragraph(content, style='List Number')
-        else:
-            paragraph = self.document.add_paragraph(content, style='List Bullet')
+        paragraph = self._add_styled_paragraph(
+            LIST_NUMBER_STYLE if is_ordered else LIST_BULLET_STYLE
+        )
+        paragraph.add_run(content)
         
         # Apply list formatting
         paragraph_format = paragraph.paragraph_format
@@ -285,9 +440,10 @@ class WordGenerator(FormatGenerator):
         for i, header in enumerate(headers):
             header_cells[i].text = header
             # Make header bold
+            strong = self.style_sheet.style_id(STRONG_STYLE)
             for paragraph in header_cells[i].paragraphs:
                 for run in paragraph.runs:
-                    run.font.bold = True
+                    run._r.style = strong
         
         # Add data rows
         for row_idx, row_data in enumerate(rows):
@@ -301,27 +457,9 @@ class WordGenerator(FormatGenerator):
         content = node.content
         language = node.metadata.get('language')
         
-        paragraph = self.document.add_paragraph()
-        paragraph.style = 'No Spacing'
-        
-        # Apply code block styling
-        if self.current_style_preset:
-            code_style = self.current_style_preset.code_block_style
-            
-            # Set background color (requires custom XML)
-            self._set_paragraph_background(paragraph, code_style.background_color)
-            
-            # Set border
-            paragraph_format = paragraph.paragraph_format
-            paragraph_format.left_indent = Inches(0.25)
-            paragraph_format.right_indent = Inches(0.25)
-            paragraph_format.space_before = Pt(6)
-            paragraph_format.space_after = Pt(6)
-        
-        # Add code content with monospace font
-        run = paragraph.add_run(content)
-        run.font.name = 'Courier New'
-        run.font.size = Pt(10)
+        # The Code style sets the monospace font, indents and background
+        paragraph = self._add_styled_paragraph(CODE_STYLE)
+        run = paragraph.add_run()
         
         # Preserve line breaks
         content_lines = content.split('\n')
@@ -334,14 +472,8 @@ class WordGenerator(FormatGenerator):
         """Add blockquote to document."""
         content = node.content
         
-        paragraph = self.document.add_paragraph(content)
-        paragraph.style = 'Quote'
-        
-        # Apply blockquote styling
-        if self.current_style_preset:
-            paragraph_format = paragraph.paragraph_format
-            paragraph_format.left_indent = Inches(0.5)
-            paragraph_format.right_indent = Inches(0.5)
+        paragraph = self._add_styled_paragraph(QUOTE_STYLE)
+        paragraph.add_run(content)
     
     def _add_horizontal_rule(self):
         """Add horizontal rule to document."""
@@ -366,6 +498,10 @@ class WordGenerator(FormatGenerator):
             base_path = options.get('base_path', '.')
             image_path = Path(base_path) / image_path
         
+        # Cached sections are only reused while their images are unchanged
+        if self._section_images:
+            self._section_images[-1][str(image_path)] = file_signature(str(image_path))
+        
         if not image_path.exists():
             if options.get('skip_missing_images', False):
                 return
@@ -407,18 +543,14 @@ class WordGenerator(FormatGenerator):
         bookmark_end.set(qn('w:id'), '0')
         run._element.getparent().append(bookmark_end)
     
+    def _add_table_of_contents_heading(self):
+        """Add the table of contents heading (placed at the start of the body)."""
+        paragraph = self.document.add_paragraph("Table of Contents")
+        paragraph.style = 'Heading 1'
+        return paragraph
+    
     def _add_table_of_contents(self):
-        """Add table of contents to document."""
-        # Insert TOC at the beginning
-        if not self.document.paragraphs:
-            self.document.add_paragraph()
-        
-        # Add TOC heading
-        toc_paragraph = self.document.paragraphs[0]
-        toc_paragraph.insert_paragraph_before("Table of Contents")
-        toc_paragraph = self.document.paragraphs[0]
-        toc_paragraph.style = 'Heading 1'
-        
+        """Add the table of contents field to the end of the document."""
         # Add TOC field using Word field codes
         # Create a paragraph for TOC
         toc_content_para = self.document.add_paragraph()
@@ -446,28 +578,6 @@ class WordGenerator(FormatGenerator):
         # Add page break after TOC
         self.document.add_page_break()
     
-    def _set_paragraph_background(self, paragraph, color: str):
-        """Set paragraph background color (requires custom XML)."""
-        # This requires custom XML manipulation
-        # Simplified implementation - full version would set shading
-        pass
-    
-    def _parse_color(self, color_str: str) -> Any:
-        """Parse color string to RGBColor."""
-        if not DOCX_AVAILABLE:
-            return None
-        
-        if color_str.startswith('#'):
-            color_str = color_str[1:]
-        
-        if len(color_str) == 6:
-            r = int(color_str[0:2], 16)
-            g = int(color_str[2:4], 16)
-            b = int(color_str[4:6], 16)
-            return RGBColor(r, g, b)
-        
-        return RGBColor(0, 0, 0)
-    
     def _clean_bookmark_name(self, name: str) -> str:
         """Clean bookmark name to be valid Word bookmark identifier."""
         # Remove invalid characters
@@ -0,0 +1,183 @@
+"""
+Streaming Word Writer
+
+Memory-bounded alternative to ``Document.save`` for very large documents.
+Finished body elements are serialized to a temporary file and removed
+from the python-docx tree as the AST is visited, so the in-memory XML
+stays proportional to the block being built. Styles, numbering,
+relationships and media are written from the python-docx package when
+the document is finished.
+
+Keeping the live body small also avoids python-docx's linear scan for
+the section properties on every appended block.
+"""
+
+import re
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+from typing import BinaryIO, Dict, Optional
+
+try:
+    from docx.opc.oxml import serialize_part_xml
+    from docx.oxml.ns import qn
+    from lxml import etree
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+# Zip entry holding the main document part
+DOCUMENT_PART = 'word/document.xml'
+
+# Body XML kept in memory before spilling to disk
+SPOOL_SIZE = 1024 * 1024
+
+_NAMESPACE_DECLARATION = re.compile(rb' xmlns:(\w+)="([^"]*)"')
+
+
+def document_namespaces(document) -> Dict[bytes, bytes]:
+    """
+    Get the namespace declarations made on a document's root element.
+
+    Args:
+        document: python-docx Document
+
+    Returns:
+        Prefix to namespace URI mapping
+    """
+    return {
+        prefix.encode(): uri.encode()
+        for prefix, uri in document.element.nsmap.items() if prefix
+    }
+
+
+def serialize_body_element(element, namespaces: Dict[bytes, bytes]) -> bytes:
+    """
+    Serialize a body element without the declarations the root already makes.
+
+    Args:
+        element: Body child element
+        namespaces: Root declarations from ``document_namespaces()``
+
+    Returns:
+        Element XML
+    """
+    chunk = etree.tostring(element, encoding='UTF-8', xml_declaration=False, with_tail=False)
+    end = chunk.find(b'>')
+    start_tag = _NAMESPACE_DECLARATION.sub(
+        lambda match: b'' if namespaces.get(match.group(1)) == match.group(2)
+        else match.group(0),
+        chunk[:end]
+    )
+    return start_tag + chunk[end:]
+
+
+class StreamingDocxWriter:
+    """
+    Writes the body of a python-docx Document incrementally.
+
+    Usage::
+
+        writer = StreamingDocxWriter(document)
+        ...add content to document...
+        writer.flush()          # after each finished block
+        data = writer.finish()  # complete .docx bytes
+    """
+
+    def __init__(self, document):
+        """
+        Initialize streaming writer.
+
+        Args:
+            document: python-docx Document whose body is streamed
+        """
+        if not DOCX_AVAILABLE:
+            raise ImportError(
+                "python-docx is required for Word generation. "
+                "Install with: pip install python-docx"
+            )
+        self.document = document
+        self._body = document.element.body
+        self._namespaces = document_namespaces(document)
+        self._spool: Optional[BinaryIO] = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self.bytes_written = 0
+
+    def flush(self):
+        """Serialize finished body elements and drop them from the tree."""
+        section_properties = qn('w:sectPr')
+        for element in list(self._body):
+            if element.tag == section_properties:
+                continue
+            self.write_raw(serialize_body_element(element, self._namespaces))
+            self._body.remove(element)
+
+    def write_raw(self, chunk: bytes):
+        """
+        Append already serialized body XML after the flushed content.
+
+        Args:
+            chunk: Body elements serialized with ``serialize_body_element()``
+        """
+        self._spool.write(chunk)
+        self.bytes_written += len(chunk)
+
+    def read_since(self, offset: int) -> bytes:
+        """
+        Read back the body XML written after an earlier ``bytes_written``.
+
+        Args:
+            offset: Earlier value of ``bytes_written``
+
+        Returns:
+            Body XML written since then
+        """
+        self._spool.seek(offset)
+        chunk = self._spool.read(self.bytes_written - offset)
+        self._spool.seek(0, 2)
+        return chunk
+
+    def finish(self, output: Optional[BinaryIO] = None) -> Optional[bytes]:
+        """
+        Write the complete package.
+
+        Args:
+            output: Binary file to write to (bytes are returned if omitted)
+
+        Returns:
+            Document bytes, or None if ``output`` was given
+        """
+        self.flush()
+
+        # The remaining body holds only the section properties
+        head, _, tail = serialize_part_xml(self.document.element).partition(b'<w:body>')
+        head += b'<w:body>'
+
+        package = BytesIO()
+        self.document.save(package)
+        package.seek(0)
+
+        target = output if output is not None else BytesIO()
+        with zipfile.ZipFile(package) as source, \
+                zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as destination:
+            for info in source.infolist():
+                if info.filename != DOCUMENT_PART:
+                    destination.writestr(info, source.read(info.filename),
+                                         compress_type=zipfile.ZIP_DEFLATED)
+                    continue
+                with destination.open(DOCUMENT_PART, 'w') as stream:
+                    stream.write(head)
+                    self._spool.seek(0)
+                    shutil.copyfileobj(self._spool, stream)
+                    stream.write(tail)
+
+        self.close()
+        if output is None:
+            return target.getvalue()
+        return None
+
+    def close(self):
+        """Discard the buffered body."""
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
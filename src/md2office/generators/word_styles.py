@@ -0,0 +1,235 @@
+"""
+Word Style Sheet
+
+Compiles a StylePreset into Word styles (the document's styles part) so
+paragraphs and runs only reference styles instead of repeating direct
+formatting on every element.
+"""
+
+import copy
+from typing import Dict, Optional
+
+try:
+    from docx.shared import Pt, Inches, RGBColor
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+from ..styling.style import StylePreset
+
+# Style names used by the Word generator
+NORMAL_STYLE = 'Normal'
+BODY_STYLE = 'Body Text'
+CODE_STYLE = 'Code'
+QUOTE_STYLE = 'Quote'
+STRONG_STYLE = 'Strong'
+EMPHASIS_STYLE = 'Emphasis'
+INLINE_CODE_STYLE = 'Inline Code'
+HYPERLINK_STYLE = 'Hyperlink'
+LIST_BULLET_STYLE = 'List Bullet'
+LIST_NUMBER_STYLE = 'List Number'
+
+# Inline segment kind to character style, as used by InlineFormatter
+CHARACTER_STYLES = {
+    'bold': STRONG_STYLE,
+    'italic': EMPHASIS_STYLE,
+    'code': INLINE_CODE_STYLE,
+    'link': HYPERLINK_STYLE,
+}
+
+# Generic font families to concrete Word fonts
+FONT_FAMILIES = {
+    'sans-serif': 'Calibri',
+    'serif': 'Cambria',
+    'monospace': 'Courier New',
+}
+
+ALIGNMENTS = {
+    'left': 'LEFT',
+    'center': 'CENTER',
+    'right': 'RIGHT',
+    'justify': 'JUSTIFY',
+}
+
+HEADING_LEVELS = range(1, 7)
+
+# Paragraph property elements that must follow <w:shd> (schema order)
+SHADING_SUCCESSORS = (
+    'w:tabs', 'w:suppressAutoHyphens', 'w:kinsoku', 'w:wordWrap', 'w:overflowPunct',
+    'w:topLinePunct', 'w:autoSpaceDE', 'w:autoSpaceDN', 'w:bidi', 'w:adjustRightInd',
+    'w:snapToGrid', 'w:spacing', 'w:ind', 'w:contextualSpacing', 'w:mirrorIndents',
+    'w:suppressOverlap', 'w:jc', 'w:textDirection', 'w:textAlignment',
+    'w:textboxTightWrap', 'w:outlineLvl', 'w:divId', 'w:cnfStyle', 'w:rPr',
+    'w:sectPr', 'w:pPrChange',
+)
+
+
+def heading_style_name(level: int) -> str:
+    """Get the Word style name for a heading level."""
+    return f'Heading {level}'
+
+
+def _rgb(color: str) -> 'RGBColor':
+    """Parse a '#RRGGBB' color string."""
+    color = color.lstrip('#')
+    if len(color) != 6:
+        return RGBColor(0, 0, 0)
+    return RGBColor(int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16))
+
+
+class WordStyleSheet:
+    """
+    Word styles compiled from a StylePreset.
+
+    The first call to ``apply()`` sets the styles up through python-docx
+    and keeps a copy of the resulting style elements; later documents get
+    copies of those elements, so the preset is only compiled once.
+    """
+
+    def __init__(self, preset: StylePreset):
+        """
+        Initialize style sheet.
+
+        Args:
+            preset: Style preset to compile
+        """
+        if not DOCX_AVAILABLE:
+            raise ImportError(
+                "python-docx is required for Word styles. "
+                "Install with: pip install python-docx"
+            )
+        self.preset = preset
+        self.style_ids: Dict[str, str] = {}
+        self._elements: Optional[Dict[str, object]] = None
+
+    def apply(self, document):
+        """
+        Install the compiled styles into a document's styles part.
+
+        Args:
+            document: python-docx Document
+        """
+        if self._elements is None:
+            self._compile(document)
+            return
+
+        styles_element = document.styles.element
+        for style_id, element in self._elements.items():
+            existing = styles_element.get_by_id(style_id)
+            if existing is not None:
+                existing.getparent().replace(existing, copy.deepcopy(element))
+            else:
+                styles_element.append(copy.deepcopy(element))
+
+    def style_id(self, name: str) -> str:
+        """
+        Get the style ID for a style name (for setting styles directly on XML).
+
+        Args:
+            name: Style name, e.g. 'Heading 1'
+
+        Returns:
+            Style ID, e.g. 'Heading1'
+        """
+        return self.style_ids[name]
+
+    def _compile(self, document):
+        """Create or update every style in the document and remember them."""
+        styles = document.styles
+        preset = self.preset
+        paragraph = preset.paragraph_style
+        body_size = paragraph.font.size
+
+        normal = styles[NORMAL_STYLE]
+        self._set_font(normal.font, paragraph.font.family, body_size, paragraph.font.color)
+
+        body = self._get_or_add(styles, BODY_STYLE, WD_STYLE_TYPE.PARAGRAPH, normal)
+        body_format = body.paragraph_format
+        body_format.space_before = Pt(paragraph.spacing_before)
+        body_format.space_after = Pt(paragraph.spacing_after)
+        body_format.line_spacing = paragraph.line_height
+        alignment = ALIGNMENTS.get(paragraph.alignment)
+        if alignment:
+            body_format.alignment = getattr(WD_ALIGN_PARAGRAPH, alignment)
+
+        for level in HEADING_LEVELS:
+            heading = preset.get_heading_style(level)
+            style = styles[heading_style_name(level)]
+            style.font.size = Pt(heading.font.size)
+            style.font.bold = heading.font.weight == "bold"
+            style.font.italic = heading.font.style == "italic"
+            if heading.font.color:
+                style.font.color.rgb = _rgb(heading.font.color)
+            style.paragraph_format.space_before = Pt(heading.spacing_before)
+            style.paragraph_format.space_after = Pt(heading.spacing_after)
+            style.paragraph_format.page_break_before = heading.page_break_before
+
+        code_block = preset.code_block_style
+        code = self._get_or_add(styles, CODE_STYLE, WD_STYLE_TYPE.PARAGRAPH,
+                                styles['No Spacing'])
+        self._set_font(code.font, code_block.font.family, code_block.font.size,
+                       code_block.font.color)
+        code_format = code.paragraph_format
+        code_format.left_indent = Inches(0.25)
+        code_format.right_indent = Inches(0.25)
+        code_format.space_before = Pt(6)
+        code_format.space_after = Pt(6)
+        self._set_shading(code.element, code_block.background_color)
+
+        quote = styles[QUOTE_STYLE]
+        quote.paragraph_format.left_indent = Inches(0.5)
+        quote.paragraph_format.right_indent = Inches(0.5)
+
+        styles[STRONG_STYLE].font.bold = True
+        styles[EMPHASIS_STYLE].font.italic = True
+
+        inline_code = self._get_or_add(styles, INLINE_CODE_STYLE, WD_STYLE_TYPE.CHARACTER)
+        self._set_font(inline_code.font, 'monospace', body_size * 0.9, '#CC0000')
+
+        hyperlink = self._get_or_add(styles, HYPERLINK_STYLE, WD_STYLE_TYPE.CHARACTER)
+        hyperlink.font.color.rgb = _rgb(preset.link_color)
+        hyperlink.font.underline = True
+
+        names = [NORMAL_STYLE, BODY_STYLE, CODE_STYLE, QUOTE_STYLE, STRONG_STYLE,
+                 EMPHASIS_STYLE, INLINE_CODE_STYLE, HYPERLINK_STYLE]
+        names += [heading_style_name(level) for level in HEADING_LEVELS]
+        self._elements = {}
+        for name in names:
+            style = styles[name]
+            self.style_ids[name] = style.style_id
+            self._elements[style.style_id] = copy.deepcopy(style.element)
+        # Template styles used unchanged
+        for name in (LIST_BULLET_STYLE, LIST_NUMBER_STYLE):
+            self.style_ids[name] = styles[name].style_id
+
+    @staticmethod
+    def _get_or_add(styles, name: str, style_type, base_style=None):
+        """Get a style by name, adding it if the template lacks it."""
+        if name in styles:
+            return styles[name]
+        style = styles.add_style(name, style_type)
+        if base_style is not None:
+            style.base_style = base_style
+        style.quick_style = True
+        return style
+
+    @staticmethod
+    def _set_font(font, family: str, size: float, color: Optional[str]):
+        """Set font name, size and color on a style font."""
+        font.name = FONT_FAMILIES.get(family, family)
+        font.size = Pt(size)
+        if color:
+            font.color.rgb = _rgb(color)
+
+    @staticmethod
+    def _set_shading(style_element, color: str):
+        """Give a paragraph style a background fill."""
+        shading = OxmlElement('w:shd')
+        shading.set(qn('w:val'), 'clear')
+        shading.set(qn('w:color'), 'auto')
+        shading.set(qn('w:fill'), color.lstrip('#'))
+        style_element.get_or_add_pPr().insert_element_before(shading, *SHADING_SUCCESSORS)
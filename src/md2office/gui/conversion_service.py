@@ -7,20 +7,15 @@ Shared service for CLI and GUI conversion operations.
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from ..router import ConversionPipeline
-from ..config import Config, merge_configs, find_config_file, load_config
+from ..config import ConfigResolver
+from ..parser import ASTCache
+from ..cancellation import CancellationToken, OutputTransaction
+from ..progress import ProgressReporter
 from ..errors import (
     MD2OfficeError, ParseError, ConversionError, FileError,
-    ConfigurationError, setup_logger
+    ConfigurationError, CancellationError, setup_logger
 )
 
-# Import generators (may be None if dependencies not installed)
-try:
-    from ..generators import WordGenerator, PowerPointGenerator, PDFGenerator
-except ImportError:
-    WordGenerator = None
-    PowerPointGenerator = None
-    PDFGenerator = None
-
 
 class ConversionService:
     """
@@ -29,33 +24,19 @@ class ConversionService:
     Provides a clean interface for both CLI and GUI to perform conversions.
     """
     
-    def __init__(self):
-        """Initialize conversion service."""
-        self.pipeline = ConversionPipeline()
-        self._ensure_generators_registered()
-    
-    def _ensure_generators_registered(self):
-        """Ensure format generators are registered."""
-        if WordGenerator is not None:
-            try:
-                word_gen = WordGenerator()
-                self.pipeline.register_generator('word', word_gen)
-            except Exception:
-                pass
-        
-        if PowerPointGenerator is not None:
-            try:
-                pptx_gen = PowerPointGenerator()
-                self.pipeline.register_generator('powerpoint', pptx_gen)
-            except Exception:
-                pass
+    def __init__(self, config_resolver: Optional[ConfigResolver] = None,
+                 ast_cache: Optional[ASTCache] = None):
+        """
+        Initialize conversion service (generators are loaded on first use).
         
-        if PDFGenerator is not None:
-            try:
-                pdf_gen = PDFGenerator()
-                self.pipeline.register_generator('pdf', pdf_gen)
-            except Exception:
-                pass
+        Args:
+            config_resolver: Configuration resolver to share with other
+                services (a new one is created if not provided)
+            ast_cache: Parsed-AST cache to share with other services
+                (no AST caching if not provided)
+        """
+        self.pipeline = ConversionPipeline(ast_cache=ast_cache)
+        self.config_resolver = config_resolver or ConfigResolver()
     
     def convert_file(
         self,
@@ -65,11 +46,17 @@ class ConversionService:
         output_name: Optional[str] = None,
         output_suffix: Optional[str] = None,
         overwrite: bool = False,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[ProgressReporter] = None
     ) -> Dict[str, Any]:
         """
         Convert a markdown file to specified formats.
         
+        Output files are written only once every format has been
+        generated, and none are left behind if the conversion fails or
+        is cancelled.
+        
         Args:
             input_path: Path to markdown file
             formats: List of format names ('word', 'powerpoint', 'pdf')
@@ -78,9 +65,12 @@ class ConversionService:
             output_suffix: Suffix to add to output filename
             overwrite: Whether to overwrite existing files
             config: Additional configuration options
+            cancel_token: Token that stops the conversion when cancelled
+            progress: Reporter that receives ProgressEvents while converting
             
         Returns:
             Dictionary with 'success', 'output_files', and 'error' keys
+            ('error_type' is 'Cancelled' for a cancelled conversion)
         """
         try:
             input_path_obj = Path(input_path)
@@ -100,21 +90,11 @@ class ConversionService:
                     'error_type': 'InvalidPath'
                 }
             
-            # Prepare configuration
-            base_config = Config()
-            # Try to find and load config file
-            config_path = find_config_file(str(input_path_obj.parent))
-            if config_path:
-                try:
-                    base_config = load_config(config_path)
-                except ConfigurationError:
-                    pass  # Ignore config errors
-            
-            # Merge with provided config
-            if config:
-                final_config = merge_configs(base_config, config)
-            else:
-                final_config = base_config
+            # Find and load the config file (cached per directory), then
+            # merge with provided config
+            _, final_config = self.config_resolver.resolve(
+                str(input_path_obj.parent), config
+            )
             
             # Determine output filename
             if output_name:
@@ -128,7 +108,9 @@ class ConversionService:
             results = self.pipeline.convert_file(
                 str(input_path_obj),
                 formats,
-                final_config.to_dict()
+                final_config.to_dict(),
+                cancel_token=cancel_token,
+                progress=progress
             )
             
             # Check for errors in results
@@ -147,9 +129,11 @@ class ConversionService:
             ext_map = {
                 'word': '.docx',
                 'powerpoint': '.pptx',
-                'pdf': '.pdf'
+                'pdf': '.pdf',
+                'html': '.html'
             }
             
+            outputs = []
             for format_name, doc_bytes in results.items():
                 if format_name == 'error':
                     continue
@@ -157,7 +141,7 @@ class ConversionService:
                 ext = ext_map.get(format_name, f'.{format_name}')
                 output_file = output_dir_obj / f"{base_name}{ext}"
                 
-                # Check if file exists
+                # Check if file exists (before writing anything)
                 if output_file.exists() and not overwrite:
                     return {
                         'success': False,
@@ -165,14 +149,17 @@ class ConversionService:
                         'error_type': 'FileExists',
                         'output_file': str(output_file)
                     }
-                
-                # Write file
-                output_file.write_bytes(doc_bytes)
-                output_files.append({
-                    'format': format_name,
-                    'path': str(output_file),
-                    'size': len(doc_bytes)
-                })
+                outputs.append((format_name, output_file, doc_bytes))
+            
+            # Write files (all or none)
+            with OutputTransaction() as transaction:
+                for format_name, output_file, doc_bytes in outputs:
+                    transaction.write(output_file, doc_bytes)
+                    output_files.append({
+                        'format': format_name,
+                        'path': str(output_file),
+                        'size': len(doc_bytes)
+                    })
             
             return {
                 'success': True,
@@ -180,6 +167,14 @@ class ConversionService:
                 'input_file': str(input_path_obj)
             }
         
+        except CancellationError as e:
+            return {
+                'success': False,
+                'error': e.message,
+                'error_type': 'Cancelled',
+                'stage': e.stage
+            }
+        
         except ParseError as e:
             return {
                 'success': False,
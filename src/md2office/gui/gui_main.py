@@ -6,6 +6,7 @@ Launches the md2office graphical user interface.
 
 import os
 import sys
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication
 from .main_window import MainWindow
 
@@ -24,6 +25,9 @@ def main():
     # Check if QApplication already exists
     app = QApplication.instance()
     if app is None:
+        # QtWebEngine is imported after the application is created (once
+        # the window is shown), so it cannot set this attribute itself
+        QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
         app = QApplication(sys.argv)
     
     # Set application properties
@@ -41,7 +45,8 @@ def main():
         except Exception:
             pass  # Use default if both fail
     
-    # Create and show main window
+    # Create and show main window (the preview and the generators are
+    # loaded once it has been painted)
     window = MainWindow()
     window.show()
     
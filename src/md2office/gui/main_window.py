@@ -13,12 +13,21 @@ from PySide6.QtWidgets import (
     QProgressBar, QGroupBox, QComboBox, QTextEdit, QSplitter,
     QMenuBar, QMenu
 )
-from PySide6.QtCore import Qt, Signal, QThread, QMimeData
+from PySide6.QtCore import Qt, Signal, QThread, QMimeData, QTimer
 from PySide6.QtGui import QDragEnterEvent, QDropEvent, QShortcut, QKeySequence, QCloseEvent, QAction
 
+from ..config import ConfigResolver
+from ..parser import ASTCache
+from .conversion_service import ConversionService
 from .workers.conversion_worker import ConversionWorker
+from .workers.batch_queue import BatchQueue
+from .workers.preload_worker import PreloadWorker
 from .widgets.markdown_viewer import MarkdownViewer
 from .widgets.markdown_editor import MarkdownEditor
+from .widgets.batch_queue_panel import BatchQueuePanel
+
+# Lines of a large file shown in the preview, around the visible ones
+PREVIEW_WINDOW_LINES = 2000
 
 
 class MainWindow(QMainWindow):
@@ -27,8 +36,17 @@ class MainWindow(QMainWindow):
     
     Provides basic conversion interface with file selection,
     format selection, and conversion controls.
+    
+    The preview's web view and the format generators are loaded after the
+    window is first painted (see finish_startup()), so the window appears
+    without waiting for QtWebEngine or the document libraries.
+    
+    Signals:
+        startup_finished: Emitted when the deferred start-up work is done
     """
     
+    startup_finished = Signal()
+    
     def __init__(self, parent=None):
         """Initialize main window."""
         super().__init__(parent)
@@ -41,9 +59,33 @@ class MainWindow(QMainWindow):
         # Conversion state
         self.current_worker: Optional[ConversionWorker] = None
         
+        # Parsed configuration files are reused across conversions
+        self.config_resolver = ConfigResolver()
+        
+        # Parsed documents are reused when only options or style change
+        self.ast_cache = ASTCache()
+        
+        # Single conversions reuse one service, so generators are created once
+        self.conversion_service = ConversionService(self.config_resolver, self.ast_cache)
+        
+        # Batch conversions run on a shared thread pool
+        self.batch_queue = BatchQueue(
+            config_resolver=self.config_resolver,
+            ast_cache=self.ast_cache,
+            parent=self
+        )
+        
         # Current markdown file path
         self.current_markdown_path: Optional[Path] = None
         
+        # First line of a large file shown in the preview
+        self._preview_window_start = 0
+        
+        # Deferred start-up work (see finish_startup())
+        self._startup_scheduled = False
+        self._preload_worker: Optional[PreloadWorker] = None
+        self.startup_complete = False
+        
         # Create menu bar first
         self._create_menu_bar()
         
@@ -54,8 +96,48 @@ class MainWindow(QMainWindow):
         
         # Connect editor to preview (after UI is created)
         self.markdown_editor.content_changed.connect(self._on_editor_content_changed)
+        self.markdown_editor.lines_changed.connect(self._on_editor_lines_changed)
+        self.markdown_editor.load_progress.connect(self._on_editor_load_progress)
+        self.markdown_editor.load_finished.connect(self._on_editor_load_finished)
+        # Slower previews lengthen the editor's preview debounce
+        self.markdown_viewer.preview_rendered.connect(self.markdown_editor.set_preview_render_time)
+        # Editor and preview scroll together
+        self.markdown_editor.visible_line_changed.connect(self._on_editor_scrolled)
+        self.markdown_viewer.preview_scrolled.connect(self._on_preview_scrolled)
         self.markdown_editor.modification_changed.connect(self._on_modification_changed)
     
+    def paintEvent(self, event):
+        """Schedule the deferred start-up work after the first paint."""
+        super().paintEvent(event)
+        if not self._startup_scheduled:
+            self._startup_scheduled = True
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        """
+        Create the preview's web view and preload the generators (once).
+        
+        The web view is created on the UI thread; the generators are
+        created by a PreloadWorker, and startup_finished is emitted when
+        it is done.
+        """
+        self._startup_scheduled = True
+        if self._preload_worker is not None or self.startup_complete:
+            return
+        self.markdown_viewer.create_web_view()
+        
+        worker = PreloadWorker(self.conversion_service.pipeline.registry, parent=self)
+        worker.finished.connect(self._on_preload_finished)
+        self._preload_worker = worker
+        worker.start()
+    
+    def _on_preload_finished(self):
+        """Finish start-up once the generators are loaded."""
+        self._preload_worker.deleteLater()
+        self._preload_worker = None
+        self.startup_complete = True
+        self.startup_finished.emit()
+    
     def _create_menu_bar(self):
         """Create menu bar with file operations."""
         menubar = self.menuBar()
@@ -230,12 +312,18 @@ class MainWindow(QMainWindow):
         button_layout.addWidget(self.convert_btn)
         
         cancel_btn = QPushButton("Cancel")
-        cancel_btn.clicked.connect(self.close)
+        cancel_btn.clicked.connect(self._cancel_or_close)
         button_layout.addWidget(cancel_btn)
         
         left_layout.addLayout(button_layout)
         
-        left_layout.addStretch()
+        # Batch Queue Section
+        batch_group = QGroupBox("Batch Queue")
+        batch_layout = QVBoxLayout(batch_group)
+        self.batch_panel = BatchQueuePanel(self.batch_queue)
+        self.batch_panel.files_requested.connect(self._queue_files)
+        batch_layout.addWidget(self.batch_panel)
+        left_layout.addWidget(batch_group, 1)
         
         # Add left widget to main splitter
         main_splitter.addWidget(left_widget)
@@ -258,7 +346,8 @@ class MainWindow(QMainWindow):
         preview_layout = QVBoxLayout(preview_group)
         preview_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.markdown_viewer = MarkdownViewer()
+        # Shares the AST cache, so exporting a previewed document does not parse it again
+        self.markdown_viewer = MarkdownViewer(ast_cache=self.ast_cache)
         preview_layout.addWidget(self.markdown_viewer)
         
         editor_preview_splitter.addWidget(preview_group)
@@ -302,7 +391,10 @@ class MainWindow(QMainWindow):
             return
         
         urls = event.mimeData().urls()
-        if urls:
+        if len(urls) > 1 or (urls and Path(urls[0].toLocalFile()).is_dir()):
+            # Several files or a folder: convert them in the batch queue
+            self._queue_files([url.toLocalFile() for url in urls])
+        elif urls:
             file_path = urls[0].toLocalFile()
             if file_path.lower().endswith('.md'):
                 self._update_preview(file_path)
@@ -474,13 +566,15 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.status_label.setText("Starting conversion...")
         
-        # Create and start worker
+        # Create and start worker (look up config files afresh for each run)
+        self.config_resolver.clear_lookups()
         self.current_worker = ConversionWorker(
             input_path=file_path,
             formats=formats,
             output_dir=output_dir,
             overwrite=False,
-            config=config
+            config=config,
+            service=self.conversion_service
         )
         
         # Connect signals
@@ -490,17 +584,52 @@ class MainWindow(QMainWindow):
         # Start conversion
         self.current_worker.start()
     
+    def _queue_files(self, paths: List[str]) -> List[int]:
+        """
+        Queue files and folders for batch conversion with the current settings.
+        
+        Args:
+            paths: Markdown files and folders containing markdown files
+            
+        Returns:
+            IDs of the queued items
+        """
+        formats = self._get_selected_formats()
+        if not formats:
+            QMessageBox.warning(self, "Validation Error", "Please select at least one output format.")
+            return []
+        
+        output_dir = self.output_dir_edit.text().strip() or "."
+        item_ids = self.batch_queue.add_files(paths, formats, output_dir, self._get_config())
+        if not item_ids:
+            QMessageBox.warning(
+                self,
+                "No Markdown Files",
+                "No markdown (.md) files were found to convert."
+            )
+        return item_ids
+    
     def _on_progress_updated(self, percentage: int, message: str):
         """Handle progress update."""
         self.progress_bar.setValue(percentage)
         self.status_label.setText(message)
     
+    def _cancel_or_close(self):
+        """Cancel the running conversion, or close the window if there is none."""
+        if self.current_worker and self.current_worker.isRunning():
+            self.current_worker.cancel()
+            self.status_label.setText("Cancelling conversion...")
+        else:
+            self.close()
+    
     def _on_conversion_finished(self, result: Dict[str, Any]):
         """Handle conversion completion."""
         self.progress_bar.setVisible(False)
         self.convert_btn.setEnabled(True)
         
-        if result.get('success'):
+        if result.get('error_type') == 'Cancelled':
+            self.status_label.setText("Conversion cancelled")
+        elif result.get('success'):
             # Show success message
             output_files = result.get('output_files', [])
             file_list = "\n".join([f"  • {f['path']}" for f in output_files])
@@ -557,6 +686,26 @@ class MainWindow(QMainWindow):
             event.ignore()
             return
         
+        self.markdown_editor.cancel_loading()
+        if self._preload_worker is not None:
+            # Imports cannot be interrupted; they finish shortly
+            self._preload_worker.wait()
+        
+        # Check if batch conversions are queued or running
+        if self.batch_queue.is_busy():
+            reply = QMessageBox.question(
+                self,
+                "Batch Conversion in Progress",
+                "Files are still being converted. Do you want to cancel them and close?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+            self.batch_queue.cancel_all()
+            self.batch_queue.wait()
+        
         # Check if conversion is in progress
         if self.current_worker and self.current_worker.isRunning():
             reply = QMessageBox.question(
@@ -568,11 +717,11 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.Yes:
-                # Stop the worker
-                self.current_worker.terminate()
-                self.current_worker.wait(3000)  # Wait up to 3 seconds
-                if self.current_worker.isRunning():
-                    self.current_worker.kill()
+                # Stop the worker (cancelled conversions write no files)
+                self.current_worker.cancel()
+                if not self.current_worker.wait(3000):  # Wait up to 3 seconds
+                    self.current_worker.terminate()
+                    self.current_worker.wait()
                 event.accept()
             else:
                 event.ignore()
@@ -606,7 +755,55 @@ class MainWindow(QMainWindow):
     def _on_editor_content_changed(self, content: str):
         """Handle editor content changes - update preview."""
         base_path = self.markdown_editor.current_file.parent if self.markdown_editor.current_file else None
-        self.markdown_viewer.set_markdown(content, base_path)
+        self.markdown_viewer.render_markdown(content, base_path)
+    
+    def _on_editor_lines_changed(self, first_line: int, last_line: int):
+        """Update the preview of a large file if the edit shows in it."""
+        if first_line < self._preview_window_start + PREVIEW_WINDOW_LINES:
+            self._render_preview_window()
+    
+    def _render_preview_window(self):
+        """Preview the lines of a large file around the visible ones."""
+        start = self._preview_window_start
+        text = self.markdown_editor.text_range(start, start + PREVIEW_WINDOW_LINES - 1)
+        self._on_editor_content_changed(text)
+    
+    def _on_editor_scrolled(self, line: int):
+        """Scroll the preview to the editor's top line."""
+        if self.markdown_editor.large_file_mode:
+            # Move the previewed lines once the editor nears their ends
+            start = self._preview_window_start
+            margin = PREVIEW_WINDOW_LINES // 4
+            if not start + margin <= line < start + PREVIEW_WINDOW_LINES - margin:
+                new_start = max(line - margin, 0)
+                if new_start != start:
+                    self._preview_window_start = new_start
+                    self._render_preview_window()
+            line -= self._preview_window_start
+        self.markdown_viewer.scroll_to_line(line)
+    
+    def _on_preview_scrolled(self, line: int):
+        """Scroll the editor to the preview's top line."""
+        if self.markdown_editor.large_file_mode:
+            line += self._preview_window_start
+        self.markdown_editor.scroll_to_line(line)
+    
+    def _on_editor_load_progress(self, percentage: int):
+        """Show the progress of loading a large file."""
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(percentage)
+        self.status_label.setText(f"Loading file... {percentage}%")
+    
+    def _on_editor_load_finished(self, success: bool):
+        """Preview a loaded large file, or report why it failed to load."""
+        self.progress_bar.setVisible(False)
+        self._preview_window_start = 0
+        self._render_preview_window()
+        if success:
+            self.status_label.setText("File loaded")
+        else:
+            self.status_label.setText("Loading failed")
+            QMessageBox.warning(self, "Open Failed", self.markdown_editor.last_error)
     
     def _on_modification_changed(self, modified: bool):
         """Handle modification state changes."""
@@ -652,11 +849,10 @@ class MainWindow(QMainWindow):
                 self.current_markdown_path = path
                 self._update_window_title()
             else:
-                QMessageBox.warning(
-                    self,
-                    "Open Failed",
-                    f"Could not open file: {file_path}"
-                )
+                message = f"Could not open file: {file_path}"
+                if self.markdown_editor.last_error:
+                    message += f"\n\n{self.markdown_editor.last_error}"
+                QMessageBox.warning(self, "Open Failed", message)
     
     def _handle_file_overwrite(self, file_path: Path) -> Optional[Path]:
         """
@@ -0,0 +1,378 @@
+/*
+ * Markdown preview updates.
+ *
+ * The viewer loads shell.html once and then calls
+ * md2officePreview.update(bodyHtml) for each edit. Top-level nodes whose
+ * markup did not change are kept as they are (with their highlighting,
+ * rendered diagrams and the scroll position); only new or changed nodes
+ * are inserted. Rendered Mermaid diagrams are cached by the hash of their
+ * source, so an unchanged diagram is never rendered twice.
+ *
+ * The body is made of parts (<section class="md2office-part">), one per
+ * section; update() also receives the source line each part starts at, for
+ * scrolling in step with the editor. Parts of long documents arrive as
+ * empty placeholders (with a data-key) that are filled, through the
+ * viewer's QWebChannel bridge, when they come near the viewport and
+ * emptied again when they move far away.
+ */
+(function () {
+    'use strict';
+
+    // Rendered diagram markup (SVG or error), as promises, by source hash
+    const diagramCache = new Map();
+    let renderCount = 0;
+    let mermaidReady = false;
+
+    // Placeholders are filled within this distance of the viewport
+    const VIEWPORT_MARGIN = '1500px';
+    // Scroll events after a scroll made for the editor are not reported
+    const SYNC_SCROLL_QUIET_MS = 200;
+
+    // HTML of placeholder parts received from the viewer, by key
+    const partHtml = new Map();
+    // Placeholders waiting for requested HTML, by key
+    const waitingParts = new Map();
+    let observer = null;
+
+    // Part elements in document order, and the source line of each
+    let partList = [];
+    let partLines = [];
+
+    let bridge = null;
+    let unsentKeys = [];
+    let ignoreScrollUntil = 0;
+    let scrollReportPending = false;
+    let lastReportedLine = -1;
+
+    function initMermaid() {
+        if (!mermaidReady && typeof mermaid !== 'undefined') {
+            mermaid.initialize({
+                startOnLoad: false,
+                theme: 'default',
+                securityLevel: 'loose',
+                flowchart: {
+                    useMaxWidth: true,
+                    htmlLabels: true
+                }
+            });
+            mermaidReady = true;
+        }
+        return mermaidReady;
+    }
+
+    function escapeHtml(text) {
+        const element = document.createElement('span');
+        element.textContent = text;
+        return element.innerHTML;
+    }
+
+    function errorMarkup(err, source) {
+        return '<div class="mermaid-error">' +
+            '<strong>Mermaid Diagram Error:</strong><br>' +
+            escapeHtml(err && err.message ? err.message : String(err)).replace(/\n/g, '<br>') +
+            '<code>' + escapeHtml(source) + '</code>' +
+            '</div>';
+    }
+
+    function renderDiagram(element) {
+        const hash = element.dataset.hash;
+        let markup = diagramCache.get(hash);
+        if (markup === undefined) {
+            if (!initMermaid()) {
+                // Mermaid.js is not bundled: show the diagram source
+                element.classList.add('mermaid-pending');
+                return;
+            }
+            const source = element.textContent;
+            renderCount += 1;
+            markup = mermaid.render('mermaid-svg-' + renderCount, source).then(
+                function (result) { return result.svg; },
+                function (err) {
+                    console.error('Mermaid rendering error:', err);
+                    return errorMarkup(err, source);
+                }
+            );
+            diagramCache.set(hash, markup);
+        }
+        markup.then(function (html) { element.innerHTML = html; });
+    }
+
+    function highlightCode(block) {
+        try {
+            hljs.highlightElement(block);
+        } catch (e) {
+            console.warn('Syntax highlighting failed:', e);
+        }
+    }
+
+    // Highlight code and render diagrams in a newly inserted node
+    function prepare(node) {
+        if (node.nodeType !== Node.ELEMENT_NODE) {
+            return;
+        }
+        if (node.matches('.mermaid')) {
+            renderDiagram(node);
+        } else {
+            node.querySelectorAll('.mermaid').forEach(renderDiagram);
+        }
+        if (typeof hljs !== 'undefined') {
+            node.querySelectorAll('pre code').forEach(highlightCode);
+        }
+    }
+
+    function connectBridge() {
+        if (typeof QWebChannel === 'undefined' || !window.qt || !qt.webChannelTransport) {
+            return;
+        }
+        new QWebChannel(qt.webChannelTransport, function (channel) {
+            bridge = channel.objects.md2officeBridge;
+            if (unsentKeys.length) {
+                bridge.requestParts(unsentKeys);
+                unsentKeys = [];
+            }
+        });
+    }
+
+    function requestParts(keys) {
+        if (bridge) {
+            bridge.requestParts(keys);
+        } else {
+            unsentKeys = unsentKeys.concat(keys);
+        }
+    }
+
+    function partObserver() {
+        if (!observer) {
+            observer = new IntersectionObserver(onPartVisibility, {
+                rootMargin: VIEWPORT_MARGIN + ' 0px'
+            });
+        }
+        return observer;
+    }
+
+    // Fill placeholders coming near the viewport, empty those moving away
+    function onPartVisibility(entries) {
+        const missing = [];
+        entries.forEach(function (entry) {
+            const part = entry.target;
+            const key = part.dataset.key;
+            part.md2officeNear = entry.isIntersecting;
+            if (!entry.isIntersecting) {
+                if (part.md2officeFilled) {
+                    unloadPart(part);
+                }
+                return;
+            }
+            if (part.md2officeFilled) {
+                return;
+            }
+            if (partHtml.has(key)) {
+                fillPart(part, partHtml.get(key));
+                return;
+            }
+            if (!waitingParts.has(key)) {
+                waitingParts.set(key, []);
+                missing.push(key);
+            }
+            waitingParts.get(key).push(part);
+        });
+        if (missing.length) {
+            requestParts(missing);
+        }
+    }
+
+    function fillPart(part, html) {
+        part.innerHTML = html;
+        part.style.minHeight = '';
+        part.md2officeFilled = true;
+        prepare(part);
+    }
+
+    // Empty a part far from the viewport, keeping its measured height
+    function unloadPart(part) {
+        part.style.minHeight = part.offsetHeight + 'px';
+        part.innerHTML = '';
+        part.md2officeFilled = false;
+    }
+
+    // HTML of requested parts, sent by the viewer
+    function fillParts(parts) {
+        Object.keys(parts).forEach(function (key) {
+            partHtml.set(key, parts[key]);
+            (waitingParts.get(key) || []).forEach(function (part) {
+                if (part.isConnected && part.md2officeNear && !part.md2officeFilled) {
+                    fillPart(part, parts[key]);
+                }
+            });
+            waitingParts.delete(key);
+        });
+    }
+
+    // Index of the last part starting at or before a source line
+    function partIndexForLine(line) {
+        let low = 0;
+        let high = partLines.length - 1;
+        let found = -1;
+        while (low <= high) {
+            const middle = (low + high) >> 1;
+            if (partLines[middle] <= line) {
+                found = middle;
+                low = middle + 1;
+            } else {
+                high = middle - 1;
+            }
+        }
+        return found;
+    }
+
+    // Share of a part between its start line and the next part's
+    function lineFraction(index, line) {
+        const start = partLines[index];
+        const end = index + 1 < partLines.length ? partLines[index + 1] : start;
+        return end > start ? Math.min((line - start) / (end - start), 1) : 0;
+    }
+
+    function scrollToLine(line) {
+        const index = partIndexForLine(line);
+        if (index < 0) {
+            return;
+        }
+        const part = partList[index];
+        ignoreScrollUntil = Date.now() + SYNC_SCROLL_QUIET_MS;
+        window.scrollTo(0, part.offsetTop + lineFraction(index, line) * part.offsetHeight);
+    }
+
+    // Source line shown at the top of the page
+    function lineAtTop() {
+        const top = window.scrollY;
+        let low = 0;
+        let high = partList.length - 1;
+        let found = 0;
+        while (low <= high) {
+            const middle = (low + high) >> 1;
+            if (partList[middle].offsetTop <= top) {
+                found = middle;
+                low = middle + 1;
+            } else {
+                high = middle - 1;
+            }
+        }
+        const part = partList[found];
+        const start = partLines[found];
+        const end = found + 1 < partLines.length ? partLines[found + 1] : start;
+        const fraction = part.offsetHeight ?
+            Math.min(Math.max((top - part.offsetTop) / part.offsetHeight, 0), 1) : 0;
+        return Math.round(start + fraction * (end - start));
+    }
+
+    function reportScroll() {
+        scrollReportPending = false;
+        if (!bridge || !partList.length || Date.now() < ignoreScrollUntil) {
+            return;
+        }
+        const line = lineAtTop();
+        if (line !== lastReportedLine) {
+            lastReportedLine = line;
+            bridge.previewScrolled(line);
+        }
+    }
+
+    function sourceOf(node) {
+        return node.nodeType === Node.ELEMENT_NODE ? node.outerHTML : '#' + node.nodeType + node.textContent;
+    }
+
+    function update(html, lines) {
+        const container = document.getElementById('preview');
+        const template = document.createElement('template');
+        template.innerHTML = html;
+
+        // Current nodes by the markup they were created from
+        const available = new Map();
+        container.childNodes.forEach(function (node) {
+            if (node.md2officeSource !== undefined) {
+                const nodes = available.get(node.md2officeSource) || [];
+                nodes.push(node);
+                available.set(node.md2officeSource, nodes);
+            }
+        });
+
+        // Place the new nodes in order, reusing unchanged ones
+        const inserted = [];
+        let cursor = container.firstChild;
+        Array.from(template.content.childNodes).forEach(function (fresh) {
+            const source = sourceOf(fresh);
+            const reusable = available.get(source);
+            let node = reusable && reusable.shift();
+            if (!node) {
+                node = fresh;
+                node.md2officeSource = source;
+                inserted.push(node);
+            }
+            if (node === cursor) {
+                cursor = cursor.nextSibling;
+            } else {
+                container.insertBefore(node, cursor);
+            }
+        });
+
+        // Whatever is left after the placed nodes is stale
+        while (cursor) {
+            const next = cursor.nextSibling;
+            if (observer && cursor.nodeType === Node.ELEMENT_NODE) {
+                observer.unobserve(cursor);
+            }
+            container.removeChild(cursor);
+            cursor = next;
+        }
+
+        // Placeholders are filled when they come into view
+        inserted.forEach(function (node) {
+            if (node.nodeType === Node.ELEMENT_NODE && node.dataset.key !== undefined) {
+                partObserver().observe(node);
+            } else {
+                prepare(node);
+            }
+        });
+
+        // Forget parts that are gone
+        const keys = new Set();
+        partList = Array.from(container.querySelectorAll(':scope > .md2office-part'));
+        partList.forEach(function (part) {
+            if (part.dataset.key !== undefined) {
+                keys.add(part.dataset.key);
+            }
+        });
+        [partHtml, waitingParts].forEach(function (byKey) {
+            byKey.forEach(function (value, key) {
+                if (!keys.has(key)) {
+                    byKey.delete(key);
+                }
+            });
+        });
+        partLines = lines || [];
+
+        return {inserted: inserted.length, diagrams: diagramCache.size};
+    }
+
+    window.md2officePreview = {
+        update: update,
+        fillParts: fillParts,
+        scrollToLine: scrollToLine
+    };
+
+    window.addEventListener('scroll', function () {
+        if (!scrollReportPending) {
+            scrollReportPending = true;
+            window.requestAnimationFrame(reportScroll);
+        }
+    });
+
+    // A standalone document carries its body inline: prepare it the same way
+    document.addEventListener('DOMContentLoaded', function () {
+        connectBridge();
+        const container = document.getElementById('preview');
+        if (container.children.length) {
+            update(container.innerHTML);
+        }
+    });
+})();
@@ -4,6 +4,7 @@ Custom widgets for md2office GUI.
 
 from .markdown_viewer import MarkdownViewer
 from .markdown_editor import MarkdownEditor
+from .batch_queue_panel import BatchQueuePanel
 
-__all__ = ['MarkdownViewer', 'MarkdownEditor']
+__all__ = ['MarkdownViewer', 'MarkdownEditor', 'BatchQueuePanel']
 
@@ -0,0 +1,261 @@
+"""
+Batch Queue Panel Widget
+
+Lists the files of a BatchQueue with per-file progress, and lets the
+user add files or folders, reprioritise and cancel queued files.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog,
+    QTableWidget, QTableWidgetItem, QProgressBar, QAbstractItemView, QHeaderView
+)
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QDragEnterEvent, QDropEvent
+
+from ..workers.batch_queue import BatchQueue, QUEUED, RUNNING, DONE, FAILED, CANCELLED
+
+# Table columns
+FILE_COLUMN = 0
+STATUS_COLUMN = 1
+PROGRESS_COLUMN = 2
+TIME_COLUMN = 3
+
+_STATUS_TEXT = {
+    QUEUED: "Queued",
+    RUNNING: "Converting",
+    DONE: "Done",
+    FAILED: "Failed",
+    CANCELLED: "Cancelled"
+}
+
+
+class BatchQueuePanel(QWidget):
+    """
+    Panel showing a batch conversion queue.
+
+    Adding files is delegated to the owner through ``files_requested``,
+    which knows the formats, output directory and options to use.
+    """
+
+    # Signals
+    files_requested = Signal(list)  # file and folder paths to queue
+
+    def __init__(self, batch_queue: BatchQueue, parent=None):
+        """
+        Initialize batch queue panel.
+
+        Args:
+            batch_queue: Queue to display and control
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.batch_queue = batch_queue
+        self._rows: Dict[int, int] = {}  # item id to table row
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["File", "Status", "Progress", "Time"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(FILE_COLUMN, QHeaderView.Stretch)
+        self.table.itemSelectionChanged.connect(self._update_buttons)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        add_files_btn = QPushButton("Add Files...")
+        add_files_btn.clicked.connect(self._browse_files)
+        button_layout.addWidget(add_files_btn)
+
+        add_folder_btn = QPushButton("Add Folder...")
+        add_folder_btn.clicked.connect(self._browse_folder)
+        button_layout.addWidget(add_folder_btn)
+
+        self.up_btn = QPushButton("Up")
+        self.up_btn.clicked.connect(self._move_selected_up)
+        button_layout.addWidget(self.up_btn)
+
+        self.down_btn = QPushButton("Down")
+        self.down_btn.clicked.connect(self._move_selected_down)
+        button_layout.addWidget(self.down_btn)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self._cancel_selected)
+        button_layout.addWidget(self.cancel_btn)
+
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self._clear_finished)
+        button_layout.addWidget(clear_btn)
+        layout.addLayout(button_layout)
+
+        self.throughput_label = QLabel("Drop files or folders here to queue them")
+        layout.addWidget(self.throughput_label)
+
+        self.setAcceptDrops(True)
+
+        batch_queue.item_added.connect(self._on_item_added)
+        batch_queue.item_started.connect(self._refresh_item)
+        batch_queue.item_progress.connect(self._on_item_progress)
+        batch_queue.item_finished.connect(self._refresh_item)
+        batch_queue.item_cancelled.connect(self._refresh_item)
+        batch_queue.order_changed.connect(self._on_order_changed)
+        batch_queue.throughput_updated.connect(self._on_throughput_updated)
+
+        self._update_buttons()
+
+    def dragEnterEvent(self, event: QDragEnterEvent):
+        """Handle drag enter event."""
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event: QDropEvent):
+        """Queue dropped files and folders."""
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if paths:
+            self.files_requested.emit(paths)
+            event.acceptProposedAction()
+
+    def selected_item_ids(self) -> List[int]:
+        """Get IDs of the selected items, in table order."""
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        return [self.table.item(row, FILE_COLUMN).data(Qt.UserRole) for row in rows]
+
+    def _browse_files(self):
+        """Browse for markdown files to queue."""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Add Markdown Files",
+            "",
+            "Markdown Files (*.md *.markdown);;All Files (*)"
+        )
+        if file_paths:
+            self.files_requested.emit(file_paths)
+
+    def _browse_folder(self):
+        """Browse for a folder of markdown files to queue."""
+        dir_path = QFileDialog.getExistingDirectory(self, "Add Folder")
+        if dir_path:
+            self.files_requested.emit([dir_path])
+
+    def _move_selected_up(self):
+        """Start the selected queued items one place earlier."""
+        selected = self.selected_item_ids()
+        for item_id in selected:
+            self.batch_queue.move_up(item_id)
+        self._select(selected)
+
+    def _move_selected_down(self):
+        """Start the selected queued items one place later."""
+        selected = self.selected_item_ids()
+        # Move the lowest item first so adjacent items keep their order
+        for item_id in reversed(selected):
+            self.batch_queue.move_down(item_id)
+        self._select(selected)
+
+    def _cancel_selected(self):
+        """Cancel the selected queued and running items."""
+        for item_id in self.selected_item_ids():
+            self.batch_queue.cancel(item_id)
+        self._update_buttons()
+
+    def _clear_finished(self):
+        """Remove finished items from the queue and the table."""
+        self.batch_queue.clear_finished()
+        self._rebuild()
+
+    def _on_item_added(self, item_id: int):
+        """Add a row for a new item."""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+
+        file_item = QTableWidgetItem()
+        file_item.setData(Qt.UserRole, item_id)
+        self.table.setItem(row, FILE_COLUMN, file_item)
+        self.table.setItem(row, STATUS_COLUMN, QTableWidgetItem())
+        self.table.setItem(row, TIME_COLUMN, QTableWidgetItem())
+
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        self.table.setCellWidget(row, PROGRESS_COLUMN, progress)
+
+        self._rows[item_id] = row
+        self._refresh_item(item_id)
+
+    def _on_item_progress(self, item_id: int, percentage: int, message: str):
+        """Update an item's progress bar."""
+        row = self._rows.get(item_id)
+        if row is None:
+            return
+        self.table.cellWidget(row, PROGRESS_COLUMN).setValue(percentage)
+        self.table.item(row, STATUS_COLUMN).setToolTip(message)
+
+    def _on_order_changed(self):
+        """Re-sort rows to the new start order, keeping the selection."""
+        selected = self.selected_item_ids()
+        self._rebuild()
+        self._select(selected)
+
+    def _on_throughput_updated(self, finished: int, total: int, files_per_second: float):
+        """Show batch progress and throughput."""
+        if files_per_second > 0:
+            self.throughput_label.setText(
+                f"{finished} of {total} files finished ({files_per_second:.2f} files/s)"
+            )
+        else:
+            self.throughput_label.setText(f"{finished} of {total} files finished")
+
+    def _refresh_item(self, item_id: int, *args):
+        """Update an item's row from its queue state."""
+        row = self._rows.get(item_id)
+        item = self.batch_queue.items.get(item_id)
+        if row is None or item is None:
+            return
+
+        file_item = self.table.item(row, FILE_COLUMN)
+        file_item.setText(Path(item.input_path).name)
+        file_item.setToolTip(item.input_path)
+
+        status_item = self.table.item(row, STATUS_COLUMN)
+        status_item.setText(_STATUS_TEXT.get(item.status, item.status))
+        if item.status == FAILED and item.result:
+            status_item.setToolTip(item.result.get('error', ''))
+
+        self.table.cellWidget(row, PROGRESS_COLUMN).setValue(item.progress)
+        if item.elapsed is not None:
+            self.table.item(row, TIME_COLUMN).setText(f"{item.elapsed:.1f} s")
+        self._update_buttons()
+
+    def _rebuild(self):
+        """Rebuild the table: finished and running items first, then the queue order."""
+        pending = self.batch_queue.pending_ids()
+        started = [item_id for item_id in self.batch_queue.items if item_id not in pending]
+
+        self.table.setRowCount(0)
+        self._rows.clear()
+        for item_id in started + pending:
+            self._on_item_added(item_id)
+
+    def _select(self, item_ids: List[int]):
+        """Select the rows of the given items."""
+        self.table.clearSelection()
+        mode = self.table.selectionMode()
+        self.table.setSelectionMode(QAbstractItemView.MultiSelection)
+        for item_id in item_ids:
+            row = self._rows.get(item_id)
+            if row is not None:
+                self.table.selectRow(row)
+        self.table.setSelectionMode(mode)
+
+    def _update_buttons(self):
+        """Enable queue actions only for selections they apply to."""
+        pending = set(self.batch_queue.pending_ids())
+        selected = [self.batch_queue.items.get(item_id) for item_id in self.selected_item_ids()]
+        has_queued = any(item is not None and item.item_id in pending for item in selected)
+        has_running = any(item is not None and item.status == RUNNING for item in selected)
+        self.up_btn.setEnabled(has_queued)
+        self.down_btn.setEnabled(has_queued)
+        self.cancel_btn.setEnabled(has_queued or has_running)
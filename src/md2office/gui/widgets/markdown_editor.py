@@ -2,17 +2,131 @@
 Markdown Editor Widget
 
 Provides a text editor for editing markdown source code with syntax awareness.
+Files above LARGE_FILE_THRESHOLD are opened in large-file mode: they are
+loaded in chunks on a background thread, only the visible lines are
+highlighted, and edits are reported as line ranges rather than as the
+whole text.
 """
 
+import re
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from PySide6.QtWidgets import QPlainTextEdit
-from PySide6.QtCore import Qt, Signal, QTimer
-from PySide6.QtGui import QFont, QTextCharFormat, QColor, QSyntaxHighlighter, QTextDocument
+from PySide6.QtCore import Qt, QObject, Signal, QTimer
+from PySide6.QtGui import (
+    QFont, QTextCharFormat, QColor, QSyntaxHighlighter, QTextDocument, QTextCursor, QTextLayout
+)
+
+from ..workers.preview_worker import preview_delay
+from ..workers.file_loader import FileLoadWorker
+
+# Files of this size (bytes) or more are opened in large-file mode
+LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+
+# Estimated editor memory per byte of a file (UTF-16 text and block data)
+DOCUMENT_MEMORY_FACTOR = 4
+
+# Default limit for the estimated editor memory of a file (bytes)
+DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+
+# Lines above the viewport scanned for code blocks and front matter when
+# only visible lines are highlighted
+HIGHLIGHT_LOOKBACK_LINES = 200
+
+
+# Block states: outside any multi-line construct, inside YAML front
+# matter, or inside a fenced code block (the fence character and length
+# are encoded in the state so only a matching fence closes the block)
+NORMAL_STATE = -1
+FRONT_MATTER_STATE = 1
+_FENCE_STATE_BASE = 16
+
+# Patterns are compiled once. Inline formats are layered in this order,
+# later spans overriding earlier ones, so italic shows inside bold and a
+# link keeps its format around formatted text. Code span contents are
+# masked for the other patterns so they are not formatted.
+_HEADING = re.compile(r'#{1,6}\s+\S')
+_FENCE = re.compile(r' {0,3}(`{3,}|~{3,})')
+_CODE = re.compile(r'`[^`]+`')
+_INLINE_LAYERS = (
+    ('bold', re.compile(r'\*\*.+?\*\*')),
+    ('italic', re.compile(r'(?<!\*)\*[^*]+?\*(?!\*)')),
+    ('code', _CODE),
+    ('link', re.compile(r'\[[^\]]+\]\([^)]+\)')),
+)
+
+
+def _fence_state(fence: str) -> int:
+    """Block state for the inside of a code block opened by a fence."""
+    return _FENCE_STATE_BASE + 2 * len(fence) + (fence[0] == '~')
+
+
+def _closes_fence(text: str, state: int) -> bool:
+    """Whether a line closes the code block of the given state."""
+    match = _FENCE.match(text)
+    if match is None or text[match.end():].strip():
+        return False
+    fence = match.group(1)
+    opening_length, tilde = divmod(state - _FENCE_STATE_BASE, 2)
+    return (fence[0] == '~') == bool(tilde) and len(fence) >= opening_length
+
+
+def scan_line(text: str, previous: int, first_line: bool = False) -> Tuple[int, List[Tuple[int, int, str]]]:
+    """
+    Highlight one line of markdown.
+    
+    Args:
+        text: Line text
+        previous: Block state at the end of the previous line
+        first_line: Whether this is the document's first line (where
+            front matter may start)
+        
+    Returns:
+        Tuple of (block state at the end of the line, list of
+        (start, length, format name) spans)
+    """
+    # Inside front matter (closed by --- or ...)
+    if previous == FRONT_MATTER_STATE:
+        closed = text.rstrip() in ('---', '...')
+        return NORMAL_STATE if closed else FRONT_MATTER_STATE, [(0, len(text), 'front_matter')]
+    
+    # Inside a fenced code block
+    if previous >= _FENCE_STATE_BASE:
+        state = NORMAL_STATE if _closes_fence(text, previous) else previous
+        return state, [(0, len(text), 'code_block')]
+    
+    # Front matter only starts on the first line
+    if first_line and text.rstrip() == '---':
+        return FRONT_MATTER_STATE, [(0, len(text), 'front_matter')]
+    
+    fence = _FENCE.match(text)
+    if fence is not None and not (fence.group(1)[0] == '`' and '`' in text[fence.end():]):
+        return _fence_state(fence.group(1)), [(0, len(text), 'code_block')]
+    
+    spans = []
+    # Headers (# Header)
+    if _HEADING.match(text):
+        spans.append((0, len(text), 'header'))
+    
+    # Bold, italic, inline code and links
+    masked = text
+    if '`' in text:
+        masked = _CODE.sub(lambda match: '\0' * len(match.group()), text)
+    for name, pattern in _INLINE_LAYERS:
+        for match in pattern.finditer(text if name == 'code' else masked):
+            spans.append((match.start(), match.end() - match.start(), name))
+    return NORMAL_STATE, spans
 
 
 class MarkdownHighlighter(QSyntaxHighlighter):
-    """Basic syntax highlighter for markdown."""
+    """
+    Stateful syntax highlighter for markdown.
+    
+    Fenced code blocks and YAML front matter span several lines: each
+    block's state records whether it ends inside one, so after an edit
+    Qt only rehighlights the following blocks while their state changes.
+    """
     
     def __init__(self, parent: QTextDocument):
         super().__init__(parent)
@@ -40,43 +154,115 @@ class MarkdownHighlighter(QSyntaxHighlighter):
         code_format = QTextCharFormat()
         code_format.setForeground(QColor("#c7254e"))
         code_format.setBackground(QColor("#f9f2f4"))
-        code_format.setFontFamily("Courier New")
+        code_format.setFontFamilies(["Courier New"])
         self.code_format = code_format
         
+        # Fenced code blocks
+        code_block_format = QTextCharFormat()
+        code_block_format.setForeground(QColor("#333333"))
+        code_block_format.setBackground(QColor("#f5f5f5"))
+        code_block_format.setFontFamilies(["Courier New"])
+        self.code_block_format = code_block_format
+        
+        # Front matter
+        front_matter_format = QTextCharFormat()
+        front_matter_format.setForeground(QColor("#6a737d"))
+        self.front_matter_format = front_matter_format
+        
         # Links
         link_format = QTextCharFormat()
         link_format.setForeground(QColor("#0066cc"))
         link_format.setUnderlineStyle(QTextCharFormat.SingleUnderline)
         self.link_format = link_format
+        
+        # Formats by the span names of scan_line()
+        self.formats = {
+            'header': header_format,
+            'code': code_format,
+            'bold': bold_format,
+            'italic': italic_format,
+            'link': link_format,
+            'code_block': code_block_format,
+            'front_matter': front_matter_format
+        }
     
     def highlightBlock(self, text: str):
         """Apply syntax highlighting to a block of text."""
-        import re
-        
-        # Headers (# Header)
-        pattern = r'^(#{1,6})\s+(.+)$'
-        for match in re.finditer(pattern, text):
-            self.setFormat(match.start(), match.end(), self.header_format)
+        # The block number is only needed for a possible front matter start
+        first_line = text.rstrip() == '---' and self.currentBlock().blockNumber() == 0
+        state, spans = scan_line(text, self.previousBlockState(), first_line)
+        self.setCurrentBlockState(state)
+        formats = self.formats
+        for start, length, name in spans:
+            self.setFormat(start, length, formats[name])
+
+
+class VisibleBlockHighlighter(QObject):
+    """
+    Highlights only the lines in an editor's viewport.
+    
+    Used in large-file mode instead of MarkdownHighlighter, which
+    highlights every line of the document. Formats are set on the layouts
+    of the visible lines after scrolling, resizing and edits. Code blocks
+    and front matter opened above the viewport are found by scanning up
+    to HIGHLIGHT_LOOKBACK_LINES lines above it.
+    """
+    
+    def __init__(self, editor: QPlainTextEdit, formats: dict):
+        """
+        Initialize visible-line highlighter.
         
-        # Bold (**text**)
-        pattern = r'\*\*(.+?)\*\*'
-        for match in re.finditer(pattern, text):
-            self.setFormat(match.start(), match.end(), self.bold_format)
+        Args:
+            editor: Editor to highlight
+            formats: Formats by the span names of scan_line()
+        """
+        super().__init__(editor)
+        self._editor = editor
+        self._formats = formats
+        self.enabled = False
         
-        # Italic (*text*)
-        pattern = r'(?<!\*)\*([^*]+?)\*(?!\*)'
-        for match in re.finditer(pattern, text):
-            self.setFormat(match.start(), match.end(), self.italic_format)
+        # Scrolling and typing trigger one refresh per event loop pass
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.refresh)
+    
+    def schedule(self):
+        """Refresh the highlighting once control returns to the event loop."""
+        if self.enabled:
+            self._timer.start()
+    
+    def refresh(self):
+        """Highlight the lines currently in the viewport."""
+        if not self.enabled:
+            return
+        editor = self._editor
+        document = editor.document()
+        block = editor.firstVisibleBlock()
+        first = block.blockNumber()
         
-        # Inline code (`code`)
-        pattern = r'`([^`]+)`'
-        for match in re.finditer(pattern, text):
-            self.setFormat(match.start(), match.end(), self.code_format)
+        # State at the top of the viewport
+        state = NORMAL_STATE
+        scanned = document.findBlockByNumber(max(first - HIGHLIGHT_LOOKBACK_LINES, 0))
+        while scanned.isValid() and scanned.blockNumber() < first:
+            state = scan_line(scanned.text(), state, scanned.blockNumber() == 0)[0]
+            scanned = scanned.next()
         
-        # Links [text](url)
-        pattern = r'\[([^\]]+)\]\([^\)]+\)'
-        for match in re.finditer(pattern, text):
-            self.setFormat(match.start(), match.end(), self.link_format)
+        offset = editor.contentOffset()
+        bottom = editor.viewport().height()
+        formats = self._formats
+        while block.isValid() and editor.blockBoundingGeometry(block).translated(offset).top() <= bottom:
+            state, spans = scan_line(block.text(), state, block.blockNumber() == 0)
+            ranges = []
+            for start, length, name in spans:
+                format_range = QTextLayout.FormatRange()
+                format_range.start = start
+                format_range.length = length
+                format_range.format = formats[name]
+                ranges.append(format_range)
+            block.layout().setFormats(ranges)
+            document.markContentsDirty(block.position(), block.length())
+            block = block.next()
 
 
 class MarkdownEditor(QPlainTextEdit):
@@ -84,11 +270,22 @@ class MarkdownEditor(QPlainTextEdit):
     Text editor widget for markdown source code.
     
     Provides syntax highlighting, file operations, and change tracking.
+    
+    In large-file mode (files of LARGE_FILE_THRESHOLD bytes or more),
+    load_file() returns at once and the file arrives in chunks
+    (load_progress, then load_finished), only visible lines are
+    highlighted, and lines_changed replaces content_changed so the text
+    is not copied on every edit. Files whose estimated editor memory
+    exceeds memory_budget are not opened.
     """
     
     # Signals
     content_changed = Signal(str)  # Emitted when content changes (for preview)
+    lines_changed = Signal(int, int)  # Emitted with the first and last edited line (large-file mode)
     modification_changed = Signal(bool)  # Emitted when modification state changes
+    visible_line_changed = Signal(int)  # Emitted with the top visible line when scrolled
+    load_progress = Signal(int)  # Emitted with the percentage of a large file loaded
+    load_finished = Signal(bool)  # Emitted when a large file is loaded (or failed to)
     
     def __init__(self, parent=None):
         """Initialize markdown editor."""
@@ -105,14 +302,32 @@ class MarkdownEditor(QPlainTextEdit):
         
         # Setup syntax highlighting
         self.highlighter = MarkdownHighlighter(self.document())
+        self.visible_highlighter = VisibleBlockHighlighter(self, self.highlighter.formats)
         
-        # Debounce timer for preview updates
+        # Large-file mode and chunked loading
+        self.memory_budget = DEFAULT_MEMORY_BUDGET
+        self.last_error: Optional[str] = None
+        self._large_file_mode = False
+        self._loader: Optional[FileLoadWorker] = None
+        self._load_error: Optional[str] = None
+        # Lines edited since the last lines_changed, and the line count then
+        self._changed_lines: Optional[Tuple[int, int]] = None
+        self._block_count = 1
+        self.document().contentsChange.connect(self._on_contents_change)
+        
+        # Debounce timer for preview updates; its interval adapts to the
+        # document size and to how long previews take to render
+        self._preview_render_seconds = 0.0
         self._preview_timer = QTimer(self)
         self._preview_timer.setSingleShot(True)
         self._preview_timer.timeout.connect(self._emit_content_changed)
         
         # Connect text changes
         self.textChanged.connect(self._on_text_changed)
+        
+        # Report scrolling (except scrolling to follow the preview)
+        self._following_scroll = False
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
     
     def _setup_editor(self):
         """Setup editor appearance and behavior."""
@@ -132,19 +347,90 @@ class MarkdownEditor(QPlainTextEdit):
     
     def _on_text_changed(self):
         """Handle text changes."""
+        if self._loader is not None:
+            return
+        
         # Mark as modified
         if not self._is_modified:
             self._is_modified = True
             self.modification_changed.emit(True)
         
-        # Debounce preview updates (500ms delay)
+        # Debounce preview updates
         self._preview_timer.stop()
-        self._preview_timer.start(500)
+        self._preview_timer.start(self.preview_delay())
+    
+    def preview_delay(self) -> int:
+        """Get the current preview debounce interval in milliseconds."""
+        return preview_delay(self.document().characterCount(), self._preview_render_seconds)
+    
+    def set_preview_render_time(self, seconds: float):
+        """
+        Set the measured preview render time used for the debounce interval.
+        
+        Args:
+            seconds: Average preview render time in seconds
+        """
+        self._preview_render_seconds = seconds
     
     def _emit_content_changed(self):
         """Emit content changed signal for preview update."""
+        if self._large_file_mode:
+            if self._changed_lines is not None:
+                first, last = self._changed_lines
+                self._changed_lines = None
+                self.lines_changed.emit(first, last)
+            return
         self.content_changed.emit(self.toPlainText())
     
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """Record the lines edited in large-file mode."""
+        if not self._large_file_mode or self._loader is not None:
+            return
+        self.visible_highlighter.schedule()
+        document = self.document()
+        first = document.findBlock(position).blockNumber()
+        last = max(document.findBlock(position + added).blockNumber(), first)
+        
+        # Earlier edits below this one moved by the lines it added or removed
+        delta = document.blockCount() - self._block_count
+        self._block_count = document.blockCount()
+        if self._changed_lines is not None:
+            start, end = self._changed_lines
+            if start > first:
+                start = max(start + delta, first)
+            if end > first:
+                end = max(end + delta, first)
+            first, last = min(first, start), max(last, end)
+        self._changed_lines = (first, last)
+    
+    def resizeEvent(self, event):
+        """Re-highlight the visible lines after resizing."""
+        super().resizeEvent(event)
+        self.visible_highlighter.schedule()
+    
+    def _on_scrolled(self, value: int):
+        """Report the top visible line after the user scrolled."""
+        self.visible_highlighter.schedule()
+        if not self._following_scroll:
+            self.visible_line_changed.emit(self.firstVisibleBlock().blockNumber())
+    
+    def scroll_to_line(self, line: int):
+        """
+        Scroll so that a line is at the top, without reporting it back.
+        
+        Args:
+            line: 0-based line (block) number
+        """
+        block = self.document().findBlockByNumber(line)
+        if not block.isValid():
+            return
+        self._following_scroll = True
+        try:
+            # The scroll bar counts layout lines (wrapped lines included)
+            self.verticalScrollBar().setValue(block.firstLineNumber())
+        finally:
+            self._following_scroll = False
+    
     def load_file(self, file_path: Path) -> bool:
         """
         Load markdown content from file.
@@ -155,12 +441,19 @@ class MarkdownEditor(QPlainTextEdit):
         Returns:
             True if successful, False otherwise
         """
+        self.last_error = None
         try:
             if not file_path.exists():
                 return False
             
+            size = file_path.stat().st_size
+            if size >= LARGE_FILE_THRESHOLD:
+                return self._load_large_file(file_path, size)
+            
             content = file_path.read_text(encoding='utf-8')
+            self.cancel_loading()
             self.setPlainText(content)
+            self._set_large_file_mode(False)
             self._current_file = file_path
             self._is_modified = False
             self.modification_changed.emit(False)
@@ -169,6 +462,134 @@ class MarkdownEditor(QPlainTextEdit):
         except Exception:
             return False
     
+    def _load_large_file(self, file_path: Path, size: int) -> bool:
+        """
+        Start loading a large file in chunks, in large-file mode.
+        
+        Args:
+            file_path: Path to markdown file
+            size: File size in bytes
+            
+        Returns:
+            True if loading started, False if the file exceeds the memory budget
+        """
+        if size * DOCUMENT_MEMORY_FACTOR > self.memory_budget:
+            megabyte = 1024 * 1024
+            self.last_error = (
+                f"The file is too large to edit ({size // megabyte} MB); the editor's "
+                f"memory budget allows files of up to "
+                f"{self.memory_budget // DOCUMENT_MEMORY_FACTOR // megabyte} MB."
+            )
+            return False
+        
+        self.cancel_loading()
+        self._set_large_file_mode(True)
+        loader = FileLoadWorker(file_path, parent=self)
+        self._loader = loader
+        self._load_error = None
+        self._current_file = file_path
+        
+        # No undo history or edits while loading
+        self.setReadOnly(True)
+        self.document().setUndoRedoEnabled(False)
+        self.setPlainText("")
+        
+        loader.chunk_loaded.connect(partial(self._append_chunk, loader))
+        loader.progress_updated.connect(self.load_progress)
+        loader.failed.connect(partial(self._on_load_failed, loader))
+        loader.finished.connect(partial(self._on_load_finished, loader))
+        loader.start()
+        return True
+    
+    def _append_chunk(self, loader: FileLoadWorker, text: str):
+        """Append a loaded chunk to the document."""
+        if loader is not self._loader:
+            return
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        loader.chunk_done()
+    
+    def _on_load_failed(self, loader: FileLoadWorker, message: str):
+        """Record a loading error."""
+        if loader is self._loader:
+            self._load_error = message
+    
+    def _on_load_finished(self, loader: FileLoadWorker):
+        """Make the loaded document editable and report the result."""
+        loader.deleteLater()
+        if loader is not self._loader:
+            return
+        self._end_loading()
+        self.moveCursor(QTextCursor.Start)
+        self._is_modified = False
+        self.modification_changed.emit(False)
+        
+        if self._load_error is not None:
+            self.last_error = f"Could not read the file: {self._load_error}"
+        self.visible_highlighter.schedule()
+        self.load_finished.emit(self._load_error is None)
+    
+    def _end_loading(self):
+        """Leave the loading state."""
+        self._loader = None
+        self._changed_lines = None
+        self._block_count = self.document().blockCount()
+        self.document().setUndoRedoEnabled(True)
+        self.setReadOnly(False)
+    
+    def cancel_loading(self):
+        """Stop loading a large file, keeping what was loaded so far."""
+        loader = self._loader
+        if loader is None:
+            return
+        loader.cancel()
+        loader.wait()
+        self._end_loading()
+    
+    def _set_large_file_mode(self, enabled: bool):
+        """Switch between full and visible-line highlighting."""
+        if enabled == self._large_file_mode:
+            return
+        self._large_file_mode = enabled
+        self._changed_lines = None
+        # Attaching the highlighter highlights the whole document
+        self.highlighter.setDocument(None if enabled else self.document())
+        self.visible_highlighter.enabled = enabled
+        self.visible_highlighter.schedule()
+    
+    @property
+    def large_file_mode(self) -> bool:
+        """Whether the document was opened in large-file mode."""
+        return self._large_file_mode
+    
+    @property
+    def is_loading(self) -> bool:
+        """Whether a large file is still being loaded."""
+        return self._loader is not None
+    
+    def text_range(self, first_line: int, last_line: int) -> str:
+        """
+        Get the text of a range of lines without copying the whole document.
+        
+        Args:
+            first_line: First line (0-based)
+            last_line: Last line, included (clamped to the document)
+            
+        Returns:
+            Text of the lines
+        """
+        document = self.document()
+        first = document.findBlockByNumber(max(first_line, 0))
+        last = document.findBlockByNumber(min(last_line, document.blockCount() - 1))
+        if not first.isValid() or not last.isValid():
+            return ""
+        cursor = QTextCursor(document)
+        cursor.setPosition(first.position())
+        cursor.setPosition(last.position() + last.length() - 1, QTextCursor.KeepAnchor)
+        # Selections separate lines with U+2029
+        return cursor.selectedText().replace('\u2029', '\n')
+    
     def save_file(self, file_path: Optional[Path] = None) -> bool:
         """
         Save markdown content to file.
@@ -180,7 +601,7 @@ class MarkdownEditor(QPlainTextEdit):
             True if successful, False otherwise
         """
         target_file = file_path or self._current_file
-        if not target_file:
+        if not target_file or self.is_loading:
             return False
         
         try:
@@ -195,14 +616,18 @@ class MarkdownEditor(QPlainTextEdit):
     
     def new_file(self):
         """Create a new empty document."""
+        self.cancel_loading()
         self.setPlainText("")
+        self._set_large_file_mode(False)
         self._current_file = None
         self._is_modified = False
         self.modification_changed.emit(False)
     
     def clear(self):
         """Clear the editor content."""
+        self.cancel_loading()
         self.setPlainText("")
+        self._set_large_file_mode(False)
         self._current_file = None
         self._is_modified = False
         self.modification_changed.emit(False)
@@ -2,29 +2,94 @@
 Markdown Viewer Widget
 
 Displays markdown content with Mermaid.js diagram support using QWebEngineView.
+The viewer loads a locally bundled shell page once and pushes each update's
+HTML body into it with JavaScript, so scripts are not reloaded (and nothing
+is fetched from the network) and unchanged diagrams are not re-rendered.
+Long documents are virtualized: only the parts near the viewport are
+rendered (see preview_parts).
+
+QtWebEngine is only imported when the web view is created, which the main
+window defers until it has been shown: loading QtWebEngine and starting
+its renderer process take most of the GUI's start-up time.
 """
 
+import html
+import json
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt, QUrl
+from PySide6.QtCore import Qt, QObject, QUrl, Signal, Slot
 from PySide6.QtGui import QFont
 
-# Try to import QWebEngineView, handle gracefully if not available
+from ...router import ConversionPipeline
+from ...parser import ASTCache
+from ...generators.html_generator import HTMLGenerator
+from ...cancellation import check_cancelled
+from ..workers.preview_worker import PreviewRenderer
+from .preview_parts import (
+    PreviewContent, PreviewPart, VIRTUAL_PREVIEW_LINES,
+    split_parts, part_element, placeholder_element
+)
+
+# QWebEngineView is imported by load_web_engine() on first use
+# (None until then, False if PySide6-QtWebEngine is not installed)
+WEBENGINE_AVAILABLE: Optional[bool] = None
+QWebEngineView = None
+
+# QWebChannel lets the page request the parts of virtualized documents
 try:
-    from PySide6.QtWebEngineWidgets import QWebEngineView
-    WEBENGINE_AVAILABLE = True
+    from PySide6.QtWebChannel import QWebChannel
+    WEBCHANNEL_AVAILABLE = True
 except ImportError:
-    WEBENGINE_AVAILABLE = False
-    # Create a dummy class for type hints
-    class QWebEngineView:
-        def __init__(self, *args, **kwargs):
-            raise ImportError(
-                "QWebEngineView is not available. "
-                "Please install PySide6-QtWebEngine package:\n"
-                "  pip install PySide6-QtWebEngine"
-            )
+    WEBCHANNEL_AVAILABLE = False
+
+# Shell page and its scripts and styles (bundled with the package)
+PREVIEW_RESOURCES = Path(__file__).parent.parent / 'resources' / 'preview'
+SHELL_PAGE = PREVIEW_RESOURCES / 'shell.html'
+
+# Marker in the shell page replaced by the body of standalone documents
+BODY_PLACEHOLDER = '<!--PREVIEW_BODY-->'
+
+
+def load_web_engine() -> bool:
+    """
+    Import QWebEngineView if it has not been imported yet.
+    
+    Returns:
+        True if QWebEngineView is available
+    """
+    global WEBENGINE_AVAILABLE, QWebEngineView
+    if WEBENGINE_AVAILABLE is None:
+        try:
+            from PySide6.QtWebEngineWidgets import QWebEngineView
+            WEBENGINE_AVAILABLE = True
+        except ImportError:
+            WEBENGINE_AVAILABLE = False
+    return WEBENGINE_AVAILABLE
+
+
+class PreviewBridge(QObject):
+    """
+    Object the preview page calls through QWebChannel.
+    
+    Signals:
+        parts_requested: Emitted with the keys of parts coming into view
+        scrolled: Emitted with the source line at the top of the page
+    """
+    
+    parts_requested = Signal(list)  # part keys
+    scrolled = Signal(int)  # source line
+    
+    @Slot(list)
+    def requestParts(self, keys: List[str]):
+        """Request the HTML of placeholder parts (called by the page)."""
+        self.parts_requested.emit(list(keys))
+    
+    @Slot(int)
+    def previewScrolled(self, line: int):
+        """Report the source line at the top of the page (called by the page)."""
+        self.scrolled.emit(line)
 
 
 class MarkdownViewer(QWidget):
@@ -32,44 +97,131 @@ class MarkdownViewer(QWidget):
     Widget for displaying markdown content with Mermaid.js support.
     
     Uses QWebEngineView to render HTML generated from markdown,
-    with Mermaid.js integration for diagram rendering.
+    with Mermaid.js integration for diagram rendering. The web view is
+    created by create_web_view(), not by the constructor; content set
+    before then is shown once its shell page has loaded. The shell page is
+    loaded once; set_markdown() then only replaces the changed parts of
+    its body (see preview.js), and rendered diagrams are cached by the
+    hash of their source.
+    
+    render_markdown() renders on a background thread instead, applying
+    only the newest request's result, so editing stays responsive.
+    
+    The body is made of parts, one per section, that know their source
+    line; scroll_to_line() and preview_scrolled keep the preview in step
+    with the editor. Documents of VIRTUAL_PREVIEW_LINES lines or more are
+    sent as placeholders that the page fills as they scroll into view.
+    
+    Signals:
+        preview_rendered: Emitted after a background render is shown, with
+            the average render time in seconds
+        preview_scrolled: Emitted with the source line at the top of the
+            preview when the user scrolls it
     """
     
-    def __init__(self, parent=None):
-        """Initialize markdown viewer."""
+    preview_rendered = Signal(float)  # average render seconds
+    preview_scrolled = Signal(int)  # source line
+    
+    def __init__(self, parent=None, ast_cache: Optional[ASTCache] = None):
+        """
+        Initialize markdown viewer.
+        
+        Args:
+            parent: Parent widget
+            ast_cache: Parsed-AST cache shared with the conversion service,
+                so a previewed document is not parsed again for export
+        """
         super().__init__(parent)
+        self.pipeline = ConversionPipeline(ast_cache=ast_cache)
         
-        # Check if QWebEngineView is available
-        if not WEBENGINE_AVAILABLE:
-            self._show_error("QWebEngineView is not available. Please install PySide6-QtWebEngine.")
-            return
+        # Long documents are virtualized when the page can request parts
+        self.virtualize = False
+        
+        # Background rendering for render_markdown()
+        self.renderer = PreviewRenderer(self._compose, self)
+        self.renderer.rendered.connect(self._on_body_rendered)
+        self.renderer.failed.connect(self._on_render_failed)
+        
+        # Page calls for parts and scroll positions
+        self.bridge = PreviewBridge(self)
+        self.bridge.parts_requested.connect(self._on_parts_requested)
+        self.bridge.scrolled.connect(self.preview_scrolled)
         
         # Create layout
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
         
-        # Create web view for rendering HTML
-        try:
-            self.web_view = QWebEngineView(self)
-            layout.addWidget(self.web_view)
-        except Exception as e:
-            self._show_error(f"Failed to initialize QWebEngineView: {str(e)}")
-            return
-        
         # Status label for errors/loading
-        self.status_label = QLabel("Ready")
+        self.status_label = QLabel("Loading preview...")
         self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setVisible(False)
         self.status_label.setStyleSheet("background-color: #f0f0f0; padding: 8px;")
         layout.addWidget(self.status_label)
         
-        # Initialize with empty content
-        self.set_markdown("")
+        # Web view, created by create_web_view()
+        self.web_view: Optional[QWebEngineView] = None
+        self._web_view_failed = False
+        
+        # Latest request made before the web view was created
+        self._deferred: Optional[tuple] = None
+        
+        # Content shown in the page, and content waiting for the page to load
+        self._shell_loaded = False
+        self._shown: Optional[PreviewContent] = None
+        self._pending: Optional[PreviewContent] = PreviewContent("")
+        
+        # Renders the parts of the shown virtualized document on request
+        self._part_generator = HTMLGenerator()
+    
+    def create_web_view(self) -> bool:
+        """
+        Create the web view and load the shell page (once).
+        
+        Imports QtWebEngine on first use. Content requested earlier is
+        rendered now.
+        
+        Returns:
+            True if the web view was created
+        """
+        if self.web_view is not None or self._web_view_failed:
+            return self.web_view is not None
+        
+        # Check if QWebEngineView is available
+        if not load_web_engine():
+            self._show_error("QWebEngineView is not available. Please install PySide6-QtWebEngine.")
+            return False
+        
+        # Create web view for rendering HTML
+        try:
+            web_view = QWebEngineView(self)
+        except Exception as e:
+            self._show_error(f"Failed to initialize QWebEngineView: {str(e)}")
+            return False
+        self.web_view = web_view
+        self.layout().insertWidget(0, web_view)
+        
+        # Let the page call the bridge
+        if WEBCHANNEL_AVAILABLE:
+            self.channel = QWebChannel(self)
+            self.channel.registerObject('md2officeBridge', self.bridge)
+            web_view.page().setWebChannel(self.channel)
+            self.virtualize = True
+        
+        # Load the shell page once; content is pushed into it afterwards
+        web_view.loadFinished.connect(self._on_shell_loaded)
+        web_view.load(QUrl.fromLocalFile(str(SHELL_PAGE)))
+        
+        if self._deferred is not None:
+            request, self._deferred = self._deferred, None
+            self.render_markdown(*request)
+        return True
     
     def _show_error(self, message: str):
         """Show error message when QWebEngineView is not available."""
-        layout = QVBoxLayout(self)
+        self._web_view_failed = True
+        self._deferred = None
+        self.status_label.setVisible(False)
+        layout = self.layout()
         layout.setContentsMargins(20, 20, 20, 20)
         
         error_label = QLabel(message)
@@ -85,19 +237,57 @@ class MarkdownViewer(QWidget):
             markdown_content: Raw markdown text
             base_path: Base path for resolving relative image URLs
         """
-        if not WEBENGINE_AVAILABLE or not hasattr(self, 'web_view'):
+        if self.web_view is None:
+            self._defer(markdown_content, base_path)
             return
         
+        # This content supersedes any background render still in flight
+        self.renderer.invalidate()
         try:
-            html = self._markdown_to_html(markdown_content, base_path)
-            self.web_view.setHtml(html)
+            self._show_content(self._compose(markdown_content, base_path))
             self.status_label.setVisible(False)
         except Exception as e:
-            error_msg = f"Error rendering markdown: {str(e)}"
-            self.status_label.setText(error_msg)
-            self.status_label.setVisible(True)
-            if hasattr(self, 'web_view'):
-                self.web_view.setHtml(f"<html><body><p style='color: red;'>{error_msg}</p></body></html>")
+            self._show_error_body(f"Error rendering markdown: {str(e)}")
+    
+    def render_markdown(self, markdown_content: str, base_path: Optional[Path] = None):
+        """
+        Render markdown on a background thread and show it when done.
+        
+        Results of earlier requests that finish later are dropped.
+        
+        Args:
+            markdown_content: Raw markdown text
+            base_path: Base path for resolving relative image URLs
+        """
+        if self.web_view is None:
+            self._defer(markdown_content, base_path)
+            return
+        self.renderer.request(markdown_content, base_path)
+    
+    def _defer(self, markdown_content: str, base_path: Optional[Path]):
+        """Keep the latest request until the web view is created."""
+        if not self._web_view_failed:
+            self._deferred = (markdown_content, base_path)
+    
+    def scroll_to_line(self, line: int):
+        """
+        Scroll the preview to the part showing a source line.
+        
+        Args:
+            line: 0-based source line
+        """
+        if self.web_view is not None and self._shell_loaded:
+            self.web_view.page().runJavaScript(f"md2officePreview.scrollToLine({int(line)});")
+    
+    def _on_body_rendered(self, content: PreviewContent, seconds: float):
+        """Show content rendered in the background."""
+        self._show_content(content)
+        self.status_label.setVisible(False)
+        self.preview_rendered.emit(self.renderer.render_seconds)
+    
+    def _on_render_failed(self, message: str):
+        """Show an error from a background render."""
+        self._show_error_body(f"Error rendering markdown: {message}")
     
     def set_markdown_file(self, file_path: Path):
         """
@@ -106,7 +296,7 @@ class MarkdownViewer(QWidget):
         Args:
             file_path: Path to markdown file
         """
-        if not WEBENGINE_AVAILABLE or not hasattr(self, 'web_view'):
+        if self._web_view_failed:
             return
         
         try:
@@ -116,15 +306,66 @@ class MarkdownViewer(QWidget):
             content = file_path.read_text(encoding='utf-8')
             self.set_markdown(content, base_path=file_path.parent)
         except Exception as e:
-            error_msg = f"Error loading file: {str(e)}"
-            self.status_label.setText(error_msg)
+            self._show_error_body(f"Error loading file: {str(e)}")
+    
+    def _show_content(self, content: PreviewContent):
+        """
+        Show content in the shell page.
+        
+        Args:
+            content: Preview content
+        """
+        if not self._shell_loaded:
+            self._pending = content
+            return
+        shown = self._shown
+        self._shown = content
+        if shown is not None and (content.body, content.lines) == (shown.body, shown.lines):
+            return
+        # Heading ids of parts rendered on request are unique per document
+        self._part_generator = HTMLGenerator()
+        self.web_view.page().runJavaScript(self._update_script(content))
+    
+    def _show_error_body(self, error_msg: str):
+        """Show an error in the status label and the page."""
+        self.status_label.setText(error_msg)
+        self.status_label.setVisible(True)
+        self._show_content(PreviewContent(f"<p style='color: red;'>{html.escape(error_msg)}</p>"))
+    
+    def _on_shell_loaded(self, ok: bool):
+        """Push the pending content once the shell page has loaded."""
+        if not ok:
+            self.status_label.setText(f"Failed to load preview page: {SHELL_PAGE}")
             self.status_label.setVisible(True)
-            if hasattr(self, 'web_view'):
-                self.web_view.setHtml(f"<html><body><p style='color: red;'>{error_msg}</p></body></html>")
+            return
+        self._shell_loaded = True
+        self.status_label.setVisible(False)
+        self._shown = None
+        if self._pending is not None:
+            content, self._pending = self._pending, None
+            self._show_content(content)
+    
+    def _on_parts_requested(self, keys: List[str]):
+        """Send the page the HTML of the requested placeholder parts."""
+        if self._shown is None:
+            return
+        rendered = {}
+        for key in keys:
+            part = self._shown.parts.get(key)
+            if part is not None:
+                rendered[key] = self._render_part(self._part_generator, part,
+                                                  self._shown.base_path)
+        if rendered:
+            self.web_view.page().runJavaScript(f"md2officePreview.fillParts({json.dumps(rendered)});")
+    
+    @staticmethod
+    def _update_script(content: PreviewContent) -> str:
+        """JavaScript that replaces the shell page's body content."""
+        return f"md2officePreview.update({json.dumps(content.body)}, {json.dumps(content.lines)});"
     
     def _markdown_to_html(self, markdown_content: str, base_path: Optional[Path] = None) -> str:
         """
-        Convert markdown to HTML with Mermaid.js support.
+        Convert markdown to a standalone HTML document with Mermaid.js support.
         
         Args:
             markdown_content: Raw markdown text
@@ -133,60 +374,74 @@ class MarkdownViewer(QWidget):
         Returns:
             Complete HTML document as string
         """
-        # Pre-process: Extract Mermaid blocks and replace with HTML comments
-        # HTML comments survive markdown processing and can be easily found
-        mermaid_blocks = []
-        mermaid_pattern = r'```\s*mermaid\s*\n(.*?)```'
-        
-        def extract_mermaid(match):
-            diagram_code = match.group(1).strip()
-            block_id = len(mermaid_blocks)
-            mermaid_blocks.append(diagram_code)
-            # Use HTML comment as placeholder - survives markdown processing
-            return f"<!-- MERMAID_BLOCK_{block_id} -->"
-        
-        # Extract all Mermaid blocks first (case-insensitive)
-        processed_content = re.sub(mermaid_pattern, extract_mermaid, markdown_content, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Try to import markdown library
-        try:
-            import markdown
-            # Use extensions for better markdown support
-            extensions = ['fenced_code', 'tables', 'nl2br', 'toc']
-            try:
-                # Try to add codehilite if available
-                extensions.append('codehilite')
-            except:
-                pass
-            
-            md = markdown.Markdown(extensions=extensions)
-            html_body = md.convert(processed_content)
-        except ImportError:
-            # Fallback to basic markdown conversion if library not available
-            html_body = self._basic_markdown_to_html(processed_content)
-        
-        # Restore Mermaid blocks as divs
-        # Replace HTML comment placeholders with actual Mermaid divs
-        import hashlib
-        for i, diagram_code in enumerate(mermaid_blocks):
-            placeholder_comment = f"<!-- MERMAID_BLOCK_{i} -->"
-            diagram_id = f"mermaid-{hashlib.md5(diagram_code.encode()).hexdigest()[:8]}"
-            mermaid_div = f'<div class="mermaid" id="{diagram_id}">{diagram_code}</div>'
-            
-            # Replace the HTML comment with the Mermaid div
-            html_body = html_body.replace(placeholder_comment, mermaid_div)
+        body = self._markdown_to_body(markdown_content, base_path)
+        return self._build_html_document(body, base_path)
+    
+    def _markdown_to_body(self, markdown_content: str, base_path: Optional[Path] = None) -> str:
+        """
+        Convert markdown to preview body HTML, with every part rendered.
         
-        # Process any remaining Mermaid blocks that might have been missed
-        html_body = self._process_mermaid_blocks(html_body)
+        Args:
+            markdown_content: Raw markdown text
+            base_path: Base path for resolving relative image URLs
+            
+        Returns:
+            HTML body content
+        """
+        return self._compose(markdown_content, base_path, virtual=False).body
+    
+    def _compose(self, markdown_content: str, base_path: Optional[Path] = None,
+                 options: Optional[Dict[str, Any]] = None,
+                 virtual: Optional[bool] = None) -> PreviewContent:
+        """
+        Convert markdown to preview content.
         
-        # Process image paths to resolve relative URLs
-        if base_path:
-            html_body = self._process_image_paths(html_body, base_path)
+        The markdown is parsed by the conversion pipeline (through the
+        shared AST cache) and rendered by the HTML generator, so the
+        preview shows the same tree that is exported. Called on the
+        preview thread as well as the UI thread, so it does not touch
+        widgets.
         
-        # Build complete HTML document
-        html = self._build_html_document(html_body, base_path)
+        Args:
+            markdown_content: Raw markdown text
+            base_path: Base path for resolving relative image URLs
+            options: Extra conversion options (e.g. a cancellation token)
+            virtual: Whether to send parts as placeholders (by default,
+                for long documents when the page can request parts)
+            
+        Returns:
+            Preview content
+        """
+        options = {'ignore_errors': True, **(options or {})}
+        ast = self.pipeline.parse(markdown_content, options)
+        # Generators keep per-document state: one per render
+        generator = HTMLGenerator()
+        parts = split_parts(list(generator.iter_parts(ast)), markdown_content)
+        if virtual is None:
+            virtual = self.virtualize and markdown_content.count('\n') + 1 >= VIRTUAL_PREVIEW_LINES
+        
+        if virtual:
+            return PreviewContent(
+                ''.join(placeholder_element(part) for part in parts),
+                [part.line for part in parts],
+                {part.key: part for part in parts},
+                base_path
+            )
         
-        return html
+        elements = []
+        for part in parts:
+            check_cancelled(options, "preview")
+            elements.append(part_element(self._render_part(generator, part, base_path, options)))
+        return PreviewContent(''.join(elements), [part.line for part in parts], base_path=base_path)
+    
+    def _render_part(self, generator: HTMLGenerator, part: PreviewPart,
+                     base_path: Optional[Path] = None,
+                     options: Optional[Dict[str, Any]] = None) -> str:
+        """Render the blocks of a preview part, resolving image paths."""
+        part_html = generator.render_blocks(part.blocks, options)
+        if base_path and '<img' in part_html:
+            part_html = self._process_image_paths(part_html, base_path)
+        return part_html
     
     def _process_image_paths(self, html_content: str, base_path: Path) -> str:
         """
@@ -236,108 +491,9 @@ class MarkdownViewer(QWidget):
         return html_content
     
     
-    def _basic_markdown_to_html(self, markdown_content: str) -> str:
-        """
-        Basic markdown to HTML conversion without external libraries.
-        
-        This is a fallback implementation for basic markdown syntax.
-        """
-        html = markdown_content
-        
-        # Headings
-        html = re.sub(r'^### (.*?)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-        html = re.sub(r'^## (.*?)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'^# (.*?)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-        
-        # Bold
-        html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
-        
-        # Italic
-        html = re.sub(r'\*(.*?)\*', r'<em>\1</em>', html)
-        
-        # Code blocks (preserve for Mermaid processing)
-        html = re.sub(
-            r'```(\w+)?\n(.*?)```',
-            r'<pre><code class="language-\1">\2</code></pre>',
-            html,
-            flags=re.DOTALL
-        )
-        
-        # Inline code
-        html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
-        
-        # Paragraphs (wrap consecutive lines)
-        paragraphs = html.split('\n\n')
-        html = '\n'.join([f'<p>{p.strip()}</p>' if p.strip() and not p.strip().startswith('<') else p for p in paragraphs])
-        
-        # Line breaks
-        html = html.replace('\n', '<br>\n')
-        
-        return html
-    
-    def _process_mermaid_blocks(self, html_content: str) -> str:
-        """
-        Process Mermaid code blocks and convert them for Mermaid.js rendering.
-        
-        Args:
-            html_content: HTML content with code blocks
-            
-        Returns:
-            HTML with Mermaid blocks converted to div elements
-        """
-        import hashlib
-        
-        # Pattern to match code blocks - handle multiple formats:
-        # 1. <pre><code class="language-mermaid">...</code></pre>
-        # 2. <pre><code class="language-mermaid" data-language="mermaid">...</code></pre>
-        # 3. <pre><code>...</code></pre> (for heuristic detection)
-        # Use a more flexible pattern that handles whitespace variations
-        pattern = r'<pre><code(?:\s+[^>]*class="[^"]*language-([Mm]ermaid)[^"]*"[^>]*)?\s*>(.*?)</code></pre>'
-        
-        def replace_mermaid(match):
-            lang = match.group(1)
-            diagram_code = match.group(2)
-            
-            # Clean up HTML entities
-            diagram_code = diagram_code.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
-            # Remove leading/trailing whitespace and newlines
-            diagram_code = diagram_code.strip()
-            
-            # If language is explicitly mermaid, use it
-            if lang and lang.lower() == 'mermaid':
-                if not diagram_code:
-                    return match.group(0)  # Return original if empty
-                
-                # Generate unique ID for this diagram
-                diagram_id = f"mermaid-{hashlib.md5(diagram_code.encode()).hexdigest()[:8]}"
-                
-                # Replace with Mermaid div (preserve whitespace)
-                return f'<div class="mermaid" id="{diagram_id}">{diagram_code}</div>'
-            
-            # Check if it's a mermaid diagram by content (heuristic)
-            # Only apply heuristic if no language was specified
-            if not lang and diagram_code:
-                mermaid_keywords = ['graph', 'flowchart', 'sequenceDiagram', 'classDiagram', 
-                                   'stateDiagram', 'stateDiagram-v2', 'erDiagram', 'gantt', 
-                                   'pie', 'gitgraph', 'journey', 'mindmap', 'C4Context', 
-                                   'quadrantChart', 'requirement', 'timeline']
-                
-                first_line = diagram_code.split('\n')[0].strip()
-                # Check if first line starts with a mermaid keyword
-                if any(first_line.startswith(keyword) for keyword in mermaid_keywords):
-                    diagram_id = f"mermaid-{hashlib.md5(diagram_code.encode()).hexdigest()[:8]}"
-                    return f'<div class="mermaid" id="{diagram_id}">{diagram_code}</div>'
-            
-            return match.group(0)  # Return original if not mermaid
-        
-        # Replace mermaid code blocks (non-greedy match, case-insensitive)
-        html_content = re.sub(pattern, replace_mermaid, html_content, flags=re.DOTALL | re.IGNORECASE)
-        
-        return html_content
-    
     def _build_html_document(self, body_content: str, base_path: Optional[Path] = None) -> str:
         """
-        Build complete HTML document with Mermaid.js integration.
+        Build a standalone HTML document from the shell page.
         
         Args:
             body_content: HTML body content
@@ -346,216 +502,17 @@ class MarkdownViewer(QWidget):
         Returns:
             Complete HTML document
         """
-        # Mermaid.js CDN (using latest stable version)
-        mermaid_js = "https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"
-        # Highlight.js CDN for syntax highlighting
-        highlight_js = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js"
-        highlight_css = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/default.min.css"
-        
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Markdown Preview</title>
-    <link rel="stylesheet" href="{highlight_css}">
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-            line-height: 1.6;
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 20px;
-            color: #333;
-            background-color: #fff;
-        }}
-        h1 {{ font-size: 2em; margin-top: 0.67em; margin-bottom: 0.67em; }}
-        h2 {{ font-size: 1.5em; margin-top: 0.83em; margin-bottom: 0.83em; }}
-        h3 {{ font-size: 1.17em; margin-top: 1em; margin-bottom: 1em; }}
-        h4 {{ font-size: 1em; margin-top: 1.33em; margin-bottom: 1.33em; }}
-        h5 {{ font-size: 0.83em; margin-top: 1.67em; margin-bottom: 1.67em; }}
-        h6 {{ font-size: 0.67em; margin-top: 2.33em; margin-bottom: 2.33em; }}
-        p {{ margin: 1em 0; }}
-        code {{
-            background-color: #f4f4f4;
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-family: "Courier New", monospace;
-            font-size: 0.9em;
-        }}
-        pre {{
-            background-color: #f4f4f4;
-            padding: 10px;
-            border-radius: 5px;
-            overflow-x: auto;
-            border: 1px solid #ddd;
-        }}
-        pre code {{
-            background-color: transparent;
-            padding: 0;
-        }}
-        table {{
-            border-collapse: collapse;
-            width: 100%;
-            margin: 1em 0;
-        }}
-        table th, table td {{
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-        }}
-        table th {{
-            background-color: #f2f2f2;
-            font-weight: bold;
-        }}
-        blockquote {{
-            border-left: 4px solid #ddd;
-            margin: 1em 0;
-            padding-left: 1em;
-            color: #666;
-        }}
-        img {{
-            max-width: 100%;
-            height: auto;
-        }}
-        .mermaid {{
-            text-align: center;
-            margin: 20px 0;
-            background-color: #fff;
-            min-height: 100px;
-        }}
-        .mermaid-error {{
-            border: 1px solid #ff6b6b;
-            background-color: #ffe0e0;
-            padding: 10px;
-            margin: 20px 0;
-            border-radius: 5px;
-            color: #c92a2a;
-        }}
-        .mermaid-error code {{
-            background-color: #fff;
-            padding: 5px;
-            display: block;
-            margin-top: 10px;
-            font-size: 0.9em;
-        }}
-        a {{
-            color: #0066cc;
-            text-decoration: none;
-        }}
-        a:hover {{
-            text-decoration: underline;
-        }}
-        ul, ol {{
-            margin: 1em 0;
-            padding-left: 2em;
-        }}
-        li {{
-            margin: 0.5em 0;
-        }}
-        hr {{
-            border: none;
-            border-top: 1px solid #ddd;
-            margin: 2em 0;
-        }}
-    </style>
-    <script src="{highlight_js}"></script>
-    <script src="{mermaid_js}"></script>
-</head>
-<body>
-    {body_content}
-    <script>
-        // Wait for both DOM and scripts to be ready
-        (function() {{
-            function initMermaid() {{
-                // Check if Mermaid is loaded
-                if (typeof mermaid === 'undefined') {{
-                    console.warn('Mermaid.js not loaded, retrying...');
-                    setTimeout(initMermaid, 100);
-                    return;
-                }}
-                
-                // Initialize Mermaid.js
-                mermaid.initialize({{
-                    startOnLoad: false,
-                    theme: 'default',
-                    securityLevel: 'loose',
-                    flowchart: {{
-                        useMaxWidth: true,
-                        htmlLabels: true
-                    }},
-                    errorCallback: function(err, hash) {{
-                        console.error('Mermaid rendering error:', err);
-                        // Find the element and show error
-                        const element = document.getElementById(hash);
-                        if (element) {{
-                            element.innerHTML = '<div class="mermaid-error">' +
-                                '<strong>Mermaid Diagram Error:</strong><br>' +
-                                (err.message || String(err)).replace(/\\n/g, '<br>') +
-                                '<code>' + element.textContent + '</code>' +
-                                '</div>';
-                        }}
-                    }}
-                }});
-                
-                // Render all Mermaid diagrams
-                const mermaidElements = document.querySelectorAll('.mermaid');
-                console.log('Found', mermaidElements.length, 'Mermaid diagrams');
-                if (mermaidElements.length > 0) {{
-                    mermaid.run({{
-                        nodes: mermaidElements
-                    }}).then(function() {{
-                        console.log('Mermaid diagrams rendered successfully');
-                    }}).catch(function(err) {{
-                        console.error('Mermaid run error:', err);
-                        // Show error in each diagram element
-                        mermaidElements.forEach(function(el) {{
-                            if (!el.querySelector('svg')) {{
-                                el.innerHTML = '<div class="mermaid-error">' +
-                                    '<strong>Mermaid Rendering Failed:</strong><br>' +
-                                    (err.message || String(err)) +
-                                    '<code>' + el.textContent + '</code>' +
-                                    '</div>';
-                            }}
-                        }});
-                    }});
-                }}
-            }}
-            
-            function initHighlight() {{
-                // Initialize syntax highlighting
-                if (typeof hljs !== 'undefined') {{
-                    document.querySelectorAll('pre code:not(.mermaid *)').forEach(function(block) {{
-                        try {{
-                            hljs.highlightElement(block);
-                        }} catch (e) {{
-                            console.warn('Syntax highlighting failed:', e);
-                        }}
-                    }});
-                }}
-            }}
-            
-            // Initialize when DOM is ready
-            if (document.readyState === 'loading') {{
-                document.addEventListener('DOMContentLoaded', function() {{
-                    initHighlight();
-                    initMermaid();
-                }});
-            }} else {{
-                // DOM already loaded
-                initHighlight();
-                initMermaid();
-            }}
-        }})();
-    </script>
-</body>
-</html>"""
-        
-        return html
+        shell = SHELL_PAGE.read_text(encoding='utf-8')
+        # Resolve the shell's scripts and styles wherever the document is shown
+        base_url = QUrl.fromLocalFile(str(PREVIEW_RESOURCES) + '/').toString()
+        shell = shell.replace('<head>', f'<head>\n    <base href="{base_url}">', 1)
+        return shell.replace(BODY_PLACEHOLDER, body_content, 1)
     
     def clear(self):
         """Clear the viewer content."""
-        if hasattr(self, 'web_view'):
-            self.web_view.setHtml("")
-        self.status_label.setVisible(False)
+        self._deferred = None
+        if self.web_view is not None:
+            self.renderer.invalidate()
+            self._show_content(PreviewContent(""))
+            self.status_label.setVisible(False)
 
@@ -0,0 +1,217 @@
+"""
+Preview Parts
+
+The preview body is made of parts: one ``<section class="md2office-part">``
+per heading and the blocks up to the next heading. Each part records the
+source line it starts at, so the editor and the preview can keep their
+scroll positions in step.
+
+Long documents are virtualized: their parts are sent as empty placeholders
+sized by an estimated height, and the page asks for the HTML of the parts
+near the viewport as they scroll into view (see preview.js). The cost of
+showing a document then depends on what is visible, not on its length.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ...parser.ast_builder import ASTNode, NodeType
+from ...generators.html_generator import is_mermaid_diagram
+
+# Documents with at least this many source lines are virtualized
+VIRTUAL_PREVIEW_LINES = 5000
+
+# Class of the part elements in the preview page
+PART_CLASS = 'md2office-part'
+
+# Height estimates for placeholders (pixels)
+LINE_HEIGHT_PX = 24
+CODE_LINE_HEIGHT_PX = 18
+HEADING_HEIGHT_PX = 48
+BLOCK_MARGIN_PX = 16
+TABLE_ROW_HEIGHT_PX = 34
+DIAGRAM_HEIGHT_PX = 320
+CHARACTERS_PER_LINE = 90
+
+# Lines starting a heading or a code fence (in fenced code, '#' lines
+# are not headings), found in one pass over the source
+_HEADING_OR_FENCE_LINE = re.compile(r'^(?:(?P<fence>[ \t]*(?:```|~~~))|#{1,6}[ \t]+\S)',
+                                    re.MULTILINE)
+_FRONT_MATTER_DELIMITER = '---'
+
+
+@dataclass
+class PreviewPart:
+    """
+    A part of the preview: a heading and the blocks up to the next one.
+
+    Attributes:
+        key: Hash of the part's content (equal parts have equal keys)
+        line: Source line the part starts at (0-based)
+        blocks: Block nodes of the part
+        height: Estimated rendered height in pixels
+    """
+    key: str
+    line: int
+    blocks: List[ASTNode]
+    height: int
+
+
+@dataclass
+class PreviewContent:
+    """
+    Content pushed to the preview page.
+
+    Attributes:
+        body: Body HTML (rendered parts, or placeholders when virtual)
+        lines: Source line of each part, in document order
+        parts: Parts rendered on request, by key (empty unless virtual)
+        base_path: Base path for resolving relative image URLs
+    """
+    body: str
+    lines: List[int] = field(default_factory=list)
+    parts: Dict[str, PreviewPart] = field(default_factory=dict)
+    base_path: Optional[Path] = None
+
+    @property
+    def virtual(self) -> bool:
+        """Whether parts are rendered only when they come into view."""
+        return bool(self.parts)
+
+
+def heading_lines(markdown: str) -> List[int]:
+    """
+    Find the source lines of the headings of a document.
+
+    Lines in the front matter and in fenced code blocks are skipped.
+
+    Args:
+        markdown: Raw markdown text
+
+    Returns:
+        0-based line numbers, in document order
+    """
+    start = 0
+    if markdown.split('\n', 1)[0].strip() == _FRONT_MATTER_DELIMITER:
+        first_line_end = markdown.find('\n')
+        closing = re.compile(rf'^{_FRONT_MATTER_DELIMITER}[ \t]*$', re.MULTILINE)
+        match = closing.search(markdown, first_line_end + 1) if first_line_end >= 0 else None
+        if match:
+            start = match.end()
+
+    headings = []
+    in_fence = False
+    line = 0
+    position = 0
+    for match in _HEADING_OR_FENCE_LINE.finditer(markdown, start):
+        line += markdown.count('\n', position, match.start())
+        position = match.start()
+        if match.group('fence'):
+            in_fence = not in_fence
+        elif not in_fence:
+            headings.append(line)
+    return headings
+
+
+def part_key(blocks: List[ASTNode]) -> str:
+    """
+    Get the key of a part from its content.
+
+    Headings hash their own text only; their subsections are other parts.
+
+    Args:
+        blocks: Block nodes of the part
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for node in blocks:
+        if node.node_type == NodeType.HEADING:
+            digest.update(repr(('heading', node.level, node.content)).encode())
+        else:
+            digest.update(node.structural_hash().encode())
+    return digest.hexdigest()
+
+
+def estimate_height(blocks: List[ASTNode]) -> int:
+    """
+    Estimate the rendered height of blocks, for placeholder sizes.
+
+    Args:
+        blocks: Block nodes
+
+    Returns:
+        Height in pixels
+    """
+    height = 0
+    for node in blocks:
+        node_type = node.node_type
+        if node_type == NodeType.HEADING:
+            height += HEADING_HEIGHT_PX
+            continue
+        if node_type == NodeType.CODE_BLOCK:
+            if is_mermaid_diagram(node.metadata.get('language'), node.content):
+                height += DIAGRAM_HEIGHT_PX
+            else:
+                height += (node.content.count('\n') + 1) * CODE_LINE_HEIGHT_PX
+        elif node_type == NodeType.LIST:
+            height += sum(_text_lines(item.content) for item in node.children) * LINE_HEIGHT_PX
+        elif node_type == NodeType.TABLE:
+            height += (len(node.children) + 1) * TABLE_ROW_HEIGHT_PX
+        else:
+            height += _text_lines(node.content) * LINE_HEIGHT_PX
+        height += BLOCK_MARGIN_PX
+    return height
+
+
+def split_parts(parts: List[List[ASTNode]], markdown: str) -> List[PreviewPart]:
+    """
+    Make preview parts from a document's block lists.
+
+    Args:
+        parts: Block lists from ``HTMLGenerator.iter_parts()``
+        markdown: Source of the document
+
+    Returns:
+        Preview parts, in document order
+    """
+    headings = heading_lines(markdown)
+    total_lines = markdown.count('\n') + 1
+    heading_parts = sum(1 for blocks in parts if blocks[0].node_type == NodeType.HEADING)
+    # Parser and scan agree on the headings except in unusual markup;
+    # then parts are placed in proportion instead
+    exact = heading_parts == len(headings)
+
+    preview_parts = []
+    heading_index = 0
+    for index, blocks in enumerate(parts):
+        if blocks[0].node_type != NodeType.HEADING:
+            line = headings[heading_index - 1] + 1 if exact and heading_index else 0
+        elif exact:
+            line = headings[heading_index]
+            heading_index += 1
+        else:
+            line = total_lines * index // len(parts)
+            heading_index += 1
+        preview_parts.append(PreviewPart(part_key(blocks), line, blocks, estimate_height(blocks)))
+    return preview_parts
+
+
+def part_element(inner_html: str) -> str:
+    """Wrap the rendered HTML of a part in its element."""
+    return f'<section class="{PART_CLASS}">\n{inner_html}</section>\n'
+
+
+def placeholder_element(part: PreviewPart) -> str:
+    """Get the placeholder element of a part that is rendered on request."""
+    return (f'<section class="{PART_CLASS}" data-key="{part.key}" '
+            f'style="min-height: {part.height}px"></section>\n')
+
+
+def _text_lines(text: str) -> int:
+    """Estimate the number of wrapped lines of a text."""
+    return sum(len(line) // CHARACTERS_PER_LINE + 1 for line in text.split('\n'))
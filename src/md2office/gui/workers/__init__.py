@@ -1,4 +1,3 @@
 """
 Worker threads for GUI operations.
 """
-
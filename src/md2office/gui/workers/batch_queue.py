@@ -0,0 +1,481 @@
+"""
+Batch Conversion Queue
+
+Converts many markdown files on a shared thread pool. Queued files can
+be reprioritised, and queued or running files can be cancelled.
+
+Generators keep per-document state, so each pool thread borrows a warm
+ConversionService (generators preloaded once) instead of sharing one;
+all services share the configuration resolver and parsed-AST cache.
+"""
+
+import queue
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from PySide6.QtCore import QObject, QRunnable, QThread, QThreadPool, Signal
+
+from ...config import ConfigResolver
+from ...parser import ASTCache
+from ...cancellation import CancellationToken
+from ...progress import ProgressEvent, ProgressReporter
+from ..conversion_service import ConversionService
+
+# Markdown file extensions picked up when a folder is queued
+MARKDOWN_EXTENSIONS = ('.md', '.markdown')
+
+# Item states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+def collect_markdown_files(paths: Iterable[str]) -> List[str]:
+    """
+    Expand files and folders into the markdown files to convert.
+
+    Folders are searched recursively; files are kept in the order given
+    and duplicates are dropped.
+
+    Args:
+        paths: File and folder paths
+
+    Returns:
+        List of markdown file paths
+    """
+    files = []
+    seen = set()
+    for path in paths:
+        path_obj = Path(path)
+        if path_obj.is_dir():
+            candidates = sorted(
+                p for p in path_obj.rglob('*')
+                if p.is_file() and p.suffix.lower() in MARKDOWN_EXTENSIONS
+            )
+        elif path_obj.is_file() and path_obj.suffix.lower() in MARKDOWN_EXTENSIONS:
+            candidates = [path_obj]
+        else:
+            continue
+
+        for candidate in candidates:
+            key = str(candidate.resolve())
+            if key not in seen:
+                seen.add(key)
+                files.append(str(candidate))
+    return files
+
+
+@dataclass
+class BatchItem:
+    """
+    A file in the batch queue.
+
+    Attributes:
+        item_id: Queue-unique identifier
+        input_path: Markdown file to convert
+        formats: Output format names
+        output_dir: Output directory
+        config: Conversion configuration
+        status: One of queued, running, done, failed or cancelled
+        progress: Conversion progress percentage
+        result: ConversionService result once finished
+        size: Input file size in bytes
+        started: Monotonic start time
+        finished: Monotonic finish time
+        cancel_token: Token that stops the item's conversion
+    """
+    item_id: int
+    input_path: str
+    formats: List[str]
+    output_dir: str
+    config: Dict[str, Any] = field(default_factory=dict)
+    status: str = QUEUED
+    progress: int = 0
+    result: Optional[Dict[str, Any]] = None
+    size: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    cancel_token: CancellationToken = field(default_factory=CancellationToken, repr=False)
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        """Conversion time in seconds, once finished."""
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class _JobSignals(QObject):
+    """Signals for a pool job (QRunnable cannot emit signals itself)."""
+
+    progress = Signal(int, int, str)  # item id, percentage, status message
+    finished = Signal(int, dict)  # item id, result dictionary
+
+
+class _BatchJob(QRunnable):
+    """Converts one queued file on a pool thread."""
+
+    def __init__(self, item: BatchItem, signals: _JobSignals, services: 'queue.Queue',
+                 create_service, overwrite: bool):
+        """
+        Initialize batch job.
+
+        Args:
+            item: Item to convert
+            signals: Signals owned by the queue (outlives the job)
+            services: Idle warm services to borrow from
+            create_service: Factory used when no idle service is left
+            overwrite: Whether to overwrite existing files
+        """
+        super().__init__()
+        self.item = item
+        self.signals = signals
+        self.services = services
+        self.create_service = create_service
+        self.overwrite = overwrite
+
+    def run(self):
+        """
+        Convert each requested format, reporting the pipeline's progress.
+        
+        Files written for earlier formats are removed if a later one fails
+        or is cancelled, so an item's outputs are all or nothing.
+        """
+        item = self.item
+        try:
+            service = self.services.get_nowait()
+        except queue.Empty:
+            service = self.create_service(item.formats)
+
+        try:
+            output_files = []
+            result: Dict[str, Any] = {'success': True, 'input_file': item.input_path}
+            for index, format_name in enumerate(item.formats):
+                # The document is parsed once; later formats hit the AST cache
+                result = service.convert_file(
+                    input_path=item.input_path,
+                    formats=[format_name],
+                    output_dir=item.output_dir,
+                    overwrite=self.overwrite,
+                    config=item.config,
+                    cancel_token=item.cancel_token,
+                    progress=ProgressReporter(partial(self._report_progress, index))
+                )
+                if not result.get('success'):
+                    break
+                output_files.extend(result.get('output_files', []))
+
+            if result.get('success'):
+                result['output_files'] = output_files
+            else:
+                for output_file in output_files:
+                    Path(output_file['path']).unlink(missing_ok=True)
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': f"Unexpected error: {str(e)}",
+                'error_type': 'UnexpectedError'
+            }
+        finally:
+            self.services.put(service)
+
+        self.signals.finished.emit(item.item_id, result)
+
+    def _report_progress(self, index: int, event: ProgressEvent):
+        """Report progress of the format at index as progress of the whole item."""
+        formats = len(self.item.formats)
+        self.signals.progress.emit(self.item.item_id, int(100 * (index + event.fraction) / formats),
+                                   event.message)
+
+
+class BatchQueue(QObject):
+    """
+    Queue of files converted on a shared thread pool.
+
+    Files are started in queue order as workers become free. Items still
+    waiting can be moved; cancelling a running item stops its conversion
+    and kills its renderer processes.
+    Signals are emitted on the thread that owns the queue (the GUI thread).
+    """
+
+    # Signals
+    item_added = Signal(int)  # item id
+    item_started = Signal(int)  # item id
+    item_progress = Signal(int, int, str)  # item id, percentage, status message
+    item_finished = Signal(int, dict)  # item id, result dictionary
+    item_cancelled = Signal(int)  # item id
+    order_changed = Signal()  # queued items were reordered
+    throughput_updated = Signal(int, int, float)  # finished, total, files per second
+    queue_finished = Signal(dict)  # summary: 'done', 'failed', 'cancelled', 'elapsed'
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 config_resolver: Optional[ConfigResolver] = None,
+                 ast_cache: Optional[ASTCache] = None,
+                 overwrite: bool = False, parent=None):
+        """
+        Initialize batch queue.
+
+        Args:
+            max_workers: Files converted at the same time (defaults to the
+                ideal thread count, at most 4)
+            config_resolver: Shared configuration resolver
+            ast_cache: Shared parsed-AST cache (a new one is created if not
+                provided, so each document is parsed once for all formats)
+            overwrite: Whether to overwrite existing output files
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        if max_workers is None:
+            max_workers = min(QThread.idealThreadCount(), 4)
+        self.max_workers = max(1, max_workers)
+        self.config_resolver = config_resolver or ConfigResolver()
+        self.ast_cache = ast_cache if ast_cache is not None else ASTCache()
+        self.overwrite = overwrite
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.max_workers)
+
+        self.items: Dict[int, BatchItem] = {}
+        self._pending: List[int] = []
+        self._running: Set[int] = set()
+        self._services: 'queue.Queue[ConversionService]' = queue.Queue()
+        self._next_id = 1
+        self._batch_started: Optional[float] = None
+        self._batch_ids: List[int] = []
+
+        self._signals = _JobSignals(self)
+        self._signals.progress.connect(self._on_job_progress)
+        self._signals.finished.connect(self._on_job_finished)
+
+    def add_files(self, paths: Iterable[str], formats: List[str],
+                  output_dir: str = ".", config: Optional[Dict[str, Any]] = None) -> List[int]:
+        """
+        Queue files and folders for conversion.
+
+        Args:
+            paths: Markdown files and folders containing markdown files
+            formats: Output format names
+            output_dir: Output directory
+            config: Conversion configuration
+
+        Returns:
+            IDs of the queued items
+        """
+        new_batch = not self.is_busy()
+        item_ids = []
+        for input_path in collect_markdown_files(paths):
+            item = BatchItem(
+                item_id=self._next_id,
+                input_path=input_path,
+                formats=list(formats),
+                output_dir=output_dir,
+                config=dict(config or {})
+            )
+            try:
+                item.size = Path(input_path).stat().st_size
+            except OSError:
+                pass
+            self._next_id += 1
+            self.items[item.item_id] = item
+            self._pending.append(item.item_id)
+            item_ids.append(item.item_id)
+
+        if not item_ids:
+            return item_ids
+
+        if new_batch:
+            # A new batch: look up config files afresh and restart the clock
+            self.config_resolver.clear_lookups()
+            self._batch_started = time.monotonic()
+            self._batch_ids = []
+        self._batch_ids.extend(item_ids)
+
+        for item_id in item_ids:
+            self.item_added.emit(item_id)
+        self._dispatch()
+        self._emit_throughput()
+        return item_ids
+
+    def pending_ids(self) -> List[int]:
+        """Get IDs of items waiting for a worker, in start order."""
+        return list(self._pending)
+
+    def is_busy(self) -> bool:
+        """Check whether any item is queued or running."""
+        return bool(self._pending or self._running)
+
+    def move_up(self, item_id: int) -> bool:
+        """Start a queued item one place earlier."""
+        return self._move(item_id, -1)
+
+    def move_down(self, item_id: int) -> bool:
+        """Start a queued item one place later."""
+        return self._move(item_id, 1)
+
+    def move_to_front(self, item_id: int) -> bool:
+        """Start a queued item next."""
+        if item_id not in self._pending:
+            return False
+        self._pending.remove(item_id)
+        self._pending.insert(0, item_id)
+        self.order_changed.emit()
+        return True
+
+    def cancel(self, item_id: int) -> bool:
+        """
+        Cancel a queued or running item.
+
+        A running item stops at its next cancellation check and is
+        reported through item_finished with status cancelled.
+
+        Args:
+            item_id: Item to cancel
+
+        Returns:
+            True if the item was queued or running
+        """
+        if item_id in self._running:
+            self.items[item_id].cancel_token.cancel()
+            return True
+        if item_id not in self._pending:
+            return False
+        self._pending.remove(item_id)
+        item = self.items[item_id]
+        item.status = CANCELLED
+        self.item_cancelled.emit(item_id)
+        self._emit_throughput()
+        self._check_finished()
+        return True
+
+    def cancel_pending(self) -> int:
+        """
+        Cancel every queued item.
+
+        Returns:
+            Number of items cancelled
+        """
+        return sum(self.cancel(item_id) for item_id in list(self._pending))
+
+    def cancel_all(self) -> int:
+        """
+        Cancel every queued and running item.
+
+        Returns:
+            Number of items cancelled
+        """
+        running = list(self._running)
+        return self.cancel_pending() + sum(self.cancel(item_id) for item_id in running)
+
+    def clear_finished(self) -> List[int]:
+        """
+        Forget items that are done, failed or cancelled.
+
+        Returns:
+            IDs of the removed items
+        """
+        removed = [item_id for item_id, item in self.items.items()
+                   if item.status in (DONE, FAILED, CANCELLED)]
+        for item_id in removed:
+            del self.items[item_id]
+        return removed
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """
+        Wait for running items to finish (does not deliver their signals).
+
+        Args:
+            timeout_ms: Maximum time to wait, or -1 to wait indefinitely
+
+        Returns:
+            True if every running item finished
+        """
+        return self.pool.waitForDone(timeout_ms)
+
+    def _move(self, item_id: int, offset: int) -> bool:
+        """Move a queued item by offset places."""
+        if item_id not in self._pending:
+            return False
+        index = self._pending.index(item_id)
+        new_index = index + offset
+        if not 0 <= new_index < len(self._pending):
+            return False
+        self._pending[index], self._pending[new_index] = self._pending[new_index], self._pending[index]
+        self.order_changed.emit()
+        return True
+
+    def _create_service(self, formats: List[str]) -> ConversionService:
+        """Create a service with the given generators constructed up front."""
+        service = ConversionService(self.config_resolver, self.ast_cache)
+        service.pipeline.registry.preload(formats)
+        return service
+
+    def _dispatch(self):
+        """Start queued items while workers are free."""
+        while self._pending and len(self._running) < self.max_workers:
+            item_id = self._pending.pop(0)
+            item = self.items[item_id]
+            item.status = RUNNING
+            item.started = time.monotonic()
+
+            self._running.add(item_id)
+            self.item_started.emit(item_id)
+            self.pool.start(_BatchJob(item, self._signals, self._services,
+                                      self._create_service, self.overwrite))
+
+    def _on_job_progress(self, item_id: int, percentage: int, message: str):
+        """Record and forward a running item's progress."""
+        item = self.items.get(item_id)
+        if item is not None:
+            item.progress = percentage
+        self.item_progress.emit(item_id, percentage, message)
+
+    def _on_job_finished(self, item_id: int, result: Dict[str, Any]):
+        """Record a finished item and start the next one."""
+        self._running.discard(item_id)
+        item = self.items.get(item_id)
+        if item is not None:
+            item.finished = time.monotonic()
+            item.result = result
+            if result.get('success'):
+                item.status, message = DONE, "Conversion complete"
+            elif result.get('error_type') == 'Cancelled':
+                item.status, message = CANCELLED, "Conversion cancelled"
+            else:
+                item.status, message = FAILED, "Conversion failed"
+            self._on_job_progress(item_id, 100, message)
+        self.item_finished.emit(item_id, result)
+        self._dispatch()
+        self._emit_throughput()
+        self._check_finished()
+
+    def _batch_items(self) -> List[BatchItem]:
+        """Items of the current batch that are still known."""
+        return [self.items[item_id] for item_id in self._batch_ids if item_id in self.items]
+
+    def _emit_throughput(self):
+        """Report finished items and files converted per second."""
+        items = self._batch_items()
+        finished = sum(1 for item in items if item.status in (DONE, FAILED, CANCELLED))
+        converted = sum(1 for item in items if item.status in (DONE, FAILED))
+        elapsed = time.monotonic() - self._batch_started if self._batch_started else 0.0
+        rate = converted / elapsed if elapsed > 0 else 0.0
+        self.throughput_updated.emit(finished, len(items), rate)
+
+    def _check_finished(self):
+        """Emit queue_finished once the batch has drained."""
+        if self.is_busy() or self._batch_started is None:
+            return
+        items = self._batch_items()
+        summary = {
+            'done': sum(1 for item in items if item.status == DONE),
+            'failed': sum(1 for item in items if item.status == FAILED),
+            'cancelled': sum(1 for item in items if item.status == CANCELLED),
+            'elapsed': time.monotonic() - self._batch_started
+        }
+        self._batch_started = None
+        self.queue_finished.emit(summary)
@@ -6,14 +6,22 @@ Background thread for performing conversions without blocking the UI.
 
 from PySide6.QtCore import QThread, Signal
 from typing import List, Dict, Any, Optional
+from ...config import ConfigResolver
+from ...parser import ASTCache
+from ...cancellation import CancellationToken
+from ...progress import ProgressEvent, ProgressReporter
 from ..conversion_service import ConversionService
 
+# Progress (in percent) at which generation ends and writing the files starts
+WRITE_START = 95
+
 
 class ConversionWorker(QThread):
     """
     Worker thread for file conversion.
     
-    Performs conversion in background to keep UI responsive.
+    Performs conversion in background to keep UI responsive. A running
+    conversion can be stopped with cancel().
     """
     
     # Signals
@@ -31,6 +39,9 @@ class ConversionWorker(QThread):
         output_suffix: Optional[str] = None,
         overwrite: bool = False,
         config: Optional[Dict[str, Any]] = None,
+        config_resolver: Optional[ConfigResolver] = None,
+        ast_cache: Optional[ASTCache] = None,
+        service: Optional[ConversionService] = None,
         parent=None
     ):
         """
@@ -44,6 +55,11 @@ class ConversionWorker(QThread):
             output_suffix: Suffix for output filename
             overwrite: Whether to overwrite existing files
             config: Configuration options
+            config_resolver: Shared configuration resolver
+            ast_cache: Shared parsed-AST cache
+            service: Warm service to reuse (generators already created);
+                a new one is created from config_resolver and ast_cache
+                if not provided
             parent: Parent QObject
         """
         super().__init__(parent)
@@ -54,17 +70,26 @@ class ConversionWorker(QThread):
         self.output_suffix = output_suffix
         self.overwrite = overwrite
         self.config = config or {}
-        self.service = ConversionService()
+        self.service = service or ConversionService(config_resolver, ast_cache)
+        self.cancel_token = CancellationToken()
+    
+    def cancel(self):
+        """
+        Stop the conversion as soon as possible (safe to call from any thread).
+        
+        Renderer processes are killed and no output files are written;
+        the worker finishes with an 'error_type' of 'Cancelled'.
+        """
+        self.cancel_token.cancel()
     
     def run(self):
         """Execute conversion in background thread."""
         try:
             # Emit start signal
             self.file_started.emit(self.input_path)
-            self.progress_updated.emit(10, "Starting conversion...")
+            self.progress_updated.emit(0, "Starting conversion...")
             
-            # Perform conversion
-            self.progress_updated.emit(30, "Reading markdown file...")
+            # Perform conversion, reporting the pipeline's progress
             result = self.service.convert_file(
                 input_path=self.input_path,
                 formats=self.formats,
@@ -72,16 +97,22 @@ class ConversionWorker(QThread):
                 output_name=self.output_name,
                 output_suffix=self.output_suffix,
                 overwrite=self.overwrite,
-                config=self.config
+                config=self.config,
+                cancel_token=self.cancel_token,
+                progress=ProgressReporter(self._report_progress)
             )
             
-            self.progress_updated.emit(80, "Writing output files...")
-            
             # Emit completion signal
             success = result.get('success', False)
             self.file_completed.emit(self.input_path, success)
             
-            self.progress_updated.emit(100, "Conversion complete" if success else "Conversion failed")
+            if success:
+                message = "Conversion complete"
+            elif result.get('error_type') == 'Cancelled':
+                message = "Conversion cancelled"
+            else:
+                message = "Conversion failed"
+            self.progress_updated.emit(100, message)
             
             # Emit finished signal with result
             self.finished.emit(result)
@@ -95,4 +126,9 @@ class ConversionWorker(QThread):
             }
             self.file_completed.emit(self.input_path, False)
             self.finished.emit(error_result)
+    
+    def _report_progress(self, event: ProgressEvent):
+        """Forward pipeline progress (writing the files completes the last few percent)."""
+        message = "Writing output files..." if event.stage == 'done' else event.message
+        self.progress_updated.emit(int(event.fraction * WRITE_START), message)
 
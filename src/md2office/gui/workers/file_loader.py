@@ -0,0 +1,83 @@
+"""
+File Loader Thread
+
+Reads a large text file on a background thread and hands it to the UI in
+chunks, so the editor can append them without blocking the event loop.
+"""
+
+import codecs
+import io
+import threading
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QThread, Signal
+
+# Bytes read per chunk
+LOAD_CHUNK_SIZE = 1024 * 1024
+
+# Chunks read ahead of the UI; the reader waits for the UI beyond this,
+# so the file is never held in memory twice
+MAX_PENDING_CHUNKS = 4
+
+
+class FileLoadWorker(QThread):
+    """
+    Worker thread reading a UTF-8 text file in chunks.
+
+    Line endings are normalized to ``\\n`` as in text mode. Each chunk must
+    be acknowledged with chunk_done() once the UI has used it.
+    """
+
+    # Signals
+    chunk_loaded = Signal(str)  # decoded text
+    progress_updated = Signal(int)  # percentage of the file read
+    failed = Signal(str)  # error message
+
+    def __init__(self, file_path: Path, chunk_size: Optional[int] = None, parent=None):
+        """
+        Initialize file loader.
+
+        Args:
+            file_path: File to read
+            chunk_size: Bytes read per chunk (default LOAD_CHUNK_SIZE)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.file_path = Path(file_path)
+        self.chunk_size = chunk_size or LOAD_CHUNK_SIZE
+        self._slots = threading.Semaphore(MAX_PENDING_CHUNKS)
+        self._cancelled = threading.Event()
+
+    def chunk_done(self):
+        """Acknowledge a chunk (called by the UI after appending it)."""
+        self._slots.release()
+
+    def cancel(self):
+        """Stop reading (safe to call from any thread)."""
+        self._cancelled.set()
+        self._slots.release()
+
+    def run(self):
+        """Read the file and emit its chunks."""
+        try:
+            size = self.file_path.stat().st_size
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder('utf-8')(), translate=True
+            )
+            read = 0
+            with open(self.file_path, 'rb') as f:
+                while not self._cancelled.is_set():
+                    data = f.read(self.chunk_size)
+                    read += len(data)
+                    text = decoder.decode(data, final=not data)
+                    if text:
+                        self._slots.acquire()
+                        if self._cancelled.is_set():
+                            return
+                        self.chunk_loaded.emit(text)
+                    if not data:
+                        break
+                    self.progress_updated.emit(int(read * 100 / size) if size else 100)
+        except (OSError, UnicodeDecodeError) as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,43 @@
+"""
+Generator Preloading Thread
+
+Creates the format generators (importing python-docx, python-pptx and
+ReportLab) on a background thread after the main window is shown, so
+neither the window nor the first conversion waits for them.
+"""
+
+from typing import List, Optional
+
+from PySide6.QtCore import QThread, Signal
+
+from ...generators.registry import GeneratorRegistry
+
+
+class PreloadWorker(QThread):
+    """
+    Worker thread creating generators ahead of their first use.
+
+    Formats whose dependencies are not installed are skipped; they fail
+    when a conversion requests them, as before.
+    """
+
+    # Signals
+    loaded = Signal(list)  # formats whose generators were created
+
+    def __init__(self, registry: GeneratorRegistry, formats: Optional[List[str]] = None,
+                 parent=None):
+        """
+        Initialize preload worker.
+
+        Args:
+            registry: Registry to create the generators in
+            formats: Formats to load (defaults to all registered formats)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.registry = registry
+        self.formats = formats
+
+    def run(self):
+        """Create the generators."""
+        self.loaded.emit(self.registry.preload(self.formats))
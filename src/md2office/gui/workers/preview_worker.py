@@ -0,0 +1,224 @@
+"""
+Background Preview Rendering
+
+Renders the markdown preview on a worker thread so that parsing, HTML
+generation and image path resolution do not block typing. Each request
+gets a generation number: only the newest request's result is applied,
+a superseded render in flight is cancelled, and requests made while a
+render runs are coalesced into the latest one.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from ...cancellation import CancellationToken, CANCEL_OPTION
+from ...errors import CancellationError
+
+# Render function: (markdown, base path, options) -> preview content
+RenderFunction = Callable[[str, Optional[Path], Dict[str, Any]], Any]
+
+# Preview debounce bounds (milliseconds)
+MIN_PREVIEW_DELAY_MS = 150
+MAX_PREVIEW_DELAY_MS = 2000
+
+# Debounce added per character of the document (milliseconds)
+DELAY_PER_CHARACTER_MS = 0.0005
+
+# Debounce as a multiple of the measured render time
+RENDER_TIME_FACTOR = 1.5
+
+# Weight of the newest render time in its moving average
+RENDER_TIME_SMOOTHING = 0.3
+
+
+def preview_delay(document_size: int, render_seconds: float = 0.0) -> int:
+    """
+    Get the preview debounce interval for a document.
+
+    The interval grows with the document size and with the time recent
+    renders took, so large documents are not re-rendered on every pause
+    while small ones update almost immediately.
+
+    Args:
+        document_size: Document length in characters
+        render_seconds: Average preview render time in seconds
+
+    Returns:
+        Debounce interval in milliseconds
+    """
+    delay = max(MIN_PREVIEW_DELAY_MS + document_size * DELAY_PER_CHARACTER_MS,
+                render_seconds * 1000 * RENDER_TIME_FACTOR)
+    return int(min(delay, MAX_PREVIEW_DELAY_MS))
+
+
+class _RenderSignals(QObject):
+    """Signals for a render job (QRunnable cannot emit signals itself)."""
+
+    finished = Signal(int, object, float)  # generation, content, render seconds
+    failed = Signal(int, str)  # generation, error message
+    cancelled = Signal(int)  # generation
+
+
+class _RenderJob(QRunnable):
+    """Renders one preview request on a pool thread."""
+
+    def __init__(self, generation: int, render: RenderFunction, markdown: str,
+                 base_path: Optional[Path], token: CancellationToken,
+                 signals: _RenderSignals):
+        """
+        Initialize render job.
+
+        Args:
+            generation: Request generation number
+            render: Render function
+            markdown: Markdown to render
+            base_path: Base path for resolving relative image URLs
+            token: Token cancelled when the request is superseded
+            signals: Signals owned by the renderer (outlives the job)
+        """
+        super().__init__()
+        self.generation = generation
+        self.render = render
+        self.markdown = markdown
+        self.base_path = base_path
+        self.token = token
+        self.signals = signals
+
+    def run(self):
+        """Render the preview content and report the result."""
+        start = time.perf_counter()
+        try:
+            content = self.render(self.markdown, self.base_path, {CANCEL_OPTION: self.token})
+        except CancellationError:
+            self.signals.cancelled.emit(self.generation)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, content, time.perf_counter() - start)
+
+
+class PreviewRenderer(QObject):
+    """
+    Renders preview content off the UI thread, newest request wins.
+
+    At most one render runs at a time. A request made while one runs
+    cancels it and waits; when it ends, only the latest waiting request
+    is started. Results are delivered on the renderer's thread, and only
+    for the newest request.
+
+    Signals:
+        rendered: Emitted with the content and render time of the newest request
+        failed: Emitted with the error message if the newest request failed
+    """
+
+    rendered = Signal(object, float)  # content, render seconds
+    failed = Signal(str)  # error message
+
+    def __init__(self, render: RenderFunction, parent: Optional[QObject] = None):
+        """
+        Initialize preview renderer.
+
+        Args:
+            render: Function rendering markdown for the preview; called on
+                a worker thread, so it must not touch widgets
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._render = render
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._signals = _RenderSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.cancelled.connect(self._on_done)
+
+        # Newest request generation; results for older ones are dropped
+        self._generation = 0
+        self._running_token: Optional[CancellationToken] = None
+        self._pending: Optional[Tuple[int, str, Optional[Path]]] = None
+
+        # Moving average of render times (seconds)
+        self.render_seconds = 0.0
+
+    @property
+    def generation(self) -> int:
+        """Generation number of the newest request."""
+        return self._generation
+
+    def request(self, markdown: str, base_path: Optional[Path] = None) -> int:
+        """
+        Request a preview render, superseding earlier requests.
+
+        Args:
+            markdown: Markdown to render
+            base_path: Base path for resolving relative image URLs
+
+        Returns:
+            Generation number of the request
+        """
+        self._generation += 1
+        self._pending = (self._generation, markdown, base_path)
+        if self._running_token is None:
+            self._start_pending()
+        else:
+            self._running_token.cancel()
+        return self._generation
+
+    def invalidate(self):
+        """Drop all outstanding requests (e.g. after a synchronous update)."""
+        self._generation += 1
+        self._pending = None
+        if self._running_token is not None:
+            self._running_token.cancel()
+
+    def is_busy(self) -> bool:
+        """Whether a render is running or waiting."""
+        return self._running_token is not None or self._pending is not None
+
+    def wait(self, msecs: int = -1) -> bool:
+        """
+        Wait for the running render's thread work to finish.
+
+        Results are delivered through the event loop afterwards.
+
+        Args:
+            msecs: Timeout in milliseconds (-1 waits indefinitely)
+
+        Returns:
+            True if no render is running on the pool
+        """
+        return self._pool.waitForDone(msecs)
+
+    def _start_pending(self):
+        """Start rendering the newest waiting request."""
+        generation, markdown, base_path = self._pending
+        self._pending = None
+        self._running_token = CancellationToken()
+        self._pool.start(_RenderJob(generation, self._render, markdown, base_path,
+                                    self._running_token, self._signals))
+
+    def _on_finished(self, generation: int, content: Any, seconds: float):
+        """Apply a finished render if it is still the newest request."""
+        if self.render_seconds:
+            self.render_seconds += RENDER_TIME_SMOOTHING * (seconds - self.render_seconds)
+        else:
+            self.render_seconds = seconds
+        if generation == self._generation:
+            self.rendered.emit(content, seconds)
+        self._on_done(generation)
+
+    def _on_failed(self, generation: int, message: str):
+        """Report a failed render if it is still the newest request."""
+        if generation == self._generation:
+            self.failed.emit(message)
+        self._on_done(generation)
+
+    def _on_done(self, generation: int):
+        """Start the next waiting request once a render has ended."""
+        self._running_token = None
+        if self._pending is not None:
+            self._start_pending()
@@ -4,6 +4,7 @@ Markdown parser module for parsing Copilot-generated markdown.
 
 from .markdown_parser import MarkdownParser
 from .ast_builder import ASTBuilder, ASTNode, NodeType, StructureAnalyzer
+from .ast_cache import ASTCache
 
-__all__ = ['MarkdownParser', 'ASTBuilder', 'ASTNode', 'NodeType', 'StructureAnalyzer']
+__all__ = ['MarkdownParser', 'ASTBuilder', 'ASTNode', 'NodeType', 'StructureAnalyzer', 'ASTCache']
 
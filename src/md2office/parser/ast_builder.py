@@ -5,11 +5,16 @@ Implements Story 1.2: AST Builder and Structure Analyzer
 Builds Abstract Syntax Tree from parsed markdown tokens.
 """
 
+import hashlib
 from typing import List, Optional, Dict, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
 from .markdown_parser import Token, TokenType
 
+# Metadata that records source positions only; it does not change the
+# generated output, so it is left out of structural hashes
+HASH_IGNORED_METADATA = frozenset({'line_number'})
+
 
 class NodeType(Enum):
     """Types of AST nodes."""
@@ -33,11 +38,24 @@ class NodeType(Enum):
     SECTION = "section"
 
 
-@dataclass
+def _canonical(value: Any) -> Any:
+    """Get an order-independent, hashable form of a metadata value."""
+    if isinstance(value, dict):
+        return tuple(sorted(((repr(key), _canonical(item)) for key, item in value.items()),
+                            key=lambda entry: entry[0]))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_canonical(item) for item in value)
+    return value
+
+
+@dataclass(eq=False)
 class ASTNode:
     """
     Represents a node in the Abstract Syntax Tree.
     
+    Nodes compare (and hash) by identity. Use ``structural_hash()`` to
+    compare the content of subtrees.
+    
     Attributes:
         node_type: Type of the node
         content: Text content of the node
@@ -54,17 +72,63 @@ class ASTNode:
     level: Optional[int] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     attributes: Dict[str, Any] = field(default_factory=dict)
+    _structural_hash: Optional[str] = field(default=None, init=False, repr=False)
     
     def add_child(self, child: 'ASTNode'):
         """Add a child node and set its parent."""
         child.parent = self
         self.children.append(child)
+        self.invalidate_hash()
     
     def get_siblings(self) -> List['ASTNode']:
         """Get sibling nodes."""
         if self.parent is None:
             return []
-        return [node for node in self.parent.children if node != self]
+        return [node for node in self.parent.children if node is not self]
+    
+    def structural_hash(self) -> str:
+        """
+        Get a hash of this subtree's type, content, level, metadata,
+        attributes and children.
+        
+        Hashes are computed bottom-up once and cached on each node, so
+        equal subtrees (e.g. unchanged sections) are detected by comparing
+        hashes. Source line numbers are not included. After changing a
+        node other than through ``add_child()``, call ``invalidate_hash()``.
+        
+        Returns:
+            Hex digest
+        """
+        if self._structural_hash is not None:
+            return self._structural_hash
+        
+        # Iterative post-order walk over nodes without a cached hash
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if node._structural_hash is not None:
+                continue
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children
+                             if child._structural_hash is None)
+                continue
+            digest = hashlib.blake2b(digest_size=16)
+            metadata = {key: value for key, value in node.metadata.items()
+                        if key not in HASH_IGNORED_METADATA}
+            digest.update(repr((node.node_type.value, node.content, node.level,
+                                _canonical(metadata), _canonical(node.attributes))).encode())
+            for child in node.children:
+                digest.update(child._structural_hash.encode('ascii'))
+            node._structural_hash = digest.hexdigest()
+        return self._structural_hash
+    
+    def invalidate_hash(self):
+        """Drop the cached structural hash of this node and its ancestors."""
+        node = self
+        while node is not None and node._structural_hash is not None:
+            node._structural_hash = None
+            node = node.parent
     
     def get_ancestors(self) -> List['ASTNode']:
         """Get all ancestor nodes."""
@@ -78,7 +142,31 @@ class ASTNode:
     def find_children(self, node_type: NodeType) -> List['ASTNode']:
         """Find all children of a specific type."""
         return [child for child in self.children if child.node_type == node_type]
-    
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize this node and its descendants to the binary AST format.
+
+        Returns:
+            Serialized tree (see ``ast_serializer`` for the layout)
+        """
+        from .ast_serializer import serialize_ast
+        return serialize_ast(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ASTNode':
+        """
+        Rebuild a tree serialized with ``to_bytes()``.
+
+        Args:
+            data: Serialized tree
+
+        Returns:
+            Root node of the rebuilt tree (without a parent)
+        """
+        from .ast_serializer import deserialize_ast
+        return deserialize_ast(data)
+
     def __repr__(self):
         return f"ASTNode(type={self.node_type.value}, level={self.level}, children={len(self.children)})"
 
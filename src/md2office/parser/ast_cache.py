@@ -0,0 +1,252 @@
+"""
+Parsed AST Cache
+
+Caches built ASTs (and their structure analysis) by markdown content,
+so conversions that only change styling or generator options skip
+parsing, AST building and analysis.
+
+Entries are kept in an in-memory LRU and, when a cache directory is
+given, on disk as ``.mdast`` files (the format written by
+``ASTNode.to_bytes()``). Cached ASTs are shared between conversions and
+must not be modified.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .ast_builder import ASTNode
+from .ast_serializer import FORMAT_VERSION
+from ..errors import SerializationError, get_logger
+
+# Bump when MarkdownParser or ASTBuilder output changes, so cached ASTs
+# built by older code are not reused
+PARSER_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 16
+
+# On-disk cache size kept after pruning
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+
+CACHE_FILE_EXTENSION = '.mdast'
+
+
+def default_cache_dir() -> str:
+    """
+    Get the per-user directory for the on-disk AST cache.
+
+    Returns:
+        $XDG_CACHE_HOME/md2office/ast (or the platform equivalent)
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    if not base:
+        base = str(Path.home() / '.cache')
+    return str(Path(base) / 'md2office' / 'ast')
+
+
+class _Entry:
+    """In-memory cache entry."""
+
+    __slots__ = ('ast', 'analysis')
+
+    def __init__(self, ast: ASTNode, analysis: Optional[Dict[str, Any]] = None):
+        self.ast = ast
+        self.analysis = analysis
+
+
+class ASTCache:
+    """
+    LRU cache of built ASTs keyed by content hash and parser version.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        """
+        Initialize AST cache.
+
+        Args:
+            max_entries: ASTs kept in memory
+            cache_dir: Directory for on-disk entries (memory only if omitted)
+            max_disk_bytes: Size the on-disk cache is pruned to
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._pruned = False
+        self._logger = get_logger()
+
+    @staticmethod
+    def key(markdown_content: str) -> str:
+        """
+        Get the cache key for markdown content.
+
+        Args:
+            markdown_content: Raw markdown text
+
+        Returns:
+            Hex digest of the content, parser version and AST format version
+        """
+        digest = hashlib.sha256(f"{PARSER_VERSION}:{FORMAT_VERSION}\0".encode('ascii'))
+        digest.update(markdown_content.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[ASTNode]:
+        """
+        Get a cached AST.
+
+        Args:
+            key: Cache key from ``key()``
+
+        Returns:
+            Cached AST (shared; do not modify), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.ast
+
+        ast = self._read(key)
+        with self._lock:
+            if ast is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, _Entry(ast))
+            return ast
+
+    def put(self, key: str, ast: ASTNode):
+        """
+        Cache a built AST.
+
+        Args:
+            key: Cache key from ``key()``
+            ast: Root AST node
+        """
+        with self._lock:
+            self._store(key, _Entry(ast))
+        self._write(key, ast)
+
+    def get_analysis(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached structure analysis of an AST (memory only).
+
+        Args:
+            key: Cache key from ``key()``
+
+        Returns:
+            Analysis dictionary, or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.analysis if entry is not None else None
+
+    def put_analysis(self, key: str, analysis: Dict[str, Any]):
+        """
+        Cache the structure analysis of a cached AST.
+
+        Args:
+            key: Cache key from ``key()``
+            analysis: StructureAnalyzer result
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.analysis = analysis
+
+    def clear(self):
+        """Drop the in-memory entries (on-disk entries are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, entry: _Entry):
+        """Add an in-memory entry, evicting the least recently used."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        """Get the on-disk path of an entry."""
+        return Path(self.cache_dir) / f"{key}{CACHE_FILE_EXTENSION}"
+
+    def _read(self, key: str) -> Optional[ASTNode]:
+        """Load an entry from disk."""
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            ast = ASTNode.from_bytes(data)
+        except SerializationError as e:
+            self._logger.debug(f"Discarding AST cache entry {path}: {e.message}")
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)  # Recently used entries survive pruning
+        except OSError:
+            pass
+        return ast
+
+    def _write(self, key: str, ast: ASTNode):
+        """Save an entry to disk (errors only disable caching)."""
+        if not self.cache_dir:
+            return
+        try:
+            data = ast.to_bytes()
+        except SerializationError as e:
+            self._logger.debug(f"Not caching AST on disk: {e.message}")
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if not self._pruned:
+                self._pruned = True
+                self._prune()
+            descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            self._logger.debug(f"Not caching AST on disk: {e}")
+
+    def _prune(self):
+        """Remove the least recently used on-disk entries over the size limit."""
+        entries = []
+        for path in Path(self.cache_dir).glob(f"*{CACHE_FILE_EXTENSION}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
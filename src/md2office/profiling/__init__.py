@@ -0,0 +1,14 @@
+"""
+Profiling module.
+
+Per-stage wall time, CPU time and peak memory measurements for
+conversions.
+"""
+
+from .profiler import (
+    ConversionProfiler, StageTiming, profile_stage, cprofile_to, PROFILER_OPTION
+)
+
+__all__ = [
+    'ConversionProfiler', 'StageTiming', 'profile_stage', 'cprofile_to', 'PROFILER_OPTION'
+]
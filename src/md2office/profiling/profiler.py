@@ -0,0 +1,236 @@
+"""
+Conversion Profiler
+
+Records wall time, CPU time and peak memory for each conversion stage
+(parse, validate, build, analyze, generation per format, and nested
+work such as image embedding and Mermaid rendering).
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Key under which the active profiler is passed to generators in options
+PROFILER_OPTION = 'profiler'
+
+
+@dataclass
+class StageTiming:
+    """Accumulated measurements for one stage."""
+    name: str
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: int = 0
+
+    @property
+    def depth(self) -> int:
+        """Nesting depth of the stage (0 for top-level stages)."""
+        return self.name.count('.')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert timing to dictionary."""
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'peak_memory': self.peak_memory
+        }
+
+
+class _Frame:
+    """Bookkeeping for an active stage."""
+
+    __slots__ = ('path', 'wall_start', 'cpu_start', 'memory_start', 'memory_peak')
+
+    def __init__(self, path: str, memory_start: int):
+        self.path = path
+        self.memory_start = memory_start
+        self.memory_peak = memory_start
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+
+class ConversionProfiler:
+    """
+    Collects per-stage timings for one or more conversions.
+
+    Stages nest: a stage opened while another is active is recorded
+    under a dotted name such as ``generate.word.image``. Peak memory is
+    the highest traced allocation above the level at stage entry.
+    """
+
+    def __init__(self, track_memory: bool = True):
+        """
+        Initialize profiler.
+
+        Args:
+            track_memory: Measure peak memory with tracemalloc (slower)
+        """
+        self.track_memory = track_memory
+        self.stages: Dict[str, StageTiming] = {}
+        self._order: Dict[str, int] = {}
+        self._stack: List[_Frame] = []
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Measure a stage.
+
+        Args:
+            name: Stage name (nested under the active stage, if any)
+        """
+        path = f"{self._stack[-1].path}.{name}" if self._stack else name
+        self._order.setdefault(path, len(self._order))
+        memory_start = self._enter_memory()
+        frame = _Frame(path, memory_start)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - frame.wall_start
+            cpu_time = time.process_time() - frame.cpu_start
+            self._stack.pop()
+            peak = self._exit_memory(frame)
+
+            timing = self.stages.get(path)
+            if timing is None:
+                timing = self.stages[path] = StageTiming(path)
+            timing.calls += 1
+            timing.wall_time += wall_time
+            timing.cpu_time += cpu_time
+            timing.peak_memory = max(timing.peak_memory, peak)
+
+    def get_timings(self) -> List[StageTiming]:
+        """Get stage timings in the order stages were first entered."""
+        return [self.stages[name] for name in sorted(self.stages, key=self._order.__getitem__)]
+
+    def merge(self, other: 'ConversionProfiler'):
+        """
+        Add another profiler's measurements to this one.
+
+        Args:
+            other: Profiler to merge
+        """
+        for name in sorted(other._order, key=other._order.__getitem__):
+            self._order.setdefault(name, len(self._order))
+        for name, timing in other.stages.items():
+            merged = self.stages.setdefault(name, StageTiming(name))
+            merged.calls += timing.calls
+            merged.wall_time += timing.wall_time
+            merged.cpu_time += timing.cpu_time
+            merged.peak_memory = max(merged.peak_memory, timing.peak_memory)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Convert timings to a dictionary keyed by stage name."""
+        return {timing.name: timing.to_dict() for timing in self.get_timings()}
+
+    def format_table(self) -> str:
+        """
+        Format timings as a text table.
+
+        Returns:
+            Multi-line summary table
+        """
+        rows = [("Stage", "Calls", "Wall (ms)", "CPU (ms)", "Peak mem")]
+        for timing in self.get_timings():
+            rows.append((
+                "  " * timing.depth + timing.name.rsplit('.', 1)[-1],
+                str(timing.calls),
+                f"{timing.wall_time * 1000:.1f}",
+                f"{timing.cpu_time * 1000:.1f}",
+                _format_bytes(timing.peak_memory) if self.track_memory else "-"
+            ))
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = []
+        for index, row in enumerate(rows):
+            cells = [row[0].ljust(widths[0])] + [cell.rjust(widths[i]) for i, cell in enumerate(row) if i]
+            lines.append("  ".join(cells))
+            if index == 0:
+                lines.append("  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def close(self):
+        """Stop memory tracing if this profiler started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _enter_memory(self) -> int:
+        """Record the parent's peak so far and start a fresh peak window."""
+        if not self.track_memory:
+            return 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1].memory_peak = max(self._stack[-1].memory_peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def _exit_memory(self, frame: _Frame) -> int:
+        """Compute a finished stage's peak and pass it on to its parent."""
+        if not self.track_memory or not tracemalloc.is_tracing():
+            return 0
+        peak = max(frame.memory_peak, tracemalloc.get_traced_memory()[1])
+        if self._stack:
+            self._stack[-1].memory_peak = max(self._stack[-1].memory_peak, peak)
+        tracemalloc.reset_peak()
+        return peak - frame.memory_start
+
+
+def profile_stage(options: Optional[Dict[str, Any]], name: str):
+    """
+    Measure a stage if a profiler was passed in the conversion options.
+
+    Args:
+        options: Conversion options (may contain a profiler)
+        name: Stage name
+
+    Returns:
+        Context manager
+    """
+    profiler = options.get(PROFILER_OPTION) if options else None
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name)
+
+
+@contextmanager
+def cprofile_to(path: Optional[str]) -> Iterator[Optional[Any]]:
+    """
+    Run the enclosed code under cProfile and dump pstats data.
+
+    Args:
+        path: Output .prof file (profiling is skipped if None)
+    """
+    if path is None:
+        yield None
+        return
+
+    import cProfile
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(path)
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count for display."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,14 @@
+"""
+Progress module.
+
+Progress events for conversions: stage, work done out of the total,
+pages or slides produced and estimated time remaining.
+"""
+
+from .reporter import (
+    ProgressEvent, ProgressReporter, PROGRESS_OPTION, get_progress, format_duration
+)
+
+__all__ = [
+    'ProgressEvent', 'ProgressReporter', 'PROGRESS_OPTION', 'get_progress', 'format_duration'
+]
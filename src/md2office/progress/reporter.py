@@ -0,0 +1,241 @@
+"""
+Progress Reporting
+
+Reports how far a conversion has got: the current stage, units of work
+done out of the total known from the AST (sections, slides or PDF
+flowables), pages or slides produced so far, and an estimate of the time
+remaining. A ProgressReporter is passed to the pipeline and generators in
+the conversion options, like the profiler and the cancellation token.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# Key under which the progress reporter is passed to generators in options
+PROGRESS_OPTION = 'progress'
+
+# Share of a conversion spent reading, parsing and analyzing; generation
+# of each format shares the rest equally
+PARSE_SHARE = 0.1
+
+# Units in which generators report their work, with what they produce
+PRODUCT_NAMES = {'pdf': 'pages', 'powerpoint': 'slides'}
+
+
+@dataclass
+class ProgressEvent:
+    """
+    Progress of a conversion at one point in time.
+
+    Attributes:
+        stage: 'parse', a format name ('word', 'powerpoint', 'pdf') or 'done'
+        completed: Units of the stage finished
+        total: Units in the stage (0 if not known yet)
+        unit: What the stage counts ('sections', 'slides', 'flowables')
+        produced: Pages (PDF) or slides (PowerPoint) produced so far
+        fraction: Fraction of the whole conversion finished (0 to 1)
+        elapsed: Seconds since the conversion started
+        eta: Estimated seconds remaining (None until it can be estimated)
+    """
+    stage: str
+    completed: int = 0
+    total: int = 0
+    unit: str = ''
+    produced: int = 0
+    fraction: float = 0.0
+    elapsed: float = 0.0
+    eta: Optional[float] = None
+
+    @property
+    def percentage(self) -> int:
+        """Whole conversion finished, in percent."""
+        return int(self.fraction * 100)
+
+    @property
+    def message(self) -> str:
+        """Short human-readable description of the progress."""
+        return self.describe()
+
+    def describe(self, with_eta: bool = True) -> str:
+        """
+        Describe the progress.
+
+        Args:
+            with_eta: Include the estimated time left
+
+        Returns:
+            Human-readable description
+        """
+        if self.stage == 'done':
+            return "Conversion complete"
+        if self.stage == 'parse':
+            text = "Parsing markdown"
+        else:
+            text = f"Generating {self.stage}"
+            if self.total:
+                text += f": {self.completed}/{self.total} {self.unit}"
+            product = PRODUCT_NAMES.get(self.stage, 'parts')
+            if self.produced and product != self.unit:
+                text += f", {self.produced} {product}"
+        if with_eta and self.eta is not None:
+            text += f" (about {format_duration(self.eta)} left)"
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert event to dictionary."""
+        return {
+            'stage': self.stage,
+            'completed': self.completed,
+            'total': self.total,
+            'unit': self.unit,
+            'produced': self.produced,
+            'fraction': self.fraction,
+            'elapsed': self.elapsed,
+            'eta': self.eta
+        }
+
+
+class ProgressReporter:
+    """
+    Turns progress reported by the pipeline into ProgressEvents.
+
+    Generators call advance() once per unit of work; events are passed
+    to the callback at most every ``min_interval`` seconds (and always
+    when a stage starts or the conversion finishes), so reporting costs
+    little more than a counter increment. Not thread-safe: use one
+    reporter per conversion.
+    """
+
+    def __init__(self, callback: Callable[[ProgressEvent], None],
+                 min_interval: float = 0.1):
+        """
+        Initialize progress reporter.
+
+        Args:
+            callback: Called with each ProgressEvent
+            min_interval: Minimum seconds between events within a stage
+        """
+        self.callback = callback
+        self.min_interval = min_interval
+        self._stages: List[str] = []
+        self._start = time.monotonic()
+        self._last_emit = 0.0
+        self._stage = 'parse'
+        self._stage_index = 0
+        self._completed = 0
+        self._total = 0
+        self._unit = ''
+        self._produced = 0
+
+    def start(self, formats: List[str]):
+        """
+        Start reporting a conversion.
+
+        Args:
+            formats: Names of the formats that will be generated, in order
+        """
+        self._stages = list(formats)
+        self._start = time.monotonic()
+        self.begin_stage('parse')
+
+    def begin_stage(self, stage: str, total: int = 0, unit: str = 'sections'):
+        """
+        Start a stage.
+
+        Args:
+            stage: 'parse' or the format being generated
+            total: Units of work in the stage, if known
+            unit: What the units are
+        """
+        self._stage = stage
+        self._stage_index = self._stages.index(stage) + 1 if stage in self._stages else 0
+        self._completed = 0
+        self._total = total
+        self._unit = unit
+        self._produced = 0
+        self.emit()
+
+    def set_total(self, total: int, unit: Optional[str] = None):
+        """
+        Set the amount of work in the current stage once it is known.
+
+        Args:
+            total: Units of work in the stage
+            unit: What the units are (unchanged if omitted)
+        """
+        self._completed = 0
+        self._total = total
+        if unit is not None:
+            self._unit = unit
+
+    def advance(self, count: int = 1, produced: Optional[int] = None):
+        """
+        Record finished units of work in the current stage.
+
+        Args:
+            count: Units finished
+            produced: Pages or slides produced so far, if known
+        """
+        self._completed += count
+        if produced is not None:
+            self._produced = produced
+        if time.monotonic() - self._last_emit >= self.min_interval:
+            self.emit()
+
+    def finish(self):
+        """Report the end of the conversion."""
+        self._stage = 'done'
+        self._stage_index = len(self._stages) + 1
+        self._completed = self._total
+        self.emit()
+
+    def current(self) -> ProgressEvent:
+        """
+        Get the current progress.
+
+        Returns:
+            ProgressEvent describing the conversion now
+        """
+        elapsed = time.monotonic() - self._start
+        fraction = self._fraction()
+        eta = None
+        if 0 < fraction < 1 and self._stage != 'parse':
+            eta = elapsed * (1 - fraction) / fraction
+        return ProgressEvent(
+            stage=self._stage,
+            completed=min(self._completed, self._total) if self._total else self._completed,
+            total=self._total,
+            unit=self._unit,
+            produced=self._produced,
+            fraction=fraction,
+            elapsed=elapsed,
+            eta=eta
+        )
+
+    def emit(self):
+        """Pass the current progress to the callback now."""
+        self._last_emit = time.monotonic()
+        self.callback(self.current())
+
+    def _fraction(self) -> float:
+        """Fraction of the whole conversion finished."""
+        if self._stage == 'done':
+            return 1.0
+        if self._stage_index == 0:
+            return 0.0
+        stage_share = (1 - PARSE_SHARE) / len(self._stages)
+        stage_done = min(self._completed / self._total, 1.0) if self._total else 0.0
+        return PARSE_SHARE + stage_share * (self._stage_index - 1 + stage_done)
+
+
+def get_progress(options: Optional[Dict[str, Any]]) -> Optional[ProgressReporter]:
+    """Get the progress reporter passed in the conversion options, if any."""
+    return options.get(PROGRESS_OPTION) if options else None
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration for progress messages ('45 s', '3 min')."""
+    if seconds < 60:
+        return f"{max(int(seconds + 0.5), 1)} s"
+    return f"{int(seconds / 60 + 0.5)} min"
@@ -3,7 +3,7 @@ Content router and pipeline orchestration module.
 """
 
 from .content_router import ContentRouter, OutputFormat
-from .pipeline import ConversionPipeline
+from .pipeline import ConversionPipeline, ConversionResult
 
-__all__ = ['ContentRouter', 'OutputFormat', 'ConversionPipeline']
+__all__ = ['ContentRouter', 'OutputFormat', 'ConversionPipeline', 'ConversionResult']
 
@@ -5,10 +5,14 @@ Implements Story 1.3: Content Router and Pipeline Orchestration
 Routes parsed content to appropriate format generators.
 """
 
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from enum import Enum
 from abc import ABC, abstractmethod
 from ..parser.ast_builder import ASTNode, StructureAnalyzer
+from ..parser.ast_cache import ASTCache
+from ..profiling import profile_stage
+from ..cancellation import check_cancelled
+from ..progress import get_progress
 
 
 class OutputFormat(Enum):
@@ -16,6 +20,7 @@ class OutputFormat(Enum):
     WORD = "word"
     POWERPOINT = "powerpoint"
     PDF = "pdf"
+    HTML = "html"
 
 
 class FormatGenerator(ABC):
@@ -45,12 +50,21 @@ class ContentRouter:
     """
     Routes content to appropriate format generators.
     
-    Supports single and multi-format conversion scenarios.
+    Supports single and multi-format conversion scenarios. Generators can
+    be registered explicitly or resolved lazily from a generator registry
+    the first time their format is requested.
     """
     
-    def __init__(self):
-        """Initialize content router."""
+    def __init__(self, registry=None):
+        """
+        Initialize content router.
+        
+        Args:
+            registry: Optional GeneratorRegistry used to create generators
+                on demand for formats that were not registered explicitly
+        """
         self.generators: Dict[OutputFormat, FormatGenerator] = {}
+        self.registry = registry
     
     def register_generator(self, format: OutputFormat, generator: FormatGenerator):
         """
@@ -62,6 +76,32 @@ class ContentRouter:
         """
         self.generators[format] = generator
     
+    def get_generator(self, format: OutputFormat) -> FormatGenerator:
+        """
+        Get the generator for a format, loading it from the registry if needed.
+        
+        Args:
+            format: Output format
+            
+        Returns:
+            Format generator instance
+            
+        Raises:
+            ValueError: If no generator is available for the format
+        """
+        if format not in self.generators and self.registry is not None:
+            try:
+                self.generators[format] = self.registry.get(format.value)
+            except (KeyError, ImportError) as e:
+                raise ValueError(
+                    f"Generator for format {format.value} is not available: {e}"
+                ) from e
+        
+        if format not in self.generators:
+            raise ValueError(f"Generator for format {format.value} is not registered")
+        
+        return self.generators[format]
+    
     def route(self, ast: ASTNode, formats: List[OutputFormat], 
               options: Optional[Dict[str, Any]] = None) -> Dict[OutputFormat, bytes]:
         """
@@ -70,31 +110,45 @@ class ContentRouter:
         Args:
             ast: Root AST node
             formats: List of output formats to generate
-            options: Generation options
+            options: Generation options (a cancellation token passed under
+                CANCEL_OPTION is checked before each format, and a progress
+                reporter passed under PROGRESS_OPTION is told when each
+                format starts)
             
         Returns:
             Dictionary mapping format to generated document bytes
             
         Raises:
             ValueError: If format generator is not registered
+            CancellationError: If the conversion was cancelled
         """
         if options is None:
             options = {}
         
         results = {}
+        progress = get_progress(options)
         
         for format in formats:
-            if format not in self.generators:
-                raise ValueError(f"Generator for format {format.value} is not registered")
-            
-            generator = self.generators[format]
-            results[format] = generator.generate(ast, options)
+            check_cancelled(options, format.value)
+            if progress is not None:
+                # Generators refine the total once they know their units
+                statistics = options.get('structure_analysis', {}).get('statistics', {})
+                progress.begin_stage(format.value, statistics.get('total_sections', 0))
+            with profile_stage(options, format.value):
+                with profile_stage(options, "load"):
+                    generator = self.get_generator(format)
+                results[format] = generator.generate(ast, options)
         
         return results
     
     def get_supported_formats(self) -> List[OutputFormat]:
         """Get list of supported output formats."""
-        return list(self.generators.keys())
+        formats = list(self.generators.keys())
+        if self.registry is not None:
+            for format in OutputFormat:
+                if format not in formats and self.registry.get_import_path(format.value):
+                    formats.append(format)
+        return formats
 
 
 class PipelineOrchestrator:
@@ -105,14 +159,17 @@ class PipelineOrchestrator:
     AST building, analysis, and format generation.
     """
     
-    def __init__(self, router: ContentRouter):
+    def __init__(self, router: ContentRouter, ast_cache: Optional[ASTCache] = None):
         """
         Initialize pipeline orchestrator.
         
         Args:
             router: Content router instance
+            ast_cache: Cache of built ASTs, so unchanged markdown is not
+                parsed again (no caching if omitted)
         """
         self.router = router
+        self.ast_cache = ast_cache
     
     def convert(self, markdown_content: str, formats: List[OutputFormat],
                 options: Optional[Dict[str, Any]] = None) -> Dict[OutputFormat, bytes]:
@@ -127,39 +184,95 @@ class PipelineOrchestrator:
         Returns:
             Dictionary mapping format to generated document bytes
         """
-        from ..parser.markdown_parser import MarkdownParser
-        from ..parser.ast_builder import ASTBuilder, StructureAnalyzer
+        from ..parser.ast_builder import StructureAnalyzer
         
         if options is None:
             options = {}
+        progress = get_progress(options)
+        if progress is not None:
+            progress.start([format.value for format in formats])
         
-        # Stage 1: Parse markdown
-        parser = MarkdownParser()
-        tokens = parser.parse(markdown_content)
-        
-        # Validate tokens
-        errors = parser.validate(tokens)
-        if errors and not options.get('ignore_errors', False):
-            raise ValueError(f"Markdown parsing errors: {errors}")
-        
-        # Stage 2: Build AST
-        builder = ASTBuilder()
-        ast = builder.build(tokens)
+        # Stages 1 and 2: Parse markdown and build AST
+        check_cancelled(options, "parse")
+        ast, cache_key = self._build_ast(markdown_content, options)
+        check_cancelled(options, "analyze")
         
         # Stage 3: Analyze structure
-        analyzer = StructureAnalyzer(ast)
-        analysis = analyzer.analyze()
+        analysis = self.ast_cache.get_analysis(cache_key) if cache_key else None
+        if analysis is None:
+            with profile_stage(options, "analyze"):
+                analyzer = StructureAnalyzer(ast)
+                analysis = analyzer.analyze()
+            if cache_key:
+                self.ast_cache.put_analysis(cache_key, analysis)
         
         # Add analysis to options
-        if options is None:
-            options = {}
         options['structure_analysis'] = analysis
         
         # Stage 4: Route to format generators
-        results = self.router.route(ast, formats, options)
+        with profile_stage(options, "generate"):
+            results = self.router.route(ast, formats, options)
         
+        if progress is not None:
+            progress.finish()
         return results
     
+    def build_ast(self, markdown_content: str,
+                  options: Optional[Dict[str, Any]] = None) -> ASTNode:
+        """
+        Parse and validate markdown and build its AST.
+        
+        Args:
+            markdown_content: Raw markdown text
+            options: Conversion options
+            
+        Returns:
+            Root AST node (shared with the AST cache; do not modify)
+        """
+        return self._build_ast(markdown_content, options or {})[0]
+    
+    def _build_ast(self, markdown_content: str,
+                   options: Dict[str, Any]) -> Tuple[ASTNode, Optional[str]]:
+        """
+        Build an AST, using the AST cache if there is one.
+        
+        Returns:
+            Tuple of (root AST node, cache key or None without a cache)
+        """
+        from ..parser.markdown_parser import MarkdownParser
+        from ..parser.ast_builder import ASTBuilder
+        
+        cache_key = None
+        if self.ast_cache is not None:
+            with profile_stage(options, "cache"):
+                cache_key = self.ast_cache.key(markdown_content)
+                ast = self.ast_cache.get(cache_key)
+            if ast is not None:
+                return ast, cache_key
+        
+        # Stage 1: Parse markdown
+        with profile_stage(options, "parse"):
+            parser = MarkdownParser()
+            tokens = parser.parse(markdown_content)
+        
+        # Validate tokens
+        with profile_stage(options, "validate"):
+            errors = parser.validate(tokens)
+        if errors and not options.get('ignore_errors', False):
+            raise ValueError(f"Markdown parsing errors: {errors}")
+        
+        # Stage 2: Build AST
+        with profile_stage(options, "build"):
+            builder = ASTBuilder()
+            ast = builder.build(tokens)
+        
+        # Only ASTs that passed validation are cached, so a cache hit
+        # never skips a validation error
+        if cache_key is None or errors:
+            return ast, None
+        self.ast_cache.put(cache_key, ast)
+        return ast, cache_key
+    
     def convert_file(self, input_path: str, formats: List[OutputFormat],
                      options: Optional[Dict[str, Any]] = None) -> Dict[OutputFormat, bytes]:
         """
@@ -173,8 +286,9 @@ class PipelineOrchestrator:
         Returns:
             Dictionary mapping format to generated document bytes
         """
-        with open(input_path, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
+        with profile_stage(options, "read"):
+            with open(input_path, 'r', encoding='utf-8') as f:
+                markdown_content = f.read()
         
         return self.convert(markdown_content, formats, options)
     
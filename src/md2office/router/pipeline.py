@@ -4,8 +4,35 @@ Conversion Pipeline
 High-level pipeline interface for markdown conversion.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .content_router import ContentRouter, OutputFormat, PipelineOrchestrator
+from ..generators.registry import GeneratorRegistry
+from ..parser.ast_builder import ASTNode
+from ..parser.ast_cache import ASTCache
+from ..profiling import ConversionProfiler, PROFILER_OPTION, profile_stage
+from ..cancellation import CancellationToken, CANCEL_OPTION
+from ..progress import ProgressReporter, PROGRESS_OPTION
+
+
+class ConversionResult(dict):
+    """
+    Conversion output: a dictionary mapping format name to document bytes.
+    
+    When profiling was requested, ``profile`` holds the
+    ConversionProfiler with per-stage timings; otherwise it is None.
+    """
+    
+    def __init__(self, outputs: Dict[str, bytes],
+                 profile: Optional[ConversionProfiler] = None):
+        """
+        Initialize conversion result.
+        
+        Args:
+            outputs: Format name to document bytes mapping
+            profile: Profiler with stage timings
+        """
+        super().__init__(outputs)
+        self.profile = profile
 
 
 class ConversionPipeline:
@@ -13,35 +40,65 @@ class ConversionPipeline:
     High-level conversion pipeline interface.
     
     Provides a simple interface for converting markdown files
-    to various output formats.
+    to various output formats. Format generators are created lazily
+    the first time a format is requested.
     """
     
-    def __init__(self):
-        """Initialize conversion pipeline."""
-        self.router = ContentRouter()
-        self.orchestrator = PipelineOrchestrator(self.router)
+    def __init__(self, registry: Optional[GeneratorRegistry] = None,
+                 ast_cache: Optional[ASTCache] = None):
+        """
+        Initialize conversion pipeline.
+        
+        Args:
+            registry: Generator registry (a private registry is created if omitted)
+            ast_cache: Cache of built ASTs, so conversions of unchanged
+                markdown skip parsing (no caching if omitted)
+        """
+        self.registry = registry if registry is not None else GeneratorRegistry()
+        self.ast_cache = ast_cache
+        self.router = ContentRouter(self.registry)
+        self.orchestrator = PipelineOrchestrator(self.router, ast_cache)
     
     def convert(self, markdown_content: str, formats: List[str],
-                options: Optional[Dict[str, Any]] = None) -> Dict[str, bytes]:
+                options: Optional[Dict[str, Any]] = None,
+                profile: bool = False,
+                cancel_token: Optional[CancellationToken] = None,
+                progress: Optional[ProgressReporter] = None) -> ConversionResult:
         """
         Convert markdown content to specified formats.
         
         Args:
             markdown_content: Raw markdown text
-            formats: List of format names ('word', 'powerpoint', 'pdf')
+            formats: List of format names ('word', 'powerpoint', 'pdf', 'html')
             options: Conversion options
+            profile: Record per-stage timings in the result's ``profile``
+            cancel_token: Token that stops the conversion when cancelled
+            progress: Reporter that receives ProgressEvents during the conversion
             
         Returns:
-            Dictionary mapping format name to document bytes
+            ConversionResult mapping format name to document bytes
+            
+        Raises:
+            CancellationError: If the conversion was cancelled
         """
         output_formats = [self._parse_format(f) for f in formats]
-        results = self.orchestrator.convert(markdown_content, output_formats, options)
+        options = self._prepare_cancellation(options, cancel_token)
+        options = self._prepare_progress(options, progress)
+        options, profiler, owned = self._prepare_profiler(options, profile)
+        try:
+            results = self.orchestrator.convert(markdown_content, output_formats, options)
+        finally:
+            if owned:
+                profiler.close()
         
         # Convert enum keys to string keys
-        return {format.value: data for format, data in results.items()}
+        return ConversionResult({format.value: data for format, data in results.items()}, profiler)
     
     def convert_file(self, input_path: str, formats: List[str],
-                     options: Optional[Dict[str, Any]] = None) -> Dict[str, bytes]:
+                     options: Optional[Dict[str, Any]] = None,
+                     profile: bool = False,
+                     cancel_token: Optional[CancellationToken] = None,
+                     progress: Optional[ProgressReporter] = None) -> ConversionResult:
         """
         Convert markdown file to specified formats.
         
@@ -49,15 +106,64 @@ class ConversionPipeline:
             input_path: Path to markdown file
             formats: List of format names
             options: Conversion options
+            profile: Record per-stage timings in the result's ``profile``
+            cancel_token: Token that stops the conversion when cancelled
+            progress: Reporter that receives ProgressEvents during the conversion
             
         Returns:
-            Dictionary mapping format name to document bytes
+            ConversionResult mapping format name to document bytes
+            
+        Raises:
+            CancellationError: If the conversion was cancelled
         """
         output_formats = [self._parse_format(f) for f in formats]
-        results = self.orchestrator.convert_file(input_path, output_formats, options)
+        options = self._prepare_cancellation(options, cancel_token)
+        options = self._prepare_progress(options, progress)
+        options, profiler, owned = self._prepare_profiler(options, profile)
+        try:
+            results = self.orchestrator.convert_file(input_path, output_formats, options)
+        finally:
+            if owned:
+                profiler.close()
         
         # Convert enum keys to string keys
-        return {format.value: data for format, data in results.items()}
+        return ConversionResult({format.value: data for format, data in results.items()}, profiler)
+    
+    def parse(self, markdown_content: str,
+              options: Optional[Dict[str, Any]] = None) -> ASTNode:
+        """
+        Parse markdown into its AST without generating any output.
+        
+        With an AST cache, the tree is shared with later conversions of
+        the same markdown, so e.g. the GUI preview and an export of the
+        document parse it only once.
+        
+        Args:
+            markdown_content: Raw markdown text
+            options: Conversion options
+            
+        Returns:
+            Root AST node (shared with the AST cache; do not modify)
+        """
+        return self.orchestrator.build_ast(markdown_content, options)
+    
+    def parse_file(self, input_path: str,
+                   options: Optional[Dict[str, Any]] = None) -> ASTNode:
+        """
+        Parse a markdown file into its AST without generating any output.
+        
+        Args:
+            input_path: Path to markdown file
+            options: Conversion options
+            
+        Returns:
+            Root AST node (shared with the AST cache; do not modify)
+        """
+        with profile_stage(options, "read"):
+            with open(input_path, 'r', encoding='utf-8') as f:
+                markdown_content = f.read()
+        
+        return self.orchestrator.build_ast(markdown_content, options)
     
     def convert_batch(self, input_paths: List[str], formats: List[str],
                       options: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, bytes]]:
@@ -92,12 +198,50 @@ class ConversionPipeline:
         Register a format generator.
         
         Args:
-            format_name: Format name ('word', 'powerpoint', 'pdf')
+            format_name: Format name ('word', 'powerpoint', 'pdf', 'html')
             generator: Format generator instance
         """
         format_enum = self._parse_format(format_name)
         self.router.register_generator(format_enum, generator)
     
+    def _prepare_cancellation(self, options: Optional[Dict[str, Any]],
+                              cancel_token: Optional[CancellationToken]
+                              ) -> Optional[Dict[str, Any]]:
+        """Pass a cancellation token to the stages in the options."""
+        if cancel_token is None:
+            return options
+        options = dict(options or {})
+        options[CANCEL_OPTION] = cancel_token
+        return options
+    
+    def _prepare_progress(self, options: Optional[Dict[str, Any]],
+                          progress: Optional[ProgressReporter]) -> Optional[Dict[str, Any]]:
+        """Pass a progress reporter to the stages in the options."""
+        if progress is None:
+            return options
+        options = dict(options or {})
+        options[PROGRESS_OPTION] = progress
+        return options
+    
+    def _prepare_profiler(self, options: Optional[Dict[str, Any]], profile: bool
+                          ) -> Tuple[Optional[Dict[str, Any]], Optional[ConversionProfiler], bool]:
+        """
+        Set up profiling for a conversion.
+        
+        Uses a profiler passed in the options, or creates one if
+        profiling was requested.
+        
+        Returns:
+            Tuple of (options, profiler or None, whether the profiler was created here)
+        """
+        profiler = options.get(PROFILER_OPTION) if options else None
+        if profiler is not None or not profile:
+            return options, profiler, False
+        
+        options = dict(options or {})
+        profiler = options[PROFILER_OPTION] = ConversionProfiler()
+        return options, profiler, True
+    
     def _parse_format(self, format_name: str) -> OutputFormat:
         """
         Parse format name to OutputFormat enum.
@@ -113,7 +257,8 @@ class ConversionPipeline:
             'docx': OutputFormat.WORD,
             'powerpoint': OutputFormat.POWERPOINT,
             'pptx': OutputFormat.POWERPOINT,
-            'pdf': OutputFormat.PDF
+            'pdf': OutputFormat.PDF,
+            'html': OutputFormat.HTML
         }
         
         format_name_lower = format_name.lower()
@@ -0,0 +1,18 @@
+"""
+Conversion server module.
+
+Provides ``md2office serve``, a long-running process with warm
+generators, and a lightweight client used by ``md2office --server``.
+"""
+
+from .conversion_server import (
+    ConversionServer, run_job, get_default_address, parse_address, is_loopback_host,
+    ADDRESS_ENV_VAR, TOKEN_ENV_VAR
+)
+from .client import ServerClient
+
+__all__ = [
+    'ConversionServer', 'ServerClient', 'run_job',
+    'get_default_address', 'parse_address', 'is_loopback_host',
+    'ADDRESS_ENV_VAR', 'TOKEN_ENV_VAR'
+]
@@ -0,0 +1,182 @@
+"""
+Conversion Server Client
+
+Thin client for submitting conversion jobs to a running
+``md2office serve`` process. Uses only the standard library so that
+client invocations stay cheap to start.
+"""
+
+import base64
+import http.client
+import json
+import os
+import socket
+from typing import Any, Dict, List, Optional
+
+from ..errors import exceptions, MD2OfficeError, ServerError
+from .conversion_server import get_default_address, parse_address, TOKEN_ENV_VAR, TOKEN_HEADER
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        """Connect to the Unix socket."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ServerClient:
+    """
+    Client for the md2office conversion server.
+
+    Conversion errors raised in the server are re-raised locally as the
+    matching MD2OfficeError subclass.
+    """
+
+    def __init__(self, address: Optional[str] = None, timeout: Optional[float] = 300.0,
+                 token: Optional[str] = None):
+        """
+        Initialize server client.
+
+        Args:
+            address: Server address (defaults to get_default_address())
+            timeout: Socket timeout in seconds
+            token: Token the server requires (defaults to $MD2OFFICE_SERVER_TOKEN)
+
+        Raises:
+            ServerError: If the address is invalid
+        """
+        self.address = address or get_default_address()
+        self.timeout = timeout
+        self.token = token or os.environ.get(TOKEN_ENV_VAR) or None
+        try:
+            self._kind, self._target = parse_address(self.address)
+        except ValueError as e:
+            raise ServerError(str(e), address=self.address) from e
+
+    def is_available(self) -> bool:
+        """Check whether a server is listening at the address."""
+        try:
+            self.health()
+            return True
+        except ServerError:
+            return False
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Get server status.
+
+        Returns:
+            Status dictionary
+
+        Raises:
+            ServerError: If the server cannot be reached
+        """
+        return self._request('GET', '/health')
+
+    def shutdown(self):
+        """Ask the server to stop."""
+        self._request('POST', '/shutdown', {})
+
+    def convert(self, formats: List[str], input_path: Optional[str] = None,
+                markdown: Optional[str] = None, options: Optional[Dict[str, Any]] = None,
+                output_dir: Optional[str] = None, name: Optional[str] = None,
+                overwrite: bool = False) -> Dict[str, Any]:
+        """
+        Submit a conversion job.
+
+        Paths are resolved by the server process, so pass absolute paths.
+
+        Args:
+            formats: List of format names
+            input_path: Markdown file path
+            markdown: Markdown text (used if input_path is not given)
+            options: Conversion options
+            output_dir: Directory the server writes outputs to; if omitted,
+                document bytes are returned instead
+            name: Output filename without extension (with output_dir)
+            overwrite: Overwrite existing output files (with output_dir)
+
+        Returns:
+            Dictionary mapping format name to document bytes, or to the
+            written file path when output_dir is given
+
+        Raises:
+            ServerError: If the server cannot be reached
+            MD2OfficeError: If the conversion fails
+        """
+        job = {
+            'formats': formats,
+            'input_path': input_path,
+            'markdown': markdown,
+            'options': options or {},
+            'output_dir': output_dir,
+            'name': name,
+            'overwrite': overwrite
+        }
+        response = self._request('POST', '/convert', job)
+
+        results = {}
+        for format_name, output in response.get('outputs', {}).items():
+            if 'data' in output:
+                results[format_name] = base64.b64decode(output['data'])
+            else:
+                results[format_name] = output['path']
+        return results
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """Create a connection to the server."""
+        if self._kind == 'unix':
+            return _UnixHTTPConnection(self._target, timeout=self.timeout)
+        host, port = self._target
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _request(self, method: str, path: str,
+                 payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send a request and decode the JSON response.
+
+        Raises:
+            ServerError: If the server cannot be reached or rejects the job
+            MD2OfficeError: If the server reports a conversion error
+        """
+        connection = self._connect()
+        try:
+            body = json.dumps(payload).encode('utf-8') if payload is not None else None
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            if self.token is not None:
+                headers[TOKEN_HEADER] = self.token
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = json.loads(response.read().decode('utf-8'))
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise ServerError(f"Could not reach conversion server at {self.address}: {e}",
+                              address=self.address) from e
+        finally:
+            connection.close()
+
+        if response.status == 200:
+            return data
+        raise self._build_error(data)
+
+    def _build_error(self, data: Dict[str, Any]) -> MD2OfficeError:
+        """Rebuild the exception reported by the server."""
+        error_class = getattr(exceptions, data.get('error', ''), None)
+        message = data.get('message', 'Unknown server error')
+
+        if not (isinstance(error_class, type) and issubclass(error_class, MD2OfficeError)):
+            return ServerError(f"Server error: {message}", address=self.address)
+
+        # Error subclasses store their extra arguments in the context
+        error = error_class.__new__(error_class)
+        MD2OfficeError.__init__(error, message, data.get('context'), data.get('suggestion'))
+        for key, value in error.context.items():
+            setattr(error, key, value)
+        return error
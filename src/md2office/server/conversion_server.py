@@ -0,0 +1,444 @@
+"""
+Conversion Server
+
+Long-running conversion service that keeps warm worker processes with
+generators already imported and constructed, so repeated conversions
+do not pay interpreter start-up, library import and template load costs.
+
+Jobs are submitted as JSON over HTTP, either on a local Unix socket or
+on a localhost TCP port. Jobs read and write files as the server's user,
+so the server only listens on loopback addresses; set $MD2OFFICE_SERVER_TOKEN
+(for both server and clients) to also keep other local users out of a
+TCP server.
+"""
+
+import base64
+import hmac
+import ipaddress
+import json
+import os
+import signal
+import socketserver
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import __version__
+from ..cancellation import OutputTransaction
+from ..errors import MD2OfficeError, ServerError, get_logger
+from ..generators.registry import get_output_extension
+
+DEFAULT_PORT = 8765
+
+# Environment variable holding the server address used by clients
+ADDRESS_ENV_VAR = 'MD2OFFICE_SERVER'
+
+# Environment variable holding the token clients must present, if set
+TOKEN_ENV_VAR = 'MD2OFFICE_SERVER_TOKEN'
+
+# Request header carrying the token
+TOKEN_HEADER = 'X-MD2Office-Token'
+
+def get_default_address() -> str:
+    """
+    Get the default server address.
+
+    Uses $MD2OFFICE_SERVER if set, otherwise a per-user Unix socket
+    (or localhost TCP on platforms without Unix sockets).
+
+    Returns:
+        Server address string
+    """
+    address = os.environ.get(ADDRESS_ENV_VAR)
+    if address:
+        return address
+
+    if hasattr(socketserver, 'UnixStreamServer'):
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+        user_id = os.getuid() if hasattr(os, 'getuid') else 0
+        return f"unix:{Path(runtime_dir) / f'md2office-{user_id}.sock'}"
+
+    return f"127.0.0.1:{DEFAULT_PORT}"
+
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """
+    Parse a server address.
+
+    Accepted forms are ``unix:/path/to.sock``, ``http://host:port``,
+    ``host:port`` and a bare port number.
+
+    Args:
+        address: Address string
+
+    Returns:
+        Tuple of ('unix', path) or ('tcp', (host, port))
+
+    Raises:
+        ValueError: If the address cannot be parsed
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+
+    if address.startswith('http://'):
+        address = address[len('http://'):].rstrip('/')
+
+    if address.isdigit():
+        return 'tcp', ('127.0.0.1', int(address))
+
+    host, separator, port = address.rpartition(':')
+    if not separator or not port.isdigit():
+        raise ValueError(f"Invalid server address: {address}")
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+def is_loopback_host(host: str) -> bool:
+    """
+    Check whether a host name or IP address is a loopback address.
+
+    Args:
+        host: Host name or IP address
+
+    Returns:
+        True for ``localhost`` and loopback IP addresses
+    """
+    if host.lower() == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host.strip('[]')).is_loopback
+    except ValueError:
+        return False
+
+
+# Per-process state for warm workers
+_worker_pipeline = None
+
+
+def _init_worker(formats: Optional[List[str]] = None):
+    """Initialize a worker: import and construct generators once."""
+    global _worker_pipeline
+    from ..parser import ASTCache
+    from ..router import ConversionPipeline
+
+    _worker_pipeline = ConversionPipeline(ast_cache=ASTCache())
+    _worker_pipeline.registry.preload(formats)
+
+
+def _init_pool_worker(formats: Optional[List[str]] = None):
+    """Initialize a pool process; Ctrl-C is handled by the server process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_worker(formats)
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a single conversion job in the current (warm) process.
+
+    Args:
+        job: Job description with 'formats' and either 'input_path' or
+            'markdown', plus optional 'options', 'output_dir', 'name'
+            and 'overwrite'
+
+    Returns:
+        Dictionary with 'outputs' mapping format name to either
+        {'data': base64} or {'path': written file}, and the output size
+
+    Raises:
+        MD2OfficeError: If conversion fails
+        ValueError: If the job is invalid
+    """
+    if _worker_pipeline is None:
+        _init_worker()
+
+    formats = job.get('formats') or []
+    if not formats:
+        raise ValueError("No output format specified")
+
+    options = dict(job.get('options') or {})
+    input_path = job.get('input_path')
+
+    # Outputs are written to output_dir only
+    name = job.get('name')
+    if name is not None and (not isinstance(name, str) or name in ('.', '..')
+                             or any(sep in name for sep in ('/', '\\', os.sep))):
+        raise ValueError(f"Invalid output name: {name!r}")
+
+    if not input_path and job.get('markdown') is None:
+        raise ValueError("Job requires 'input_path' or 'markdown'")
+
+    # Check every output file before converting, so a job writes all or none
+    output_dir = job.get('output_dir')
+    output_files = {}
+    if output_dir:
+        base_name = name or (Path(input_path).stem if input_path else 'document')
+        for format_name in formats:
+            output_file = Path(output_dir) / f"{base_name}{get_output_extension(format_name)}"
+            if output_file.exists() and not job.get('overwrite', False):
+                raise ValueError(f"Output file already exists: {output_file}")
+            output_files[format_name.lower()] = output_file
+
+    if input_path:
+        results = _worker_pipeline.convert_file(input_path, formats, options)
+    else:
+        results = _worker_pipeline.convert(job['markdown'], formats, options)
+    documents = {format_name: doc_bytes for format_name, doc_bytes in results.items()
+                 if format_name != 'error'}
+
+    outputs = {}
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        with OutputTransaction() as transaction:
+            for format_name, doc_bytes in documents.items():
+                output_file = output_files[format_name.lower()]
+                transaction.write(output_file, doc_bytes)
+                outputs[format_name] = {'path': str(output_file), 'size': len(doc_bytes)}
+    else:
+        for format_name, doc_bytes in documents.items():
+            outputs[format_name] = {
+                'data': base64.b64encode(doc_bytes).decode('ascii'),
+                'size': len(doc_bytes)
+            }
+
+    return {'outputs': outputs}
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP request handler for conversion jobs."""
+
+    server_version = f"md2office/{__version__}"
+
+    def do_GET(self):
+        """Handle health checks."""
+        if not self._authorized():
+            return
+        if self.path.rstrip('/') in ('', '/health'):
+            self._send_json(200, self.server.conversion_server.get_status())
+        else:
+            self._send_json(404, {'error': 'NotFound', 'message': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        """Handle conversion and shutdown requests."""
+        path = self.path.rstrip('/')
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if not self._authorized():
+            return
+
+        if path == '/shutdown':
+            self._send_json(200, {'status': 'stopping'})
+            threading.Thread(target=self.server.conversion_server.stop, daemon=True).start()
+            return
+
+        if path != '/convert':
+            self._send_json(404, {'error': 'NotFound', 'message': f"Unknown path: {self.path}"})
+            return
+
+        try:
+            job = json.loads(body.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': 'BadRequest', 'message': f"Invalid job: {e}"})
+            return
+
+        try:
+            result = self.server.conversion_server.submit(job)
+            self._send_json(200, result)
+        except MD2OfficeError as e:
+            self._send_json(422, e.to_dict())
+        except ValueError as e:
+            self._send_json(400, {'error': 'BadRequest', 'message': str(e)})
+        except Exception as e:
+            self._send_json(500, {'error': type(e).__name__, 'message': str(e)})
+
+    def _authorized(self) -> bool:
+        """Check the request's token, answering 401 if it is missing or wrong."""
+        token = self.server.conversion_server.token
+        if token is None or hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), token):
+            return True
+        self._send_json(401, {'error': 'Unauthorized', 'message': "Invalid or missing server token"})
+        return False
+
+    def address_string(self) -> str:
+        """Return client address (Unix socket clients have no host)."""
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return 'local'
+
+    def log_message(self, format: str, *args):
+        """Route access logs through the md2office logger."""
+        get_logger().debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        """Send a JSON response."""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Threaded HTTP server listening on a Unix domain socket."""
+        daemon_threads = True
+else:  # pragma: no cover - Windows
+    _UnixHTTPServer = None
+
+
+class ConversionServer:
+    """
+    Warm conversion server.
+
+    Keeps a pool of worker processes with generators preloaded and
+    serves conversion jobs over HTTP on a Unix socket or localhost port.
+    """
+
+    def __init__(self, address: Optional[str] = None, workers: Optional[int] = None,
+                 formats: Optional[List[str]] = None, token: Optional[str] = None):
+        """
+        Initialize conversion server.
+
+        Args:
+            address: Listen address (defaults to get_default_address())
+            workers: Number of worker processes; 0 runs jobs in-process
+                (defaults to the CPU count)
+            formats: Formats to preload in workers (defaults to all)
+            token: Token clients must send (defaults to
+                $MD2OFFICE_SERVER_TOKEN; no token is required if unset)
+
+        Raises:
+            ServerError: If the address is invalid or not a loopback address
+        """
+        self.address = address or get_default_address()
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.formats = formats
+        self.token = token or os.environ.get(TOKEN_ENV_VAR) or None
+        try:
+            self._kind, self._bind_address = parse_address(self.address)
+        except ValueError as e:
+            raise ServerError(str(e), address=self.address) from e
+        if self._kind == 'tcp' and not is_loopback_host(self._bind_address[0]):
+            raise ServerError(
+                f"Refusing to listen on {self.address}: jobs read and write files as "
+                f"this user, so only loopback addresses are allowed",
+                address=self.address
+            )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inprocess_lock = threading.Lock()
+        self._httpd = None
+        self._jobs_completed = 0
+        self._jobs_lock = threading.Lock()
+
+    def start(self):
+        """
+        Start worker processes and bind the listening socket.
+
+        Raises:
+            ServerError: If the address cannot be bound
+        """
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_pool_worker,
+                initargs=(self.formats,)
+            )
+            # Warm every worker up front instead of on its first job
+            for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        else:
+            _init_worker(self.formats)
+
+        try:
+            if self._kind == 'unix':
+                if _UnixHTTPServer is None:
+                    raise ServerError("Unix sockets are not supported on this platform",
+                                      address=self.address)
+                socket_path = Path(self._bind_address)
+                if socket_path.exists():
+                    socket_path.unlink()  # Stale socket from a previous run
+                self._httpd = _UnixHTTPServer(str(socket_path), _RequestHandler)
+                os.chmod(str(socket_path), 0o600)
+            else:
+                self._httpd = ThreadingHTTPServer(self._bind_address, _RequestHandler)
+                self._httpd.daemon_threads = True
+                # Report the actual port when binding to port 0
+                host, port = self._httpd.server_address[:2]
+                self.address = f"{host}:{port}"
+        except OSError as e:
+            self._shutdown_executor()
+            raise ServerError(f"Could not listen on {self.address}: {e}",
+                              address=self.address) from e
+
+        self._httpd.conversion_server = self
+
+    def serve_forever(self):
+        """Serve requests until stop() is called."""
+        if self._httpd is None:
+            self.start()
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._cleanup()
+
+    def stop(self):
+        """Stop serving requests."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+
+    def submit(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a job on a warm worker and wait for the result.
+
+        Args:
+            job: Job description (see run_job)
+
+        Returns:
+            Job result
+        """
+        if self._executor is not None:
+            result = self._executor.submit(run_job, job).result()
+        else:
+            # Generators keep per-document state, so run in-process jobs serially
+            with self._inprocess_lock:
+                result = run_job(job)
+
+        with self._jobs_lock:
+            self._jobs_completed += 1
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get server status for health checks."""
+        return {
+            'status': 'ok',
+            'version': __version__,
+            'address': self.address,
+            'workers': self.workers,
+            'pid': os.getpid(),
+            'jobs_completed': self._jobs_completed
+        }
+
+    def _cleanup(self):
+        """Close the socket and stop worker processes."""
+        if self._httpd is not None:
+            self._httpd.server_close()
+            if self._kind == 'unix':
+                try:
+                    Path(self._bind_address).unlink()
+                except OSError:
+                    pass
+            self._httpd = None
+        self._shutdown_executor()
+
+    def _shutdown_executor(self):
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _ping() -> int:
+    """No-op job used to force worker initialization."""
+    return os.getpid()
@@ -0,0 +1,15 @@
+"""
+Watch mode module.
+
+Monitors a documentation tree and incrementally reconverts documents
+whose markdown, images, configuration or style changed.
+"""
+
+from .file_watcher import FileWatcher, InotifyWatcher, PollingWatcher, create_watcher
+from .incremental_builder import IncrementalBuilder, DocumentState, RebuildReport
+from .watch_session import WatchSession
+
+__all__ = [
+    'FileWatcher', 'InotifyWatcher', 'PollingWatcher', 'create_watcher',
+    'IncrementalBuilder', 'DocumentState', 'RebuildReport', 'WatchSession'
+]
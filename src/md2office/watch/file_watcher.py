@@ -0,0 +1,340 @@
+"""
+File Watchers
+
+Detect changes in a documentation tree. Uses Linux inotify (through
+ctypes) where available and falls back to stat polling elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from ..generators.fragment_cache import Signature, file_signature
+
+# Files the polling watcher tracks inside the watched tree
+MARKDOWN_EXTENSIONS = {'.md'}
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.webp', '.tif', '.tiff'}
+CONFIG_NAMES = {'.md2office.json', '.md2office.yaml', '.md2office.yml'}
+
+
+def is_watched_file(name: str) -> bool:
+    """Check whether a file name is relevant to conversions."""
+    suffix = os.path.splitext(name)[1].lower()
+    return name in CONFIG_NAMES or suffix in MARKDOWN_EXTENSIONS or suffix in IMAGE_EXTENSIONS
+
+
+def _is_ignored_dir(name: str) -> bool:
+    """Skip hidden directories such as .git."""
+    return name.startswith('.')
+
+
+class FileWatcher(ABC):
+    """
+    Base class for file watchers.
+
+    A watcher monitors a directory tree (plus individually added paths)
+    and reports the absolute paths that changed since the last poll.
+    A reported directory path means "something below here changed".
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize watcher.
+
+        Args:
+            root: Directory tree to watch
+        """
+        self.root = str(Path(root).resolve())
+
+    @abstractmethod
+    def add_path(self, path: str):
+        """
+        Watch an additional file (e.g. an image outside the tree).
+
+        Args:
+            path: File path
+        """
+        pass
+
+    @abstractmethod
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits forever)
+
+        Returns:
+            Set of changed paths (empty if the timeout expired)
+        """
+        pass
+
+    def close(self):
+        """Release watcher resources."""
+
+
+class PollingWatcher(FileWatcher):
+    """
+    Portable watcher based on periodic stat calls.
+
+    Only directories and relevant files are stat'ed; a directory is
+    re-listed only when its own mtime changes.
+    """
+
+    def __init__(self, root: str, interval: float = 0.5):
+        """
+        Initialize polling watcher.
+
+        Args:
+            root: Directory tree to watch
+            interval: Seconds between scans
+        """
+        super().__init__(root)
+        self.interval = interval
+        self._dirs: Dict[str, int] = {}
+        self._files: Dict[str, Signature] = {}
+        self._extra: Set[str] = set()
+        self._last_scan = time.monotonic()
+        self._scan_dir(self.root, set())
+
+    def add_path(self, path: str):
+        """Watch an additional file."""
+        path = str(Path(path).resolve())
+        if path not in self._files:
+            self._files[path] = file_signature(path)
+        self._extra.add(path)
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """Scan for changes once per interval."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._last_scan + self.interval - time.monotonic()
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+
+            if time.monotonic() >= self._last_scan + self.interval:
+                self._last_scan = time.monotonic()
+                changed = self._scan()
+                if changed:
+                    return changed
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+    def _scan(self) -> Set[str]:
+        """Compare the tree against the previous scan."""
+        changed: Set[str] = set()
+
+        for directory, mtime in list(self._dirs.items()):
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                # Directory removed: forget everything below it
+                self._forget(directory, changed)
+                continue
+            if current != mtime:
+                self._scan_dir(directory, changed)
+
+        for path, signature in list(self._files.items()):
+            current = file_signature(path)
+            if current != signature:
+                self._files[path] = current
+                changed.add(path)
+                if current is None and path not in self._extra:
+                    del self._files[path]
+
+        return changed
+
+    def _scan_dir(self, directory: str, changed: Set[str]):
+        """List a directory, tracking new relevant files and subdirectories."""
+        try:
+            self._dirs[directory] = os.stat(directory).st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _is_ignored_dir(entry.name) and entry.path not in self._dirs:
+                        self._scan_dir(entry.path, changed)
+                        changed.add(entry.path)
+                elif is_watched_file(entry.name) and entry.path not in self._files:
+                    self._files[entry.path] = file_signature(entry.path)
+                    changed.add(entry.path)
+            except OSError:
+                continue
+
+    def _forget(self, directory: str, changed: Set[str]):
+        """Drop a removed directory and everything below it."""
+        prefix = directory + os.sep
+        for path in [d for d in self._dirs if d == directory or d.startswith(prefix)]:
+            del self._dirs[path]
+        for path in [f for f in self._files if f.startswith(prefix)]:
+            del self._files[path]
+            changed.add(path)
+
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+               IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_libc():
+    """Load libc with inotify support, or return None."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1  # noqa: B018 - check symbol exists
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Linux watcher based on inotify.
+
+    Every directory in the tree gets a watch; the kernel reports events
+    so no polling is needed.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize inotify watcher.
+
+        Args:
+            root: Directory tree to watch
+
+        Raises:
+            OSError: If inotify is not available
+        """
+        super().__init__(root)
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._watches: Dict[int, str] = {}
+        self._watched_dirs: Dict[str, int] = {}
+        self._add_tree(self.root)
+
+    def add_path(self, path: str):
+        """Watch an additional file by watching its directory."""
+        directory = str(Path(path).resolve().parent)
+        if directory not in self._watched_dirs:
+            self._add_watch(directory)
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """Wait for inotify events."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._decode(data, changed)
+        return changed
+
+    def close(self):
+        """Close the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _decode(self, data: bytes, changed: Set[str]):
+        """Decode a buffer of inotify events into changed paths."""
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report the whole tree
+                changed.add(self.root)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                self._watched_dirs.pop(directory, None)
+                continue
+
+            path = os.path.join(directory, name) if name else directory
+            changed.add(path)
+
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not _is_ignored_dir(name):
+                self._add_tree(path)
+
+    def _add_tree(self, directory: str):
+        """Watch a directory and all its subdirectories."""
+        self._add_watch(directory)
+        for current, dirnames, _ in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not _is_ignored_dir(d)]
+            for dirname in dirnames:
+                self._add_watch(os.path.join(current, dirname))
+
+    def _add_watch(self, directory: str):
+        """Add a single inotify watch."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+            self._watched_dirs[directory] = wd
+
+
+def create_watcher(root: str, polling: bool = False, interval: float = 0.5) -> FileWatcher:
+    """
+    Create the most efficient watcher available.
+
+    Args:
+        root: Directory tree to watch
+        polling: Force the stat-polling watcher
+        interval: Polling interval in seconds
+
+    Returns:
+        FileWatcher instance
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, interval=interval)
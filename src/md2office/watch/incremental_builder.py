@@ -0,0 +1,286 @@
+"""
+Incremental Builder
+
+Tracks the dependencies of every markdown document in a tree (the
+markdown file, referenced images and the applicable configuration) and
+reconverts only the documents affected by a set of changed paths.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config import ConfigResolver
+from ..errors import ConfigurationError, get_logger
+from ..generators.fragment_cache import Signature, file_signature
+from ..generators.registry import get_output_extension
+from ..parser.markdown_parser import MarkdownParser
+from .file_watcher import CONFIG_NAMES, MARKDOWN_EXTENSIONS
+
+
+@dataclass
+class DocumentState:
+    """Dependencies and option fingerprint of a built document."""
+    path: str
+    dependencies: Dict[str, Signature] = field(default_factory=dict)
+    config_path: Optional[str] = None
+    options_fingerprint: str = ''
+
+
+@dataclass
+class RebuildReport:
+    """Result of one (re)build."""
+    documents: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    build_time: float = 0.0
+    latency: Optional[float] = None
+
+
+class IncrementalBuilder:
+    """
+    Converts a documentation tree and rebuilds only what changed.
+
+    A single ConversionPipeline is reused for every build, so generators
+    stay warm between rebuilds.
+    """
+
+    def __init__(self, root: str, formats: List[str], output_dir: Optional[str] = None,
+                 cli_options: Optional[Dict[str, Any]] = None,
+                 config_file: Optional[str] = None, pipeline=None,
+                 config_resolver: Optional[ConfigResolver] = None):
+        """
+        Initialize incremental builder.
+
+        Args:
+            root: Documentation tree
+            formats: Output format names
+            output_dir: Output directory mirroring the tree layout
+                (defaults to writing next to each markdown file)
+            cli_options: Options overriding configuration files
+            config_file: Explicit configuration file (disables lookup)
+            pipeline: ConversionPipeline to reuse (created with an in-memory
+                AST cache if omitted)
+            config_resolver: ConfigResolver to reuse (created if omitted)
+        """
+        from ..parser import ASTCache
+        from ..router import ConversionPipeline
+
+        self.root = Path(root).resolve()
+        self.formats = formats
+        self.output_dir = Path(output_dir).resolve() if output_dir else None
+        self.cli_options = cli_options or {}
+        self.config_file = str(Path(config_file).resolve()) if config_file else None
+        self.pipeline = (pipeline if pipeline is not None
+                         else ConversionPipeline(ast_cache=ASTCache()))
+        self.config_resolver = config_resolver or ConfigResolver()
+        self.documents: Dict[str, DocumentState] = {}
+        self._parser = MarkdownParser()
+        self._logger = get_logger()
+
+    def preload(self):
+        """Create the generators for the configured formats up front."""
+        self.pipeline.registry.preload(self.formats)
+
+    def discover(self) -> List[str]:
+        """
+        Find markdown documents in the tree.
+
+        Returns:
+            Sorted list of absolute markdown paths
+        """
+        return sorted(self._discover_under(self.root))
+
+    def build_all(self) -> RebuildReport:
+        """
+        Convert every document in the tree.
+
+        Returns:
+            Rebuild report
+        """
+        return self._build(self.discover())
+
+    def get_watch_paths(self) -> Set[str]:
+        """Get every file the tracked documents depend on."""
+        paths: Set[str] = set()
+        for state in self.documents.values():
+            paths.update(state.dependencies)
+        return paths
+
+    def handle_changes(self, changed_paths: Iterable[str],
+                       detected_at: Optional[float] = None) -> Optional[RebuildReport]:
+        """
+        Rebuild the documents affected by changed paths.
+
+        Args:
+            changed_paths: Paths reported by a file watcher
+            detected_at: time.monotonic() of the first change, for latency
+
+        Returns:
+            Rebuild report, or None if nothing needed rebuilding
+        """
+        affected: Set[str] = set()
+        config_changed = False
+
+        for changed in changed_paths:
+            path = str(Path(changed).resolve())
+            name = os.path.basename(path)
+
+            if name in CONFIG_NAMES or path == self.config_file:
+                config_changed = True
+                continue
+
+            if os.path.isdir(path):
+                # New or moved directory: pick up new documents below it
+                affected.update(d for d in self._discover_under(Path(path))
+                                if d not in self.documents)
+                affected.update(self._stale_documents(under=path))
+                continue
+
+            if os.path.splitext(path)[1].lower() in MARKDOWN_EXTENSIONS and self._in_tree(path):
+                if os.path.exists(path):
+                    affected.add(path)
+                elif path in self.documents:
+                    del self.documents[path]
+
+            affected.update(self._stale_documents(paths={path}))
+
+        if config_changed:
+            # Config files may have been created or removed
+            self.config_resolver.clear_lookups()
+            affected.update(self._documents_with_changed_options())
+
+        if not affected:
+            return None
+
+        report = self._build(sorted(affected))
+        if detected_at is not None:
+            report.latency = time.monotonic() - detected_at
+        return report
+
+    def _build(self, documents: List[str]) -> RebuildReport:
+        """Convert documents and record their dependencies."""
+        report = RebuildReport()
+        start = time.perf_counter()
+
+        for document in documents:
+            report.documents.append(document)
+            try:
+                with open(document, 'r', encoding='utf-8') as f:
+                    content = f.read()
+
+                config_path, options = self._resolve_options(document)
+                state = DocumentState(
+                    path=document,
+                    config_path=config_path,
+                    options_fingerprint=self._fingerprint(options)
+                )
+                state.dependencies[document] = file_signature(document)
+                for image in self._find_images(content, Path(document).parent):
+                    state.dependencies[image] = file_signature(image)
+                self.documents[document] = state
+
+                results = self.pipeline.convert(content, self.formats, options)
+                for format_name, doc_bytes in results.items():
+                    output_file = self._output_path(document, format_name)
+                    output_file.parent.mkdir(parents=True, exist_ok=True)
+                    output_file.write_bytes(doc_bytes)
+                    report.outputs.append(str(output_file))
+
+            except Exception as e:
+                self._logger.debug("Failed to convert %s", document, exc_info=True)
+                report.errors[document] = getattr(e, 'message', str(e))
+
+        report.build_time = time.perf_counter() - start
+        return report
+
+    def _resolve_options(self, document: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Resolve the configuration file and conversion options for a document."""
+        directory = str(Path(document).parent)
+        config_path, config = self.config_resolver.resolve(
+            directory, self.cli_options, self.config_file
+        )
+        options = config.to_dict()
+        # Image paths in the markdown are relative to the document
+        options['base_path'] = directory
+        return config_path, options
+
+    def _documents_with_changed_options(self) -> Set[str]:
+        """Find documents whose configuration or style preset changed."""
+        changed: Set[str] = set()
+        for document, state in self.documents.items():
+            try:
+                config_path, options = self._resolve_options(document)
+            except ConfigurationError:
+                changed.add(document)  # Rebuild to report the error
+                continue
+            if (config_path != state.config_path or
+                    self._fingerprint(options) != state.options_fingerprint):
+                changed.add(document)
+        return changed
+
+    def _stale_documents(self, paths: Optional[Set[str]] = None,
+                         under: Optional[str] = None) -> Set[str]:
+        """Find documents with a dependency whose file signature changed."""
+        prefix = under.rstrip(os.sep) + os.sep if under else None
+        stale: Set[str] = set()
+        for document, state in self.documents.items():
+            for dependency, signature in state.dependencies.items():
+                if paths is not None and dependency not in paths:
+                    continue
+                if prefix is not None and not dependency.startswith(prefix):
+                    continue
+                if file_signature(dependency) != signature:
+                    if os.path.exists(document):
+                        stale.add(document)
+                    break
+        return stale
+
+    def _find_images(self, content: str, base_path: Path) -> List[str]:
+        """Get absolute paths of local images referenced by markdown."""
+        images = []
+        for image in self._parser._extract_inline_elements(content)['images']:
+            src = image['src'].strip().split(' ')[0] if image['src'].strip() else ''
+            if not src or '://' in src or src.startswith('data:'):
+                continue
+            path = Path(src)
+            if not path.is_absolute():
+                path = base_path / path
+            images.append(str(path.resolve()))
+        return images
+
+    def _discover_under(self, directory: Path) -> List[str]:
+        """Find markdown files below a directory, skipping hidden and output dirs."""
+        documents = []
+        for current, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')
+                           and Path(current, d) != self.output_dir]
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in MARKDOWN_EXTENSIONS:
+                    documents.append(str(Path(current, filename).resolve()))
+        return documents
+
+    def _in_tree(self, path: str) -> bool:
+        """Check whether a path is inside the watched tree."""
+        try:
+            Path(path).relative_to(self.root)
+            return True
+        except ValueError:
+            return False
+
+    def _output_path(self, document: str, format_name: str) -> Path:
+        """Get the output file for a document and format."""
+        source = Path(document)
+        extension = get_output_extension(format_name)
+        if self.output_dir is None:
+            return source.with_suffix(extension)
+        relative = source.relative_to(self.root)
+        return (self.output_dir / relative).with_suffix(extension)
+
+    @staticmethod
+    def _fingerprint(options: Dict[str, Any]) -> str:
+        """Stable fingerprint of conversion options."""
+        return json.dumps(options, sort_keys=True, default=str)
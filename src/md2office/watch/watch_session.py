@@ -0,0 +1,101 @@
+"""
+Watch Session
+
+Event loop for ``md2office watch``: waits for file changes, debounces
+bursts and hands the collected paths to the incremental builder.
+"""
+
+import threading
+import time
+from typing import Callable, Optional, Set
+
+from .file_watcher import FileWatcher
+from .incremental_builder import IncrementalBuilder, RebuildReport
+
+
+class WatchSession:
+    """
+    Connects a file watcher to an incremental builder.
+
+    Changes arriving within the debounce window of each other are
+    merged into a single rebuild.
+    """
+
+    def __init__(self, builder: IncrementalBuilder, watcher: FileWatcher,
+                 debounce: float = 0.2,
+                 on_rebuild: Optional[Callable[[RebuildReport], None]] = None):
+        """
+        Initialize watch session.
+
+        Args:
+            builder: Incremental builder
+            watcher: File watcher for the builder's tree
+            debounce: Quiet period in seconds that ends a burst of changes
+            on_rebuild: Callback receiving each rebuild report
+        """
+        self.builder = builder
+        self.watcher = watcher
+        self.debounce = debounce
+        self.on_rebuild = on_rebuild
+        self._stop = threading.Event()
+        self._watched_paths: Set[str] = set()
+
+    def start(self) -> RebuildReport:
+        """
+        Run the initial full build.
+
+        Returns:
+            Report of the initial build
+        """
+        self.builder.preload()
+        report = self.builder.build_all()
+        self._sync_watch_paths()
+        return report
+
+    def run(self):
+        """Rebuild on changes until stop() is called."""
+        while not self._stop.is_set():
+            self.run_once(timeout=0.5)
+
+    def run_once(self, timeout: Optional[float] = None) -> Optional[RebuildReport]:
+        """
+        Wait for one burst of changes and rebuild.
+
+        Args:
+            timeout: Maximum time to wait for the first change
+
+        Returns:
+            Rebuild report, or None if nothing was rebuilt
+        """
+        changed = self.watcher.poll(timeout)
+        if not changed:
+            return None
+        detected_at = time.monotonic()
+
+        # Debounce: keep collecting until the tree has been quiet for a while
+        while not self._stop.is_set():
+            more = self.watcher.poll(self.debounce)
+            if not more:
+                break
+            changed.update(more)
+
+        report = self.builder.handle_changes(changed, detected_at=detected_at)
+        if report is not None:
+            self._sync_watch_paths()
+            if self.on_rebuild is not None:
+                self.on_rebuild(report)
+        return report
+
+    def stop(self):
+        """Stop the run() loop."""
+        self._stop.set()
+
+    def close(self):
+        """Release watcher resources."""
+        self.watcher.close()
+
+    def _sync_watch_paths(self):
+        """Watch dependencies (e.g. images outside the tree) discovered by builds."""
+        for path in self.builder.get_watch_paths() - self._watched_paths:
+            self.watcher.add_path(path)
+            self._watched_paths.add(path)
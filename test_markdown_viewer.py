@@ -72,8 +72,7 @@ def test_mermaid_detection():
     
     all_passed = True
     for markdown, should_be_mermaid, description in test_cases:
-        html = viewer._basic_markdown_to_html(markdown)
-        processed = viewer._process_mermaid_blocks(html)
+        processed = viewer._markdown_to_body(markdown)
         is_mermaid = 'class="mermaid"' in processed
         
         if is_mermaid == should_be_mermaid:
@@ -0,0 +1,110 @@
+"""
+Fixtures for stage benchmarks.
+
+Stage timings are normalised by a fixed pure-Python calibration workload
+so that a baseline recorded on one machine remains meaningful on
+another. A stage fails when its normalised median exceeds the baseline
+by more than ``--benchmark-threshold``.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+
+import pytest
+
+
+def _calibrate(rounds: int = 7) -> float:
+    """Time a fixed CPU workload (string, regex and dict operations)."""
+    pattern = re.compile(r'(\*{1,2})([^*]+)\1')
+    text = "Some **bold** and *italic* words in a line of text. " * 20
+
+    def workload():
+        counts = {}
+        for i in range(300):
+            for match in pattern.finditer(text):
+                counts[match.group(2)] = counts.get(match.group(2), 0) + i
+            "-".join(text.split()[:50]).upper()
+        return counts
+
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        workload()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class BaselineStore:
+    """Loads, checks and records normalised stage timings."""
+
+    def __init__(self, path: Path, threshold: float, update: bool):
+        self.path = path
+        self.threshold = threshold
+        self.update = update
+        self.calibration = _calibrate()
+        self.stages = {}
+        if path.exists():
+            self.stages = json.loads(path.read_text(encoding='utf-8')).get('stages', {})
+        self._recorded = {}
+
+    def check(self, name: str, median: float):
+        """Compare a stage median against the baseline (or record it)."""
+        normalised = median / self.calibration
+        if self.update:
+            self._recorded[name] = round(normalised, 4)
+            return
+
+        expected = self.stages.get(name)
+        if expected is None:
+            return
+        limit = expected * (1 + self.threshold)
+        if normalised > limit:
+            pytest.fail(
+                f"Stage '{name}' regressed: {normalised:.3f} calibration units "
+                f"(baseline {expected:.3f}, limit {limit:.3f}, "
+                f"median {median * 1000:.2f} ms)"
+            )
+
+    def save(self):
+        """Write recorded timings, keeping entries not re-measured."""
+        if not self.update or not self._recorded:
+            return
+        stages = dict(self.stages)
+        stages.update(self._recorded)
+        self.path.write_text(json.dumps({
+            'description': "Stage medians divided by the calibration workload time",
+            'stages': dict(sorted(stages.items()))
+        }, indent=2) + "\n", encoding='utf-8')
+
+
+@pytest.fixture(scope='session')
+def baseline_store(request):
+    """Session-wide baseline store."""
+    store = BaselineStore(
+        Path(request.config.getoption('--benchmark-baseline')),
+        request.config.getoption('--benchmark-threshold'),
+        request.config.getoption('--benchmark-update-baseline'),
+    )
+    yield store
+    store.save()
+
+
+@pytest.fixture
+def stage_benchmark(benchmark, baseline_store):
+    """
+    Benchmark a stage and check it against the baseline.
+
+    Returns a function ``run(name, func, *args, **kwargs)`` that returns
+    the result of ``func``.
+    """
+    def run(name, func, *args, **kwargs):
+        benchmark.group = name.split('[')[0]
+        result = benchmark(func, *args, **kwargs)
+        stats = getattr(benchmark, 'stats', None)
+        if stats is not None:
+            baseline_store.check(name, stats.stats.median)
+        return result
+
+    return run
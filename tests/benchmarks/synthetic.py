@@ -0,0 +1,126 @@
+"""
+Synthetic markdown documents for benchmarks.
+
+DocumentSpec describes the shape of a document (size, heading depth,
+tables, lists, code, images, Mermaid diagrams); render() turns it into
+deterministic markdown text.
+"""
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+WORDS = (
+    "markdown document section content office format convert style table "
+    "list image code diagram heading paragraph render output quality layout "
+    "structure report summary detail example value result system process"
+).split()
+
+MERMAID_DIAGRAM = "graph TD\n    A[Start] --> B{Check}\n    B -->|yes| C[Done]\n    B -->|no| A\n"
+
+
+@dataclass(frozen=True)
+class DocumentSpec:
+    """Shape of a synthetic markdown document."""
+    sections: int = 10
+    heading_depth: int = 3
+    paragraphs_per_section: int = 3
+    sentences_per_paragraph: int = 4
+    table_rows: int = 0
+    table_columns: int = 4
+    list_items: int = 0
+    list_depth: int = 1
+    code_blocks: int = 0
+    code_lines: int = 10
+    images: int = 0
+    mermaid_blocks: int = 0
+    seed: int = 42
+
+    def render(self, image_dir: Optional[Path] = None) -> str:
+        """
+        Render the document.
+
+        Args:
+            image_dir: Directory to write referenced PNG images to; image
+                references are relative to it (no files written if None)
+
+        Returns:
+            Markdown text
+        """
+        rng = random.Random(self.seed)
+        lines = ["# Synthetic Benchmark Document", "", self._paragraph(rng), ""]
+
+        image_count = 0
+        for section in range(self.sections):
+            level = 2 + section % max(1, self.heading_depth - 1)
+            lines += [f"{'#' * min(level, 6)} Section {section + 1}", ""]
+
+            for _ in range(self.paragraphs_per_section):
+                lines += [self._paragraph(rng), ""]
+
+            if self.list_items:
+                for item in range(self.list_items):
+                    indent = "  " * (item % self.list_depth)
+                    lines.append(f"{indent}- {self._sentence(rng)}")
+                lines.append("")
+
+            if self.table_rows:
+                lines.append("| " + " | ".join(f"Column {c + 1}" for c in range(self.table_columns)) + " |")
+                lines.append("|" + "---|" * self.table_columns)
+                for _ in range(self.table_rows):
+                    lines.append("| " + " | ".join(rng.choice(WORDS) for _ in range(self.table_columns)) + " |")
+                lines.append("")
+
+            for block in range(self.code_blocks):
+                lines.append("```python")
+                lines += [f"value_{block}_{i} = compute({i}, '{rng.choice(WORDS)}')"
+                          for i in range(self.code_lines)]
+                lines += ["```", ""]
+
+            if image_count < self.images:
+                lines += [f"![Figure {image_count + 1}](figure_{image_count}.png)", ""]
+                image_count += 1
+
+            if section < self.mermaid_blocks:
+                lines += ["```mermaid", MERMAID_DIAGRAM.rstrip(), "```", ""]
+
+        if image_dir is not None:
+            write_images(image_dir, image_count)
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _sentence(rng: random.Random) -> str:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 14))]
+        if rng.random() < 0.3:
+            words[1] = f"**{words[1]}**"
+        if rng.random() < 0.2:
+            words[-2] = f"*{words[-2]}*"
+        if rng.random() < 0.1:
+            words[2] = f"`{words[2]}`"
+        return " ".join(words).capitalize() + "."
+
+    def _paragraph(self, rng: random.Random) -> str:
+        return " ".join(self._sentence(rng) for _ in range(self.sentences_per_paragraph))
+
+
+def write_images(image_dir: Path, count: int, size: int = 64):
+    """Write small PNG images named figure_<n>.png."""
+    from PIL import Image
+
+    image_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        path = image_dir / f"figure_{index}.png"
+        if not path.exists():
+            Image.new('RGB', (size, size), (index * 40 % 256, 120, 200)).save(path)
+
+
+# Document profiles used by the benchmark suite
+PROFILES: Dict[str, DocumentSpec] = {
+    'prose': DocumentSpec(sections=40, paragraphs_per_section=5),
+    'structured': DocumentSpec(sections=20, heading_depth=6, list_items=12, list_depth=3,
+                               table_rows=10, table_columns=5),
+    'technical': DocumentSpec(sections=15, code_blocks=2, code_lines=15, images=5,
+                              mermaid_blocks=3, table_rows=5),
+}
@@ -0,0 +1,85 @@
+"""
+Peak-memory benchmark for the streaming Word and PowerPoint backends.
+
+Generates a large synthetic document with each backend in a fresh
+interpreter and compares the growth in peak RSS during generation. The
+streaming backends should stay roughly flat while the in-memory backends
+grow with the document.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+resource = pytest.importorskip("resource")
+
+TESTS_PATH = Path(__file__).parent.parent
+SRC_PATH = TESTS_PATH.parent / 'src'
+
+# Synthetic document size (top-level sections)
+SECTIONS = 600
+
+# Allowed peak RSS growth for a streaming backend (MiB)
+STREAMING_BUDGET_MB = 48
+
+RUNNER = """
+import importlib, json, resource, sys
+from benchmarks.synthetic import DocumentSpec
+from md2office.parser import MarkdownParser, ASTBuilder
+
+module_name, class_name, option, backend, sections = sys.argv[1:6]
+spec = DocumentSpec(sections=int(sections), paragraphs_per_section=6,
+                    table_rows=8, list_items=6, code_blocks=1)
+ast = ASTBuilder().build(MarkdownParser().parse(spec.render()))
+generator = getattr(importlib.import_module(module_name), class_name)()
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+data = generator.generate(ast, {option: backend})
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is KiB on Linux, bytes on macOS
+scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+print(json.dumps({'growth_mb': (after - before) / scale, 'size': len(data)}))
+"""
+
+# format: (dependency, generator module, class, backend option, in-memory backend)
+BACKENDS = {
+    'word': ('docx', 'md2office.generators.word_generator', 'WordGenerator',
+             'word_backend', 'docx'),
+    'powerpoint': ('pptx', 'md2office.generators.powerpoint_generator', 'PowerPointGenerator',
+                   'powerpoint_backend', 'pptx'),
+}
+
+
+def measure(module_name: str, class_name: str, option: str, backend: str) -> dict:
+    """Generate the synthetic document with a backend in a fresh interpreter."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [str(SRC_PATH), str(TESTS_PATH), env.get('PYTHONPATH')])
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', RUNNER, module_name, class_name, option, backend, str(SECTIONS)],
+        capture_output=True, text=True, env=env, timeout=600
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+@pytest.mark.parametrize('format_name', sorted(BACKENDS))
+def test_streaming_peak_rss_is_bounded(format_name):
+    """Streaming keeps peak RSS growth small and well below the in-memory backend."""
+    dependency, module_name, class_name, option, in_memory = BACKENDS[format_name]
+    pytest.importorskip(dependency)
+
+    in_memory_run = measure(module_name, class_name, option, in_memory)
+    streaming_run = measure(module_name, class_name, option, 'streaming')
+    print(f"\n{format_name} peak RSS growth: {in_memory} {in_memory_run['growth_mb']:.0f} MiB, "
+          f"streaming {streaming_run['growth_mb']:.0f} MiB")
+
+    assert streaming_run['size'] == pytest.approx(in_memory_run['size'], rel=0.01)
+    assert streaming_run['growth_mb'] < STREAMING_BUDGET_MB
+    assert streaming_run['growth_mb'] < in_memory_run['growth_mb'] / 4
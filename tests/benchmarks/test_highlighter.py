@@ -0,0 +1,73 @@
+"""
+Editor syntax highlighting benchmark.
+
+Times a full rehighlight of a 20,000-line markdown document (prose,
+lists, tables and fenced code) and a single-character edit in the middle
+of it, which should only rehighlight the edited line. Run with::
+
+    pytest tests/benchmarks/test_highlighter.py --run-benchmarks -s
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from .synthetic import DocumentSpec
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+LINE_COUNT = 20000
+
+# Generous wall-clock budgets (seconds)
+REHIGHLIGHT_BUDGET = 10.0
+EDIT_BUDGET = 0.05
+
+DOCUMENT = DocumentSpec(sections=400, heading_depth=6, sentences_per_paragraph=2,
+                        list_items=8, list_depth=2, table_rows=6, code_blocks=2, code_lines=12)
+
+
+def _document_text() -> str:
+    """Render exactly LINE_COUNT lines of markdown."""
+    lines = DOCUMENT.render().split("\n")
+    while len(lines) < LINE_COUNT:
+        lines += lines
+    return "\n".join(lines[:LINE_COUNT])
+
+
+@pytest.mark.benchmark
+def test_rehighlight_20k_lines():
+    """A 20k-line document rehighlights, and edits stay local."""
+    pytest.importorskip('PySide6')
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QTextCursor
+    from md2office.gui.widgets.markdown_editor import MarkdownEditor
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    editor = MarkdownEditor()
+    editor.setPlainText(_document_text())
+    assert editor.document().blockCount() == LINE_COUNT
+
+    rehighlight = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        editor.highlighter.rehighlight()
+        rehighlight = min(rehighlight, time.perf_counter() - start)
+
+    cursor = QTextCursor(editor.document().findBlockByNumber(LINE_COUNT // 2))
+    edit = float('inf')
+    for _ in range(20):
+        start = time.perf_counter()
+        cursor.insertText("x")
+        edit = min(edit, time.perf_counter() - start)
+
+    print(f"\nrehighlight {LINE_COUNT} lines: {rehighlight * 1e3:.1f} ms, "
+          f"single edit: {edit * 1e3:.3f} ms")
+    app.processEvents()
+    assert rehighlight < REHIGHLIGHT_BUDGET
+    assert edit < EDIT_BUDGET
@@ -0,0 +1,89 @@
+"""
+Progress reporting overhead on the benchmark corpus.
+
+Generates each synthetic profile in every format with a ProgressReporter
+attached, counts the progress calls the generators make, and checks
+that the time those calls take (measured on their own) stays below 1%
+of generation time. Run with::
+
+    pytest tests/benchmarks/test_progress_overhead.py --run-benchmarks
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.parser.markdown_parser import MarkdownParser
+from md2office.parser.ast_builder import ASTBuilder, StructureAnalyzer
+from md2office.progress import ProgressReporter, PROGRESS_OPTION
+
+from .synthetic import PROFILES
+from .test_stage_benchmarks import GENERATORS
+
+# Allowed share of generation time spent reporting progress
+OVERHEAD_BUDGET = 0.01
+
+
+class _CountingReporter(ProgressReporter):
+    """Reporter that counts advance() calls."""
+
+    def __init__(self):
+        super().__init__(lambda event: None)
+        self.calls = 0
+
+    def advance(self, count=1, produced=None):
+        self.calls += 1
+        super().advance(count, produced)
+
+
+def _advance_cost(calls: int) -> float:
+    """Time ``calls`` advance() calls of a reporter in a generation stage."""
+    reporter = ProgressReporter(lambda event: None)
+    reporter.start(['pdf'])
+    reporter.begin_stage('pdf', total=calls, unit='flowables')
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for page in range(calls):
+            reporter.advance(produced=page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('profile', sorted(PROFILES))
+@pytest.mark.parametrize('format_name', sorted(GENERATORS))
+def test_progress_overhead(tmp_path, format_name, profile):
+    """Progress reporting costs less than 1% of generation time."""
+    dependency, module_name, class_name = GENERATORS[format_name]
+    pytest.importorskip(dependency)
+    module = pytest.importorskip(module_name)
+    generator = getattr(module, class_name)()
+
+    ast = ASTBuilder().build(MarkdownParser().parse(PROFILES[profile].render(tmp_path)))
+    reporter = _CountingReporter()
+    reporter.start([format_name])
+    reporter.begin_stage(format_name)
+    options = {'structure_analysis': StructureAnalyzer(ast).analyze(),
+               'base_path': str(tmp_path), PROGRESS_OPTION: reporter}
+
+    fragment_cache = getattr(generator, 'fragment_cache', None)
+    elapsed = float('inf')
+    for _ in range(3):
+        if fragment_cache is not None:
+            fragment_cache.clear()
+        reporter.calls = 0
+        start = time.perf_counter()
+        generator.generate(ast, options)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    overhead = _advance_cost(reporter.calls)
+    print(f"\n{format_name}[{profile}]: {reporter.calls} progress calls, "
+          f"{overhead * 1e3:.3f} ms of {elapsed * 1e3:.1f} ms")
+    assert reporter.calls > 0
+    assert overhead < OVERHEAD_BUDGET * elapsed
@@ -0,0 +1,54 @@
+"""
+AST serialization benchmark.
+
+Times a ``to_bytes``/``from_bytes`` round trip of each synthetic profile
+against pickling the same tree, the alternative the binary format
+replaces for the AST cache and worker hand-off. Run with::
+
+    pytest tests/benchmarks/test_serializer.py --run-benchmarks -s
+"""
+
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.parser import MarkdownParser, ASTBuilder
+from md2office.parser.ast_builder import ASTNode
+
+from .synthetic import PROFILES
+
+ROUNDS = 15
+
+
+def _best(function) -> float:
+    """Best wall-clock time of ROUNDS calls."""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('profile', sorted(PROFILES))
+def test_round_trip_vs_pickle(profile):
+    """A round trip is no slower, and the output no larger, than pickle."""
+    ast = ASTBuilder().build(MarkdownParser().parse(PROFILES[profile].render()))
+    data = ast.to_bytes()
+    pickled = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+    assert ASTNode.from_bytes(data).structural_hash() == ast.structural_hash()
+
+    ours = _best(lambda: ASTNode.from_bytes(ast.to_bytes()))
+    theirs = _best(lambda: pickle.loads(pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)))
+
+    print(f"\n{profile}: round trip {ours * 1e3:.2f} ms ({len(data)} bytes), "
+          f"pickle {theirs * 1e3:.2f} ms ({len(pickled)} bytes)")
+    assert ours <= theirs
+    assert len(data) <= len(pickled)
@@ -0,0 +1,99 @@
+"""
+Throughput benchmarks for the warm conversion server.
+
+Compares repeated cold CLI invocations against the same invocations
+routed through a running ``md2office serve`` process, and against
+direct in-process client submissions.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from md2office.server import ServerClient
+
+SRC_PATH = Path(__file__).parent.parent.parent / 'src'
+
+# Number of conversions per measurement
+JOBS = 6
+
+CLI_RUNNER = "import sys; from md2office.cli import main; sys.argv[0] = 'md2office'; main()"
+
+MARKDOWN = "\n".join(
+    f"## Section {i}\n\nParagraph with **bold** and *italic* text.\n\n- item\n- item\n"
+    for i in range(5)
+)
+
+
+def _env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_PATH), env.get('PYTHONPATH')]))
+    return env
+
+
+def _run_cli(tmp_path, *args):
+    return subprocess.run(
+        [sys.executable, '-c', CLI_RUNNER, *args],
+        capture_output=True, text=True, env=_env(), cwd=str(tmp_path), timeout=120
+    )
+
+
+@pytest.fixture
+def running_server(tmp_path):
+    """Start `md2office serve` in a subprocess on a temporary Unix socket."""
+    if not hasattr(__import__('socket'), 'AF_UNIX'):
+        pytest.skip("Unix sockets not supported")
+    address = f"unix:{tmp_path / 'md2office.sock'}"
+    process = subprocess.Popen(
+        [sys.executable, '-c', CLI_RUNNER, 'serve', '--address', address, '--workers', '2'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=_env(), cwd=str(tmp_path)
+    )
+    client = ServerClient(address)
+    deadline = time.monotonic() + 60
+    while not client.is_available():
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            pytest.fail("Conversion server did not start")
+        time.sleep(0.1)
+    yield address
+    client.shutdown()
+    process.wait(timeout=30)
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+class TestServerThroughput:
+    """Served vs cold conversion throughput."""
+
+    def test_served_cli_faster_than_cold_cli(self, tmp_path, running_server):
+        """`md2office --server` beats cold invocations on the same workload."""
+        pytest.importorskip('docx')
+        markdown_file = tmp_path / 'doc.md'
+        markdown_file.write_text(MARKDOWN, encoding='utf-8')
+        args = ['--word', '--pdf', '--overwrite', '-q', '-o', str(tmp_path / 'out'), str(markdown_file)]
+
+        start = time.perf_counter()
+        for _ in range(JOBS):
+            assert _run_cli(tmp_path, *args).returncode == 0
+        cold = (time.perf_counter() - start) / JOBS
+
+        start = time.perf_counter()
+        for _ in range(JOBS):
+            result = _run_cli(tmp_path, '--server', '--server-address', running_server, *args)
+            assert result.returncode == 0, result.stderr
+        served = (time.perf_counter() - start) / JOBS
+
+        client = ServerClient(running_server)
+        start = time.perf_counter()
+        for _ in range(JOBS):
+            client.convert(['word', 'pdf'], input_path=str(markdown_file))
+        in_process = (time.perf_counter() - start) / JOBS
+
+        print(f"\ncold CLI: {cold * 1000:.0f} ms/job, served CLI: {served * 1000:.0f} ms/job, "
+              f"client: {in_process * 1000:.0f} ms/job")
+        assert served < cold
+        assert in_process < served
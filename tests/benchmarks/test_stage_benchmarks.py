@@ -0,0 +1,98 @@
+"""
+Per-stage benchmarks on synthetic documents.
+
+Benchmarks MarkdownParser.parse, ASTBuilder.build,
+StructureAnalyzer.analyze and each format generator separately for
+several document profiles. Run with::
+
+    pytest tests/benchmarks --run-benchmarks
+    pytest tests/benchmarks --benchmark-update-baseline   # record a new baseline
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.parser.markdown_parser import MarkdownParser
+from md2office.parser.ast_builder import ASTBuilder, StructureAnalyzer
+
+from .synthetic import PROFILES
+
+GENERATORS = {
+    'word': ('docx', 'md2office.generators.word_generator', 'WordGenerator'),
+    'powerpoint': ('pptx', 'md2office.generators.powerpoint_generator', 'PowerPointGenerator'),
+    'pdf': ('reportlab', 'md2office.generators.pdf_generator', 'PDFGenerator'),
+}
+
+
+@pytest.fixture(scope='module')
+def documents(tmp_path_factory):
+    """Render every profile once, with images on disk."""
+    image_dir = tmp_path_factory.mktemp('images')
+    return {name: spec.render(image_dir) for name, spec in PROFILES.items()}, image_dir
+
+
+@pytest.fixture(scope='module')
+def prepared(documents):
+    """Parsed tokens, AST and analysis for every profile."""
+    markdown, _ = documents
+    prepared_documents = {}
+    for name, content in markdown.items():
+        tokens = MarkdownParser().parse(content)
+        ast = ASTBuilder().build(tokens)
+        prepared_documents[name] = (tokens, ast, StructureAnalyzer(ast).analyze())
+    return prepared_documents
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('profile', sorted(PROFILES))
+class TestStageBenchmarks:
+    """Benchmarks for parsing and structure stages."""
+
+    def test_parse(self, stage_benchmark, documents, profile):
+        """Benchmark MarkdownParser.parse."""
+        markdown, _ = documents
+        parser = MarkdownParser()
+        tokens = stage_benchmark(f"parse[{profile}]", parser.parse, markdown[profile])
+        assert tokens
+
+    def test_build(self, stage_benchmark, prepared, profile):
+        """Benchmark ASTBuilder.build."""
+        tokens, _, _ = prepared[profile]
+        ast = stage_benchmark(f"build[{profile}]", lambda: ASTBuilder().build(tokens))
+        assert ast.children
+
+    def test_analyze(self, stage_benchmark, prepared, profile):
+        """Benchmark StructureAnalyzer.analyze."""
+        _, ast, _ = prepared[profile]
+        analysis = stage_benchmark(f"analyze[{profile}]", lambda: StructureAnalyzer(ast).analyze())
+        assert analysis['statistics']['total_nodes'] > 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('profile', sorted(PROFILES))
+@pytest.mark.parametrize('format_name', sorted(GENERATORS))
+def test_generate(stage_benchmark, documents, prepared, format_name, profile):
+    """Benchmark each generator separately, with a warm generator instance."""
+    dependency, module_name, class_name = GENERATORS[format_name]
+    pytest.importorskip(dependency)
+    module = pytest.importorskip(module_name)
+    generator = getattr(module, class_name)()
+
+    _, image_dir = documents
+    _, ast, analysis = prepared[profile]
+    options = {'structure_analysis': analysis, 'base_path': str(image_dir)}
+
+    def generate():
+        # Measure full generation, not reuse of sections cached by earlier rounds
+        fragment_cache = getattr(generator, 'fragment_cache', None)
+        if fragment_cache is not None:
+            fragment_cache.clear()
+        return generator.generate(ast, options)
+
+    data = stage_benchmark(f"generate.{format_name}[{profile}]", generate)
+    assert data
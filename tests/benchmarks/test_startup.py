@@ -0,0 +1,165 @@
+"""
+Cold-start benchmarks for the md2office CLI and GUI.
+
+Runs the CLI in a fresh interpreter and checks that only the generator
+dependencies needed for the requested formats are imported, and that
+start-up stays within a generous latency budget.
+
+Starts the GUI in a fresh interpreter under the offscreen Qt platform and
+measures the time to the main window's first paint and the time until its
+deferred start-up work is done (time to interactive). Neither QtWebEngine
+nor any generator dependency may be imported before the first paint. Run
+with ``-s`` to print the timings.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SRC_PATH = Path(__file__).parent.parent.parent / 'src'
+
+# Top-level packages that must only be imported when actually needed
+HEAVY_MODULES = {'docx', 'pptx', 'reportlab', 'PySide6'}
+
+# Wall-clock budget for a cold `md2office --version` (seconds)
+VERSION_BUDGET = 1.0
+
+# Modules the GUI loads after its first paint
+DEFERRED_GUI_MODULES = {'docx', 'pptx', 'reportlab', 'PySide6.QtWebEngineWidgets'}
+
+# Wall-clock budgets for a cold GUI start (seconds)
+FIRST_PAINT_BUDGET = 3.0
+INTERACTIVE_BUDGET = 10.0
+
+RUNNER = """
+import atexit, json, sys
+modules_file = sys.argv[1]
+def _dump():
+    with open(modules_file, 'w') as f:
+        json.dump(sorted(sys.modules), f)
+atexit.register(_dump)
+from md2office.cli import main
+sys.argv = ['md2office'] + sys.argv[2:]
+main()
+"""
+
+GUI_RUNNER = """
+import json, sys, time
+start = time.perf_counter()
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+from md2office.gui.main_window import MainWindow
+timings = {}
+
+class FirstPaint(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and 'first_paint' not in timings:
+            timings['first_paint'] = time.perf_counter() - start
+            timings['modules_at_first_paint'] = sorted(sys.modules)
+        return False
+
+def interactive():
+    timings['interactive'] = time.perf_counter() - start
+    app.quit()
+
+window = MainWindow()
+first_paint = FirstPaint()
+window.installEventFilter(first_paint)
+window.startup_finished.connect(interactive)
+window.show()
+QTimer.singleShot(int(float(sys.argv[2]) * 1000), app.quit)
+app.exec()
+with open(sys.argv[1], 'w') as f:
+    json.dump(timings, f)
+"""
+
+
+def run_cli(tmp_path, *args):
+    """Run the CLI in a fresh interpreter; return (elapsed, imported modules, result)."""
+    modules_file = tmp_path / 'modules.json'
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_PATH), env.get('PYTHONPATH')]))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', RUNNER, str(modules_file), *args],
+        capture_output=True, text=True, env=env, cwd=str(tmp_path), timeout=120
+    )
+    elapsed = time.perf_counter() - start
+    modules = set(json.loads(modules_file.read_text())) if modules_file.exists() else set()
+    top_level = {name.split('.')[0] for name in modules}
+    return elapsed, top_level, result
+
+
+@pytest.fixture
+def markdown_file(tmp_path):
+    """Create a small markdown document."""
+    path = tmp_path / 'doc.md'
+    path.write_text("# Title\n\nSome text.\n\n## Section\n\n- item\n", encoding='utf-8')
+    return path
+
+
+@pytest.mark.slow
+class TestColdStart:
+    """Cold-start guards for the CLI entry point."""
+
+    def test_version_imports_no_generators(self, tmp_path):
+        """--version must not import any generator or GUI dependency."""
+        elapsed, modules, result = run_cli(tmp_path, '--version')
+        assert result.returncode == 0, result.stderr
+        assert 'md2office' in modules
+        assert not modules & HEAVY_MODULES
+        assert elapsed < VERSION_BUDGET
+
+    def test_word_imports_only_docx(self, tmp_path, markdown_file):
+        """--word loads python-docx but not python-pptx, ReportLab or PySide6."""
+        pytest.importorskip('docx')
+        _, modules, result = run_cli(tmp_path, '--word', '--overwrite', '-q',
+                                     '-o', str(tmp_path), str(markdown_file))
+        assert result.returncode == 0, result.stderr
+        assert 'docx' in modules
+        assert not modules & {'pptx', 'reportlab', 'PySide6'}
+
+    def test_pdf_imports_only_reportlab(self, tmp_path, markdown_file):
+        """--pdf loads ReportLab but not python-docx, python-pptx or PySide6."""
+        pytest.importorskip('reportlab')
+        _, modules, result = run_cli(tmp_path, '--pdf', '--overwrite', '-q',
+                                     '-o', str(tmp_path), str(markdown_file))
+        assert result.returncode == 0, result.stderr
+        assert 'reportlab' in modules
+        assert not modules & {'docx', 'pptx', 'PySide6'}
+
+
+def run_gui(tmp_path, timeout: float = 60.0):
+    """Start the GUI offscreen in a fresh interpreter; return its timings."""
+    timings_file = tmp_path / 'timings.json'
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_PATH), env.get('PYTHONPATH')]))
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    result = subprocess.run(
+        [sys.executable, '-c', GUI_RUNNER, str(timings_file), str(timeout)],
+        capture_output=True, text=True, env=env, cwd=str(tmp_path), timeout=timeout + 60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(timings_file.read_text())
+
+
+@pytest.mark.slow
+class TestGUIStartup:
+    """Start-up guards for the GUI main window."""
+
+    def test_first_paint_before_deferred_loading(self, tmp_path):
+        """The window paints before QtWebEngine and the generators load."""
+        pytest.importorskip('PySide6.QtWidgets')
+        timings = run_gui(tmp_path)
+        print(f"\nGUI start-up: first paint {timings['first_paint'] * 1000:.0f} ms, "
+              f"interactive {timings['interactive'] * 1000:.0f} ms")
+
+        assert not DEFERRED_GUI_MODULES & set(timings['modules_at_first_paint'])
+        assert timings['first_paint'] < FIRST_PAINT_BUDGET
+        assert timings['first_paint'] <= timings['interactive'] < INTERACTIVE_BUDGET
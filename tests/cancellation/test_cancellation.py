@@ -0,0 +1,235 @@
+"""
+Tests for Cancellation
+
+Implements tests for CancellationToken, run_process, OutputTransaction and
+cancelling conversions in the pipeline, generators and ConversionService.
+"""
+
+import os
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.cancellation import (
+    CancellationToken, CANCEL_OPTION, check_cancelled, run_process, OutputTransaction
+)
+from md2office.errors import CancellationError
+from md2office.parser import MarkdownParser, ASTBuilder
+from md2office.router import ConversionPipeline
+
+SAMPLE_MARKDOWN = "# Title\n\nSome *text*.\n\n## Section\n\n- one\n- two\n"
+
+
+class _CancelOnStage(CancellationToken):
+    """Token that cancels itself the first time a stage checks it."""
+
+    def __init__(self, stage):
+        super().__init__()
+        self.stage = stage
+
+    def raise_if_cancelled(self, stage=None):
+        if stage == self.stage:
+            self.cancel()
+        super().raise_if_cancelled(stage)
+
+
+class TestCancellationToken:
+    """Test suite for CancellationToken."""
+
+    def test_cancel_runs_callbacks_once(self):
+        """Test that callbacks run once, and not after they are unregistered."""
+        token = CancellationToken()
+        calls = []
+        token.register(lambda: calls.append('kept'))
+        handle = token.register(lambda: calls.append('removed'))
+        token.unregister(handle)
+
+        assert not token.is_cancelled
+        token.cancel()
+        token.cancel()
+
+        assert token.is_cancelled
+        assert calls == ['kept']
+
+    def test_register_after_cancel_calls_at_once(self):
+        """Test that a callback registered on a cancelled token runs immediately."""
+        token = CancellationToken()
+        token.cancel()
+        calls = []
+        assert token.register(lambda: calls.append(1)) is None
+        assert calls == [1]
+
+    def test_raise_if_cancelled(self):
+        """Test that the error names the stage that noticed the cancellation."""
+        token = CancellationToken()
+        token.raise_if_cancelled("parse")
+        check_cancelled({}, "parse")
+        check_cancelled(None, "parse")
+
+        token.cancel()
+        with pytest.raises(CancellationError) as info:
+            check_cancelled({CANCEL_OPTION: token}, "word")
+        assert info.value.stage == "word"
+        assert info.value.context['stage'] == "word"
+
+    def test_wait(self):
+        """Test waiting for cancellation from another thread."""
+        token = CancellationToken()
+        assert not token.wait(0.01)
+        threading.Timer(0.05, token.cancel).start()
+        assert token.wait(5)
+
+
+class TestRunProcess:
+    """Test suite for run_process."""
+
+    def test_captures_output(self):
+        """Test that output and the exit status are returned."""
+        result = run_process([sys.executable, "-c", "print('hello')"], {})
+        assert result.returncode == 0
+        assert result.stdout.strip() == b"hello"
+
+    def test_cancel_kills_child(self):
+        """Test that cancelling kills the child process at once."""
+        token = CancellationToken()
+        threading.Timer(0.2, token.cancel).start()
+        start = time.monotonic()
+        with pytest.raises(CancellationError):
+            run_process([sys.executable, "-c", "import time; time.sleep(30)"],
+                        {CANCEL_OPTION: token}, timeout=60)
+        assert time.monotonic() - start < 10
+
+    def test_cancelled_token_does_not_start_child(self, tmp_path):
+        """Test that nothing is run once the token is cancelled."""
+        token = CancellationToken()
+        token.cancel()
+        marker = tmp_path / "ran"
+        with pytest.raises(CancellationError):
+            run_process([sys.executable, "-c", f"open({str(marker)!r}, 'w')"],
+                        {CANCEL_OPTION: token})
+        assert not marker.exists()
+
+
+class TestOutputTransaction:
+    """Test suite for OutputTransaction."""
+
+    def test_write_replaces_file(self, tmp_path):
+        """Test that files are replaced whole with the usual permissions."""
+        path = tmp_path / "out.docx"
+        path.write_bytes(b"old")
+        with OutputTransaction() as transaction:
+            transaction.write(path, b"new")
+
+        assert path.read_bytes() == b"new"
+        assert os.listdir(tmp_path) == ["out.docx"]
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+    def test_rollback_on_error(self, tmp_path):
+        """Test that files written before an error are removed."""
+        with pytest.raises(KeyboardInterrupt):
+            with OutputTransaction() as transaction:
+                transaction.write(tmp_path / "one.docx", b"one")
+                raise KeyboardInterrupt()
+        assert os.listdir(tmp_path) == []
+
+    def test_rollback_keeps_previous_outputs(self, tmp_path):
+        """Test that outputs from an earlier run survive a failed run."""
+        docx_path = tmp_path / "doc.docx"
+        docx_path.write_bytes(b"old docx")
+        with pytest.raises(KeyboardInterrupt):
+            with OutputTransaction() as transaction:
+                transaction.write(docx_path, b"new docx")
+                transaction.write(tmp_path / "doc.pdf", b"new pdf")
+                raise KeyboardInterrupt()
+
+        assert docx_path.read_bytes() == b"old docx"
+        assert os.listdir(tmp_path) == ["doc.docx"]
+
+    def test_failed_commit_restores_previous_outputs(self, tmp_path, monkeypatch):
+        """Test that a rename failing part way puts the old files back."""
+        first, second = tmp_path / "doc.docx", tmp_path / "doc.pdf"
+        first.write_bytes(b"old docx")
+        second.write_bytes(b"old pdf")
+        replace = os.replace
+
+        def failing_replace(source, target):
+            if Path(target) == second and Path(source).suffix == '.tmp':
+                raise OSError("disk full")
+            replace(source, target)
+
+        monkeypatch.setattr(os, 'replace', failing_replace)
+        with pytest.raises(OSError):
+            with OutputTransaction() as transaction:
+                transaction.write(first, b"new docx")
+                transaction.write(second, b"new pdf")
+
+        assert first.read_bytes() == b"old docx"
+        assert second.read_bytes() == b"old pdf"
+        assert sorted(os.listdir(tmp_path)) == ["doc.docx", "doc.pdf"]
+
+
+class TestCancelledConversion:
+    """Test suite for cancelling conversions."""
+
+    @pytest.mark.parametrize("format_name", ["word", "powerpoint", "pdf"])
+    def test_cancelled_before_start(self, format_name):
+        """Test that a cancelled token stops the conversion before parsing."""
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(CancellationError) as info:
+            ConversionPipeline().convert(SAMPLE_MARKDOWN, [format_name], cancel_token=token)
+        assert info.value.stage == "parse"
+
+    @pytest.mark.parametrize("format_name", ["word", "pdf"])
+    def test_cancelled_while_generating(self, format_name):
+        """Test that generators stop between sections and do not wrap the error."""
+        token = _CancelOnStage(format_name)
+        with pytest.raises(CancellationError) as info:
+            ConversionPipeline().convert(SAMPLE_MARKDOWN, [format_name], cancel_token=token)
+        assert info.value.stage == format_name
+
+    def test_cancelled_partitioned_pdf(self):
+        """Test that cancelling kills PDF partition workers instead of falling back."""
+        pytest.importorskip("reportlab")
+        from md2office.generators import PDFGenerator
+
+        class CancelOnRegister(CancellationToken):
+            def register(self, callback):
+                handle = super().register(callback)
+                self.cancel()
+                return handle
+
+        markdown = "\n".join(f"# Chapter {number}\n\n" + "Lorem ipsum. " * 200
+                             for number in range(1, 5))
+        ast = ASTBuilder().build(MarkdownParser().parse(markdown))
+        with pytest.raises(CancellationError):
+            PDFGenerator().generate(ast, {'pdf_workers': 2, CANCEL_OPTION: CancelOnRegister()})
+
+    def test_service_writes_nothing_when_cancelled(self, tmp_path):
+        """Test that a cancelled conversion reports 'Cancelled' and leaves no files."""
+        pytest.importorskip("PySide6")
+        from md2office.gui.conversion_service import ConversionService
+
+        input_path = tmp_path / "doc.md"
+        input_path.write_text(SAMPLE_MARKDOWN)
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+
+        result = ConversionService().convert_file(
+            str(input_path), ['word', 'pdf'], output_dir=str(output_dir),
+            cancel_token=_CancelOnStage("pdf")
+        )
+
+        assert not result['success']
+        assert result['error_type'] == 'Cancelled'
+        assert result['stage'] == 'pdf'
+        assert os.listdir(output_dir) == []
@@ -0,0 +1,116 @@
+"""
+Tests for the cached configuration resolver.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.config import ConfigResolver, find_config_file
+from md2office.config import resolver as resolver_module
+from md2office.errors import ConfigurationError
+
+
+def write_config(path: Path, values: dict):
+    """Write a JSON configuration file."""
+    path.write_text(json.dumps(values), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Project with a config at the root and nested document directories."""
+    write_config(tmp_path / '.md2office.json', {'style': 'professional'})
+    (tmp_path / 'docs' / 'guide').mkdir(parents=True)
+    (tmp_path / 'other').mkdir()
+    return tmp_path
+
+
+class TestConfigResolver:
+    """Test suite for ConfigResolver."""
+
+    def test_find_matches_find_config_file(self, tree):
+        """Lookups agree with the uncached find_config_file."""
+        resolver = ConfigResolver()
+        for directory in (tree, tree / 'docs', tree / 'docs' / 'guide', tree / 'other'):
+            assert resolver.find(str(directory)) == find_config_file(str(directory))
+
+    def test_find_checks_each_directory_once(self, tree, monkeypatch):
+        """Sibling and repeated lookups reuse cached directory results."""
+        resolver = ConfigResolver()
+        checked = []
+        original = resolver._config_in
+
+        def counting(directory):
+            if directory not in resolver._present:
+                checked.append(directory)
+            return original(directory)
+
+        monkeypatch.setattr(resolver, '_config_in', counting)
+        for _ in range(3):
+            resolver.find(str(tree / 'docs' / 'guide'))
+            resolver.find(str(tree / 'docs'))
+            resolver.find(str(tree / 'other'))
+
+        assert len(checked) == len(set(checked)) == 4
+
+    def test_load_parses_once_until_modified(self, tree, monkeypatch):
+        """Parsed configs are reused until the file changes."""
+        calls = []
+        original = resolver_module.load_config
+        monkeypatch.setattr(resolver_module, 'load_config',
+                            lambda path: calls.append(path) or original(path))
+
+        resolver = ConfigResolver()
+        config_path = str(tree / '.md2office.json')
+        first = resolver.load(config_path)
+        second = resolver.load(config_path)
+        assert len(calls) == 1
+        assert second.get('style') == 'professional'
+
+        # Returned configs are independent copies
+        first.set('style', 'minimal')
+        assert resolver.load(config_path).get('style') == 'professional'
+
+        write_config(tree / '.md2office.json', {'style': 'minimal', 'pageBreaks': True})
+        os.utime(config_path, ns=(0, 10**9))
+        assert resolver.load(config_path).get('style') == 'minimal'
+        assert len(calls) == 2
+
+    def test_resolve_merges_overrides(self, tree):
+        """CLI overrides win over configuration file values."""
+        resolver = ConfigResolver()
+        config_path, config = resolver.resolve(str(tree / 'docs'), {'pageBreaks': True})
+        assert config_path == str(tree / '.md2office.json')
+        assert config.get('style') == 'professional'
+        assert config.get('pageBreaks') is True
+
+    def test_resolve_ignores_invalid_found_config(self, tree):
+        """Invalid auto-found configs fall back to defaults; explicit ones raise."""
+        bad = tree / 'other' / '.md2office.json'
+        bad.write_text('{not json', encoding='utf-8')
+        resolver = ConfigResolver()
+
+        config_path, config = resolver.resolve(str(tree / 'other'))
+        assert config_path == str(bad)
+        assert config.get('style') == 'default'
+
+        with pytest.raises(ConfigurationError):
+            resolver.resolve(str(tree / 'other'), config_file=str(bad))
+
+    def test_clear_lookups_finds_new_config(self, tree):
+        """New config files are found after clear_lookups()."""
+        resolver = ConfigResolver()
+        assert resolver.find(str(tree / 'other')) == str(tree / '.md2office.json')
+
+        new_config = write_config(tree / 'other' / '.md2office.yaml', {'style': 'minimal'})
+        assert resolver.find(str(tree / 'other')) == str(tree / '.md2office.json')
+
+        resolver.clear_lookups()
+        assert resolver.find(str(tree / 'other')) == str(new_config)
@@ -0,0 +1,197 @@
+"""
+Tests for HTML Document Generator
+"""
+
+import pytest
+import sys
+from io import BytesIO
+from pathlib import Path
+
+# Add src to path (now in subdirectory, go up two levels)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.parser import MarkdownParser, ASTBuilder
+from md2office.generators import HTMLGenerator
+from md2office.generators.html_generator import render_inline, diagram_hash
+from md2office.router import ConversionPipeline
+from md2office.cancellation import CancellationToken, CANCEL_OPTION
+from md2office.errors import CancellationError
+
+
+def build_ast(markdown: str):
+    """Parse markdown and build its AST."""
+    return ASTBuilder().build(MarkdownParser().parse(markdown))
+
+
+class TestHTMLGenerator:
+    """Test suite for HTML generator."""
+
+    @pytest.fixture
+    def html_generator(self):
+        """Create HTML generator instance."""
+        return HTMLGenerator()
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing."""
+        return """---
+title: Sample & Test
+author: Jane
+---
+
+Intro text.
+
+# Test Document
+
+This is a test document with **bold** and *italic* text.
+
+## Section 1
+
+Some content with `a < b` and a [link](https://example.com/?a=1&b=2).
+
+### Subsection
+
+- Item 1
+  - Nested item
+- Item 2
+
+1. First
+2. Second
+
+## Section 2
+
+```python
+def hello():
+    print("<Hello>")
+```
+
+```mermaid
+graph TD
+    A --> B
+```
+
+> Quoted **text**
+
+---
+"""
+
+    def test_generate_document(self, html_generator, sample_markdown):
+        """Test that a complete, escaped HTML document is generated."""
+        html = html_generator.generate(build_ast(sample_markdown), {}).decode('utf-8')
+
+        assert html.startswith('<!DOCTYPE html>')
+        assert '<title>Sample &amp; Test</title>' in html
+        assert '<meta name="author" content="Jane">' in html
+        assert '<h1 id="test-document">Test Document</h1>' in html
+        assert '<strong>bold</strong>' in html and '<em>italic</em>' in html
+        assert '<code>a &lt; b</code>' in html
+        assert '<a href="https://example.com/?a=1&amp;b=2">link</a>' in html
+        assert '<ul><li>Item 1<ul><li>Nested item</li></ul></li><li>Item 2</li></ul>' in html
+        assert '<ol><li>First</li><li>Second</li></ol>' in html
+        assert '<pre><code class="language-python">def hello():\n    print("&lt;Hello&gt;")' in html
+        assert '<blockquote><p>Quoted <strong>text</strong></p></blockquote>' in html
+        assert '<hr>' in html
+        assert html.rstrip().endswith('</html>')
+
+    def test_blocks_in_document_order(self, html_generator, sample_markdown):
+        """Test that sections follow their parent's content."""
+        body = html_generator.render_body(build_ast(sample_markdown))
+        order = [body.index(text) for text in (
+            'Intro text.', 'Test Document', 'This is a test', 'Section 1',
+            'Some content', 'Subsection', 'Item 1', 'Section 2', 'hello', 'Quoted'
+        )]
+        assert order == sorted(order)
+        assert body.count('Test Document') == 1
+
+    def test_parts_render_body(self, html_generator, sample_markdown):
+        """Test that rendering the parts one by one gives the body."""
+        ast = build_ast(sample_markdown)
+        parts = list(html_generator.iter_parts(ast))
+
+        assert [blocks[0].content for blocks in parts[1:]] == [
+            'Test Document', 'Section 1', 'Subsection', 'Section 2'
+        ]
+        rendered = ''.join(HTMLGenerator().render_blocks(blocks) for blocks in parts)
+        assert rendered == html_generator.render_body(ast)
+
+    def test_mermaid_diagram(self, html_generator):
+        """Test that Mermaid blocks become diagram elements keyed by hash."""
+        body = html_generator.render_body(build_ast("```mermaid\ngraph TD\n    A --> B\n```\n"))
+        source = "graph TD\n    A --> B"
+        assert body == (f'<div class="mermaid" data-hash="{diagram_hash(source)}">'
+                        f'graph TD\n    A --&gt; B</div>\n')
+
+    def test_inline_markdown(self):
+        """Test inline rendering and escaping."""
+        assert render_inline("a **b _c_** `*d*` <e>") == (
+            "a <strong>b <em>c</em></strong> <code>*d*</code> &lt;e&gt;"
+        )
+        assert render_inline('![alt "x"](img.png)') == '<img src="img.png" alt="alt &quot;x&quot;">'
+        assert render_inline("snake_case_name") == "snake_case_name"
+
+    def test_unsafe_urls_rendered_as_text(self, html_generator):
+        """Test that only http(s), mailto and relative URLs become links."""
+        assert render_inline("[x](javascript:alert(1)") == "x"
+        assert render_inline("[**x**](JavaScript:alert)") == "<strong>x</strong>"
+        assert render_inline("[x](\x01javascript:alert)") == "x"
+        assert render_inline("![pic](data:image/svg+xml,x)") == "pic"
+        for url in ('https://example.com', 'mailto:a@example.com', 'docs/a.md', '#top'):
+            assert render_inline(f"[x]({url})") == f'<a href="{url}">x</a>'
+
+        body = html_generator.render_body(build_ast("![pic](vbscript:x)\n"))
+        assert '<img' not in body and 'pic' in body
+
+    def test_table_of_contents_and_page_breaks(self, html_generator, sample_markdown):
+        """Test TOC links and page breaks before H1 headings."""
+        body = html_generator.render_body(build_ast(sample_markdown + "\n# Test Document\n"),
+                                          {'table_of_contents': True, 'page_breaks': True})
+        assert body.startswith('<nav class="toc">')
+        assert '<a href="#test-document-1">Test Document</a>' in body
+        assert '<h1 id="test-document-1" class="page-break">' in body
+        assert '<h2 id="section-1">' in body
+
+    def test_style_preset_stylesheet(self, html_generator):
+        """Test that the style preset is applied through the stylesheet."""
+        from md2office.styling.style import get_style_preset
+
+        html = html_generator.generate(build_ast("# Title"), {'style': 'professional'}).decode()
+        preset = get_style_preset('professional')
+        assert f"h1 {{ font-size: {preset.get_heading_style(1).font.size}pt;" in html
+
+    def test_write_streams_chunks(self, html_generator, sample_markdown, monkeypatch):
+        """Test that large documents are written in several chunks."""
+        import md2office.generators.html_generator as html_module
+        monkeypatch.setattr(html_module, 'WRITE_BUFFER_SIZE', 256)
+
+        class RecordingStream(BytesIO):
+            writes = 0
+
+            def write(self, data):
+                RecordingStream.writes += 1
+                return super().write(data)
+
+        ast = build_ast(sample_markdown * 5)
+        stream = RecordingStream()
+        html_generator.write(ast, stream, {})
+        assert RecordingStream.writes > 5
+        assert stream.getvalue() == html_generator.generate(ast, {})
+
+    def test_cancellation(self, html_generator, sample_markdown):
+        """Test that a cancelled conversion stops between sections."""
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(CancellationError):
+            html_generator.generate(build_ast(sample_markdown), {CANCEL_OPTION: token})
+
+    def test_pipeline_html_format(self, sample_markdown):
+        """Test HTML as a pipeline output format sharing the cached AST."""
+        from md2office.parser import ASTCache
+
+        cache = ASTCache()
+        pipeline = ConversionPipeline(ast_cache=cache)
+        ast = pipeline.parse(sample_markdown)
+        result = pipeline.convert(sample_markdown, ['html'])
+
+        assert pipeline.parse(sample_markdown) is ast
+        assert result['html'].decode('utf-8').count('<h2 ') == 2
+        assert HTMLGenerator().get_file_extension() == '.html'
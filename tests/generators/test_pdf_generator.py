@@ -142,6 +142,75 @@ Content here.
         assert pdf_generator.get_file_extension() == ".pdf"
 
 
+class TestPartitionedPDF:
+    """Tests for rendering PDF partitions in parallel and merging them."""
+    
+    MARKDOWN = "\n".join(
+        f"# Chapter {number}\n\nIntro {number}.\n\n## Part {number}.1\n\n"
+        + "Lorem ipsum dolor sit amet. " * 200 + "\n"
+        for number in range(1, 5)
+    )
+    
+    @staticmethod
+    def read(data):
+        """Pages and outline titles of a PDF."""
+        from md2office.generators.pdf_merge import _Reader
+        reader = _Reader(data)
+        catalog = reader.resolve(reader.trailer['Root'])
+        pages = [reader.resolve(kid) for kid in reader.resolve(catalog['Pages'])['Kids']]
+        titles = []
+        
+        def walk(item):
+            while item is not None:
+                entry = reader.resolve(item)
+                titles.append(bytes(entry['Title']))
+                walk(entry.get('First'))
+                item = entry.get('Next')
+        
+        walk(reader.resolve(catalog['Outlines'])['First'] if 'Outlines' in catalog else None)
+        return reader, pages, titles
+    
+    def test_matches_serial_document(self):
+        """Merged partitions have every heading in the outline and numbered pages."""
+        pytest.importorskip("reportlab")
+        ast = ASTBuilder().build(MarkdownParser().parse(self.MARKDOWN))
+        serial = PDFGenerator()
+        _, serial_pages, serial_titles = self.read(serial.generate(ast, {}))
+        generator = PDFGenerator()
+        reader, pages, titles = self.read(generator.generate(ast, {'pdf_workers': 2}))
+        
+        assert titles == serial_titles
+        assert titles[:2] == [b"(Chapter 1)", b"(Part 1.1)"] and len(titles) == 8
+        # Each partition starts on a new page
+        assert len(serial_pages) <= len(pages) <= len(serial_pages) + 1
+        for number, page in enumerate(pages, 1):
+            assert f"(Page {number})".encode() in reader.resolve(page['Contents'][-1]).data
+        assert [bookmark['page'] for bookmark in generator.bookmarks] == sorted(
+            bookmark['page'] for bookmark in generator.bookmarks)
+    
+    def test_partition_segments(self):
+        """Segments are grouped into contiguous partitions of similar size."""
+        pytest.importorskip("reportlab")
+        from md2office.generators.pdf_generator import partition_segments
+        assert partition_segments([1, 10, 10, 10, 10], 2) == [range(0, 3), range(3, 5)]
+        assert partition_segments([5, 100, 1, 1], 4) == [range(0, 1), range(1, 2), range(2, 3), range(3, 4)]
+        assert partition_segments([5], 4) == [range(0, 1)]
+    
+    def test_single_section_renders_in_process(self):
+        """Documents without sections to split are rendered serially."""
+        pytest.importorskip("reportlab")
+        ast = ASTBuilder().build(MarkdownParser().parse("Just a paragraph."))
+        data = PDFGenerator().generate(ast, {'pdf_workers': 4})
+        _, pages, _ = self.read(data)
+        assert len(pages) == 1
+    
+    def test_outline_titles_are_encoded(self):
+        """Outline titles outside Latin-1 are written as UTF-16."""
+        pytest.importorskip("reportlab")
+        from md2office.generators.pdf_merge import text_string
+        assert text_string("a (b)") == b"(a \\(b\\))"
+        assert text_string("\u2713") == b"<FEFF2713>"
+
 class TestPDFGeneratorIntegration:
     """Integration tests for PDF generator."""
     
@@ -4,6 +4,7 @@ Tests for PowerPoint Document Generator
 Implements Story 3.5: PowerPoint Testing and Validation
 """
 
+import os
 import pytest
 import sys
 from pathlib import Path
@@ -133,6 +134,223 @@ Content here.
         assert powerpoint_generator.get_file_extension() == ".pptx"
 
 
+class TestStreamingPowerPointBackend:
+    """Tests for the streaming PowerPoint backend."""
+    
+    MARKDOWN = """# Deck
+
+Intro with **bold** and `code`.
+
+## Data
+
+| A | B |
+|---|---|
+| 1 | 2 |
+
+- First
+- Second
+
+## Code
+
+```python
+print("hi")
+```
+
+> A quote
+"""
+    
+    def test_matches_pptx_backend(self):
+        """Streaming output has the same parts as python-pptx output."""
+        pytest.importorskip("pptx")
+        import zipfile
+        from io import BytesIO
+        generator = PowerPointGenerator()
+        ast = ASTBuilder().build(MarkdownParser().parse(self.MARKDOWN))
+        
+        parts = {}
+        for backend in ('pptx', 'streaming'):
+            data = generator.generate(ast, {'powerpoint_backend': backend})
+            with zipfile.ZipFile(BytesIO(data)) as package:
+                parts[backend] = {name: package.read(name) for name in package.namelist()}
+        
+        assert parts['streaming'] == parts['pptx']
+    
+    def test_images_reused_after_release(self):
+        """A picture added again after its slide was written reuses the same part."""
+        pytest.importorskip("pptx")
+        Image = pytest.importorskip("PIL.Image")
+        import zipfile
+        from io import BytesIO
+        from pptx import Presentation
+        from md2office.generators.pptx_streaming import StreamingPptxWriter
+        
+        image = BytesIO()
+        Image.new('RGB', (20, 10), 'red').save(image, 'PNG')
+        presentation = Presentation()
+        writer = StreamingPptxWriter(presentation)
+        for _ in range(2):
+            slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+            image.seek(0)
+            slide.shapes.add_picture(image, 0, 0)
+            writer.write_slide(slide)
+        
+        with zipfile.ZipFile(BytesIO(writer.finish())) as package:
+            media = [name for name in package.namelist() if name.startswith('ppt/media/')]
+            assert package.namelist()[0] == '[Content_Types].xml'
+        assert writer.slides_written == 2
+        assert media == ['ppt/media/image1.png']
+    
+    def test_pptx_internals_present(self):
+        """The python-pptx internals the streaming writer relies on still exist."""
+        pytest.importorskip("pptx")
+        Image = pytest.importorskip("PIL.Image")
+        from io import BytesIO
+        from pptx import Presentation
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        from md2office.generators.pptx_streaming import check_streaming_support
+        
+        check_streaming_support()
+        image = BytesIO()
+        Image.new('RGB', (20, 10), 'red').save(image, 'PNG')
+        presentation = Presentation()
+        slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+        slide.shapes.add_picture(image, 0, 0)
+        image_part = next(rel.target_part for rel in slide.part.rels.values()
+                          if rel.reltype == RT.IMAGE)
+        
+        assert slide.part._element is not None
+        assert presentation.part.package._rels is not None
+        assert slide.part._rels is not None
+        assert image_part._blob == image_part.blob
+        assert image_part._px_size == (20, 10)
+        assert image_part._dpi
+        
+    def test_unsupported_pptx_version(self, monkeypatch):
+        """Newer python-pptx releases are rejected with a clear error."""
+        pptx = pytest.importorskip("pptx")
+        monkeypatch.setattr(pptx, '__version__', '9.0.0')
+        ast = ASTBuilder().build(MarkdownParser().parse(self.MARKDOWN))
+        with pytest.raises(ConversionError, match="does not support python-pptx 9.0.0"):
+            PowerPointGenerator().generate(ast, {'powerpoint_backend': 'streaming'})
+        assert PowerPointGenerator().generate(ast, {'powerpoint_backend': 'pptx'})
+    
+    def test_unknown_backend(self):
+        """Unknown backends are rejected."""
+        pytest.importorskip("pptx")
+        ast = ASTBuilder().build(MarkdownParser().parse(self.MARKDOWN))
+        with pytest.raises(ConversionError, match="Unknown PowerPoint backend"):
+            PowerPointGenerator().generate(ast, {'powerpoint_backend': 'odp'})
+
+
+class TestPowerPointSlideCache:
+    """Tests for reusing rendered slides between generations."""
+    
+    MARKDOWN = TestStreamingPowerPointBackend.MARKDOWN + """
+## Diagram
+
+```mermaid
+graph TD
+    A --> B
+```
+"""
+    
+    @staticmethod
+    def parts(data: bytes) -> dict:
+        """Parts of a generated deck by name."""
+        import zipfile
+        from io import BytesIO
+        with zipfile.ZipFile(BytesIO(data)) as package:
+            return {name: package.read(name) for name in package.namelist()}
+    
+    @staticmethod
+    def build(markdown):
+        """Build an AST."""
+        return ASTBuilder().build(MarkdownParser().parse(markdown))
+    
+    @staticmethod
+    def fake_mermaid(generator, tmp_path, calls):
+        """Render Mermaid diagrams as a fixed PNG, counting renders."""
+        Image = pytest.importorskip("PIL.Image")
+        
+        def render(code, options):
+            calls.append(code)
+            path = tmp_path / f"diagram{len(calls)}.png"
+            Image.new('RGB', (40, 20), 'green').save(path)
+            return path
+        
+        generator._render_mermaid_diagram = render
+    
+    def test_edit_reuses_unchanged_slides(self, tmp_path):
+        """Regenerating after an edit matches a fresh generation and reuses slides."""
+        pytest.importorskip("pptx")
+        options = {'powerpoint_backend': 'pptx'}
+        edited = self.MARKDOWN.replace("- Second", "- Second\n- Third")
+        
+        calls = []
+        generator = PowerPointGenerator()
+        self.fake_mermaid(generator, tmp_path, calls)
+        generator.generate(self.build(self.MARKDOWN), options)
+        hits = generator.fragment_cache.hits
+        regenerated = generator.generate(self.build(edited), options)
+        
+        fresh = PowerPointGenerator()
+        self.fake_mermaid(fresh, tmp_path, [])
+        assert self.parts(regenerated) == self.parts(fresh.generate(self.build(edited), options))
+        assert generator.fragment_cache.hits - hits == 3
+        assert len(calls) == 1  # The diagram slide was reused
+    
+    def test_streaming_does_not_cache(self):
+        """The streaming backend keeps no slides in memory between generations."""
+        pytest.importorskip("pptx")
+        generator = PowerPointGenerator()
+        generator.generate(self.build(self.MARKDOWN), {'powerpoint_backend': 'streaming'})
+        
+        assert generator.fragment_cache._size == 0
+        assert generator.fragment_cache.hits == generator.fragment_cache.misses == 0
+    
+    def test_unrendered_diagrams_are_not_cached(self):
+        """Slides whose diagram fell back to code are rendered again."""
+        pytest.importorskip("pptx")
+        generator = PowerPointGenerator()
+        generator._render_mermaid_diagram = lambda code, options: None
+        generator.generate(self.build(self.MARKDOWN), {})
+        misses = generator.fragment_cache.misses
+        generator.generate(self.build(self.MARKDOWN), {})
+        
+        assert generator.fragment_cache.misses - misses == 1
+    
+    def test_images_tracked(self, tmp_path):
+        """Spliced slides keep their images; changed images are re-rendered."""
+        pytest.importorskip("pptx")
+        Image = pytest.importorskip("PIL.Image")
+        from md2office.parser import ASTNode, NodeType
+        
+        image = tmp_path / 'figure.png'
+        Image.new('RGB', (20, 10), 'red').save(image)
+        
+        def deck():
+            root = ASTNode(NodeType.DOCUMENT)
+            for title in ('One', 'Two'):
+                section = ASTNode(NodeType.SECTION, level=2)
+                section.add_child(ASTNode(NodeType.HEADING, content=title, level=2))
+                section.add_child(ASTNode(NodeType.IMAGE, content='alt', attributes={'src': str(image)}))
+                root.add_child(section)
+            return root
+        
+        def media(data):
+            return sorted(blob for name, blob in self.parts(data).items() if 'media/' in name)
+        
+        generator = PowerPointGenerator()
+        first = generator.generate(deck(), {})
+        misses = generator.fragment_cache.misses
+        assert self.parts(generator.generate(deck(), {})) == self.parts(first)
+        assert generator.fragment_cache.misses == misses
+        
+        Image.new('RGB', (30, 10), 'blue').save(image)
+        os.utime(image, ns=(0, 10**9))
+        assert media(generator.generate(deck(), {})) != media(first)
+        assert generator.fragment_cache.misses - misses == 2
+
 class TestPowerPointGeneratorIntegration:
     """Integration tests for PowerPoint generator."""
     
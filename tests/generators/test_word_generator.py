@@ -4,6 +4,7 @@ Tests for Word Document Generator
 Implements Story 2.5: Word Testing and Validation
 """
 
+import os
 import pytest
 import sys
 from pathlib import Path
@@ -139,6 +140,220 @@ Content here.
         assert word_generator.get_file_extension() == ".docx"
 
 
+class TestWordStyleSheet:
+    """Tests for style-sheet based Word output."""
+    
+    @pytest.fixture
+    def generate(self):
+        """Generate a Word document and load it with python-docx."""
+        docx = pytest.importorskip("docx")
+        from io import BytesIO
+        generator = WordGenerator()
+        
+        def run(markdown, style='default'):
+            ast = ASTBuilder().build(MarkdownParser().parse(markdown))
+            return docx.Document(BytesIO(generator.generate(ast, {'style': style})))
+        
+        return run
+    
+    def test_content_references_styles(self, generate):
+        """Paragraphs and runs use styles rather than direct formatting."""
+        document = generate("# Title\n\nText with **bold**, `code` and [a link](https://example.com).\n\n"
+                            "```\nx = 1\n```\n\n> Quoted\n")
+        body = document.element.body
+        assert not body.xpath('.//w:r/w:rPr/w:sz')
+        assert not body.xpath('.//w:r/w:rPr/w:rFonts')
+        
+        styles = {p.style.name for p in document.paragraphs}
+        assert {'Heading 1', 'Body Text', 'Code', 'Quote'} <= styles
+        run_styles = {run.style.name for p in document.paragraphs for run in p.runs}
+        assert {'Strong', 'Inline Code'} <= run_styles
+        
+        from docx.oxml.ns import qn
+        hyperlink = body.xpath('.//w:hyperlink')[0]
+        assert hyperlink.xpath('string(w:r/w:rPr/w:rStyle/@w:val)') == 'Hyperlink'
+        assert hyperlink.xpath('string(w:r/w:t)') == 'a link'
+        rel = document.part.rels[hyperlink.get(qn('r:id'))]
+        assert rel.is_external and rel.target_ref == 'https://example.com'
+    
+    def test_styles_compiled_from_preset(self, generate):
+        """Word styles carry the preset's fonts and spacing."""
+        from md2office.styling import get_style_preset
+        preset = get_style_preset('professional')
+        
+        for _ in range(2):  # Second document reuses the compiled style sheet
+            document = generate("# Title\n\nText\n", style='professional')
+            heading = document.styles['Heading 1']
+            assert heading.font.size.pt == preset.get_heading_style(1).font.size
+            assert str(heading.font.color.rgb) == '1A1A1A'
+            assert document.styles['Normal'].font.size.pt == preset.paragraph_style.font.size
+            assert document.styles['Body Text'].paragraph_format.space_after.pt == \
+                preset.paragraph_style.spacing_after
+            assert document.styles['Code'].font.name == 'Courier New'
+
+
+class TestStreamingWordBackend:
+    """Tests for the streaming Word backend."""
+    
+    MARKDOWN = """# Report
+
+Intro with **bold** and `code`.
+
+## Data
+
+| A | B |
+|---|---|
+| 1 | 2 |
+
+- First
+- Second
+
+```python
+print("hi")
+```
+
+> A quote
+
+# Appendix
+
+More text.
+"""
+    
+    @pytest.mark.parametrize('options', [
+        {},
+        {'page_breaks': True, 'table_of_contents': True},
+    ])
+    def test_matches_docx_backend(self, options):
+        """Streaming output has the same document part as python-docx output."""
+        pytest.importorskip("docx")
+        import zipfile
+        from io import BytesIO
+        generator = WordGenerator()
+        ast = ASTBuilder().build(MarkdownParser().parse(self.MARKDOWN))
+        
+        parts = {}
+        for backend in ('docx', 'streaming'):
+            data = generator.generate(ast, dict(options, word_backend=backend))
+            with zipfile.ZipFile(BytesIO(data)) as package:
+                parts[backend] = (package.read('word/document.xml'),
+                                  sorted(package.namelist()))
+        
+        assert parts['streaming'] == parts['docx']
+        if options:
+            assert parts['docx'][0].count(b'<w:pageBreakBefore/>') >= 2
+            assert parts['docx'][0].index(b'Table of Contents') < parts['docx'][0].index(b'Report')
+    
+    def test_unknown_backend(self):
+        """Unknown backends are rejected."""
+        pytest.importorskip("docx")
+        ast = ASTBuilder().build(MarkdownParser().parse(self.MARKDOWN))
+        with pytest.raises(ConversionError, match="Unknown Word backend"):
+            WordGenerator().generate(ast, {'word_backend': 'lxml'})
+
+
+class TestWordSectionCache:
+    """Tests for reusing rendered sections between generations."""
+    
+    MARKDOWN = """# Intro
+
+First paragraph with **bold**.
+
+# Data
+
+| A | B |
+|---|---|
+| 1 | 2 |
+
+- one
+- two
+
+# Code
+
+```python
+print("hi")
+```
+"""
+    
+    @staticmethod
+    def body(data: bytes) -> bytes:
+        """Canonical XML of a generated document's main part."""
+        import zipfile
+        from io import BytesIO
+        from lxml import etree
+        with zipfile.ZipFile(BytesIO(data)) as package:
+            root = etree.fromstring(package.read('word/document.xml'))
+        return etree.tostring(root, method='c14n')
+    
+    @staticmethod
+    def build(markdown):
+        """Build an AST."""
+        return ASTBuilder().build(MarkdownParser().parse(markdown))
+    
+    @pytest.mark.parametrize('backend', ['docx', 'streaming'])
+    def test_edit_reuses_unchanged_sections(self, backend):
+        """Regenerating after an edit matches a fresh generation and reuses sections."""
+        pytest.importorskip("docx")
+        options = {'word_backend': backend}
+        edited = self.MARKDOWN.replace("- two", "- two\n- three")
+        
+        generator = WordGenerator()
+        generator.generate(self.build(self.MARKDOWN), options)
+        hits = generator.fragment_cache.hits
+        regenerated = generator.generate(self.build(edited), options)
+        
+        assert self.body(regenerated) == self.body(WordGenerator().generate(self.build(edited), options))
+        assert generator.fragment_cache.hits - hits >= 2
+    
+    def test_options_are_part_of_the_key(self):
+        """Sections rendered with different options are not reused."""
+        pytest.importorskip("docx")
+        generator = WordGenerator()
+        generator.generate(self.build(self.MARKDOWN), {'bookmarks': True})
+        without = generator.generate(self.build(self.MARKDOWN), {'bookmarks': False})
+        
+        assert b'bookmarkStart' not in self.body(without)
+    
+    def test_images_relocated_and_tracked(self, tmp_path):
+        """Spliced sections get their images; changed images are re-rendered."""
+        pytest.importorskip("docx")
+        Image = pytest.importorskip("PIL.Image")
+        import re
+        import zipfile
+        from io import BytesIO
+        from md2office.parser import ASTNode, NodeType
+        
+        image = tmp_path / 'figure.png'
+        Image.new('RGB', (20, 10), 'red').save(image)
+        
+        def document():
+            root = ASTNode(NodeType.DOCUMENT)
+            section = ASTNode(NodeType.SECTION, level=1, metadata={'heading': 'Figure'})
+            section.add_child(ASTNode(NodeType.HEADING, content='Figure', level=1))
+            section.add_child(ASTNode(NodeType.IMAGE, content='alt', attributes={'src': str(image)}))
+            root.add_child(section)
+            return root
+        
+        def media(data):
+            with zipfile.ZipFile(BytesIO(data)) as package:
+                xml = package.read('word/document.xml').decode()
+                rels = package.read('word/_rels/document.xml.rels').decode()
+                blobs = [package.read(name) for name in package.namelist() if 'media/' in name]
+            for rel_id in re.findall(r'r:embed="([^"]+)"', xml):
+                assert f'Id="{rel_id}"' in rels
+            return blobs
+        
+        generator = WordGenerator()
+        first = media(generator.generate(document(), {}))
+        misses = generator.fragment_cache.misses
+        assert media(generator.generate(document(), {})) == first
+        assert generator.fragment_cache.misses == misses
+        
+        Image.new('RGB', (30, 10), 'blue').save(image)
+        os.utime(image, ns=(0, 10**9))
+        assert media(generator.generate(document(), {})) != first
+        assert generator.fragment_cache.misses > misses
+
+
 class TestWordGeneratorIntegration:
     """Integration tests for Word generator."""
     
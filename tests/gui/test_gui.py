@@ -4,6 +4,7 @@ Tests for GUI components.
 Note: These tests require PySide6 to be installed.
 """
 
+import gc
 import pytest
 import sys
 from pathlib import Path
@@ -36,6 +37,18 @@ def qapp():
     return app
 
 
+@pytest.fixture(autouse=True)
+def collect_qt_objects():
+    """
+    Collect each test's Qt objects on the GUI thread.
+    
+    Otherwise a garbage collection started by a later test's pool thread
+    could delete them (and their widgets) off the GUI thread.
+    """
+    yield
+    gc.collect()
+
+
 @pytest.fixture
 def main_window(qapp):
     """Create main window instance."""
@@ -51,6 +64,29 @@ class TestMainWindow:
         assert main_window is not None
         assert main_window.windowTitle() == "md2office - Markdown to Office Document Converter"
     
+    def test_deferred_startup(self, qapp, main_window):
+        """Test that the preview and generators load after the first paint."""
+        import time
+        viewer = main_window.markdown_viewer
+        registry = main_window.conversion_service.pipeline.registry
+        assert viewer.web_view is None and not registry.is_loaded('html')
+        
+        # Content set before the web view exists is kept for it
+        viewer.render_markdown("# Early", None)
+        assert viewer._deferred == ("# Early", None)
+        
+        finished = []
+        main_window.startup_finished.connect(lambda: finished.append(True))
+        main_window.show()
+        deadline = time.monotonic() + 30
+        while not finished and time.monotonic() < deadline:
+            qapp.processEvents()
+        
+        assert finished == [True] and main_window.startup_complete
+        assert registry.is_loaded('html')
+        assert viewer.web_view is not None or viewer._deferred is None
+        main_window.close()
+    
     def test_file_path_edit_exists(self, main_window):
         """Test that file path edit exists."""
         assert main_window.file_path_edit is not None
@@ -218,4 +254,705 @@ class TestConversionWorker:
         assert worker is not None
         assert worker.input_path == str(test_file)
         assert worker.formats == ['word']
+    
+    def test_worker_reports_pipeline_progress(self, qapp, tmp_path):
+        """Test that progress comes from the pipeline and ends after writing files."""
+        from md2office.gui.workers.conversion_worker import ConversionWorker
+        
+        test_file = tmp_path / "test.md"
+        test_file.write_text("# One\n\nText\n\n# Two\n\nText")
+        worker = ConversionWorker(
+            input_path=str(test_file),
+            formats=['word'],
+            output_dir=str(tmp_path)
+        )
+        updates = []
+        worker.progress_updated.connect(lambda percentage, message: updates.append((percentage, message)))
+        
+        worker.run()
+        
+        percentages = [percentage for percentage, _ in updates]
+        assert percentages == sorted(percentages)
+        assert any(message.startswith("Generating word") for _, message in updates)
+        assert updates[-2] == (95, "Writing output files...")
+        assert updates[-1] == (100, "Conversion complete")
+
+
+
+class TestMarkdownHighlighter:
+    """Tests for the markdown syntax highlighter."""
+    
+    @staticmethod
+    def _states(editor):
+        """Block state of each line of the editor."""
+        document = editor.document()
+        return [document.findBlockByNumber(i).userState() for i in range(document.blockCount())]
+    
+    def test_fenced_code_spans_lines(self, qapp):
+        """Test that fenced code block state carries across lines."""
+        from md2office.gui.widgets.markdown_editor import (
+            MarkdownEditor, NORMAL_STATE, FRONT_MATTER_STATE
+        )
+        
+        editor = MarkdownEditor()
+        editor.setPlainText("---\ntitle: Doc\n---\n# Title\n```python\n# not a header\n``\n```\ntext")
+        states = self._states(editor)
+        
+        assert states[:3] == [FRONT_MATTER_STATE, FRONT_MATTER_STATE, NORMAL_STATE]
+        assert states[3] == NORMAL_STATE
+        assert states[4] == states[5] == states[6] > FRONT_MATTER_STATE
+        assert states[7:] == [NORMAL_STATE, NORMAL_STATE]
+        
+        # Only the opening fence character closes the block
+        editor.setPlainText("~~~\n```\n~~~\ntext")
+        states = self._states(editor)
+        assert states[0] == states[1] != NORMAL_STATE
+        assert states[2:] == [NORMAL_STATE, NORMAL_STATE]
+        
+        # Front matter only starts on the first line
+        editor.setPlainText("text\n---\nmore")
+        assert self._states(editor) == [NORMAL_STATE] * 3
+    
+    def test_inline_formats(self, qapp):
+        """Test that inline spans are formatted and code spans win."""
+        from md2office.gui.widgets.markdown_editor import MarkdownEditor
+        
+        editor = MarkdownEditor()
+        editor.setPlainText("**bold** and `**code**` and [link](url)")
+        highlighter = editor.highlighter
+        formats = editor.document().firstBlock().layout().formats()
+        ranges = {(r.start, r.length): r.format for r in formats}
+        
+        assert ranges[(0, 8)].fontWeight() == highlighter.bold_format.fontWeight()
+        assert ranges[(13, 10)].background() == highlighter.code_format.background()
+        assert (15, 6) not in ranges
+        assert ranges[(28, 11)].fontUnderline()
+    
+    def test_nested_inline_formats(self, qapp):
+        """Test links around formatted text and italic inside bold."""
+        from md2office.gui.widgets.markdown_editor import scan_line, NORMAL_STATE
+        
+        def formats_at(text):
+            chars = [None] * len(text)
+            for start, length, name in scan_line(text, NORMAL_STATE)[1]:
+                chars[start:start + length] = [name] * length
+            return chars
+        
+        assert set(formats_at("[`api`](url)")) == {'link'}
+        assert set(formats_at("[**x**](url)")) == {'link'}
+        chars = formats_at("**a *b* c**")
+        assert chars[4:7] == ['italic'] * 3
+        assert chars[:4] == chars[7:] == ['bold'] * 4
+    
+    def test_edit_rehighlights_affected_blocks(self, qapp):
+        """Test that an edit only rehighlights blocks whose state changes."""
+        from md2office.gui.widgets.markdown_editor import MarkdownEditor, NORMAL_STATE
+        from PySide6.QtGui import QTextCursor
+        
+        editor = MarkdownEditor()
+        editor.setPlainText("\n".join(f"line {i}" for i in range(200)))
+        highlighted = []
+        original = editor.highlighter.highlightBlock
+        
+        def counting(text):
+            highlighted.append(text)
+            original(text)
+        editor.highlighter.highlightBlock = counting
+        
+        cursor = QTextCursor(editor.document().findBlockByNumber(100))
+        cursor.insertText("**")
+        assert len(highlighted) == 1
+        
+        # Opening a fence changes the state of every following line
+        highlighted.clear()
+        cursor = QTextCursor(editor.document().findBlockByNumber(50))
+        cursor.insertText("```\n")
+        assert len(highlighted) > 100
+        assert self._states(editor)[-1] != NORMAL_STATE
+
 
+
+class TestLargeFileMode:
+    """Tests for the editor's large-file mode."""
+    
+    @pytest.fixture
+    def editor(self, qapp, monkeypatch):
+        """Create an editor treating files of 1 KB or more as large."""
+        import md2office.gui.widgets.markdown_editor as editor_module
+        import md2office.gui.workers.file_loader as loader_module
+        monkeypatch.setattr(editor_module, 'LARGE_FILE_THRESHOLD', 1024)
+        monkeypatch.setattr(loader_module, 'LOAD_CHUNK_SIZE', 4096)
+        
+        editor = editor_module.MarkdownEditor()
+        editor.resize(600, 400)
+        yield editor
+        editor.cancel_loading()
+    
+    @staticmethod
+    def _load(qapp, editor, path, timeout=10):
+        """Load a file and process events until it is loaded."""
+        import time
+        finished = []
+        editor.load_finished.connect(finished.append)
+        assert editor.load_file(path)
+        deadline = time.monotonic() + timeout
+        while not finished and time.monotonic() < deadline:
+            qapp.processEvents()
+        assert finished == [True]
+    
+    def test_chunked_loading(self, qapp, editor, tmp_path):
+        """Test that large files load in chunks without undo history."""
+        path = tmp_path / "large.md"
+        path.write_bytes("# Titre é\r\n\r\nLigne **grasse** ✓\r\n".encode('utf-8') * 2000)
+        progress = []
+        editor.load_progress.connect(progress.append)
+        
+        self._load(qapp, editor, path)
+        
+        assert editor.large_file_mode and not editor.is_loading
+        assert editor.toPlainText() == path.read_text(encoding='utf-8')
+        assert len(progress) > 1 and progress[-1] == 100
+        assert editor.current_file == path and not editor.is_modified
+        assert not editor.document().isUndoAvailable() and not editor.isReadOnly()
+        assert editor.highlighter.document() is None
+        
+        # Small files go back to full highlighting
+        small = tmp_path / "small.md"
+        small.write_text("# Small", encoding='utf-8')
+        assert editor.load_file(small)
+        assert not editor.large_file_mode
+        assert editor.highlighter.document() is editor.document()
+    
+    def test_memory_budget(self, editor, tmp_path):
+        """Test that files exceeding the memory budget are not opened."""
+        path = tmp_path / "large.md"
+        path.write_text("text\n" * 1000, encoding='utf-8')
+        editor.memory_budget = 4096
+        
+        assert not editor.load_file(path)
+        assert "memory budget" in editor.last_error
+        assert not editor.is_loading and editor.current_file is None
+    
+    def test_edits_report_line_ranges(self, qapp, editor, tmp_path):
+        """Test that edits report the lines they touched, not the text."""
+        from PySide6.QtGui import QTextCursor
+        
+        path = tmp_path / "large.md"
+        path.write_text("".join(f"line {i}\n" for i in range(1000)), encoding='utf-8')
+        self._load(qapp, editor, path)
+        lines, contents = [], []
+        editor.lines_changed.connect(lambda first, last: lines.append((first, last)))
+        editor.content_changed.connect(contents.append)
+        
+        # Lines added above an earlier edit move it down
+        document = editor.document()
+        QTextCursor(document.findBlockByNumber(500)).insertText("**")
+        QTextCursor(document.findBlockByNumber(10)).insertText("new\nlines\n")
+        editor._emit_content_changed()
+        
+        assert lines == [(10, 502)] and contents == []
+        assert editor.text_range(10, 12) == "new\nlines\nline 10"
+    
+    def test_visible_lines_highlighted(self, qapp, editor, tmp_path):
+        """Test that only the lines in view are highlighted."""
+        path = tmp_path / "large.md"
+        path.write_text("```\n" + "**code** line\n" * 500 + "```\n" + "**bold**\n" * 500,
+                        encoding='utf-8')
+        self._load(qapp, editor, path)
+        editor.show()
+        qapp.processEvents()
+        document = editor.document()
+        
+        assert document.findBlockByNumber(1).layout().formats()[0].length == len("**code** line")
+        assert not document.findBlockByNumber(900).layout().formats()
+        
+        # Code block state is found above the viewport
+        editor.scroll_to_line(150)
+        qapp.processEvents()
+        assert document.findBlockByNumber(160).layout().formats()[0].length == len("**code** line")
+        editor.scroll_to_line(700)
+        qapp.processEvents()
+        assert document.findBlockByNumber(710).layout().formats()[0].length == len("**bold**")
+    
+    def test_preview_shows_window(self, qapp, editor, tmp_path, monkeypatch):
+        """Test that the preview of a large file follows the visible lines."""
+        import md2office.gui.main_window as window_module
+        monkeypatch.setattr(window_module, 'PREVIEW_WINDOW_LINES', 100)
+        path = tmp_path / "large.md"
+        path.write_text("".join(f"line {i}\n" for i in range(1000)), encoding='utf-8')
+        window = window_module.MainWindow()
+        rendered, scrolled = [], []
+        window.markdown_viewer.render_markdown = lambda text, base_path: rendered.append(text)
+        window.markdown_viewer.scroll_to_line = scrolled.append
+        
+        self._load(qapp, window.markdown_editor, path)
+        assert rendered[-1].split("\n") == [f"line {i}" for i in range(100)]
+        
+        window.markdown_editor.visible_line_changed.emit(500)
+        assert rendered[-1].startswith("line 475\n") and scrolled[-1] == 25
+        window.markdown_editor.cancel_loading()
+
+
+def _pushed_update(script):
+    """Get the body and part lines of an md2officePreview.update() script."""
+    import json
+    assert script.startswith("md2officePreview.update(") and script.endswith(");")
+    return json.loads("[" + script[len("md2officePreview.update("):-2] + "]")
+
+
+@pytest.fixture
+def viewer(qapp):
+    """Markdown viewer with a recording stand-in for the web view."""
+    from PySide6.QtWidgets import QLabel
+    from md2office.gui.widgets.markdown_viewer import MarkdownViewer
+    from md2office.gui.widgets.preview_parts import PreviewContent
+    
+    viewer = MarkdownViewer()
+    viewer.web_view = Mock()
+    viewer.status_label = QLabel()
+    viewer._shell_loaded = False
+    viewer._shown = None
+    viewer._pending = PreviewContent("")
+    with patch('md2office.gui.widgets.markdown_viewer.WEBENGINE_AVAILABLE', True):
+        yield viewer
+
+
+class TestMarkdownViewer:
+    """Tests for the markdown preview."""
+    
+    def test_shell_page_is_local(self):
+        """Test that the shell page only falls back to the pinned CDN files."""
+        import re
+        import runpy
+        from md2office.gui.widgets.markdown_viewer import (
+            PREVIEW_RESOURCES, SHELL_PAGE, BODY_PLACEHOLDER
+        )
+        
+        shell = SHELL_PAGE.read_text(encoding='utf-8')
+        assert BODY_PLACEHOLDER in shell
+        for name in ('preview.js', 'preview.css'):
+            text = (PREVIEW_RESOURCES / name).read_text(encoding='utf-8')
+            assert 'http://' not in text and 'https://' not in text
+        
+        script = Path(__file__).parents[2] / 'scripts' / 'fetch_preview_assets.py'
+        assets = runpy.run_path(str(script))['ASSETS']
+        assert 'http://' not in shell
+        assert set(re.findall(r'https://[^"]+', shell)) == {
+            url for url, _mirror in assets.values()
+        }
+    
+    def test_mermaid_blocks_keyed_by_source_hash(self, viewer):
+        """Test that diagrams carry a hash of their (escaped) source."""
+        import re
+        diagram = "```mermaid\ngraph TD\n    A --> B<br/>\n```\n"
+        other = "```mermaid\ngraph TD\n    A --> C\n```\n"
+        
+        body = viewer._markdown_to_body(f"# Title\n\n{diagram}\ntext\n\n{other}")
+        hashes = re.findall(r'<div class="mermaid" data-hash="(\w+)">', body)
+        assert len(hashes) == 2 and hashes[0] != hashes[1]
+        assert "A --&gt; B&lt;br/&gt;" in body
+        
+        again = viewer._markdown_to_body(f"Changed text\n\n{diagram}")
+        assert re.findall(r'data-hash="(\w+)"', again) == hashes[:1]
+    
+    def test_updates_pushed_to_loaded_shell(self, viewer):
+        """Test that content waits for the shell page, then is pushed with JavaScript."""
+        run_javascript = viewer.web_view.page.return_value.runJavaScript
+        
+        viewer.set_markdown("# First")
+        viewer.set_markdown("# Second \"quoted\" </script>")
+        run_javascript.assert_not_called()
+        viewer.web_view.setHtml.assert_not_called()
+        
+        viewer._on_shell_loaded(True)
+        assert run_javascript.call_count == 1
+        body, lines = _pushed_update(run_javascript.call_args[0][0])
+        assert body == viewer._markdown_to_body("# Second \"quoted\" </script>")
+        assert lines == [0]
+        
+        # Unchanged content is not pushed again
+        viewer.set_markdown("# Second \"quoted\" </script>")
+        assert run_javascript.call_count == 1
+        viewer.set_markdown("# Third")
+        assert run_javascript.call_count == 2
+        viewer.web_view.load.assert_not_called()
+    
+    def test_standalone_document_from_shell(self, viewer):
+        """Test that a standalone document embeds the body in the shell page."""
+        from md2office.gui.widgets.markdown_viewer import BODY_PLACEHOLDER
+        
+        document = viewer._markdown_to_html("# Title")
+        assert "<h1" in document and "Title" in document
+        assert BODY_PLACEHOLDER not in document
+        assert '<base href="file://' in document
+    
+    def test_background_render_shows_newest(self, qapp, viewer):
+        """Test that render_markdown() renders off the UI thread and shows the result."""
+        import time
+        run_javascript = viewer.web_view.page.return_value.runJavaScript
+        rendered = []
+        viewer.preview_rendered.connect(rendered.append)
+        viewer._on_shell_loaded(True)
+        run_javascript.reset_mock()
+        
+        viewer.render_markdown("# First")
+        viewer.render_markdown("# Second")
+        deadline = time.monotonic() + 10
+        while viewer.renderer.is_busy() and time.monotonic() < deadline:
+            viewer.renderer.wait(50)
+            qapp.processEvents()
+        
+        assert run_javascript.call_count == 1
+        body, lines = _pushed_update(run_javascript.call_args[0][0])
+        assert body == viewer._markdown_to_body("# Second")
+        assert len(rendered) == 1 and rendered[0] > 0
+    
+    def test_long_documents_virtualized(self, viewer, monkeypatch):
+        """Test that long documents are sent as placeholders filled on request."""
+        import json
+        import re
+        import md2office.gui.widgets.markdown_viewer as viewer_module
+        monkeypatch.setattr(viewer_module, 'VIRTUAL_PREVIEW_LINES', 20)
+        run_javascript = viewer.web_view.page.return_value.runJavaScript
+        viewer.virtualize = True
+        viewer._on_shell_loaded(True)
+        
+        sections = "".join(f"## Section {i}\n\nText {i}.\n\n" for i in range(10))
+        viewer.set_markdown(sections)
+        body, lines = _pushed_update(run_javascript.call_args[0][0])
+        assert lines == [4 * i for i in range(10)]
+        assert "Text" not in body
+        keys = re.findall(r'<section class="md2office-part" data-key="(\w+)" '
+                          r'style="min-height: \d+px"></section>', body)
+        assert len(keys) == 10
+        
+        # The page asks for parts as they come into view
+        viewer._on_parts_requested([keys[3], "unknown"])
+        script = run_javascript.call_args[0][0]
+        assert script.startswith("md2officePreview.fillParts(")
+        parts = json.loads(script[len("md2officePreview.fillParts("):-2])
+        assert list(parts) == [keys[3]]
+        assert "Section 3" in parts[keys[3]] and "Text 3." in parts[keys[3]]
+        
+        # Short documents are rendered in full
+        viewer.set_markdown("# Short\n\nText.")
+        body, lines = _pushed_update(run_javascript.call_args[0][0])
+        assert body == viewer._markdown_to_body("# Short\n\nText.") and "Text." in body
+    
+    def test_scroll_sync(self, qapp, viewer):
+        """Test that editor and preview scroll positions are passed along."""
+        from md2office.gui.widgets.markdown_editor import MarkdownEditor
+        
+        run_javascript = viewer.web_view.page.return_value.runJavaScript
+        viewer._on_shell_loaded(True)
+        viewer.scroll_to_line(42)
+        assert run_javascript.call_args[0][0] == "md2officePreview.scrollToLine(42);"
+        
+        reported = []
+        viewer.preview_scrolled.connect(reported.append)
+        viewer.bridge.previewScrolled(7)
+        assert reported == [7]
+        
+        editor = MarkdownEditor()
+        editor.resize(400, 200)
+        editor.setPlainText("\n".join(f"line {i}" for i in range(500)))
+        visible = []
+        editor.visible_line_changed.connect(visible.append)
+        
+        # Following the preview is not reported back
+        editor.scroll_to_line(120)
+        assert editor.firstVisibleBlock().blockNumber() == 120
+        assert visible == []
+        
+        editor.verticalScrollBar().setValue(300)
+        assert visible == [300]
+
+
+def _drain_renderer(qapp, renderer, timeout=10):
+    """Process events until the preview renderer is idle."""
+    import time
+    deadline = time.monotonic() + timeout
+    while renderer.is_busy() and time.monotonic() < deadline:
+        renderer.wait(50)
+        qapp.processEvents()
+    qapp.processEvents()
+    assert not renderer.is_busy()
+
+
+class TestPreviewParts:
+    """Tests for splitting the preview into parts."""
+    
+    def test_heading_lines(self):
+        """Test that front matter and fenced code are not scanned for headings."""
+        from md2office.gui.widgets.preview_parts import heading_lines
+        
+        markdown = "---\ntitle: T\n---\n# One\n\n```\n# code\n```\n## Two\n#tag"
+        assert heading_lines(markdown) == [3, 8]
+    
+    def test_parts_follow_document(self):
+        """Test part lines, and keys that only change with their own content."""
+        from md2office.parser import MarkdownParser, ASTBuilder
+        from md2office.generators import HTMLGenerator
+        from md2office.gui.widgets.preview_parts import split_parts
+        
+        def parts_of(markdown):
+            ast = ASTBuilder().build(MarkdownParser().parse(markdown))
+            return split_parts(list(HTMLGenerator().iter_parts(ast)), markdown)
+        
+        markdown = "Intro\n\n# A\n\nText A\n\n## B\n\nText B\n\n# C\n\nText C\n"
+        parts = parts_of(markdown)
+        assert [part.line for part in parts] == [0, 2, 6, 10]
+        assert all(part.height > 0 for part in parts)
+        
+        edited = parts_of(markdown.replace("Text B", "Changed B"))
+        assert [part.key == other.key for part, other in zip(parts, edited)] == [
+            True, True, False, True
+        ]
+    
+    def test_placeholder_height_estimate(self):
+        """Test that placeholder heights grow with their content."""
+        from md2office.parser import MarkdownParser, ASTBuilder
+        from md2office.gui.widgets.preview_parts import estimate_height
+        
+        def height(markdown):
+            return estimate_height(ASTBuilder().build(MarkdownParser().parse(markdown)).children)
+        
+        code = "```python\n" + "x = 1\n" * 40 + "```\n"
+        assert height(code) > height("```python\nx = 1\n```\n")
+        assert height("word " * 200) > height("word")
+
+
+class TestPreviewRenderer:
+    """Tests for background preview rendering."""
+    
+    def test_preview_delay_adapts(self):
+        """Test that the debounce grows with document size and render time."""
+        from md2office.gui.workers.preview_worker import (
+            preview_delay, MIN_PREVIEW_DELAY_MS, MAX_PREVIEW_DELAY_MS
+        )
+        
+        assert preview_delay(0) == MIN_PREVIEW_DELAY_MS
+        assert MIN_PREVIEW_DELAY_MS < preview_delay(500_000) < MAX_PREVIEW_DELAY_MS
+        assert preview_delay(0, render_seconds=0.4) == 600
+        assert preview_delay(100_000_000) == MAX_PREVIEW_DELAY_MS
+    
+    def test_stale_results_dropped(self, qapp):
+        """Test that superseded renders are cancelled and only the newest is applied."""
+        import threading
+        from md2office.cancellation import CANCEL_OPTION, check_cancelled
+        from md2office.gui.workers.preview_worker import PreviewRenderer
+        
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def render(markdown, base_path, options):
+            calls.append(markdown)
+            if markdown == "first":
+                started.set()
+                release.wait(10)
+                check_cancelled(options, "html")
+            return f"<p>{markdown}</p>"
+        
+        renderer = PreviewRenderer(render)
+        results = []
+        renderer.rendered.connect(lambda body, seconds: results.append(body))
+        
+        renderer.request("first")
+        assert started.wait(10)
+        renderer.request("second")
+        newest = renderer.request("third")
+        release.set()
+        _drain_renderer(qapp, renderer)
+        
+        # The waiting "second" request was coalesced into "third"
+        assert calls == ["first", "third"]
+        assert results == ["<p>third</p>"]
+        assert renderer.generation == newest
+        
+        # Results of invalidated requests are not applied
+        renderer.request("fourth")
+        renderer.invalidate()
+        _drain_renderer(qapp, renderer)
+        assert results == ["<p>third</p>"]
+    
+    def test_editor_debounce_uses_render_time(self, qapp):
+        """Test that the editor's preview debounce follows the render time."""
+        from md2office.gui.widgets.markdown_editor import MarkdownEditor
+        from md2office.gui.workers.preview_worker import MIN_PREVIEW_DELAY_MS
+        
+        editor = MarkdownEditor()
+        assert editor.preview_delay() == MIN_PREVIEW_DELAY_MS
+        editor.set_preview_render_time(0.8)
+        assert editor.preview_delay() == 1200
+        editor.setPlainText("# Title")
+        assert editor._preview_timer.interval() == 1200
+
+def _wait_for_queue(qapp, batch_queue, timeout=60):
+    """Process events until the batch queue has drained."""
+    import time
+    deadline = time.monotonic() + timeout
+    while batch_queue.is_busy() and time.monotonic() < deadline:
+        batch_queue.wait(50)
+        qapp.processEvents()
+    qapp.processEvents()
+    assert not batch_queue.is_busy()
+
+
+class TestBatchQueue:
+    """Tests for the batch conversion queue."""
+    
+    def test_collect_markdown_files(self, tmp_path):
+        """Test that folders expand to their markdown files."""
+        from md2office.gui.workers.batch_queue import collect_markdown_files
+        
+        (tmp_path / "docs" / "nested").mkdir(parents=True)
+        (tmp_path / "docs" / "b.md").write_text("# B")
+        (tmp_path / "docs" / "nested" / "a.markdown").write_text("# A")
+        (tmp_path / "docs" / "notes.txt").write_text("Not markdown")
+        single = tmp_path / "single.md"
+        single.write_text("# Single")
+        
+        files = collect_markdown_files([str(single), str(tmp_path / "docs"), str(single)])
+        
+        assert [Path(f).name for f in files] == ["single.md", "b.md", "a.markdown"]
+    
+    def test_converts_all_files(self, qapp, tmp_path):
+        """Test that queued files are converted and throughput is reported."""
+        from md2office.gui.workers.batch_queue import BatchQueue, DONE
+        
+        for name in ("one", "two", "three"):
+            (tmp_path / f"{name}.md").write_text(f"# {name}\n\nSome text.")
+        output_dir = tmp_path / "out"
+        
+        batch_queue = BatchQueue(max_workers=2)
+        throughput = []
+        summaries = []
+        batch_queue.throughput_updated.connect(lambda *args: throughput.append(args))
+        batch_queue.queue_finished.connect(summaries.append)
+        
+        item_ids = batch_queue.add_files([str(tmp_path)], ['word', 'pdf'], str(output_dir))
+        _wait_for_queue(qapp, batch_queue)
+        
+        assert len(item_ids) == 3
+        assert all(batch_queue.items[item_id].status == DONE for item_id in item_ids)
+        assert all(batch_queue.items[item_id].progress == 100 for item_id in item_ids)
+        for name in ("one", "two", "three"):
+            assert (output_dir / f"{name}.docx").exists()
+            assert (output_dir / f"{name}.pdf").exists()
+        assert throughput[-1][:2] == (3, 3)
+        assert summaries == [dict(summaries[0], done=3, failed=0, cancelled=0)]
+    
+    def test_reprioritise_and_cancel(self, qapp, tmp_path):
+        """Test that queued items can be reordered and cancelled."""
+        from md2office.gui.workers.batch_queue import BatchQueue, CANCELLED, DONE
+        
+        paths = []
+        for name in ("first", "second", "third", "fourth"):
+            path = tmp_path / f"{name}.md"
+            path.write_text(f"# {name}")
+            paths.append(str(path))
+        output_dir = tmp_path / "out"
+        
+        batch_queue = BatchQueue(max_workers=1)
+        started = []
+        batch_queue.item_started.connect(started.append)
+        first, second, third, fourth = batch_queue.add_files(paths, ['word'], str(output_dir))
+        
+        # The first file starts right away; the rest wait for the worker
+        assert batch_queue.pending_ids() == [second, third, fourth]
+        assert batch_queue.move_up(fourth)
+        assert batch_queue.move_to_front(third)
+        assert batch_queue.pending_ids() == [third, second, fourth]
+        assert not batch_queue.move_up(third)
+        assert batch_queue.cancel(second)
+        
+        _wait_for_queue(qapp, batch_queue)
+        
+        assert started == [first, third, fourth]
+        assert batch_queue.items[second].status == CANCELLED
+        assert not (output_dir / "second.docx").exists()
+        assert batch_queue.items[fourth].status == DONE
+        assert batch_queue.clear_finished() == [first, second, third, fourth]
+    
+    def test_cancel_running_item(self, qapp, tmp_path):
+        """Test that cancelling a running item stops it without leaving outputs."""
+        from md2office.gui.workers.batch_queue import BatchQueue, CANCELLED, DONE
+        
+        large = tmp_path / "large.md"
+        large.write_text("\n\n".join(f"## Section {i}\n\nParagraph {i}." for i in range(300)))
+        small = tmp_path / "small.md"
+        small.write_text("# Small")
+        output_dir = tmp_path / "out"
+        
+        batch_queue = BatchQueue(max_workers=1)
+        first, second = batch_queue.add_files([str(large), str(small)], ['word', 'pdf'],
+                                              str(output_dir))
+        assert batch_queue.cancel(first)
+        
+        _wait_for_queue(qapp, batch_queue)
+        
+        assert batch_queue.items[first].status == CANCELLED
+        assert not (output_dir / "large.docx").exists()
+        assert not (output_dir / "large.pdf").exists()
+        assert batch_queue.items[second].status == DONE
+    
+    def test_failed_file_does_not_stop_queue(self, qapp, tmp_path):
+        """Test that a failing file is reported and later files still convert."""
+        from md2office.gui.workers.batch_queue import BatchQueue, DONE, FAILED
+        
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        (output_dir / "exists.docx").write_bytes(b"keep")
+        (tmp_path / "exists.md").write_text("# Exists")
+        (tmp_path / "fresh.md").write_text("# Fresh")
+        
+        batch_queue = BatchQueue(max_workers=1)
+        existing, fresh = batch_queue.add_files(
+            [str(tmp_path / "exists.md"), str(tmp_path / "fresh.md")], ['word'], str(output_dir)
+        )
+        _wait_for_queue(qapp, batch_queue)
+        
+        assert batch_queue.items[existing].status == FAILED
+        assert batch_queue.items[existing].result['error_type'] == 'FileExists'
+        assert (output_dir / "exists.docx").read_bytes() == b"keep"
+        assert batch_queue.items[fresh].status == DONE
+    
+    def test_panel_tracks_queue(self, qapp, tmp_path):
+        """Test that the panel lists queued files with their status."""
+        from md2office.gui.workers.batch_queue import BatchQueue
+        from md2office.gui.widgets.batch_queue_panel import BatchQueuePanel
+        
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.md"
+            path.write_text(f"# {name}")
+            paths.append(str(path))
+        
+        batch_queue = BatchQueue(max_workers=1)
+        panel = BatchQueuePanel(batch_queue)
+        first, second, third = batch_queue.add_files(paths, ['word'], str(tmp_path / "out"))
+        batch_queue.move_up(third)
+        
+        names = [panel.table.item(row, 0).text() for row in range(panel.table.rowCount())]
+        assert names == ["a.md", "c.md", "b.md"]
+        
+        _wait_for_queue(qapp, batch_queue)
+        statuses = {panel.table.item(row, 1).text() for row in range(panel.table.rowCount())}
+        assert statuses == {"Done"}
+        assert panel.throughput_label.text().startswith("3 of 3 files finished")
+    
+    def test_main_window_queues_with_current_settings(self, main_window, qapp, tmp_path):
+        """Test that the main window queues files with the selected formats."""
+        (tmp_path / "doc.md").write_text("# Doc")
+        main_window.all_formats_checkbox.setChecked(False)
+        main_window.word_checkbox.setChecked(False)
+        main_window.pdf_checkbox.setChecked(True)
+        main_window.output_dir_edit.setText(str(tmp_path / "out"))
+        
+        item_ids = main_window._queue_files([str(tmp_path)])
+        _wait_for_queue(qapp, main_window.batch_queue)
+        
+        item = main_window.batch_queue.items[item_ids[0]]
+        assert item.formats == ['pdf']
+        assert (tmp_path / "out" / "doc.pdf").exists()
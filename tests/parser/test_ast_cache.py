@@ -0,0 +1,140 @@
+"""
+Tests for the parsed-AST cache.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.parser import ASTBuilder, ASTCache, MarkdownParser, NodeType
+from md2office.parser import ast_cache as ast_cache_module
+from md2office.router.content_router import ContentRouter, OutputFormat, PipelineOrchestrator
+
+MARKDOWN = """# Title
+
+Some **text**.
+
+## Section
+
+- one
+- two
+"""
+
+
+def build(markdown: str):
+    """Build an AST without the cache."""
+    return ASTBuilder().build(MarkdownParser().parse(markdown))
+
+
+class RecordingGenerator:
+    """Generator stub that records the AST and options it was given."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, ast, options):
+        self.calls.append((ast, dict(options)))
+        return b''
+
+    def get_file_extension(self):
+        return '.bin'
+
+
+class TestASTCache:
+    """Test suite for ASTCache."""
+
+    def test_key_depends_on_content_and_parser_version(self, monkeypatch):
+        """Keys change with the content and with the parser version."""
+        key = ASTCache.key(MARKDOWN)
+        assert key == ASTCache.key(MARKDOWN)
+        assert key != ASTCache.key(MARKDOWN + "\n")
+
+        monkeypatch.setattr(ast_cache_module, 'PARSER_VERSION', ast_cache_module.PARSER_VERSION + 1)
+        assert key != ASTCache.key(MARKDOWN)
+
+    def test_memory_lru(self):
+        """Hits return the cached tree; the least recently used entry is evicted."""
+        cache = ASTCache(max_entries=2)
+        trees = {name: build(f"# {name}") for name in ('a', 'b', 'c')}
+
+        cache.put('a', trees['a'])
+        cache.put('b', trees['b'])
+        assert cache.get('a') is trees['a']
+        cache.put('c', trees['c'])
+
+        assert cache.get('b') is None
+        assert cache.get('a') is trees['a']
+        assert cache.get('c') is trees['c']
+        assert (cache.hits, cache.misses) == (3, 1)
+
+    def test_disk_entries_shared_between_instances(self, tmp_path):
+        """A new cache instance finds entries written by another one."""
+        key = ASTCache.key(MARKDOWN)
+        ASTCache(cache_dir=str(tmp_path)).put(key, build(MARKDOWN))
+
+        restored = ASTCache(cache_dir=str(tmp_path)).get(key)
+        assert restored is not None
+        assert restored.children[0].metadata['heading'] == 'Title'
+
+    def test_corrupt_disk_entry_is_discarded(self, tmp_path):
+        """Unreadable entries count as misses and are removed."""
+        key = ASTCache.key(MARKDOWN)
+        entry = tmp_path / f"{key}.mdast"
+        entry.write_bytes(b'MDAST garbage')
+
+        assert ASTCache(cache_dir=str(tmp_path)).get(key) is None
+        assert not entry.exists()
+
+    def test_disk_pruned_to_size_limit(self, tmp_path):
+        """Old on-disk entries are removed once the size limit is exceeded."""
+        for index in range(5):
+            (tmp_path / f"old{index}.mdast").write_bytes(b'x' * 1000)
+
+        cache = ASTCache(cache_dir=str(tmp_path), max_disk_bytes=2500)
+        cache.put(ASTCache.key(MARKDOWN), build(MARKDOWN))
+
+        assert len(list(tmp_path.glob('old*.mdast'))) == 2
+
+
+class TestCachedPipeline:
+    """Test AST caching in the pipeline orchestrator."""
+
+    @pytest.fixture
+    def orchestrator(self):
+        """Orchestrator with an AST cache and a recording generator."""
+        router = ContentRouter()
+        generator = RecordingGenerator()
+        router.register_generator(OutputFormat.WORD, generator)
+        orchestrator = PipelineOrchestrator(router, ASTCache())
+        orchestrator.generator = generator
+        return orchestrator
+
+    def test_option_changes_skip_parsing(self, orchestrator, monkeypatch):
+        """Converting the same markdown again reuses the AST and analysis."""
+        parses = []
+        original = MarkdownParser.parse
+        monkeypatch.setattr(MarkdownParser, 'parse',
+                            lambda self, text: parses.append(text) or original(self, text))
+
+        orchestrator.convert(MARKDOWN, [OutputFormat.WORD], {'style': 'default'})
+        orchestrator.convert(MARKDOWN, [OutputFormat.WORD], {'style': 'minimal', 'pageBreaks': True})
+
+        assert len(parses) == 1
+        (first_ast, first_options), (second_ast, second_options) = orchestrator.generator.calls
+        assert second_ast is first_ast
+        assert second_options['structure_analysis'] is first_options['structure_analysis']
+        assert second_options['style'] == 'minimal'
+
+        orchestrator.convert(MARKDOWN + "\nMore.\n", [OutputFormat.WORD])
+        assert len(parses) == 2
+
+    def test_invalid_markdown_not_cached(self, orchestrator):
+        """Documents with validation errors are never served from the cache."""
+        invalid = "# Title\n\n### Skipped level\n"
+        orchestrator.convert(invalid, [OutputFormat.WORD], {'ignore_errors': True})
+        with pytest.raises(ValueError):
+            orchestrator.convert(invalid, [OutputFormat.WORD])
@@ -0,0 +1,114 @@
+"""
+Tests for binary AST serialization.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.parser import MarkdownParser, ASTBuilder, ASTNode, NodeType
+from md2office.parser.ast_serializer import FORMAT_VERSION, MAGIC
+from md2office.errors import SerializationError
+
+MARKDOWN = """---
+title: Report
+---
+
+# Report
+
+Intro with **bold**, `code` and a [link](https://example.com) ünïcödé 🎉.
+
+## Data
+
+| A | B |
+|---|---|
+| 1 | 2 |
+
+1. First
+2. Second
+
+```python
+print("hi")
+```
+
+> A quote
+
+---
+"""
+
+
+def assert_same_tree(original: ASTNode, copy: ASTNode):
+    """Check two trees have the same fields, structure and parent links."""
+    assert copy.node_type == original.node_type
+    assert copy.content == original.content
+    assert copy.level == original.level
+    assert copy.metadata == original.metadata
+    assert copy.attributes == original.attributes
+    assert len(copy.children) == len(original.children)
+    for original_child, copied_child in zip(original.children, copy.children):
+        assert copied_child.parent is copy
+        assert_same_tree(original_child, copied_child)
+
+
+class TestASTSerializer:
+    """Test suite for ASTNode.to_bytes() / from_bytes()."""
+
+    @pytest.fixture
+    def ast(self):
+        """Build an AST covering every block type."""
+        return ASTBuilder().build(MarkdownParser().parse(MARKDOWN))
+
+    def test_round_trip(self, ast):
+        """A document tree survives serialization unchanged."""
+        data = ast.to_bytes()
+        assert data.startswith(MAGIC)
+        restored = ASTNode.from_bytes(data)
+        assert restored.parent is None
+        assert_same_tree(ast, restored)
+
+    def test_round_trip_values(self):
+        """Metadata values of every supported type are preserved."""
+        metadata = {
+            'none': None, 'flags': [True, False], 'count': -2 ** 40, 'ratio': 0.25,
+            'pair': (1, 'two'), 'nested': {'items': [{'a': 1}, {}], 3: 'int key'},
+        }
+        root = ASTNode(node_type=NodeType.DOCUMENT, metadata=metadata)
+        root.add_child(ASTNode(node_type=NodeType.IMAGE, content='alt',
+                               attributes={'src': 'a.png'}, metadata=dict(metadata)))
+
+        restored = ASTNode.from_bytes(root.to_bytes())
+        assert_same_tree(root, restored)
+        assert restored.metadata is not restored.children[0].metadata
+
+    def test_subtree(self, ast):
+        """Serializing a subtree drops its parent."""
+        section = ast.children[0]
+        restored = ASTNode.from_bytes(section.to_bytes())
+        assert restored.parent is None
+        assert_same_tree(section, restored)
+
+    def test_unsupported_value(self):
+        """Values outside the supported types are rejected."""
+        node = ASTNode(node_type=NodeType.TEXT, metadata={'bad': object()})
+        with pytest.raises(SerializationError, match="object"):
+            node.to_bytes()
+
+    def test_rejects_bad_data(self, ast):
+        """Foreign, other-version and truncated data raise SerializationError."""
+        data = ast.to_bytes()
+        other_version = data[:len(MAGIC)] + bytes([FORMAT_VERSION + 1]) + data[len(MAGIC) + 1:]
+        for bad in (b'', b'not an ast', other_version, data[:-3], data + b'\0'):
+            with pytest.raises(SerializationError):
+                ASTNode.from_bytes(bad)
+
+    def test_corrupt_data_keeps_cause(self, ast):
+        """Decoding errors are chained to the SerializationError."""
+        data = bytearray(ast.to_bytes())
+        data[data.index(b'Report')] = 0xff
+        with pytest.raises(SerializationError, match="corrupt") as excinfo:
+            ASTNode.from_bytes(bytes(data))
+        assert isinstance(excinfo.value.__cause__, UnicodeDecodeError)
@@ -86,3 +86,79 @@ class TestASTNode:
         assert len(parent.children) == 1
         assert parent.children[0] == child
 
+    
+    def test_identity_equality(self):
+        """Nodes compare by identity, so equal-looking nodes are distinct."""
+        first = ASTNode(NodeType.PARAGRAPH, content="Same")
+        second = ASTNode(NodeType.PARAGRAPH, content="Same")
+        assert first != second
+        assert len({first, second}) == 2
+        
+        parent = ASTNode(NodeType.DOCUMENT)
+        parent.add_child(first)
+        parent.add_child(second)
+        assert first.get_siblings() == [second]
+
+
+class TestStructuralHash:
+    """Test suite for ASTNode.structural_hash()."""
+    
+    MARKDOWN = "# Title\n\nIntro.\n\n## Part\n\n- a\n- b\n\n## Other\n\nText.\n"
+    
+    def build(self, markdown):
+        """Build an AST."""
+        return ASTBuilder().build(MarkdownParser().parse(markdown))
+    
+    def section(self, node, heading):
+        """Find the section node for a heading."""
+        if node.node_type == NodeType.SECTION and node.metadata.get('heading') == heading:
+            return node
+        for child in node.children:
+            found = self.section(child, heading)
+            if found is not None:
+                return found
+        return None
+    
+    def test_equal_trees_have_equal_hashes(self):
+        """Separately built identical documents hash the same."""
+        assert self.build(self.MARKDOWN).structural_hash() == \
+            self.build(self.MARKDOWN).structural_hash()
+    
+    def test_unchanged_sections_keep_their_hash(self):
+        """Editing one section changes only its hash and its ancestors'."""
+        original = self.build(self.MARKDOWN)
+        edited = self.build("Preface.\n\n" + self.MARKDOWN.replace("- b", "- c"))
+        part, other = self.section(original, 'Part'), self.section(original, 'Other')
+        edited_part, edited_other = self.section(edited, 'Part'), self.section(edited, 'Other')
+        
+        assert other.structural_hash() == edited_other.structural_hash()
+        assert part.structural_hash() != edited_part.structural_hash()
+        assert original.structural_hash() != edited.structural_hash()
+    
+    def test_metadata_and_attributes_are_hashed(self):
+        """Metadata and attributes contribute to the hash; key order does not."""
+        def node(**kwargs):
+            return ASTNode(NodeType.IMAGE, content="alt", **kwargs).structural_hash()
+        
+        assert node(attributes={'src': 'a.png'}) != node(attributes={'src': 'b.png'})
+        assert node(metadata={'a': 1, 'b': [1]}) == node(metadata={'b': [1], 'a': 1})
+        assert node(metadata={'a': 1}) != node(metadata={'a': True})
+        assert node(metadata={'line_number': 3}) == node(metadata={'line_number': 9})
+    
+    def test_add_child_invalidates_ancestors(self):
+        """Adding a node refreshes the cached hashes above it."""
+        root = self.build(self.MARKDOWN)
+        section = root.children[0]
+        before = root.structural_hash(), section.structural_hash()
+        
+        section.add_child(ASTNode(NodeType.PARAGRAPH, content="New"))
+        assert (root.structural_hash(), section.structural_hash()) != before
+    
+    def test_deep_tree(self):
+        """Hashing does not recurse, so very deep trees are fine."""
+        root = node = ASTNode(NodeType.DOCUMENT)
+        for _ in range(5000):
+            child = ASTNode(NodeType.BLOCKQUOTE)
+            node.add_child(child)
+            node = child
+        assert len(root.structural_hash()) == 32
@@ -0,0 +1,120 @@
+"""
+Tests for Profiling
+
+Implements tests for ConversionProfiler and pipeline/CLI profiling.
+"""
+
+import pstats
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.profiling import ConversionProfiler, profile_stage
+from md2office.router import ConversionPipeline, ConversionResult
+from md2office.cli import cli
+
+SAMPLE_MARKDOWN = "# Title\n\nSome *text*.\n\n## Section\n\n- one\n- two\n"
+
+
+class TestConversionProfiler:
+    """Test suite for ConversionProfiler."""
+
+    def test_nested_stages(self):
+        """Test nested stages get dotted names and are listed after their parent."""
+        profiler = ConversionProfiler()
+        with profiler.stage('generate'):
+            with profiler.stage('word'):
+                data = [0] * 100000
+            del data
+        with profiler.stage('generate'):
+            pass
+        profiler.close()
+
+        timings = profiler.get_timings()
+        assert [t.name for t in timings] == ['generate', 'generate.word']
+        assert timings[0].calls == 2
+        assert timings[1].depth == 1
+        assert timings[0].wall_time >= timings[1].wall_time
+        # The list allocation is attributed to both the stage and its parent
+        assert timings[1].peak_memory >= 800000
+        assert timings[0].peak_memory >= timings[1].peak_memory
+
+    def test_without_memory_tracking(self):
+        """Test memory tracking can be disabled."""
+        profiler = ConversionProfiler(track_memory=False)
+        with profiler.stage('parse'):
+            pass
+        assert profiler.stages['parse'].peak_memory == 0
+        assert 'parse' in profiler.format_table()
+
+    def test_merge(self):
+        """Test merging accumulates calls and times."""
+        first, second = ConversionProfiler(track_memory=False), ConversionProfiler(track_memory=False)
+        with first.stage('parse'):
+            pass
+        with second.stage('parse'):
+            pass
+        with second.stage('build'):
+            pass
+        first.merge(second)
+        assert first.stages['parse'].calls == 2
+        assert list(first.to_dict()) == ['parse', 'build']
+
+    def test_profile_stage_without_profiler(self):
+        """Test profile_stage is a no-op without a profiler."""
+        with profile_stage({}, 'parse'):
+            pass
+        with profile_stage(None, 'parse'):
+            pass
+
+
+class TestPipelineProfiling:
+    """Test suite for profiling through ConversionPipeline."""
+
+    def test_result_without_profile(self):
+        """Test results behave like dictionaries with no profile by default."""
+        result = ConversionPipeline().convert(SAMPLE_MARKDOWN, ['word'])
+        assert isinstance(result, ConversionResult)
+        assert result.profile is None
+        assert list(result) == ['word']
+
+    def test_result_with_profile(self):
+        """Test per-stage and per-generator timings are exposed on the result."""
+        result = ConversionPipeline().convert(SAMPLE_MARKDOWN, ['word', 'pdf'], profile=True)
+        stages = result.profile.to_dict()
+        for name in ('parse', 'validate', 'build', 'analyze', 'generate',
+                     'generate.word', 'generate.pdf', 'generate.word.load'):
+            assert name in stages
+        assert stages['generate.word']['wall_time'] > 0
+
+    def test_options_are_not_mutated(self):
+        """Test requesting a profile does not add a profiler to caller options."""
+        options = {'style': 'default'}
+        ConversionPipeline().convert(SAMPLE_MARKDOWN, ['word'], options, profile=True)
+        assert 'profiler' not in options
+
+
+class TestProfileCLI:
+    """Test suite for --profile and --profile-dump."""
+
+    def test_profile_table_and_dump(self, tmp_path):
+        """Test the summary table is printed and a pstats file is written."""
+        markdown_file = tmp_path / 'doc.md'
+        markdown_file.write_text(SAMPLE_MARKDOWN, encoding='utf-8')
+        dump_dir = tmp_path / 'prof'
+
+        result = CliRunner().invoke(cli, [
+            '--word', '--profile', '--profile-dump', str(dump_dir),
+            '--output', str(tmp_path), str(markdown_file)
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert 'Profile (1 document(s))' in result.output
+        assert 'generate' in result.output
+        stats = pstats.Stats(str(dump_dir / 'doc.prof'))
+        assert stats.total_calls > 0
@@ -0,0 +1,159 @@
+"""
+Tests for Progress Reporting
+
+Implements tests for ProgressReporter, progress events from the pipeline
+and generators, and the CLI progress line.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.progress import ProgressEvent, ProgressReporter, format_duration
+from md2office.router import ConversionPipeline
+from md2office.cli import cli
+
+SAMPLE_MARKDOWN = "\n\n".join(
+    f"# Chapter {number}\n\nIntro {number}.\n\n## Part {number}.1\n\n- one\n- two\n"
+    for number in range(1, 6)
+)
+
+
+def collect(pipeline, formats, markdown=SAMPLE_MARKDOWN, options=None):
+    """Convert markdown and return every progress event."""
+    events = []
+    pipeline.convert(markdown, formats, options,
+                     progress=ProgressReporter(events.append, min_interval=0))
+    return events
+
+
+class TestProgressReporter:
+    """Test suite for ProgressReporter."""
+
+    def test_fraction_covers_stages(self):
+        """Test that parsing and each format get their share of the conversion."""
+        events = []
+        reporter = ProgressReporter(events.append, min_interval=0)
+        reporter.start(['word', 'pdf'])
+        reporter.begin_stage('word', total=4)
+        reporter.advance(2)
+        reporter.begin_stage('pdf', total=10, unit='flowables')
+        reporter.advance(5, produced=3)
+        reporter.finish()
+
+        assert [event.stage for event in events] == ['parse', 'word', 'word', 'pdf', 'pdf', 'done']
+        assert [round(event.fraction, 3) for event in events] == [0.0, 0.1, 0.325, 0.55, 0.775, 1.0]
+        assert events[2].message.startswith("Generating word: 2/4 sections")
+        assert events[4].describe(with_eta=False) == "Generating pdf: 5/10 flowables, 3 pages"
+        assert events[4].eta is not None and events[4].eta >= 0
+        assert events[0].eta is None and events[-1].eta is None
+        assert events[-1].message == "Conversion complete"
+
+    def test_events_are_throttled(self):
+        """Test that advancing does not report more often than min_interval."""
+        events = []
+        reporter = ProgressReporter(events.append, min_interval=60)
+        reporter.start(['word'])
+        reporter.begin_stage('word', total=1000)
+        for _ in range(1000):
+            reporter.advance()
+        reporter.finish()
+
+        assert [event.stage for event in events] == ['parse', 'word', 'done']
+        assert reporter.current().completed == 1000
+
+    def test_completed_is_capped_at_total(self):
+        """Test that extra units (such as split PDF flowables) do not exceed the total."""
+        reporter = ProgressReporter(lambda event: None)
+        reporter.start(['pdf'])
+        reporter.begin_stage('pdf', total=2, unit='flowables')
+        reporter.advance(3)
+        event = reporter.current()
+        assert event.completed == 2
+        assert event.fraction == pytest.approx(1.0)
+
+    def test_format_duration(self):
+        """Test durations in progress messages."""
+        assert format_duration(0.2) == "1 s"
+        assert format_duration(44.6) == "45 s"
+        assert format_duration(150) == "3 min"
+
+    def test_event_to_dict(self):
+        """Test event serialization."""
+        event = ProgressEvent('pdf', completed=1, total=2, unit='flowables', produced=1)
+        assert event.to_dict()['produced'] == 1
+        assert event.percentage == 0
+
+
+class TestPipelineProgress:
+    """Test suite for progress reported by the pipeline and generators."""
+
+    def test_word_counts_sections(self):
+        """Test that Word reports every section, also when reusing cached sections."""
+        pipeline = ConversionPipeline()
+        for _ in range(2):
+            events = collect(pipeline, ['word'])
+            word = [event for event in events if event.stage == 'word']
+            assert word[0].total == 10 and word[0].unit == 'sections'
+            assert word[-1].completed == 10
+            assert events[-1].stage == 'done' and events[-1].fraction == 1.0
+
+    def test_powerpoint_counts_slides(self):
+        """Test that PowerPoint reports slides rendered out of slides laid out."""
+        pytest.importorskip("pptx")
+        events = collect(ConversionPipeline(), ['powerpoint'])
+        slides = [event for event in events if event.unit == 'slides']
+        assert slides and slides[-1].completed == slides[-1].total == slides[-1].produced
+
+    def test_pdf_counts_flowables_and_pages(self):
+        """Test that PDF reports laid out flowables and pages produced."""
+        pytest.importorskip("reportlab")
+        events = collect(ConversionPipeline(), ['pdf'])
+        flowables = [event for event in events if event.unit == 'flowables']
+        assert flowables[-1].completed == flowables[-1].total
+        assert flowables[-1].produced >= 1
+
+    def test_fraction_never_decreases(self):
+        """Test that progress over several formats only moves forward."""
+        pytest.importorskip("reportlab")
+        events = collect(ConversionPipeline(), ['word', 'pdf'])
+        fractions = [event.fraction for event in events]
+        assert fractions == sorted(fractions)
+        assert [event.stage for event in events][:1] == ['parse']
+        assert {'word', 'pdf', 'done'} <= {event.stage for event in events}
+
+    def test_partitioned_pdf_counts_partitions(self):
+        """Test that parallel PDF rendering reports finished partitions."""
+        pytest.importorskip("reportlab")
+        markdown = "\n".join(f"# Chapter {number}\n\n" + "Lorem ipsum. " * 200
+                             for number in range(1, 5))
+        events = collect(ConversionPipeline(), ['pdf'], markdown, {'pdf_workers': 2})
+        partitions = [event for event in events if event.unit == 'partitions']
+        assert partitions[-1].completed == partitions[-1].total == 2
+        assert partitions[-1].produced >= 2
+
+
+class TestProgressCLI:
+    """Test suite for --progress."""
+
+    def test_progress_line(self, tmp_path):
+        """Test the progress line shows the file, its progress and the batch."""
+        paths = []
+        for name in ('one', 'two'):
+            path = tmp_path / f'{name}.md'
+            path.write_text(SAMPLE_MARKDOWN, encoding='utf-8')
+            paths.append(str(path))
+
+        result = CliRunner().invoke(cli, [
+            '--word', '--progress', '--no-ast-cache', '--output', str(tmp_path / 'out')
+        ] + paths)
+
+        assert result.exit_code == 0, result.output
+        assert '[1/2] one.md: Parsing markdown | batch 0%' in result.output
+        assert '[2/2] two.md: Conversion complete | batch 100%' in result.output
+        assert (tmp_path / 'out' / 'two.docx').exists()
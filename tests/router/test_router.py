@@ -15,6 +15,10 @@ from md2office.router import ContentRouter, ConversionPipeline, OutputFormat
 from md2office.parser import ASTNode, NodeType
 
 
+class DummyGenerator:
+    """Stand-in generator used by registry tests."""
+
+
 class TestContentRouter:
     """Test suite for ContentRouter."""
     
@@ -58,3 +62,30 @@ class TestConversionPipeline:
         """Test pipeline initialization."""
         assert pipeline is not None
 
+
+
+class TestGeneratorRegistry:
+    """Test suite for lazy generator loading."""
+    
+    def test_pipeline_does_not_create_generators_eagerly(self):
+        """Generators are only created when their format is requested."""
+        pipeline = ConversionPipeline()
+        assert not pipeline.registry.is_loaded('word')
+        assert pipeline.router.generators == {}
+    
+    def test_registry_creates_generator_on_demand(self):
+        """Requesting a format creates and caches its generator."""
+        from md2office.generators.registry import GeneratorRegistry
+        registry = GeneratorRegistry(
+            {'word': f'{__name__}:DummyGenerator'}, use_entry_points=False
+        )
+        generator = registry.get('word')
+        assert isinstance(generator, DummyGenerator)
+        assert registry.get('word') is generator
+    
+    def test_unknown_format_raises(self):
+        """Unknown formats raise KeyError."""
+        from md2office.generators.registry import GeneratorRegistry
+        registry = GeneratorRegistry(use_entry_points=False)
+        with pytest.raises(KeyError):
+            registry.get('unknown')
@@ -0,0 +1,233 @@
+"""
+Tests for Conversion Server
+
+Implements tests for the warm conversion server and its client.
+"""
+
+import gc
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.server import conversion_server as server_module
+from md2office.server import ConversionServer, ServerClient, parse_address
+from md2office.errors import ConversionError, ServerError
+from md2office.cli import cli
+from md2office.cli.serve import serve_cli
+
+SAMPLE_MARKDOWN = "# Title\n\nSome *text*.\n\n## Section\n\n- one\n- two\n"
+
+
+class FailingGenerator:
+    """Generator that always fails, used to exercise error forwarding."""
+
+    def generate(self, ast, options):
+        raise ConversionError("Generator failed", format='pdf', stage='generation')
+
+
+@pytest.fixture
+def server():
+    """Run an in-process server on a free localhost port."""
+    # Collect leftover Qt objects from other tests on the main thread; if the
+    # collector first runs on a handler thread, destroying them crashes Qt
+    gc.collect()
+    conversion_server = ConversionServer(address='127.0.0.1:0', workers=0)
+    conversion_server.start()
+    thread = threading.Thread(target=conversion_server.serve_forever, daemon=True)
+    thread.start()
+    yield conversion_server
+    conversion_server.stop()
+    thread.join(timeout=10)
+
+
+@pytest.fixture
+def markdown_file(tmp_path):
+    """Create a small markdown document."""
+    path = tmp_path / 'doc.md'
+    path.write_text(SAMPLE_MARKDOWN, encoding='utf-8')
+    return path
+
+
+class TestAddress:
+    """Test suite for server address parsing."""
+
+    def test_parse_unix_address(self):
+        """Test parsing Unix socket addresses."""
+        assert parse_address('unix:/tmp/md2office.sock') == ('unix', '/tmp/md2office.sock')
+
+    def test_parse_tcp_address(self):
+        """Test parsing host:port, URL and bare port addresses."""
+        assert parse_address('localhost:9000') == ('tcp', ('localhost', 9000))
+        assert parse_address('http://127.0.0.1:9000/') == ('tcp', ('127.0.0.1', 9000))
+        assert parse_address('9000') == ('tcp', ('127.0.0.1', 9000))
+
+    def test_parse_invalid_address(self):
+        """Test invalid addresses are rejected."""
+        with pytest.raises(ValueError):
+            parse_address('localhost')
+
+
+class TestConversionServer:
+    """Test suite for ConversionServer and ServerClient."""
+
+    def test_health(self, server):
+        """Test health endpoint reports server status."""
+        status = ServerClient(server.address).health()
+        assert status['status'] == 'ok'
+        assert status['workers'] == 0
+
+    def test_convert_markdown_body(self, server):
+        """Test converting markdown text returns document bytes."""
+        results = ServerClient(server.address).convert(['word', 'pdf'], markdown=SAMPLE_MARKDOWN)
+        assert results['word'][:2] == b'PK'
+        assert results['pdf'][:4] == b'%PDF'
+
+    def test_convert_writes_outputs(self, server, markdown_file, tmp_path):
+        """Test server writes outputs when given an output directory."""
+        output_dir = tmp_path / 'out'
+        results = ServerClient(server.address).convert(
+            ['word'], input_path=str(markdown_file), output_dir=str(output_dir)
+        )
+        assert Path(results['word']) == output_dir / 'doc.docx'
+        assert (output_dir / 'doc.docx').exists()
+
+    def test_existing_output_writes_nothing(self, server, markdown_file, tmp_path):
+        """Test that a job stopped by an existing output leaves no partial output."""
+        output_dir = tmp_path / 'out'
+        output_dir.mkdir()
+        (output_dir / 'doc.pdf').write_bytes(b'existing')
+        with pytest.raises(ServerError):
+            ServerClient(server.address).convert(
+                ['word', 'pdf'], input_path=str(markdown_file), output_dir=str(output_dir)
+            )
+        assert sorted(p.name for p in output_dir.iterdir()) == ['doc.pdf']
+        assert (output_dir / 'doc.pdf').read_bytes() == b'existing'
+
+    def test_error_is_reraised(self, server):
+        """Test conversion errors are re-raised locally with their context."""
+        server_module._worker_pipeline.register_generator('pdf', FailingGenerator())
+        client = ServerClient(server.address)
+        with pytest.raises(ConversionError) as exc_info:
+            client.convert(['pdf'], markdown=SAMPLE_MARKDOWN)
+        assert exc_info.value.format == 'pdf'
+        assert exc_info.value.stage == 'generation'
+        with pytest.raises(ServerError):
+            client.convert(['word'])
+
+    def test_unix_socket(self, tmp_path):
+        """Test serving on a Unix domain socket."""
+        if not hasattr(__import__('socket'), 'AF_UNIX'):
+            pytest.skip("Unix sockets not supported")
+        gc.collect()
+        conversion_server = ConversionServer(address=f"unix:{tmp_path / 's.sock'}", workers=0)
+        conversion_server.start()
+        thread = threading.Thread(target=conversion_server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            results = ServerClient(conversion_server.address).convert(['word'], markdown=SAMPLE_MARKDOWN)
+            assert results['word'][:2] == b'PK'
+        finally:
+            conversion_server.stop()
+            thread.join(timeout=10)
+        assert not (tmp_path / 's.sock').exists()
+
+    def test_loopback_only(self):
+        """Test that the server refuses to listen beyond this machine."""
+        with pytest.raises(ServerError):
+            ConversionServer(address='0.0.0.0:0', workers=0)
+        assert ConversionServer(address='localhost:0', workers=0).address == 'localhost:0'
+
+    def test_token_required(self):
+        """Test that a server with a token rejects clients without it."""
+        gc.collect()
+        conversion_server = ConversionServer(address='127.0.0.1:0', workers=0, token='secret')
+        conversion_server.start()
+        thread = threading.Thread(target=conversion_server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with pytest.raises(ServerError):
+                ServerClient(conversion_server.address).health()
+            with pytest.raises(ServerError):
+                ServerClient(conversion_server.address, token='wrong').health()
+            assert ServerClient(conversion_server.address, token='secret').health()['status'] == 'ok'
+        finally:
+            conversion_server.stop()
+            thread.join(timeout=10)
+
+    def test_output_name_stays_in_output_dir(self, server, tmp_path):
+        """Test that output names cannot point outside the output directory."""
+        client = ServerClient(server.address)
+        for name in ('../escaped', 'sub/escaped', '..'):
+            with pytest.raises(ServerError):
+                client.convert(['word'], markdown=SAMPLE_MARKDOWN,
+                               output_dir=str(tmp_path / 'out'), name=name)
+        assert not any(tmp_path.rglob('escaped*'))
+
+    def test_worker_processes(self, markdown_file, tmp_path):
+        """Test jobs run in the worker process pool."""
+        gc.collect()
+        conversion_server = ConversionServer(address='127.0.0.1:0', workers=1)
+        conversion_server.start()
+        thread = threading.Thread(target=conversion_server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = ServerClient(conversion_server.address)
+            assert client.health()['workers'] == 1
+            results = client.convert(['word', 'html'], markdown=SAMPLE_MARKDOWN)
+            assert results['word'][:2] == b'PK'
+            assert b'<h1' in results['html']
+            outputs = client.convert(['word'], input_path=str(markdown_file),
+                                     output_dir=str(tmp_path / 'out'))
+            assert Path(outputs['word']) == tmp_path / 'out' / 'doc.docx'
+            assert (tmp_path / 'out' / 'doc.docx').read_bytes()[:2] == b'PK'
+            assert conversion_server.get_status()['jobs_completed'] == 2
+        finally:
+            conversion_server.stop()
+            thread.join(timeout=10)
+
+    def test_unreachable_server(self, tmp_path):
+        """Test unreachable server raises ServerError."""
+        client = ServerClient(f"unix:{tmp_path / 'none.sock'}")
+        assert not client.is_available()
+        with pytest.raises(ServerError):
+            client.health()
+
+
+class TestServerCLI:
+    """Test suite for the --server CLI flag."""
+
+    @pytest.mark.parametrize('address', ['0.0.0.0:8765', 'localhost:port'])
+    def test_serve_rejects_bad_address(self, address):
+        """Test 'md2office serve' reports a bad address without a traceback."""
+        result = CliRunner().invoke(serve_cli, ['--address', address, '--workers', '0'])
+        assert result.exit_code == 1
+        assert result.output.startswith('Error: ')
+        assert not isinstance(result.exception, ServerError)
+
+    def test_cli_uses_server(self, server, markdown_file, tmp_path):
+        """Test --server converts through the running server."""
+        output_dir = tmp_path / 'out'
+        result = CliRunner().invoke(cli, [
+            '--server', '--server-address', server.address,
+            '--word', '--output', str(output_dir), str(markdown_file)
+        ])
+        assert result.exit_code == 0, result.output
+        assert (output_dir / 'doc.docx').exists()
+        assert server.get_status()['jobs_completed'] == 1
+
+    def test_cli_falls_back_without_server(self, markdown_file, tmp_path):
+        """Test --server converts locally when no server is running."""
+        output_dir = tmp_path / 'out'
+        result = CliRunner().invoke(cli, [
+            '--server', '--server-address', f"unix:{tmp_path / 'none.sock'}",
+            '--word', '--output', str(output_dir), str(markdown_file)
+        ])
+        assert result.exit_code == 0, result.output
+        assert 'converting locally' in result.output
+        assert (output_dir / 'doc.docx').exists()
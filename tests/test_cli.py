@@ -117,6 +117,20 @@ Some content here.
             output_files = list(temp_output_dir.glob('*.pptx'))
             assert len(output_files) > 0
     
+    def test_cli_html_conversion(self, runner, sample_markdown_file, temp_output_dir):
+        """Test CLI HTML conversion."""
+        result = runner.invoke(cli, [
+            '--html',
+            '--output', str(temp_output_dir),
+            str(sample_markdown_file)
+        ])
+        
+        # HTML needs no optional libraries
+        assert result.exit_code == 0
+        output_files = list(temp_output_dir.glob('*.html'))
+        assert len(output_files) == 1
+        assert output_files[0].read_text(encoding='utf-8').startswith('<!DOCTYPE html>')
+    
     def test_cli_all_formats(self, runner, sample_markdown_file, temp_output_dir):
         """Test CLI --all option."""
         result = runner.invoke(cli, [
@@ -158,6 +172,22 @@ Some content here.
             output_files = list(temp_output_dir.glob('*-converted.docx'))
             assert len(output_files) > 0
     
+    def test_cli_emit_ast(self, runner, sample_markdown_file, temp_output_dir):
+        """Test CLI --emit-ast option without any output format."""
+        from md2office.parser import ASTNode, NodeType
+        
+        result = runner.invoke(cli, [
+            '--emit-ast',
+            '--output', str(temp_output_dir),
+            str(sample_markdown_file)
+        ])
+        
+        assert result.exit_code == 0
+        ast_file = temp_output_dir / f"{sample_markdown_file.stem}.mdast"
+        ast = ASTNode.from_bytes(ast_file.read_bytes())
+        assert ast.node_type == NodeType.DOCUMENT
+        assert ast.children[0].metadata['heading'] == 'Test Document'
+    
     def test_cli_verbose(self, runner, sample_markdown_file, temp_output_dir):
         """Test CLI --verbose option."""
         result = runner.invoke(cli, [
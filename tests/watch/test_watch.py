@@ -0,0 +1,196 @@
+"""
+Tests for Watch Mode
+
+Implements tests for file watchers, the incremental builder and the
+watch session.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from md2office.watch import (
+    FileWatcher, IncrementalBuilder, InotifyWatcher, PollingWatcher, WatchSession,
+    create_watcher
+)
+
+
+def write_png(path: Path, size: int = 4):
+    """Write a small PNG image."""
+    from PIL import Image
+    Image.new('RGB', (size, size), 'red').save(path)
+
+
+def touch_later(path: Path, content: str):
+    """Rewrite a file with a strictly newer mtime."""
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content, encoding='utf-8')
+    os.utime(path, ns=(previous + 10**9, previous + 10**9))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a documentation tree with an image outside it."""
+    docs = tmp_path / 'docs'
+    (docs / 'sub').mkdir(parents=True)
+    (tmp_path / 'img').mkdir()
+    write_png(tmp_path / 'img' / 'pic.png')
+    (docs / 'a.md').write_text("# A\n\n![pic](../img/pic.png)\n\nText.\n", encoding='utf-8')
+    (docs / 'sub' / 'b.md').write_text("# B\n\nText.\n", encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def builder(tree):
+    """Create an incremental builder with an initial build."""
+    incremental_builder = IncrementalBuilder(str(tree / 'docs'), ['word'])
+    report = incremental_builder.build_all()
+    assert not report.errors
+    return incremental_builder
+
+
+def rebuilt_names(report):
+    """Names of rebuilt documents."""
+    return sorted(Path(d).name for d in report.documents) if report else []
+
+
+class TestIncrementalBuilder:
+    """Test suite for IncrementalBuilder."""
+
+    def test_initial_build(self, tree, builder):
+        """Test every document is converted next to its source."""
+        assert (tree / 'docs' / 'a.docx').exists()
+        assert (tree / 'docs' / 'sub' / 'b.docx').exists()
+        assert str((tree / 'img' / 'pic.png').resolve()) in builder.get_watch_paths()
+
+    def test_markdown_change_rebuilds_only_that_document(self, tree, builder):
+        """Test a markdown edit rebuilds just the edited document."""
+        path = tree / 'docs' / 'sub' / 'b.md'
+        touch_later(path, "# B\n\nEdited.\n")
+        report = builder.handle_changes([str(path)])
+        assert rebuilt_names(report) == ['b.md']
+
+    def test_image_change_rebuilds_referencing_document(self, tree, builder):
+        """Test an image edit rebuilds documents that reference it."""
+        image = tree / 'img' / 'pic.png'
+        write_png(image, size=8)
+        report = builder.handle_changes([str(image)])
+        assert rebuilt_names(report) == ['a.md']
+
+    def test_unchanged_file_is_ignored(self, tree, builder):
+        """Test events for files whose signature did not change are ignored."""
+        assert builder.handle_changes([str(tree / 'img' / 'pic.png')]) is None
+
+    def test_config_change_rebuilds_documents_it_applies_to(self, tree, builder):
+        """Test a style change in a config file rebuilds only affected documents."""
+        config = tree / 'docs' / 'sub' / '.md2office.json'
+        config.write_text(json.dumps({'style': 'professional'}), encoding='utf-8')
+        report = builder.handle_changes([str(config)])
+        assert rebuilt_names(report) == ['b.md']
+
+        # Rewriting the same settings does not rebuild anything
+        config.write_text(json.dumps({'style': 'professional'}), encoding='utf-8')
+        assert builder.handle_changes([str(config)]) is None
+
+    def test_new_and_deleted_documents(self, tree, builder):
+        """Test new documents are built and deleted ones are forgotten."""
+        new_dir = tree / 'docs' / 'new'
+        new_dir.mkdir()
+        (new_dir / 'c.md').write_text("# C\n", encoding='utf-8')
+        report = builder.handle_changes([str(new_dir)])
+        assert rebuilt_names(report) == ['c.md']
+
+        (tree / 'docs' / 'a.md').unlink()
+        assert builder.handle_changes([str(tree / 'docs' / 'a.md')]) is None
+        assert str((tree / 'docs' / 'a.md').resolve()) not in builder.documents
+
+    def test_output_directory_mirrors_tree(self, tree):
+        """Test outputs mirror the tree layout under --output."""
+        output = tree / 'out'
+        report = IncrementalBuilder(str(tree / 'docs'), ['word'], output_dir=str(output)).build_all()
+        assert not report.errors
+        assert (output / 'a.docx').exists()
+        assert (output / 'sub' / 'b.docx').exists()
+
+
+class TestFileWatchers:
+    """Test suite for file watchers."""
+
+    @pytest.fixture(params=['polling', 'inotify'])
+    def watcher(self, request, tree):
+        """Create each available watcher type."""
+        root = str(tree / 'docs')
+        if request.param == 'polling':
+            file_watcher = PollingWatcher(root, interval=0.05)
+        else:
+            try:
+                file_watcher = InotifyWatcher(root)
+            except OSError:
+                pytest.skip("inotify not available")
+        yield file_watcher
+        file_watcher.close()
+
+    def test_detects_modification(self, tree, watcher):
+        """Test modified files are reported."""
+        path = tree / 'docs' / 'sub' / 'b.md'
+        touch_later(path, "# B\n\nChanged.\n")
+        assert str(path) in watcher.poll(timeout=2)
+
+    def test_detects_new_file_in_new_directory(self, tree, watcher):
+        """Test files in newly created directories are reported."""
+        new_dir = tree / 'docs' / 'new'
+        new_dir.mkdir()
+        changed = watcher.poll(timeout=2)
+        (new_dir / 'c.md').write_text("# C\n", encoding='utf-8')
+        changed |= watcher.poll(timeout=2)
+        assert str(new_dir) in changed
+        assert str(new_dir / 'c.md') in changed
+
+    def test_detects_added_path_outside_tree(self, tree, watcher):
+        """Test files added with add_path are watched."""
+        image = tree / 'img' / 'pic.png'
+        watcher.add_path(str(image))
+        write_png(image, size=6)
+        os.utime(image, ns=(10**18, 10**18))
+        assert str(image) in watcher.poll(timeout=2)
+
+    def test_timeout_without_changes(self, watcher):
+        """Test poll returns an empty set after the timeout."""
+        start = time.monotonic()
+        assert watcher.poll(timeout=0.1) == set()
+        assert time.monotonic() - start < 1.0
+
+    def test_create_watcher_polling(self, tree):
+        """Test polling can be forced."""
+        assert isinstance(create_watcher(str(tree), polling=True), PollingWatcher)
+
+    def test_base_watcher_is_abstract(self, tree):
+        """Test the base class cannot be used as a watcher."""
+        with pytest.raises(TypeError):
+            FileWatcher(str(tree))
+
+
+class TestWatchSession:
+    """Test suite for WatchSession."""
+
+    def test_debounced_rebuild(self, tree):
+        """Test a burst of edits results in one rebuild with latency reported."""
+        root = tree / 'docs'
+        builder = IncrementalBuilder(str(root), ['word'])
+        session = WatchSession(builder, PollingWatcher(str(root), interval=0.05), debounce=0.2)
+        assert len(session.start().documents) == 2
+
+        touch_later(root / 'a.md', "# A\n\nOne.\n")
+        touch_later(root / 'sub' / 'b.md', "# B\n\nTwo.\n")
+        report = session.run_once(timeout=2)
+        session.close()
+
+        assert rebuilt_names(report) == ['a.md', 'b.md']
+        assert report.latency is not None and report.latency >= report.build_time